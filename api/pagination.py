@@ -0,0 +1,60 @@
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from tinySteps.utils.helpers.pagination_helper import Keyset_Paginator
+
+class Keyset_Pagination(BasePagination):
+    """
+    Cursor pagination on (created_at, id) for time-ordered collections
+
+    Query parameters: ``cursor``, ``page_size`` and ``count=true`` to add an
+    approximate total to the response.
+    """
+    page_size = 10
+    max_page_size = 100
+    ordering = ('-created_at', '-id')
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    count_query_param = 'count'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        ordering = getattr(view, 'keyset_ordering', self.ordering)
+        self.request = request
+        self.paginator = Keyset_Paginator(queryset, self.get_page_size(request), ordering=ordering)
+        self.page = self.paginator.page(request.query_params.get(self.cursor_query_param))
+        return list(self.page)
+
+    def get_paginated_response(self, data):
+        response = {
+            'next': self._link(self.page.next_cursor),
+            'previous': self._link(self.page.previous_cursor),
+            'results': data,
+        }
+        if self.request.query_params.get(self.count_query_param) in ('1', 'true'):
+            response['count'] = self.paginator.approximate_count
+        return Response(response)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'count': {'type': 'integer', 'description': 'Approximate total, with count=true'},
+                'results': schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def _link(self, cursor):
+        if cursor is None:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, cursor)
@@ -4,6 +4,7 @@ from django.contrib.auth.models import User
 from tinySteps.models import (
     YourChild_Model, 
     Milestone_Model, 
+    GrowthMeasurement_Model,
     ParentsForum_Model,
     Guides_Model,
     Comment_Model,
@@ -13,6 +14,16 @@ from tinySteps.models import (
     VaccineCard_Model,
     CalendarEvent_Model,
 )
+from tinySteps.services.media.image_service import Image_Service
+
+class ImageDerivatives_Field(serializers.ReadOnlyField):
+    """Resized WebP/JPEG URLs and srcsets of an uploaded image, or None without one"""
+
+    def to_representation(self, value):
+        service = Image_Service()
+        if not value or not service.is_source(value.name):
+            return None
+        return service.describe(value.name)
 
 ###########################################################################
 # USER SERIALIZERS
@@ -27,17 +38,33 @@ class User_Serializer(serializers.ModelSerializer):
 # CHILD AND DEVELOPMENT SERIALIZERS
 ###########################################################################
 class YourChild_Serializer(serializers.ModelSerializer):
+    image_derivatives = ImageDerivatives_Field(source='image')
+    
     class Meta:
         model = YourChild_Model
         fields = '__all__'
         read_only_fields = ['id', 'user']
 
 class Milestone_Serializer(serializers.ModelSerializer):
+    photo_derivatives = ImageDerivatives_Field(source='photo')
+    
     class Meta:
         model = Milestone_Model
         fields = '__all__'
         read_only_fields = ['id']
 
+class GrowthMeasurement_Serializer(serializers.ModelSerializer):
+    class Meta:
+        model = GrowthMeasurement_Model
+        fields = ['id', 'child', 'date', 'weight', 'height', 'head_circumference', 'created_at']
+        read_only_fields = ['id', 'child', 'created_at']
+
+    def validate(self, data):
+        fields = ('weight', 'height', 'head_circumference')
+        if all(data.get(field, getattr(self.instance, field, None)) is None for field in fields):
+            raise serializers.ValidationError("At least one measurement is required")
+        return data
+
 ###########################################################################
 # COMMUNICATION SERIALIZERS
 ###########################################################################
@@ -54,8 +81,6 @@ class Comment_Serializer(serializers.ModelSerializer):
 
 class ParentsForum_Serializer(serializers.ModelSerializer):
     author_name = serializers.SerializerMethodField()
-    comments_count = serializers.SerializerMethodField()
-    likes_count = serializers.SerializerMethodField()
     
     class Meta:
         model = ParentsForum_Model
@@ -64,12 +89,6 @@ class ParentsForum_Serializer(serializers.ModelSerializer):
         
     def get_author_name(self, obj):
         return obj.author.username
-        
-    def get_comments_count(self, obj):
-        return obj.comments.count()
-        
-    def get_likes_count(self, obj):
-        return obj.likes.count()
 
 class Contact_Serializer(serializers.ModelSerializer):
     class Meta:
@@ -87,26 +106,28 @@ class Notification_Serializer(serializers.ModelSerializer):
 # EDUCATIONAL CONTENT SERIALIZERS
 ###########################################################################
 class ParentsGuide_Serializer(serializers.ModelSerializer):
-    comments_count = serializers.SerializerMethodField()
+    image_url = serializers.SerializerMethodField()
+    image_derivatives = ImageDerivatives_Field(source='image')
     
     class Meta:
         model = Guides_Model
-        fields = ['id', 'title', 'desc', 'image_url', 'created_at', 'comments_count']
-        read_only_fields = ['id', 'created_at']
-        
-    def get_comments_count(self, obj):
-        return obj.comments.count()
+        fields = ['id', 'title', 'desc', 'image_url', 'image_derivatives', 'created_at', 'comments_count']
+        read_only_fields = ['id', 'created_at', 'comments_count']
+    
+    def get_image_url(self, obj):
+        return obj.get_image_url()
 
 class NutritionGuide_Serializer(serializers.ModelSerializer):
-    comments_count = serializers.SerializerMethodField()
+    image_url = serializers.SerializerMethodField()
+    image_derivatives = ImageDerivatives_Field(source='image')
     
     class Meta:
         model = Guides_Model
-        fields = ['id', 'title', 'desc', 'image_url', 'created_at', 'comments_count']
-        read_only_fields = ['id', 'created_at']
-        
-    def get_comments_count(self, obj):
-        return obj.comments.count()
+        fields = ['id', 'title', 'desc', 'image_url', 'image_derivatives', 'created_at', 'comments_count']
+        read_only_fields = ['id', 'created_at', 'comments_count']
+    
+    def get_image_url(self, obj):
+        return obj.get_image_url()
 
 ###########################################################################
 # HEALTH AND MEDICAL SERIALIZERS
@@ -23,6 +23,7 @@ router.register(r'info-requests', views.Contact_ViewSet, basename='info-request'
 children_router = routers.NestedSimpleRouter(router, r'children', lookup='child')
 children_router.register(r'events', views.ChildCalendarEvents_ViewSet, basename='child-events')
 children_router.register(r'milestones', views.ChildMilestone_ViewSet, basename='child-milestone')
+children_router.register(r'measurements', views.ChildGrowthMeasurement_ViewSet, basename='child-measurement')
 
 # Routers for forums and guides
 forum_router = routers.NestedSimpleRouter(router, r'forums', lookup='forum')
@@ -45,6 +46,7 @@ urlpatterns = [
     # Custom views
     path('me/', views.CurrentUser_View.as_view(), name='current-user'),
     path('my-children/', views.CurrentUserChildren_View.as_view(), name='current-user-children'),
+    path('my-dashboard-stats/', views.DashboardStatistics_View.as_view(), name='current-user-dashboard-stats'),
     path('search/', views.Search_View.as_view(), name='search'),
 
     # Calendar event API endpoints
@@ -3,7 +3,7 @@ from datetime import timedelta
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.models import User
 from django.contrib.contenttypes.models import ContentType
-from django.db.models import Q
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from rest_framework import generics, permissions, status, viewsets
@@ -11,10 +11,12 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from .pagination import Keyset_Pagination
 from .serializers import (
     User_Serializer,
     YourChild_Serializer,
     Milestone_Serializer,
+    GrowthMeasurement_Serializer,
     ParentsForum_Serializer,
     Comment_Serializer,
     ParentsGuide_Serializer,
@@ -29,6 +31,7 @@ from .serializers import (
 from tinySteps.models import (
     YourChild_Model,
     Milestone_Model,
+    GrowthMeasurement_Model,
     ParentsForum_Model,
     Guides_Model,
     Comment_Model,
@@ -38,9 +41,15 @@ from tinySteps.models import (
     Vaccine_Model,
     CalendarEvent_Model,
 )
+from tinySteps.repositories import CalendarEvent_Repository, Forum_Repository, Guide_Repository
 
 logger = logging.getLogger(__name__)
 
+# Largest number of vaccine updates accepted by one batch request
+VACCINE_BATCH_LIMIT = 200
+# Number of tags returned by the guide tag facets
+GUIDE_TAG_FACET_LIMIT = 50
+
 ###########################################################################
 # CUSTOM PERMISSIONS
 ###########################################################################
@@ -144,6 +153,28 @@ class CurrentUserChildren_View(generics.ListAPIView):
     def get_queryset(self):
         return YourChild_Model.objects.filter(user=self.request.user)
 
+class DashboardStatistics_View(APIView):
+    """
+    View to get the current user's children dashboard statistics
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        from tinySteps.services.core.dashboard_service import Dashboard_Service
+        return Response(Dashboard_Service().get_user_statistics(request.user))
+
+class Metrics_View(APIView):
+    """
+    Staff-only Prometheus scrape endpoint, aggregated over every worker
+    """
+    permission_classes = [permissions.IsAdminUser]
+    throttle_classes = []  # scraped every few seconds
+
+    def get(self, request):
+        from tinySteps.utils.helpers.metrics_helper import render_metrics
+        body, content_type = render_metrics()
+        return HttpResponse(body, content_type=content_type)
+
 ###########################################################################
 # CHILDREN AND DEVELOPMENT MILESTONES
 ###########################################################################
@@ -156,6 +187,13 @@ class YourChild_ViewSet(viewsets.ModelViewSet):
     
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
+    
+    @action(detail=False, methods=['get'], url_name='all-event-stats')
+    def event_stats(self, request):
+        """Get event statistics for all of the current user's children in one query"""
+        from tinySteps.services.core.child_service import Child_Service
+        stats = Child_Service().get_event_statistics_for_user(request.user)
+        return Response({'children': {str(child_id): data for child_id, data in stats.items()}})
 
 class Milestone_ViewSet(viewsets.ModelViewSet):
     """
@@ -197,6 +235,25 @@ class ChildMilestone_ViewSet(viewsets.ModelViewSet):
         child = get_object_or_404(YourChild_Model, id=child_id, user=self.request.user)
         serializer.save(child=child)
 
+class ChildGrowthMeasurement_ViewSet(viewsets.ModelViewSet):
+    """
+    ViewSet for managing the growth measurements of a specific child
+    """
+    serializer_class = GrowthMeasurement_Serializer
+    permission_classes = [permissions.IsAuthenticated, IsAdminOrOwnerOrReadOnly]
+    
+    def get_queryset(self):
+        child_id = self.kwargs['child_pk']
+        return GrowthMeasurement_Model.objects.filter(
+            child_id=child_id,
+            child__user=self.request.user
+        ).order_by('date')
+    
+    def perform_create(self, serializer):
+        child_id = self.kwargs['child_pk']
+        child = get_object_or_404(YourChild_Model, id=child_id, user=self.request.user)
+        serializer.save(child=child)
+
 class ChildGrowthData_ViewSet(LoginRequiredMixin, viewsets.ViewSet):
     """ViewSet for child growth data"""
     permission_classes = [permissions.IsAuthenticated]
@@ -229,10 +286,11 @@ class ChildGrowthData_ViewSet(LoginRequiredMixin, viewsets.ViewSet):
 ###########################################################################
 class ParentsForum_ViewSet(viewsets.ModelViewSet):
     serializer_class = ParentsForum_Serializer
+    pagination_class = Keyset_Pagination
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsAdminOrOwnerOrReadOnly]
     
     def get_queryset(self):
-        return ParentsForum_Model.objects.all().order_by('-created_at')
+        return Forum_Repository().get_posts_with_counts()
     
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
@@ -249,8 +307,9 @@ class ParentsForum_ViewSet(viewsets.ModelViewSet):
         serializer = Comment_Serializer(comments, many=True)
         return Response(serializer.data)
     
-    @action(detail=True, methods=['post'])
+    @action(detail=True, methods=['post', 'put', 'delete'])
     def like(self, request, pk=None):
+        """POST toggles the like of the current user, PUT likes and DELETE unlikes (both idempotent)"""
         if not request.user.is_authenticated:
             return Response(
                 {'error': 'Authentication required'}, 
@@ -259,17 +318,19 @@ class ParentsForum_ViewSet(viewsets.ModelViewSet):
             
         forum = self.get_object()
 
-        # Check if user already liked this post
-        if forum.likes.filter(id=request.user.id).exists():
-            forum.likes.remove(request.user)
+        if request.method == 'PUT':
+            forum.like(request.user)
+            liked = True
+        elif request.method == 'DELETE':
+            forum.unlike(request.user)
             liked = False
         else:
-            forum.likes.add(request.user)
-            liked = True
+            liked = forum.toggle_like(request.user)
 
+        forum.refresh_from_db(fields=['likes_count'])
         return Response({
             'liked': liked,
-            'likes_count': forum.likes.count()
+            'likes_count': forum.likes_count
         })
 
 class ForumComment_ViewSet(viewsets.ModelViewSet):
@@ -277,6 +338,8 @@ class ForumComment_ViewSet(viewsets.ModelViewSet):
     ViewSet for managing comments on a specific forum post
     """
     serializer_class = Comment_Serializer
+    pagination_class = Keyset_Pagination
+    keyset_ordering = ('created_at', 'id')
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsAdminOrOwnerOrReadOnly]
     
     def get_queryset(self):
@@ -300,6 +363,7 @@ class ForumComment_ViewSet(viewsets.ModelViewSet):
 class Comment_ViewSet(viewsets.ModelViewSet):
     queryset = Comment_Model.objects.all()
     serializer_class = Comment_Serializer
+    pagination_class = Keyset_Pagination
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsAdminOrOwnerOrReadOnly]
     
     @action(detail=False, methods=['post'])
@@ -339,10 +403,20 @@ class Comment_ViewSet(viewsets.ModelViewSet):
 # PARENT AND NUTRITION GUIDES
 ###########################################################################
 class ParentsGuide_ViewSet(viewsets.ModelViewSet):
-    queryset = Guides_Model.objects.filter(guide_type='parent').order_by('-created_at')
     serializer_class = ParentsGuide_Serializer
+    pagination_class = Keyset_Pagination
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsAdminOrOwnerOrReadOnly]
     
+    def get_queryset(self):
+        return Guide_Repository(Guides_Model).get_guides_with_counts(
+            guide_type='parent', tag=self.request.query_params.get('tag')
+        )
+    
+    @action(detail=False, methods=['get'])
+    def tags(self, request):
+        """Tag facets of the approved guides, most used first: ``[{'slug', 'name', 'count'}]``"""
+        return Response(Guide_Repository(Guides_Model).get_tag_counts(guide_type='parent', limit=GUIDE_TAG_FACET_LIMIT))
+    
     @action(detail=True, methods=['get'])
     def comments(self, request, pk=None):
         guide = self.get_object()
@@ -356,10 +430,20 @@ class ParentsGuide_ViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 class NutritionGuide_ViewSet(viewsets.ModelViewSet):
-    queryset = Guides_Model.objects.filter(guide_type='nutrition').order_by('-created_at')
     serializer_class = NutritionGuide_Serializer
+    pagination_class = Keyset_Pagination
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsAdminOrOwnerOrReadOnly]
     
+    def get_queryset(self):
+        return Guide_Repository(Guides_Model).get_guides_with_counts(
+            guide_type='nutrition', tag=self.request.query_params.get('tag')
+        )
+    
+    @action(detail=False, methods=['get'])
+    def tags(self, request):
+        """Tag facets of the approved guides, most used first: ``[{'slug', 'name', 'count'}]``"""
+        return Response(Guide_Repository(Guides_Model).get_tag_counts(guide_type='nutrition', limit=GUIDE_TAG_FACET_LIMIT))
+    
     @action(detail=True, methods=['get'])
     def comments(self, request, pk=None):
         guide = self.get_object()
@@ -377,6 +461,8 @@ class GuideComment_ViewSet(viewsets.ModelViewSet):
     ViewSet for managing comments on a specific guide
     """
     serializer_class = Comment_Serializer
+    pagination_class = Keyset_Pagination
+    keyset_ordering = ('created_at', 'id')
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsAdminOrOwnerOrReadOnly]
     
     def get_queryset(self):
@@ -402,6 +488,7 @@ class GuideComment_ViewSet(viewsets.ModelViewSet):
 ###########################################################################
 class Notification_ViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = Notification_Serializer
+    pagination_class = Keyset_Pagination
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
@@ -419,6 +506,7 @@ class Notification_ViewSet(viewsets.ReadOnlyModelViewSet):
 ###########################################################################
 class Contact_ViewSet(viewsets.ModelViewSet):
     serializer_class = Contact_Serializer
+    pagination_class = Keyset_Pagination
     queryset = Contact_Model.objects.all().order_by('-created_at')
     
     def get_permissions(self):
@@ -460,7 +548,28 @@ class VaccineCard_ViewSet(viewsets.ModelViewSet):
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-    
+
+    @action(detail=True, methods=['post'])
+    def batch_update(self, request, pk=None):
+        """Update several vaccines of the card at once: ``{"updates": [{"id": 1, "administered": true}, ...]}``"""
+        card = self.get_object()
+        updates = request.data.get('updates') if isinstance(request.data, dict) else request.data
+
+        if not isinstance(updates, list) or not updates:
+            return Response(
+                {'detail': "Expected a non-empty list of updates"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(updates) > VACCINE_BATCH_LIMIT:
+            return Response(
+                {'detail': f"At most {VACCINE_BATCH_LIMIT} updates per batch"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        from tinySteps.services.core.child_service import Child_Service
+        results = Child_Service().batch_update_vaccines(card.child_id, request.user, updates)
+        return Response(results)
+
     @action(detail=True, methods=['get'])
     def stats(self, request, pk=None):
         card = self.get_object()
@@ -625,15 +734,7 @@ class ChildCalendarEvents_ViewSet(LoginRequiredMixin, viewsets.ViewSet):
         
         try:
             child = get_object_or_404(YourChild_Model, pk=child_pk, user=request.user)
-            
-            stats = {
-                'total': CalendarEvent_Model.objects.filter(child=child).count(),
-                'doctor': CalendarEvent_Model.objects.filter(child=child, type='doctor').count(),
-                'vaccine': CalendarEvent_Model.objects.filter(child=child, type='vaccine').count(),
-                'milestone': CalendarEvent_Model.objects.filter(child=child, type='milestone').count(),
-                'feeding': CalendarEvent_Model.objects.filter(child=child, type='feeding').count(),
-                'other': CalendarEvent_Model.objects.filter(child=child, type='other').count(),
-            }
+            stats = CalendarEvent_Repository().get_event_stats(child.id)
             
             logger.debug(f"Event statistics: {stats}")
             return Response(stats)
@@ -710,50 +811,63 @@ class CalendarEvent_ViewSet(LoginRequiredMixin, viewsets.ViewSet):
 ###########################################################################
 # SEARCH
 ###########################################################################
-class Search_View(generics.ListAPIView):
+class Search_View(APIView):
     """
-    View for searching across multiple content types
+    View for ranked full-text search across forum posts, guides and articles
+    
+    Query parameters: ``q``, ``type`` (forum, parents_guide, nutrition_guide,
+    guide or article; everything by default), ``page_size`` and ``cursor``.
     """
     permission_classes = [permissions.IsAuthenticated]
+    TYPE_KINDS = {
+        'forum': ['forum'],
+        'parents_guide': ['parents_guide'],
+        'nutrition_guide': ['nutrition_guide'],
+        'guide': ['parents_guide', 'nutrition_guide'],
+        'article': ['article'],
+    }
+    PAGE_SIZE = 20
     
-    def get_serializer_class(self):
-        content_type = self.request.query_params.get('type', None)
+    def get(self, request):
+        from rest_framework.utils.urls import replace_query_param
+        from tinySteps.services.search.search_service import Search_Service
         
-        if content_type == 'forum':
-            return ParentsForum_Serializer
-        elif content_type == 'guide':
-            return ParentsGuide_Serializer
+        query = request.query_params.get('q', '')
+        content_type = request.query_params.get('type')
         
-        return ParentsForum_Serializer
-    
-    def get_queryset(self):
-        query = self.request.query_params.get('q', '')
-        content_type = self.request.query_params.get('type', None)
+        if content_type and content_type not in self.TYPE_KINDS:
+            return Response(
+                {'error': f"Unknown type '{content_type}'"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
-        if not query:
-            return []
+        try:
+            page_size = int(request.query_params.get('page_size', self.PAGE_SIZE))
+        except ValueError:
+            page_size = self.PAGE_SIZE
         
-        if content_type == 'forum':
-            return ParentsForum_Model.objects.filter(
-                Q(title__icontains=query) | Q(desc__icontains=query)
-            ).order_by('-created_at')
-        elif content_type == 'parents_guide':
-            return Guides_Model.objects.filter(
-                Q(title__icontains=query) | Q(desc__icontains=query),
-                guide_type='parent'
-            ).order_by('-created_at')
-        elif content_type == 'nutrition_guide':
-            return Guides_Model.objects.filter(
-                Q(title__icontains=query) | Q(desc__icontains=query),
-                guide_type='nutrition'
-            ).order_by('-created_at')
-        else:
-            forum_results = ParentsForum_Model.objects.filter(
-                Q(title__icontains=query) | Q(desc__icontains=query)
-            ).order_by('-created_at')[:5]
-            
-            guide_results = Guides_Model.objects.filter(
-                Q(title__icontains=query) | Q(desc__icontains=query)
-            ).order_by('-created_at')[:5]
-            
-            return forum_results
+        page = Search_Service().search(
+            query,
+            kinds=self.TYPE_KINDS.get(content_type),
+            cursor=request.query_params.get('cursor'),
+            limit=page_size
+        )
+        
+        next_url = None
+        if page['next_cursor']:
+            next_url = replace_query_param(request.build_absolute_uri(), 'cursor', page['next_cursor'])
+        
+        return Response({
+            'next': next_url,
+            'results': [
+                {
+                    'type': row['kind'],
+                    'id': row['object_id'],
+                    'title': row['title'],
+                    'snippet': row['snippet'],
+                    'score': row['score'],
+                    'created_at': row['created_at'],
+                }
+                for row in page['results']
+            ]
+        })
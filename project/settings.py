@@ -93,6 +93,8 @@ if DEBUG and not RUNNING_TESTS:
 CRISPY_TEMPLATE_PACK = 'bootstrap4'
 
 MIDDLEWARE = [
+    'tinySteps.utils.middleware.metrics.Metrics_Middleware',
+    'tinySteps.utils.middleware.sql_profiler.SQLProfiler_Middleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -171,6 +173,52 @@ else:
         }
     }
 
+# ---------------------------------------------------------------
+# CACHES
+# ---------------------------------------------------------------
+# CACHE_BACKEND selects where the cache aliases live:
+#   locmem -> per-process memory (development and tests)
+#   file   -> shared directory, survives restarts and is shared by gunicorn workers
+#   redis  -> shared Redis server at REDIS_URL
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'locmem' if DEBUG else 'file')
+if RUNNING_TESTS:
+    CACHE_BACKEND = 'locmem'
+CACHE_DIR = Path(os.environ.get('CACHE_DIR', BASE_DIR / 'cache'))
+REDIS_URL = os.environ.get('REDIS_URL', 'redis://127.0.0.1:6379')
+
+CACHE_ALIASES = {
+    'default': 300,
+    'external_api': 3600,   # Responses from NewsAPI, Currents and Edamam
+    'fragments': 600,       # Rendered template fragments
+    'queries': 300,         # Query and computed results
+    'sessions': 1209600,    # Session data (two weeks, as SESSION_COOKIE_AGE)
+}
+
+def cache_config(alias, timeout):
+    if CACHE_BACKEND == 'redis':
+        config = {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': alias,
+        }
+    elif CACHE_BACKEND == 'file':
+        config = {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': CACHE_DIR / alias,
+        }
+    else:
+        config = {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': alias,
+        }
+    config['TIMEOUT'] = timeout
+    return config
+
+CACHES = {alias: cache_config(alias, timeout) for alias, timeout in CACHE_ALIASES.items()}
+
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+SESSION_CACHE_ALIAS = 'sessions'
+
 # ---------------------------------------------------------------
 # INTERNATIONALIZATION
 # ---------------------------------------------------------------
@@ -240,6 +288,104 @@ EDAMAM_APP_KEY = os.environ.get('EDAMAM_APP_KEY')
 NEWS_API_KEY = os.environ.get('NEWS_API_KEY')
 CURRENTS_API_KEY = os.environ.get('CURRENTS_API_KEY')
 
+# Shared HTTP client of the external API services (tinySteps.services.apis.http_client)
+EXTERNAL_HTTP = {
+    'TIMEOUT': (
+        float(os.environ.get('EXTERNAL_HTTP_CONNECT_TIMEOUT', 3.05)),
+        float(os.environ.get('EXTERNAL_HTTP_READ_TIMEOUT', 10)),
+    ),
+    'MAX_RETRIES': int(os.environ.get('EXTERNAL_HTTP_MAX_RETRIES', 2)),
+    'BREAKER_THRESHOLD': int(os.environ.get('EXTERNAL_HTTP_BREAKER_THRESHOLD', 5)),
+    'BREAKER_RESET': int(os.environ.get('EXTERNAL_HTTP_BREAKER_RESET', 30)),
+}
+
+# Prometheus metrics, scraped by staff on /metrics (tinySteps.utils.helpers.metrics_helper).
+# Under gunicorn export PROMETHEUS_MULTIPROC_DIR pointing at an empty directory shared by the
+# workers (wiped on every start) so the scrape aggregates all of them, and call
+# metrics_helper.mark_process_dead(worker.pid) from the child_exit server hook.
+
+# Sampling SQL profiler (tinySteps.utils.middleware.sql_profiler): the queries of a fraction of
+# the requests are fingerprinted and aggregated for the staff report on /staff/sql-profile/
+SQL_PROFILER = {
+    'SAMPLE_RATE': float(os.environ.get('SQL_PROFILER_SAMPLE_RATE', 0 if RUNNING_TESTS else 0.01)),  # 0 disables it
+    'SLOW_QUERY_MS': float(os.environ.get('SQL_PROFILER_SLOW_QUERY_MS', 200)),  # logged to logs/slow_queries.log
+    'N_PLUS_ONE_THRESHOLD': 5,  # same fingerprint this many times in one request flags an N+1
+    'STACK_DEPTH': 4,  # project frames kept in the call-site summary
+}
+
+# Log pipeline (tinySteps.services.logger.log_pipeline): request threads only enqueue log records
+# and audit/error rows; a background thread writes them to the handlers and the database in batches
+LOG_PIPELINE = {
+    'ENABLED': not RUNNING_TESTS,  # tests write synchronously so they can assert on the results
+    'QUEUE_SIZE': int(os.environ.get('LOG_PIPELINE_QUEUE_SIZE', 10000)),
+    'PUT_TIMEOUT': 0.01,  # seconds a full queue may block a request before the item is dropped
+    'BATCH_SIZE': 500,
+    'SHUTDOWN_TIMEOUT': 5,  # seconds given to flush the queue when the worker exits
+    'LOGGERS': ['tinySteps', 'api', 'audit', 'request', 'connection_errors', 'sql_profiler'],
+}
+
+# Database-backed task queue for emails and other slow side effects, run by `manage.py run_worker`
+# (tinySteps.services.tasks.task_queue_service)
+TASK_QUEUE = {
+    'BATCH_SIZE': int(os.environ.get('TASK_QUEUE_BATCH_SIZE', 50)),  # tasks claimed (and sharing one SMTP connection) per batch
+    'POLL_INTERVAL': float(os.environ.get('TASK_QUEUE_POLL_INTERVAL', 2)),  # seconds an idle worker sleeps
+    'MAX_ATTEMPTS': 5,
+    'RETRY_BACKOFF': 30,  # seconds before the first retry, doubled on every further attempt
+    'RETRY_BACKOFF_MAX': 3600,
+    'LOCK_TIMEOUT': 600,  # seconds after which the task of a dead worker is run again
+    'RETENTION_DAYS': 7,  # finished tasks kept for inspection in the admin
+}
+
+# Calendar event reminders, sent by `manage.py dispatch_reminders --loop`
+# (tinySteps.services.core.reminder_service)
+CALENDAR_REMINDERS = {
+    'DEFAULT_MINUTES': 30,  # when an event has a reminder but no reminder_minutes
+    'ALL_DAY_TIME': '09:00',  # local time all-day events and events without a time are reminded from
+    'BATCH_SIZE': int(os.environ.get('REMINDER_BATCH_SIZE', 1000)),  # reminders claimed per transaction
+    'INTERVAL': int(os.environ.get('REMINDER_INTERVAL', 30)),  # seconds between dispatcher runs
+    'MAX_DELAY': 3600,  # seconds late after which a reminder is marked sent without notifying
+}
+
+# Recommended vaccine schedule (tinySteps.services.core.vaccine_schedule_service), loaded into
+# VaccineSchedule_Model by `manage.py load_vaccine_schedule`
+VACCINE_SCHEDULE = {
+    'FILE': BASE_DIR / 'data' / 'tinySteps_jsons' / 'vaccines' / 'schedule.json',
+    'UPCOMING_DAYS': 60,  # doses due within this many days are listed as upcoming
+}
+
+# WHO growth standards (tinySteps.services.core.growth_service): LMS tables loaded once per process
+GROWTH_STANDARDS = {
+    'FILE': BASE_DIR / 'data' / 'tinySteps_jsons' / 'growth' / 'who_lms.json',
+    'PERCENTILES': [3, 15, 50, 85, 97],  # curves drawn on the growth charts
+    'CURVE_STEP_MONTHS': 1,
+}
+
+# Precomputed related guides and articles (tinySteps.services.search.similarity_service), rebuilt by
+# `manage.py rebuild_related_content` and refreshed by the worker when a guide is approved or edited
+RELATED_CONTENT = {
+    'NEIGHBOURS': 6,  # related items stored per guide or article
+    'MIN_SCORE': 0.05,  # cosine similarity below which items are not related
+    'MAX_FEATURES': 50000,  # vocabulary cap of the (sparse) TF-IDF vectors
+    'BLOCK_SIZE': 512,  # rows compared at once when rebuilding
+}
+
+# Resized photos (tinySteps.services.media.image_service): generated by the worker after an upload,
+# by `manage.py generate_image_derivatives` for existing media, or on their first request
+IMAGE_DERIVATIVES = {
+    'SIZES': {'thumbnail': 160, 'card': 480, 'full': 1280},  # maximum width of each derivative
+    'FORMATS': ['webp', 'jpeg'],  # the first one is used when no format is requested
+    'QUALITY': {'webp': 80, 'jpeg': 82},
+    'DIRECTORY': 'derivatives',  # under MEDIA_ROOT
+}
+
+# Precomputed "hot" ranking of forum posts and guides (tinySteps.services.core.trending_service)
+TRENDING = {
+    'REFRESH_INTERVAL': int(os.environ.get('TRENDING_REFRESH_INTERVAL', 900)),  # seconds between refresh runs
+    'DECAY_SECONDS': int(os.environ.get('TRENDING_DECAY_SECONDS', 45000)),  # age worth 10x the engagement
+    'LIKE_WEIGHT': 1,
+    'COMMENT_WEIGHT': 2,
+}
+
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = os.environ.get('EMAIL_HOST', 'smtp.gmail.com')
 EMAIL_PORT = int(os.environ.get('EMAIL_PORT', 587))
@@ -358,6 +504,22 @@ LOGGING = {
             'backupCount': 5,
             'formatter': 'standard',
         },
+        'slow_queries': {
+            'level': 'INFO',
+            'class': 'logging.handlers.RotatingFileHandler',
+            'filename': BASE_DIR / 'logs' / 'slow_queries.log',
+            'maxBytes': 10485760,  # 10MB
+            'backupCount': 5,
+            'formatter': 'standard',
+        },
+        'audit': {
+            'level': 'INFO',
+            'class': 'logging.handlers.RotatingFileHandler',
+            'filename': BASE_DIR / 'logs' / 'audit.log',
+            'maxBytes': 10485760,  # 10MB
+            'backupCount': 10,
+            'formatter': 'standard',
+        },
         'mail_admins': {
             'level': 'ERROR',
             'filters': ['require_debug_false'],
@@ -407,6 +569,26 @@ LOGGING = {
             'level': 'DEBUG',
             'propagate': False,
         },
+        'sql_profiler': {
+            'handlers': ['slow_queries'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+        'audit': {
+            'handlers': ['audit'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+        'request': {
+            'handlers': ['development'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+        'connection_errors': {
+            'handlers': ['development', 'production'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
         
         # Debug Toolbar logger
         'debug_toolbar': {
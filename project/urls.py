@@ -5,6 +5,8 @@ from django.conf.urls.i18n import i18n_patterns
 from django.conf.urls.static import static
 from django.utils.translation import gettext_lazy as _
 
+from api.views import Metrics_View
+
 # Debug Toolbar
 if settings.DEBUG:
     import debug_toolbar
@@ -18,6 +20,7 @@ else:
 urlpatterns = debug_patterns + [
     path('i18n/', include('django.conf.urls.i18n')),
     path('api/', include('api.urls')), 
+    path('metrics', Metrics_View.as_view(), name='metrics'),
 ]
 
 if settings.DEBUG:
@@ -5,9 +5,11 @@ from django.utils.translation import gettext as _
 from django.utils.translation import ngettext
 from django.utils import timezone
 from django.contrib import messages
-from django.urls import reverse
 from . import models
 from .models import Notification_Model
+from .services.guides.category_service import Category_Service
+from .services.search.search_service import Search_Service
+from .services.tasks.task_queue_service import enqueue_related_guides_update
 
 # User and Children Models
 @admin.register(models.YourChild_Model)
@@ -36,6 +38,20 @@ class MilestoneAdmin(admin.ModelAdmin):
     date_hierarchy = 'achieved_date'
     fields = ('child', 'title', 'achieved_date', 'description', 'photo')
 
+@admin.register(models.VaccineSchedule_Model)
+class VaccineScheduleAdmin(admin.ModelAdmin):
+    list_display = ('vaccine', 'dose', 'name', 'min_age_days', 'max_age_days', 'min_interval_days')
+    list_filter = ('vaccine',)
+    search_fields = ('vaccine', 'name')
+    ordering = ('vaccine', 'dose')
+
+@admin.register(models.GrowthMeasurement_Model)
+class GrowthMeasurementAdmin(admin.ModelAdmin):
+    list_display = ('child', 'date', 'weight', 'height', 'head_circumference')
+    list_filter = ('date',)
+    search_fields = ('child__name',)
+    date_hierarchy = 'date'
+
 @admin.register(models.CalendarEvent_Model)
 class CalendarEventAdmin(admin.ModelAdmin):
     list_display = ('title', 'child', 'type', 'date', 'time', 'has_reminder')
@@ -53,7 +69,7 @@ class GuidesAdmin(admin.ModelAdmin):
     actions = ['approve_guides', 'reject_guides']
     
     def get_comments_count(self, obj):
-        return obj.comments.count()
+        return obj.comments_count
     get_comments_count.short_description = _('Comments')
     
     def preview_image(self, obj):
@@ -63,13 +79,20 @@ class GuidesAdmin(admin.ModelAdmin):
     preview_image.short_description = _('Preview')
     
     def approve_guides(self, request, queryset):
+        # The changelist may be filtered by status: read the selection before the update changes it
+        pks = list(queryset.values_list('pk', flat=True))
         updated = queryset.update(status='approved', approved_at=timezone.now())
+        guides = list(models.Guides_Model.objects.filter(pk__in=pks).select_related('author'))
         
-        for guide in queryset:
+        # update() sends no post_save, so the search index and category counts are refreshed here
+        Search_Service().index_many(guides)
+        Category_Service().invalidate_counts()
+        for guide in guides:
+            # ... and the related guides are queued here
+            enqueue_related_guides_update(guide.pk)
             Notification_Model.objects.create(
                 user=guide.author,
-                message=_("Your guide '{0}' has been approved and is now published!").format(guide.title),
-                url=guide.get_absolute_url()
+                message=_("Your guide '{0}' has been approved and is now published!").format(guide.title)
             )
         
         self.message_user(request, ngettext(
@@ -82,13 +105,17 @@ class GuidesAdmin(admin.ModelAdmin):
     def reject_guides(self, request, queryset):
         if 'apply' in request.POST:
             rejection_reason = request.POST.get('rejection_reason')
+            pks = list(queryset.values_list('pk', flat=True))
             updated = queryset.update(status='rejected', rejection_reason=rejection_reason)
+            guides = list(models.Guides_Model.objects.filter(pk__in=pks).select_related('author'))
             
-            for guide in queryset:
+            # update() sends no post_save: drop the rejected guides from the search index and counts here
+            Search_Service().index_many(guides)
+            Category_Service().invalidate_counts()
+            for guide in guides:
                 Notification_Model.objects.create(
                     user=guide.author,
-                    message=_("Your guide '{0}' was not approved.").format(guide.title),
-                    url=reverse('admin_guides_panel')
+                    message=_("Your guide '{0}' was not approved.").format(guide.title)
                 )
             
             self.message_user(request, ngettext(
@@ -106,6 +133,12 @@ class GuidesAdmin(admin.ModelAdmin):
         }
         return render(request, 'admin/guides_reject_confirmation.html', context)
     reject_guides.short_description = _("Reject selected guides")
+
+@admin.register(models.Tag_Model)
+class TagAdmin(admin.ModelAdmin):
+    list_display = ('name', 'slug')
+    search_fields = ('name', 'slug')
+    readonly_fields = ('slug',)
     
 @admin.register(models.ParentsForum_Model)
 class ParentsForumAdmin(admin.ModelAdmin):
@@ -116,11 +149,11 @@ class ParentsForumAdmin(admin.ModelAdmin):
     readonly_fields = ('created_at', 'get_likes_count', 'get_comments_count')
     
     def get_likes_count(self, obj):
-        return obj.likes.count()
+        return obj.likes_count
     get_likes_count.short_description = 'Likes'
     
     def get_comments_count(self, obj):
-        return obj.comments.count()
+        return obj.comments_count
     get_comments_count.short_description = 'Comentarios'
 
 # Interaction Models
@@ -165,3 +198,31 @@ class ConnectionErrorAdmin(admin.ModelAdmin):
     readonly_fields = ('error_type', 'path', 'method', 'client_ip', 'user', 
                       'user_agent', 'timestamp', 'traceback')
     date_hierarchy = 'timestamp'
+
+@admin.register(models.Task_Model)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ('name', 'status', 'attempts', 'max_attempts', 'run_at', 'finished_at')
+    list_filter = ('status', 'name')
+    search_fields = ('name', 'idempotency_key', 'last_error')
+    readonly_fields = ('name', 'payload', 'idempotency_key', 'attempts', 'locked_by', 'locked_at',
+                       'last_error', 'created_at', 'finished_at')
+    actions = ['retry_tasks']
+
+    def retry_tasks(self, request, queryset):
+        updated = queryset.exclude(status=models.Task_Model.RUNNING).update(
+            status=models.Task_Model.PENDING, run_at=timezone.now(), attempts=0, last_error=''
+        )
+        self.message_user(request, ngettext(
+            '%d task was queued again.',
+            '%d tasks were queued again.',
+            updated,
+        ) % updated, messages.SUCCESS)
+    retry_tasks.short_description = _("Retry selected tasks")
+
+@admin.register(models.AuditLog_Model)
+class AuditLogAdmin(admin.ModelAdmin):
+    list_display = ('timestamp', 'actor', 'action', 'entity_type', 'entity_id', 'entity_name')
+    list_filter = ('entity_type', 'action', 'timestamp')
+    search_fields = ('actor', 'action', 'entity_id', 'entity_name')
+    readonly_fields = ('timestamp', 'entity_type', 'entity_id', 'entity_name', 'action', 'actor', 'details')
+    date_hierarchy = 'timestamp'
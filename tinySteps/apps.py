@@ -10,4 +10,17 @@ class TinyStepsConfig(AppConfig):
         This method is called when the application is ready
         so, we avoid circular imports by importing the registry here!
         """
-        GuideType_Registry.initialize()
\ No newline at end of file
+        GuideType_Registry.initialize()
+
+        # Register signal receivers
+        from tinySteps.signals import (  # noqa: F401
+            category_signals, counter_signals, dashboard_signals, guide_signals, media_signals, search_signals,
+            vaccine_signals
+        )
+
+        # Register the background task handlers
+        from tinySteps.services.tasks import content_tasks, email_tasks, media_tasks  # noqa: F401
+
+        # Move the application loggers behind the non-blocking log pipeline
+        from tinySteps.services.logger.log_pipeline import install_log_pipeline
+        install_log_pipeline()
@@ -1,8 +1,10 @@
 from django import template
 from django.template.defaultfilters import stringfilter
-from django.utils.html import strip_tags
+from django.utils.html import format_html, strip_tags
 from django.utils.text import Truncator
 
+from tinySteps.services.media.image_service import Image_Service
+
 register = template.Library()
 
 @register.filter
@@ -68,4 +70,34 @@ def split_tags(value):
     """Split a comma-separated tag string into a list of individual tags."""
     if value:
         return [tag.strip() for tag in value.split(',') if tag.strip()]
-    return []
\ No newline at end of file
+    return []
+
+@register.filter
+def derivative_url(image, size='card'):
+    """URL of a resized WebP derivative of an uploaded image, e.g. ``{{ child.image|derivative_url:"thumbnail" }}``."""
+    service = Image_Service()
+    if not image or not service.is_source(image.name):
+        return ''
+    return service.url(image.name, size)
+
+@register.filter
+def srcset(image, image_format='webp'):
+    """srcset attribute value with every derivative of an uploaded image in one format."""
+    service = Image_Service()
+    if not image or not service.is_source(image.name):
+        return ''
+    return service.srcset(image.name, image_format)
+
+@register.simple_tag
+def picture(image, alt='', sizes='100vw', css_class='', style='', size='card'):
+    """<picture> with WebP and JPEG derivatives of an uploaded image; the JPEG ``size`` is the fallback src."""
+    service = Image_Service()
+    if not image or not service.is_source(image.name):
+        return ''
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" alt="{}" class="{}" style="{}" loading="lazy" decoding="async"></picture>',
+        service.srcset(image.name, 'webp'), sizes,
+        service.url(image.name, size, 'jpeg'), service.srcset(image.name, 'jpeg'), sizes,
+        alt, css_class, style
+    )
@@ -18,6 +18,7 @@ class AdminUrl_Factory:
         
         return [
             path('staff/dashboard/', admin_views.admin_dashboard, name='admin_dashboard'),
+            path('staff/sql-profile/', admin_views.sql_profile, name='sql_profile'),
         ]
     
     @staticmethod
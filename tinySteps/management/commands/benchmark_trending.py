@@ -0,0 +1,80 @@
+import random
+import time
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from tinySteps.models import ParentsForum_Model
+from tinySteps.services.core.trending_service import Trending_Service
+
+class Command(BaseCommand):
+    help = (
+        "Seed forum posts inside a transaction, time the trending refresh and the popular-posts "
+        "read, then roll everything back"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=1_000_000, help="Number of posts to seed")
+        parser.add_argument('--days', type=int, default=365, help="Spread the posts over this many days")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self._seed(options['posts'], options['days'])
+            service = Trending_Service()
+
+            self._time("Full refresh", lambda: service.refresh())
+            ParentsForum_Model.objects.filter(
+                pk__in=ParentsForum_Model.objects.order_by('?').values('pk')[:1000]
+            ).update(likes_count=500)
+            self._time("Refresh after 1000 posts changed", lambda: service.refresh())
+
+            popular = ParentsForum_Model.objects.order_by('-hot_score', '-id')
+            self._time("Top 10 posts", lambda: list(popular[:10]))
+            self._time("Top 10 posts of the last 7 days", lambda: list(
+                popular.filter(created_at__gte=timezone.now() - timedelta(days=7))[:10]
+            ))
+            self._explain(popular[:10])
+
+            transaction.set_rollback(True)
+
+    def _seed(self, count, days):
+        author, _ = User.objects.get_or_create(username='trending-benchmark')
+        started = time.monotonic()
+
+        for offset in range(0, count, 10_000):
+            ParentsForum_Model.objects.bulk_create([
+                ParentsForum_Model(
+                    author=author,
+                    title=f"Post {number}",
+                    desc="Benchmark post",
+                    likes_count=int(random.paretovariate(1.2)) - 1,
+                    comments_count=int(random.paretovariate(1.5)) - 1,
+                )
+                for number in range(offset, min(offset + 10_000, count))
+            ], batch_size=2000)
+        # created_at is auto_now_add, so the posts are spread over the window afterwards
+        self._spread_created_at(author.pk, days)
+
+        self.stdout.write(f"Seeded {count} posts in {time.monotonic() - started:.1f}s")
+
+    def _spread_created_at(self, author_id, days):
+        """Private method to give every seeded post an age within the window, one day per id residue"""
+        table = ParentsForum_Model._meta.db_table
+        now = timezone.now()
+        with connection.cursor() as cursor:
+            for day in range(days):
+                cursor.execute(
+                    f"UPDATE {table} SET created_at = %s WHERE author_id = %s AND id %% %s = %s",
+                    [now - timedelta(days=day, seconds=random.randint(0, 86399)), author_id, days, day]
+                )
+
+    def _time(self, label, action):
+        started = time.monotonic()
+        result = action()
+        self.stdout.write(f"{label}: {(time.monotonic() - started) * 1000:.1f} ms")
+        return result
+
+    def _explain(self, queryset):
+        self.stdout.write(f"Plan: {queryset.explain()}")
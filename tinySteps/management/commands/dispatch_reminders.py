@@ -0,0 +1,41 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from tinySteps.services.core.reminder_service import Reminder_Service
+
+class Command(BaseCommand):
+    help = "Send the due reminders of calendar events as notifications and emails"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.CALENDAR_REMINDERS['BATCH_SIZE'],
+            help="Reminders claimed per transaction (CALENDAR_REMINDERS['BATCH_SIZE'] by default)"
+        )
+        parser.add_argument('--loop', action='store_true', help="Keep dispatching every --interval seconds")
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=settings.CALENDAR_REMINDERS['INTERVAL'],
+            help="Seconds between runs with --loop (CALENDAR_REMINDERS['INTERVAL'] by default)"
+        )
+
+    def handle(self, *args, **options):
+        service = Reminder_Service()
+
+        while True:
+            close_old_connections()
+            started = time.monotonic()
+            dispatched = service.dispatch(batch_size=options['batch_size'])
+            if dispatched['sent'] or dispatched['skipped'] or not options['loop']:
+                self.stdout.write(self.style.SUCCESS(
+                    f"Reminders sent: {dispatched['sent']}, skipped as too late: {dispatched['skipped']} "
+                    f"({time.monotonic() - started:.2f}s)"
+                ))
+
+            if not options['loop']:
+                return
+            time.sleep(max(0, options['interval'] - (time.monotonic() - started)))
@@ -0,0 +1,54 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from tinySteps.models import Guides_Model, Milestone_Model, Profile_Model, YourChild_Model
+from tinySteps.services.media.image_service import Image_Service, generate_derivatives
+
+IMAGE_FIELDS = (
+    (YourChild_Model, 'image'),
+    (Milestone_Model, 'photo'),
+    (Guides_Model, 'image'),
+    (Profile_Model, 'image'),
+)
+
+def init_worker():
+    """Set Django up in workers started without fork"""
+    if not apps.ready:
+        django.setup()
+
+class Command(BaseCommand):
+    help = "Generate the resized derivatives of the uploaded child, milestone, guide and profile photos"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Processes resizing images")
+        parser.add_argument('--force', action='store_true', help="Regenerate images that already have derivatives")
+
+    def handle(self, *args, **options):
+        service = Image_Service()
+        names = set()
+        for model, field in IMAGE_FIELDS:
+            names.update(
+                model.objects.exclude(**{field: ''}).exclude(**{f'{field}__isnull': True})
+                .values_list(field, flat=True).iterator(chunk_size=2000)
+            )
+        names = sorted(name for name in names if service.is_source(name))
+        if not options['force']:
+            names = [name for name in names if service.get_widths(name) is None]
+
+        # Workers only touch the storage; forked processes must not share the database connections
+        connections.close_all()
+        generated = failed = 0
+        with ProcessPoolExecutor(max_workers=max(1, options['workers']), initializer=init_worker) as pool:
+            for name, widths in pool.map(generate_derivatives, names, chunksize=8):
+                if widths is None:
+                    failed += 1
+                else:
+                    service.remember(name, widths)
+                    generated += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Images processed: {generated}, failed: {failed}"))
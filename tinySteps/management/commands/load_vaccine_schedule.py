@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from tinySteps.services.core.vaccine_schedule_service import VaccineSchedule_Service
+
+class Command(BaseCommand):
+    help = "Replace the recommended vaccine schedule with the content of its JSON data file"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--file',
+            default=settings.VACCINE_SCHEDULE['FILE'],
+            help="Schedule data file (VACCINE_SCHEDULE['FILE'] by default)"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            doses = VaccineSchedule_Service().load(options['file'])
+        except (OSError, ValueError, KeyError) as e:
+            raise CommandError(f"Could not load the vaccine schedule from {options['file']}: {e}")
+
+        self.stdout.write(self.style.SUCCESS(f"Vaccine schedule loaded: {doses} doses"))
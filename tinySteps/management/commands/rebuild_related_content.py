@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from tinySteps.services.search.similarity_service import Similarity_Service
+
+class Command(BaseCommand):
+    help = "Recompute the related guides and articles from the TF-IDF similarity of their text"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--only', choices=['guides', 'articles'], help="Rebuild only guides or only articles")
+
+    def handle(self, *args, **options):
+        service = Similarity_Service()
+        if options['only'] == 'guides':
+            counts = {'guides': service.rebuild_guides()}
+        elif options['only'] == 'articles':
+            counts = {'articles': service.rebuild_articles()}
+        else:
+            counts = service.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            ', '.join(f"Related {kind} stored: {count}" for kind, count in counts.items())
+        ))
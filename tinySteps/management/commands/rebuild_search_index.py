@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from tinySteps.services.search.search_service import Search_Service
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index of forum posts, guides and articles"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help="Objects indexed per query")
+
+    def handle(self, *args, **options):
+        total = Search_Service().rebuild(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Search documents indexed: {total}"))
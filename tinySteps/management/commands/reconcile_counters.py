@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from tinySteps.services.core.counter_service import Counter_Service
+
+class Command(BaseCommand):
+    help = "Recompute the like, comment and category counters and repair the rows that drifted"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=Counter_Service.BATCH_SIZE, help="Rows checked per transaction")
+
+    def handle(self, *args, **options):
+        repaired = Counter_Service().reconcile(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Counters repaired - forum posts: {repaired['forum_posts']}, "
+            f"guides: {repaired['guides']}, categories: {repaired['categories']}"
+        ))
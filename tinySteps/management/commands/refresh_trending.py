@@ -0,0 +1,33 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from tinySteps.services.core.trending_service import Trending_Service
+
+class Command(BaseCommand):
+    help = "Recompute the hot scores ranking popular forum posts and guides"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=Trending_Service.BATCH_SIZE, help="Rows scored per batch")
+        parser.add_argument('--loop', action='store_true', help="Keep refreshing every --interval seconds")
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=settings.TRENDING['REFRESH_INTERVAL'],
+            help="Seconds between refreshes with --loop (TRENDING['REFRESH_INTERVAL'] by default)"
+        )
+
+    def handle(self, *args, **options):
+        service = Trending_Service()
+
+        while True:
+            started = time.monotonic()
+            refreshed = service.refresh(batch_size=options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(
+                f"Hot scores rewritten - forum posts: {refreshed['forum_posts']}, "
+                f"guides: {refreshed['guides']} ({time.monotonic() - started:.2f}s)"
+            ))
+
+            if not options['loop']:
+                return
+            time.sleep(max(0, options['interval'] - (time.monotonic() - started)))
@@ -0,0 +1,69 @@
+import os
+import signal
+import socket
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from tinySteps.services.tasks.task_queue_service import TaskQueue_Service
+
+# Seconds between the recovery of stale tasks and the purge of finished ones
+MAINTENANCE_INTERVAL = 300
+
+class Command(BaseCommand):
+    help = "Run the queued background tasks (emails and other slow side effects)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.TASK_QUEUE['BATCH_SIZE'],
+            help="Tasks claimed per batch (TASK_QUEUE['BATCH_SIZE'] by default)"
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=settings.TASK_QUEUE['POLL_INTERVAL'],
+            help="Seconds to sleep when no task is due (TASK_QUEUE['POLL_INTERVAL'] by default)"
+        )
+        parser.add_argument('--once', action='store_true', help="Run the due tasks and exit")
+
+    def handle(self, *args, **options):
+        service = TaskQueue_Service()
+        worker = f"{socket.gethostname()}:{os.getpid()}"
+
+        if options['once']:
+            service.release_stale()
+            done = service.run_pending(worker, options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(f"{done} tasks done"))
+            return
+
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+        self.stdout.write(f"Worker {worker} waiting for tasks")
+
+        last_maintenance = 0
+        while not self.stopping:
+            close_old_connections()
+            if time.monotonic() - last_maintenance > MAINTENANCE_INTERVAL:
+                released, purged = service.release_stale(), service.purge()
+                if released or purged:
+                    self.stdout.write(f"Released {released} stale tasks, purged {purged} finished tasks")
+                last_maintenance = time.monotonic()
+
+            tasks = service.claim(worker, options['batch_size'])
+            if not tasks:
+                time.sleep(options['interval'])
+                continue
+
+            started = time.monotonic()
+            done = service.run_batch(tasks)
+            self.stdout.write(f"{done}/{len(tasks)} tasks done ({time.monotonic() - started:.2f}s)")
+
+        self.stdout.write(self.style.SUCCESS(f"Worker {worker} stopped"))
+
+    def _stop(self, signum, frame):
+        # The batch being run is finished first, so no task is left locked
+        self.stopping = True
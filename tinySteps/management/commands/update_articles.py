@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from tinySteps.services.external.article_service import Article_Service
+from tinySteps.services.search.similarity_service import Similarity_Service
+
+class Command(BaseCommand):
+    help = "Fetch articles from NewsAPI and Currents and upsert them"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--topic', help="Topic to fetch (e.g. sleep, nutrition); general parenting news by default")
+
+    def handle(self, *args, **options):
+        counts = Article_Service.update_from_apis(options['topic'])
+        if counts['inserted'] or counts['updated']:
+            Similarity_Service().rebuild_articles()
+        self.stdout.write(self.style.SUCCESS(
+            f"Articles inserted: {counts['inserted']}, updated: {counts['updated']}, skipped: {counts['skipped']}"
+        ))
@@ -0,0 +1,34 @@
+# Generated by Django 5.1.1 on 2026-10-18 08:06
+
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def remove_duplicate_urls(apps, schema_editor):
+    """Keep only the newest row of every URL so the unique index can be created"""
+    ExternalArticle_Model = apps.get_model('tinySteps', 'ExternalArticle_Model')
+    duplicates = (
+        ExternalArticle_Model.objects.values('url')
+        .annotate(keep_id=Max('id'), total=models.Count('id'))
+        .filter(total__gt=1)
+    )
+    for duplicate in duplicates:
+        ExternalArticle_Model.objects.filter(url=duplicate['url']).exclude(
+            id=duplicate['keep_id']
+        ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tinySteps', '0016_alter_guides_model_options_guides_model_moderated_by_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_urls, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='externalarticle_model',
+            name='url',
+            field=models.URLField(max_length=500, unique=True, verbose_name='URL'),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.1.1 on 2026-10-18 09:20
+
+import re
+
+from django.db import migrations, models
+
+# Frozen copy of normalize_ingredient() at the time of this migration
+QUANTITY_PATTERN = re.compile(r'(\d+([.,]\d+)?|\d+/\d+|[½¼¾⅓⅔]|a|an|one|half)')
+QUANTITY_UNIT_PATTERN = re.compile(r'\d+([.,]\d+)?(g|gr|kg|mg|ml|l|oz|lbs?)\.?')
+UNITS = {
+    'g', 'gr', 'gram', 'grams', 'kg', 'kilogram', 'kilograms', 'mg', 'ml', 'milliliter', 'milliliters',
+    'l', 'liter', 'liters', 'litre', 'litres', 'oz', 'ounce', 'ounces', 'lb', 'lbs', 'pound', 'pounds',
+    'cup', 'cups', 'tbsp', 'tablespoon', 'tablespoons', 'tsp', 'teaspoon', 'teaspoons',
+    'pinch', 'pinches', 'slice', 'slices', 'piece', 'pieces', 'clove', 'cloves',
+}
+
+
+def normalize_ingredient(ingredient):
+    """Lowercased ingredient with whitespace collapsed and the leading quantity and unit removed"""
+    words = (ingredient or '').lower().split()
+    original = ' '.join(words)
+
+    while words and (QUANTITY_PATTERN.fullmatch(words[0]) or QUANTITY_UNIT_PATTERN.fullmatch(words[0])):
+        words.pop(0)
+    if words and words[0].rstrip('.') in UNITS:
+        words.pop(0)
+    if words and words[0] == 'of':
+        words.pop(0)
+
+    return ' '.join(words) or original
+
+
+def populate_normalized_ingredient(apps, schema_editor):
+    """Fill the normalized key, keeping the most recently updated row of each key"""
+    ExternalNutritionData_Model = apps.get_model('tinySteps', 'ExternalNutritionData_Model')
+    seen = set()
+    for row in ExternalNutritionData_Model.objects.order_by('-updated_at', '-id'):
+        key = normalize_ingredient(row.ingredient)
+        if key in seen:
+            row.delete()
+            continue
+        seen.add(key)
+        row.normalized_ingredient = key
+        row.save(update_fields=['normalized_ingredient'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tinySteps', '0017_externalarticle_model_unique_url'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='externalnutritiondata_model',
+            name='normalized_ingredient',
+            field=models.CharField(max_length=200, null=True, verbose_name='Normalized ingredient'),
+        ),
+        migrations.RunPython(populate_normalized_ingredient, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='externalnutritiondata_model',
+            name='normalized_ingredient',
+            field=models.CharField(max_length=200, unique=True, verbose_name='Normalized ingredient'),
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 5.1.1 on 2026-10-18 08:13
+
+import django.contrib.postgres.search
+import django.db.models.deletion
+from django.db import migrations, models
+
+FTS_TABLE = 'tinysteps_search_fts'
+
+
+def create_fulltext_index(apps, schema_editor):
+    """Create the full-text index of the search documents for the current database"""
+    table = schema_editor.quote_name(apps.get_model('tinySteps', 'SearchDocument_Model')._meta.db_table)
+    vendor = schema_editor.connection.vendor
+
+    if vendor == 'postgresql':
+        schema_editor.execute(
+            f"CREATE INDEX search_document_vector_gin ON {table} USING GIN (search_vector)"
+        )
+    elif vendor == 'sqlite':
+        # External-content FTS5 table: stores only the index, rows are read from the documents table
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+            f"title, body, content={table}, content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON {table} BEGIN "
+            f"INSERT INTO {FTS_TABLE}(rowid, title, body) VALUES (new.id, new.title, new.body); END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON {table} BEGIN "
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE ON {table} BEGIN "
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); "
+            f"INSERT INTO {FTS_TABLE}(rowid, title, body) VALUES (new.id, new.title, new.body); END"
+        )
+
+
+def drop_fulltext_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+
+    if vendor == 'postgresql':
+        schema_editor.execute("DROP INDEX IF EXISTS search_document_vector_gin")
+    elif vendor == 'sqlite':
+        for suffix in ('ai', 'ad', 'au'):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('tinySteps', '0018_externalnutritiondata_model_normalized_ingredient'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument_Model',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('forum', 'Forum post'), ('parents_guide', 'Parents guide'), ('nutrition_guide', 'Nutrition guide'), ('article', 'Article')], max_length=20, verbose_name='Kind')),
+                ('object_id', models.PositiveIntegerField()),
+                ('title', models.CharField(max_length=255, verbose_name='Title')),
+                ('body', models.TextField(blank=True, verbose_name='Body')),
+                ('created_at', models.DateTimeField(verbose_name='Created at')),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(editable=False, null=True)),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype')),
+            ],
+            options={
+                'verbose_name': 'Search Document',
+                'verbose_name_plural': 'Search Documents',
+                'constraints': [models.UniqueConstraint(fields=('content_type', 'object_id'), name='unique_search_document')],
+            },
+        ),
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.1 on 2026-10-18 08:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('tinySteps', '0019_search_document'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment_model',
+            index=models.Index(fields=['content_type', 'object_id', 'created_at', 'id'], name='tinySteps_c_content_db2f49_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification_model',
+            index=models.Index(fields=['user', 'created_at', 'id'], name='tinySteps_n_user_id_dd091d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='parentsforum_model',
+            index=models.Index(fields=['created_at', 'id'], name='tinySteps_p_created_2661bf_idx'),
+        ),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 5.1.1 on 2026-10-18 08:22
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def _count(queryset, field):
+    counts = queryset.filter(**{field: OuterRef('pk')}).order_by().values(field).annotate(
+        total=Count('pk')
+    ).values('total')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def populate_counters(apps, schema_editor):
+    """Fill the like, comment and category counters from the existing rows"""
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    Comment_Model = apps.get_model('tinySteps', 'Comment_Model')
+    ParentsForum_Model = apps.get_model('tinySteps', 'ParentsForum_Model')
+    Guides_Model = apps.get_model('tinySteps', 'Guides_Model')
+    ForumCategoryCount_Model = apps.get_model('tinySteps', 'ForumCategoryCount_Model')
+
+    ParentsForum_Model.objects.update(
+        likes_count=_count(ParentsForum_Model.likes.through.objects.all(), 'parentsforum_model')
+    )
+    for model in (ParentsForum_Model, Guides_Model):
+        content_type = ContentType.objects.filter(
+            app_label='tinySteps', model=model._meta.model_name
+        ).first()
+        if content_type is not None:
+            model.objects.update(
+                comments_count=_count(Comment_Model.objects.filter(content_type=content_type), 'object_id')
+            )
+
+    counts = dict(ParentsForum_Model.objects.order_by().values_list('category').annotate(total=Count('pk')))
+    categories = [value for value, _ in ParentsForum_Model._meta.get_field('category').choices]
+    ForumCategoryCount_Model.objects.bulk_create([
+        ForumCategoryCount_Model(category=category, posts_count=counts.get(category, 0))
+        for category in dict.fromkeys(categories + list(counts))
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('tinySteps', '0020_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ForumCategoryCount_Model',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(choices=[('advice', 'Advice'), ('feeding', 'Feeding'), ('sleep', 'Sleep'), ('health', 'Health'), ('development', 'Development'), ('care', 'Baby Care')], max_length=20, unique=True, verbose_name='Category')),
+                ('posts_count', models.PositiveIntegerField(default=0, verbose_name='Posts')),
+            ],
+            options={
+                'verbose_name': 'Forum Category Count',
+                'verbose_name_plural': 'Forum Category Counts',
+            },
+        ),
+        migrations.AddField(
+            model_name='guides_model',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Comments'),
+        ),
+        migrations.AddField(
+            model_name='parentsforum_model',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Comments'),
+        ),
+        migrations.AddField(
+            model_name='parentsforum_model',
+            name='likes_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Likes'),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
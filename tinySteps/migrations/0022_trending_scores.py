@@ -0,0 +1,31 @@
+# Generated by Django 5.1.1 on 2026-10-18 08:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tinySteps', '0021_denormalized_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='guides_model',
+            name='hot_score',
+            field=models.FloatField(default=0, editable=False, verbose_name='Hot score'),
+        ),
+        migrations.AddField(
+            model_name='parentsforum_model',
+            name='hot_score',
+            field=models.FloatField(default=0, editable=False, verbose_name='Hot score'),
+        ),
+        migrations.AddIndex(
+            model_name='guides_model',
+            index=models.Index(fields=['guide_type', 'status', '-hot_score'], name='guide_hot_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='parentsforum_model',
+            index=models.Index(fields=['-hot_score', '-id'], name='forum_hot_score_idx'),
+        ),
+    ]
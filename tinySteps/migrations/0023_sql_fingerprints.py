@@ -0,0 +1,35 @@
+# Generated by Django 5.1.1 on 2026-10-18 08:35
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tinySteps', '0022_trending_scores'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SQLFingerprint_Model',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fingerprint', models.CharField(max_length=40, unique=True)),
+                ('sql', models.TextField(verbose_name='Normalized SQL')),
+                ('calls', models.PositiveBigIntegerField(default=0, verbose_name='Calls')),
+                ('total_time', models.FloatField(default=0, verbose_name='Total time (s)')),
+                ('max_time', models.FloatField(default=0, verbose_name='Max time (s)')),
+                ('n_plus_one_requests', models.PositiveIntegerField(default=0, help_text='Sampled requests that repeated this statement past the N+1 threshold', verbose_name='Requests flagged as N+1')),
+                ('route', models.CharField(blank=True, max_length=255, verbose_name='Last route')),
+                ('call_site', models.TextField(blank=True, verbose_name='Last call site')),
+                ('last_seen', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Last seen')),
+            ],
+            options={
+                'verbose_name': 'SQL Fingerprint',
+                'verbose_name_plural': 'SQL Fingerprints',
+                'ordering': ['-total_time'],
+                'indexes': [models.Index(fields=['-total_time'], name='sql_fingerprint_time_idx')],
+            },
+        ),
+    ]
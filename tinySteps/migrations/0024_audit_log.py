@@ -0,0 +1,33 @@
+# Generated by Django 5.1.1 on 2026-10-18 08:39
+
+import django.core.serializers.json
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tinySteps', '0023_sql_fingerprints'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditLog_Model',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('timestamp', models.DateTimeField(db_index=True, default=django.utils.timezone.now, verbose_name='Timestamp')),
+                ('entity_type', models.CharField(max_length=50, verbose_name='Entity type')),
+                ('entity_id', models.CharField(blank=True, max_length=64, null=True, verbose_name='Entity ID')),
+                ('entity_name', models.CharField(blank=True, max_length=255, verbose_name='Entity name')),
+                ('action', models.CharField(max_length=100, verbose_name='Action')),
+                ('actor', models.CharField(max_length=150, verbose_name='Actor')),
+                ('details', models.JSONField(blank=True, default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder, verbose_name='Details')),
+            ],
+            options={
+                'verbose_name': 'Audit Log',
+                'verbose_name_plural': 'Audit Logs',
+                'ordering': ['-timestamp'],
+            },
+        ),
+    ]
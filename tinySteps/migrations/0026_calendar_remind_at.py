@@ -0,0 +1,55 @@
+# Generated by Django 5.1.1 on 2026-10-18 08:53
+
+from datetime import datetime, time, timedelta
+
+from django.db import migrations, models
+from django.utils import timezone
+
+# Frozen copy of compute_remind_at() and of the CALENDAR_REMINDERS defaults at the time of this migration
+DEFAULT_MINUTES = 30
+ALL_DAY_TIME = time(9, 0)
+
+
+def compute_remind_at(event_date, event_time, is_all_day, reminder_minutes):
+    """Moment the reminder of a pending event with a reminder is due"""
+    if not event_date:
+        return None
+    if is_all_day or event_time is None:
+        event_time = ALL_DAY_TIME
+    starts_at = timezone.make_aware(datetime.combine(event_date, event_time), timezone.get_default_timezone())
+    minutes = reminder_minutes if reminder_minutes is not None else DEFAULT_MINUTES
+    return starts_at - timedelta(minutes=minutes)
+
+
+def fill_remind_at(apps, schema_editor):
+    """Precompute remind_at for the events whose reminder was not sent yet"""
+    CalendarEvent_Model = apps.get_model('tinySteps', 'CalendarEvent_Model')
+    events = CalendarEvent_Model.objects.filter(has_reminder=True, reminder_sent=False, status='pending')
+    batch = []
+    for event in events.iterator(chunk_size=2000):
+        event.remind_at = compute_remind_at(event.date, event.time, event.is_all_day, event.reminder_minutes)
+        batch.append(event)
+        if len(batch) == 2000:
+            CalendarEvent_Model.objects.bulk_update(batch, ['remind_at'])
+            batch = []
+    CalendarEvent_Model.objects.bulk_update(batch, ['remind_at'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tinySteps', '0025_task_queue'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='calendarevent_model',
+            name='remind_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Remind at'),
+        ),
+        migrations.AddIndex(
+            model_name='calendarevent_model',
+            index=models.Index(condition=models.Q(('remind_at__isnull', False), ('reminder_sent', False)), fields=['remind_at'], name='event_reminder_due_idx'),
+        ),
+        migrations.RunPython(fill_remind_at, migrations.RunPython.noop),
+    ]
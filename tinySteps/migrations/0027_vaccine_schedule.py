@@ -0,0 +1,57 @@
+# Generated by Django 5.1.1 on 2026-10-18 09:01
+
+import json
+import re
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def load_schedule(apps, schema_editor):
+    """Load the recommended schedule shipped in the vaccine data file"""
+    VaccineSchedule_Model = apps.get_model('tinySteps', 'VaccineSchedule_Model')
+    with open(settings.VACCINE_SCHEDULE['FILE'], encoding='utf-8') as schedule_file:
+        data = json.load(schedule_file)
+    VaccineSchedule_Model.objects.bulk_create([
+        VaccineSchedule_Model(
+            vaccine=vaccine['code'],
+            name=vaccine['name'],
+            aliases=[re.sub(r'[^0-9a-z]+', ' ', alias.lower()).strip() for alias in vaccine.get('aliases', [])],
+            dose=dose['dose'],
+            min_age_days=dose['min_age_days'],
+            max_age_days=dose.get('max_age_days'),
+            min_interval_days=dose.get('min_interval_days', 0)
+        )
+        for vaccine in data['vaccines']
+        for dose in vaccine['doses']
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tinySteps', '0026_calendar_remind_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VaccineSchedule_Model',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('vaccine', models.CharField(max_length=20, verbose_name='Vaccine code')),
+                ('name', models.CharField(max_length=100, verbose_name='Name')),
+                ('aliases', models.JSONField(blank=True, default=list, help_text='Words that identify this vaccine in the name of a recorded vaccine', verbose_name='Aliases')),
+                ('dose', models.PositiveSmallIntegerField(verbose_name='Dose')),
+                ('min_age_days', models.PositiveIntegerField(verbose_name='Minimum age (days)')),
+                ('max_age_days', models.PositiveIntegerField(blank=True, help_text='The dose is overdue after this age', null=True, verbose_name='Maximum age (days)')),
+                ('min_interval_days', models.PositiveIntegerField(default=0, help_text='Days required since the previous dose', verbose_name='Minimum interval (days)')),
+            ],
+            options={
+                'verbose_name': 'Vaccine Schedule Dose',
+                'verbose_name_plural': 'Vaccine Schedule',
+                'ordering': ['min_age_days', 'vaccine', 'dose'],
+                'constraints': [models.UniqueConstraint(fields=('vaccine', 'dose'), name='unique_vaccine_schedule_dose')],
+            },
+        ),
+        migrations.RunPython(load_schedule, migrations.RunPython.noop),
+    ]
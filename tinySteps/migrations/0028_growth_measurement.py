@@ -0,0 +1,32 @@
+# Generated by Django 5.1.1 on 2026-10-18 09:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tinySteps', '0027_vaccine_schedule'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GrowthMeasurement_Model',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Date')),
+                ('weight', models.FloatField(blank=True, null=True, verbose_name='Weight (kg)')),
+                ('height', models.FloatField(blank=True, null=True, verbose_name='Height (cm)')),
+                ('head_circumference', models.FloatField(blank=True, null=True, verbose_name='Head circumference (cm)')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('child', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='measurements', to='tinySteps.yourchild_model')),
+            ],
+            options={
+                'verbose_name': 'Growth Measurement',
+                'verbose_name_plural': 'Growth Measurements',
+                'ordering': ['date'],
+                'indexes': [models.Index(fields=['child', 'date'], name='measurement_child_date_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,103 @@
+# Generated by Django 5.1.1 on 2026-10-18 09:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils.text import slugify
+
+# Frozen copy of parse_tags() and sync_guide_tags() at the time of this migration
+MAX_TAG_LENGTH = 50
+
+
+def parse_tags(value):
+    """Split a comma-separated tag string into ``[(slug, name)]``, each slug once"""
+    tags = {}
+    for item in (value or '').split(','):
+        name = ' '.join(item.split())[:MAX_TAG_LENGTH]
+        slug = slugify(name)[:MAX_TAG_LENGTH]
+        if slug and slug not in tags:
+            tags[slug] = name
+    return list(tags.items())
+
+
+def link_guide_tags(tags_by_guide, Tag_Model, GuideTag_Model):
+    """Create the missing tags and link a batch of guides (without links yet) to theirs"""
+    names = {}
+    for tags in tags_by_guide.values():
+        for slug, name in tags:
+            names.setdefault(slug, name)
+    if not names:
+        return
+
+    Tag_Model.objects.bulk_create([Tag_Model(slug=slug, name=name) for slug, name in names.items()], ignore_conflicts=True)
+    tag_ids = dict(Tag_Model.objects.filter(slug__in=names).values_list('slug', 'id'))
+    GuideTag_Model.objects.bulk_create(
+        [
+            GuideTag_Model(guide_id=guide_id, tag_id=tag_ids[slug])
+            for guide_id, tags in tags_by_guide.items() for slug, _ in tags
+        ],
+        ignore_conflicts=True
+    )
+
+
+def index_guide_tags(apps, schema_editor):
+    """Index the comma-separated tags of the existing guides, a batch of guides at a time"""
+    Guides_Model = apps.get_model('tinySteps', 'Guides_Model')
+    Tag_Model = apps.get_model('tinySteps', 'Tag_Model')
+    GuideTag_Model = apps.get_model('tinySteps', 'GuideTag_Model')
+    guides = Guides_Model.objects.exclude(tags__isnull=True).exclude(tags='').values_list('id', 'tags')
+    batch = {}
+    for guide_id, tags in guides.iterator(chunk_size=500):
+        batch[guide_id] = parse_tags(tags)
+        if len(batch) == 500:
+            link_guide_tags(batch, Tag_Model, GuideTag_Model)
+            batch = {}
+    link_guide_tags(batch, Tag_Model, GuideTag_Model)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tinySteps', '0028_growth_measurement'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tag_Model',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, verbose_name='Name')),
+                ('slug', models.SlugField(unique=True, verbose_name='Slug')),
+            ],
+            options={
+                'verbose_name': 'Tag',
+                'verbose_name_plural': 'Tags',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='GuideTag_Model',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('guide', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='guide_tags', to='tinySteps.guides_model')),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='guide_tags', to='tinySteps.tag_model')),
+            ],
+            options={
+                'verbose_name': 'Guide Tag',
+                'verbose_name_plural': 'Guide Tags',
+            },
+        ),
+        migrations.AddField(
+            model_name='guides_model',
+            name='tag_index',
+            field=models.ManyToManyField(blank=True, related_name='guides', through='tinySteps.GuideTag_Model', to='tinySteps.tag_model', verbose_name='Tag index'),
+        ),
+        migrations.AddIndex(
+            model_name='guidetag_model',
+            index=models.Index(fields=['tag', 'guide'], name='guide_tag_tag_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='guidetag_model',
+            constraint=models.UniqueConstraint(fields=('guide', 'tag'), name='unique_guide_tag'),
+        ),
+        migrations.RunPython(index_guide_tags, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.1.1 on 2026-10-18 09:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tinySteps', '0029_guide_tags'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedArticle_Model',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(verbose_name='Score')),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_entries', to='tinySteps.externalarticle_model')),
+                ('related', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_to', to='tinySteps.externalarticle_model')),
+            ],
+            options={
+                'verbose_name': 'Related Article',
+                'verbose_name_plural': 'Related Articles',
+                'indexes': [models.Index(fields=['article', '-score'], name='related_article_score_idx')],
+                'constraints': [models.UniqueConstraint(fields=('article', 'related'), name='unique_related_article')],
+            },
+        ),
+        migrations.CreateModel(
+            name='RelatedGuide_Model',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(verbose_name='Score')),
+                ('guide', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_entries', to='tinySteps.guides_model')),
+                ('related', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_to', to='tinySteps.guides_model')),
+            ],
+            options={
+                'verbose_name': 'Related Guide',
+                'verbose_name_plural': 'Related Guides',
+                'indexes': [models.Index(fields=['guide', '-score'], name='related_guide_score_idx')],
+                'constraints': [models.UniqueConstraint(fields=('guide', 'related'), name='unique_related_guide')],
+            },
+        ),
+    ]
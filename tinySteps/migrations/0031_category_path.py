@@ -0,0 +1,56 @@
+# Generated by Django 5.1.1 on 2026-10-18 09:21
+
+from django.db import migrations, models
+
+# Frozen copy of category_paths() at the time of this migration
+PATH_SEPARATOR = '/'
+
+
+def category_paths(parents):
+    """Materialized path of every category from ``{id: parent_id}``; orphans and cycles become roots"""
+    paths = {}
+
+    def path_of(category_id, seen=()):
+        if category_id not in paths:
+            parent_id = parents.get(category_id)
+            if parent_id not in parents or parent_id in seen:
+                paths[category_id] = f"{PATH_SEPARATOR}{category_id}{PATH_SEPARATOR}"
+            else:
+                paths[category_id] = f"{path_of(parent_id, seen + (category_id,))}{category_id}{PATH_SEPARATOR}"
+        return paths[category_id]
+
+    for category_id in parents:
+        path_of(category_id)
+    return paths
+
+
+def fill_paths(apps, schema_editor):
+    """Materialize the path of the existing categories from their parent links"""
+    Category_Model = apps.get_model('tinySteps', 'Category_Model')
+    categories = list(Category_Model.objects.only('id', 'parent_id'))
+    paths = category_paths({category.id: category.parent_id for category in categories})
+    for category in categories:
+        category.path = paths[category.id]
+        category.depth = category.path.count(PATH_SEPARATOR) - 2
+    Category_Model.objects.bulk_update(categories, ['path', 'depth'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tinySteps', '0030_related_content'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category_model',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, verbose_name='Depth'),
+        ),
+        migrations.AddField(
+            model_name='category_model',
+            name='path',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=255, verbose_name='Path'),
+        ),
+        migrations.RunPython(fill_paths, migrations.RunPython.noop),
+    ]
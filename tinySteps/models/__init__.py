@@ -10,8 +10,10 @@ from .user.user_models import Profile_Model, PasswordReset_Model
 from .child.child_models import (
     YourChild_Model, 
     Milestone_Model, 
+    GrowthMeasurement_Model,
     VaccineCard_Model, 
     Vaccine_Model, 
+    VaccineSchedule_Model,
     CalendarEvent_Model
 )
 
@@ -26,15 +28,18 @@ from .content.guide_models import (
     NutritionGuides_Manager, 
     NutritionGuides_Model,
 )
-from .content.forum_models import ParentsForum_Model
+from .content.forum_models import ForumCategoryCount_Model, ParentsForum_Model
 from .content.category_models import Category_Model
+from .content.tag_models import Tag_Model, GuideTag_Model
+from .content.search_models import SearchDocument_Model
+from .content.similarity_models import RelatedGuide_Model, RelatedArticle_Model
 
 # Communication Models
 from .communication.notification_models import Notification_Model
 from .communication.contact_models import Contact_Model
 
 # System Models
-from .system.system_models import ConnectionError_Model
+from .system.system_models import AuditLog_Model, ConnectionError_Model, SQLFingerprint_Model, Task_Model
 
 # External API Models
 from .external.article_models import ExternalArticle_Model
@@ -48,21 +53,25 @@ __all__ = [
     'Profile_Model', 'PasswordReset_Model',
     
     # Child Models
-    'YourChild_Model', 'Milestone_Model', 'VaccineCard_Model', 
-    'Vaccine_Model', 'CalendarEvent_Model',
+    'YourChild_Model', 'Milestone_Model', 'GrowthMeasurement_Model', 'VaccineCard_Model', 
+    'Vaccine_Model', 'VaccineSchedule_Model', 'CalendarEvent_Model',
     
     # Content Models
     'Comment_Model', 'Like_Model',
     'Guide_Interface', 'Guides_Model', 'BaseGuide_Manager',
     'ParentGuides_Manager', 'ParentsGuides_Model',
     'NutritionGuides_Manager', 'NutritionGuides_Model',
-    'ParentsForum_Model', 'Category_Model',
+    'ParentsForum_Model', 'ForumCategoryCount_Model', 'Category_Model', 'SearchDocument_Model',
+    'Tag_Model', 'GuideTag_Model', 'RelatedGuide_Model', 'RelatedArticle_Model',
     
     # Communication Models
     'Notification_Model', 'Contact_Model',
     
     # System Models
+    'AuditLog_Model',
     'ConnectionError_Model',
+    'SQLFingerprint_Model',
+    'Task_Model',
     
     # External API Models
     'ExternalArticle_Model', 'ExternalNutritionData_Model',
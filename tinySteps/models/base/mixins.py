@@ -1,17 +1,11 @@
+from django.db import connections, transaction
+from django.db.models import F
+
 class CommentableMixin:
-    """Mixin class for models that can receive comments"""
-    
-    @property
-    def comments_count(self):
-        """Get the number of comments for this object"""
-        from django.contrib.contenttypes.models import ContentType
-        from tinySteps.models.content.comment_models import Comment_Model
-        
-        content_type = ContentType.objects.get_for_model(self.__class__)
-        return Comment_Model.objects.filter(
-            content_type=content_type,
-            object_id=self.id
-        ).count()
+    """Mixin class for models that can receive comments
+
+    The model keeps a ``comments_count`` column, moved by the comment signals.
+    """
     
     def add_comment(self, user, text):
         """Add a comment to this object"""
@@ -28,32 +22,57 @@ class CommentableMixin:
         return comment
 
 class LikeableMixin:
-    """Mixin for models that can be liked"""
+    """Mixin for models liked through a ``likes`` many-to-many to User
+
+    The model keeps a ``likes_count`` column. A like is a single
+    INSERT ... ON CONFLICT DO NOTHING and an unlike a single DELETE, and the
+    counter only moves (with an F() update, in the same transaction) when a row
+    was actually written, so repeated or concurrent requests cannot skew it.
+    """
     
-    @property
-    def likes_count(self):
-        """Get the number of likes for this object"""
-        from django.contrib.contenttypes.models import ContentType
-        from tinySteps.models.content.comment_models import Like_Model
+    def like(self, user):
+        """Like this object, returning True when the like is new"""
+        field = self._meta.get_field('likes')
+        connection = connections[self._state.db or 'default']
+        quote = connection.ops.quote_name
         
-        content_type = ContentType.objects.get_for_model(self.__class__)
-        return Like_Model.objects.filter(
-            content_type=content_type,
-            object_id=self.id
-        ).count()
+        with transaction.atomic(using=connection.alias):
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"INSERT INTO {quote(field.m2m_db_table())} "
+                    f"({quote(field.m2m_column_name())}, {quote(field.m2m_reverse_name())}) "
+                    f"VALUES (%s, %s) ON CONFLICT DO NOTHING",
+                    [self.pk, user.pk]
+                )
+                created = cursor.rowcount == 1
+            if created:
+                self._move_likes(1)
+        return created
     
-    def toggle_like(self, user):
-        """Toggle like status for this object"""
-        from django.contrib.contenttypes.models import ContentType
-        from tinySteps.models.content.comment_models import Like_Model
+    def unlike(self, user):
+        """Remove the like of user, returning True when there was one"""
+        field = self._meta.get_field('likes')
         
-        content_type = ContentType.objects.get_for_model(self.__class__)
-        like, created = Like_Model.objects.get_or_create(
-            content_type=content_type,
-            object_id=self.id,
-            user=user
-        )
-        if not created:
-            like.delete()
-            return False
-        return True
\ No newline at end of file
+        with transaction.atomic(using=self._state.db):
+            deleted, _ = field.remote_field.through._base_manager.filter(**{
+                field.m2m_field_name(): self.pk,
+                field.m2m_reverse_field_name(): user.pk,
+            }).delete()
+            if deleted:
+                self._move_likes(-1)
+        return bool(deleted)
+    
+    def toggle_like(self, user):
+        """Toggle like status for this object, returning whether it is now liked"""
+        with transaction.atomic(using=self._state.db):
+            if self.unlike(user):
+                return False
+            self.like(user)
+            return True
+    
+    def _move_likes(self, delta):
+        rows = type(self)._base_manager.filter(pk=self.pk)
+        if delta < 0:
+            rows = rows.filter(likes_count__gte=-delta)
+        rows.update(likes_count=F('likes_count') + delta)
+        self.likes_count = max(0, self.likes_count + delta)
@@ -1,7 +1,10 @@
 import time
+from datetime import date, datetime, time as dt_time, timedelta
+from django.conf import settings
 from django.contrib.auth.models import User
 from django.db import models
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.translation import gettext as _
 from django.utils.translation import gettext_lazy as _
 
@@ -62,6 +65,26 @@ class Milestone_Model(models.Model):
         verbose_name = _("Milestone")
         verbose_name_plural = _("Milestones")
 
+class GrowthMeasurement_Model(models.Model):
+    """Model for the weight, height and head circumference of a child measured on a date"""
+    child = models.ForeignKey(YourChild_Model, on_delete=models.CASCADE, related_name='measurements')
+    date = models.DateField(_("Date"))
+    weight = models.FloatField(_("Weight (kg)"), null=True, blank=True)
+    height = models.FloatField(_("Height (cm)"), null=True, blank=True)
+    head_circumference = models.FloatField(_("Head circumference (cm)"), null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['date']
+        indexes = [
+            models.Index(fields=['child', 'date'], name='measurement_child_date_idx'),
+        ]
+        verbose_name = _("Growth Measurement")
+        verbose_name_plural = _("Growth Measurements")
+
+    def __str__(self):
+        return f"{self.child} - {self.date}"
+
 class VaccineCard_Model(models.Model):
     """Model for vaccine cards"""
     child = models.OneToOneField(YourChild_Model, on_delete=models.CASCADE, related_name='vaccine_card')
@@ -92,10 +115,60 @@ class Vaccine_Model(models.Model):
     def __str__(self):
         return f"{self.name} - {self.date}"
 
+class VaccineSchedule_Model(models.Model):
+    """Model for one dose of the recommended vaccine schedule, loaded with ``manage.py load_vaccine_schedule``"""
+    vaccine = models.CharField(_("Vaccine code"), max_length=20)
+    name = models.CharField(_("Name"), max_length=100)
+    aliases = models.JSONField(
+        _("Aliases"),
+        default=list,
+        blank=True,
+        help_text=_("Words that identify this vaccine in the name of a recorded vaccine")
+    )
+    dose = models.PositiveSmallIntegerField(_("Dose"))
+    min_age_days = models.PositiveIntegerField(_("Minimum age (days)"))
+    max_age_days = models.PositiveIntegerField(
+        _("Maximum age (days)"), null=True, blank=True, help_text=_("The dose is overdue after this age")
+    )
+    min_interval_days = models.PositiveIntegerField(
+        _("Minimum interval (days)"), default=0, help_text=_("Days required since the previous dose")
+    )
+
+    class Meta:
+        ordering = ['min_age_days', 'vaccine', 'dose']
+        constraints = [
+            models.UniqueConstraint(fields=['vaccine', 'dose'], name='unique_vaccine_schedule_dose'),
+        ]
+        verbose_name = _("Vaccine Schedule Dose")
+        verbose_name_plural = _("Vaccine Schedule")
+
+    def __str__(self):
+        return f"{self.vaccine} #{self.dose}"
+
 
 
 
 
+def compute_remind_at(event_date, event_time, is_all_day, reminder_minutes, has_reminder=True, status='pending'):
+    """Get the moment the reminder of an event is due, or None when it has no reminder to send
+
+    Events without a time (or all day) are reminded relative to
+    CALENDAR_REMINDERS['ALL_DAY_TIME'] in the local time zone.
+    """
+    if not has_reminder or status != 'pending' or not event_date:
+        return None
+    if isinstance(event_date, str):
+        event_date = date.fromisoformat(event_date)
+    if isinstance(event_time, str):
+        event_time = dt_time.fromisoformat(event_time)
+    if is_all_day or event_time is None:
+        event_time = dt_time.fromisoformat(settings.CALENDAR_REMINDERS['ALL_DAY_TIME'])
+
+    starts_at = timezone.make_aware(datetime.combine(event_date, event_time), timezone.get_default_timezone())
+    minutes = reminder_minutes if reminder_minutes is not None else settings.CALENDAR_REMINDERS['DEFAULT_MINUTES']
+    return starts_at - timedelta(minutes=minutes)
+
+
 class CalendarEvent_Model(models.Model):
     """Model for child calendar events"""
     
@@ -133,6 +206,8 @@ class CalendarEvent_Model(models.Model):
     has_reminder = models.BooleanField(default=False, verbose_name=_("Has reminder"))
     reminder_minutes = models.IntegerField(null=True, blank=True, verbose_name=_("Reminder minutes"))
     reminder_sent = models.BooleanField(default=False, verbose_name=_("Reminder sent"))
+    # Precomputed on save so the dispatcher only scans the due, unsent reminders
+    remind_at = models.DateTimeField(null=True, blank=True, editable=False, verbose_name=_("Remind at"))
     
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Created at"))
@@ -146,10 +221,28 @@ class CalendarEvent_Model(models.Model):
             models.Index(fields=['child', 'date']),
             models.Index(fields=['type']),
             models.Index(fields=['status']),
+            models.Index(
+                fields=['remind_at'],
+                name='event_reminder_due_idx',
+                condition=models.Q(reminder_sent=False, remind_at__isnull=False)
+            ),
         ]
 
     def __str__(self):
         return f"{self.title} - {self.date}"
+
+    def save(self, *args, **kwargs):
+        """Keep remind_at in step with the date, time and reminder settings"""
+        remind_at = compute_remind_at(
+            self.date, self.time, self.is_all_day, self.reminder_minutes, self.has_reminder, self.status
+        )
+        if remind_at != self.remind_at:
+            # A moved or re-enabled reminder is due again
+            self.remind_at = remind_at
+            self.reminder_sent = False
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'remind_at', 'reminder_sent'}
+        super().save(*args, **kwargs)
         
     def is_upcoming(self):
         """Check if the event is in the future"""
@@ -11,6 +11,9 @@ class Notification_Model(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'created_at', 'id']),
+        ]
         verbose_name = _("Notification")
         verbose_name_plural = _("Notifications")
         
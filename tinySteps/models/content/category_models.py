@@ -1,30 +1,116 @@
-from django.db import models
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Concat, Substr
 from django.utils.translation import gettext_lazy as _
 
+PATH_SEPARATOR = '/'
+
+def category_paths(parents):
+    """Materialized path of every category from ``{id: parent_id}``, e.g. ``/3/12/``
+
+    Categories whose parent is missing, or that are part of a cycle, are
+    treated as roots.
+    """
+    paths = {}
+
+    def path_of(category_id, seen=()):
+        if category_id not in paths:
+            parent_id = parents.get(category_id)
+            if parent_id not in parents or parent_id in seen:
+                paths[category_id] = f"{PATH_SEPARATOR}{category_id}{PATH_SEPARATOR}"
+            else:
+                paths[category_id] = f"{path_of(parent_id, seen + (category_id,))}{category_id}{PATH_SEPARATOR}"
+        return paths[category_id]
+
+    for category_id in parents:
+        path_of(category_id)
+    return paths
+
 class Category_Model(models.Model):
-    """Model for categories of content"""
+    """Model for categories of content
+
+    ``path`` lists the IDs from the root down to the category (``/3/12/``),
+    so ancestors are read from the row itself and a subtree is a prefix
+    match on an indexed column. It is kept in sync on save.
+    """
     name = models.CharField(_("Name"), max_length=100)
     description = models.TextField(_("Description"), blank=True, null=True)
     parent = models.ForeignKey(
-        'self', 
-        on_delete=models.SET_NULL, 
-        null=True, 
-        blank=True, 
+        'self',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
         related_name='children',
         verbose_name=_("Parent Category")
     )
-    
+    path = models.CharField(_("Path"), max_length=255, default='', editable=False, db_index=True)
+    depth = models.PositiveSmallIntegerField(_("Depth"), default=0, editable=False)
+
     class Meta:
         verbose_name = _("Category")
         verbose_name_plural = _("Categories")
         ordering = ['name']
-    
+
     def __str__(self):
         return self.name
-    
+
+    @property
+    def ancestor_ids(self):
+        """IDs of the ancestors of this category, root first"""
+        return [int(part) for part in self.path.strip(PATH_SEPARATOR).split(PATH_SEPARATOR)[:-1] if part]
+
     @property
     def full_name(self):
         """Get the full hierarchical name of this category"""
-        if self.parent:
-            return f"{self.parent.full_name} > {self.name}"
-        return self.name
\ No newline at end of file
+        ancestors = Category_Model.objects.filter(id__in=self.ancestor_ids).in_bulk()
+        return ' > '.join([ancestors[ancestor_id].name for ancestor_id in self.ancestor_ids if ancestor_id in ancestors] + [self.name])
+
+    def clean(self):
+        super().clean()
+        if self.parent_id and self.pk and (
+            self.parent_id == self.pk or f"{PATH_SEPARATOR}{self.pk}{PATH_SEPARATOR}" in self.parent.path
+        ):
+            raise ValidationError({'parent': _("A category cannot be placed under itself or one of its subcategories.")})
+
+    def save(self, *args, **kwargs):
+        # The path is written after the row: both commit together, before the cached tree is dropped
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self._update_path()
+
+    def _update_path(self):
+        """Private method to write the materialized path of a saved category and of its subtree"""
+        parent_path = ''
+        if self.parent_id:
+            parent_path = Category_Model.objects.filter(pk=self.parent_id).values_list('path', flat=True).first() or ''
+        if f"{PATH_SEPARATOR}{self.pk}{PATH_SEPARATOR}" in parent_path:
+            # Moved under one of its own subcategories (clean() prevents it in forms): make it a root
+            parent_path = ''
+        path = f"{parent_path or PATH_SEPARATOR}{self.pk}{PATH_SEPARATOR}"
+
+        if path != self.path:
+            old_path, depth = self.path, path.count(PATH_SEPARATOR) - 2
+            if old_path:
+                # Move the whole subtree by rewriting the prefix of its paths
+                Category_Model.objects.filter(path__startswith=old_path).update(
+                    path=Concat(Value(path), Substr('path', len(old_path) + 1)),
+                    depth=F('depth') + (depth - self.depth)
+                )
+            else:
+                Category_Model.objects.filter(pk=self.pk).update(path=path, depth=depth)
+            self.path, self.depth = path, depth
+
+    @classmethod
+    def rebuild_paths(cls):
+        """Recompute every path from the parent links, returning the number of updated rows"""
+        categories = list(cls.objects.only('id', 'parent_id', 'path', 'depth'))
+        paths = category_paths({category.id: category.parent_id for category in categories})
+        changed = []
+        for category in categories:
+            if category.path != paths[category.id]:
+                category.path = paths[category.id]
+                category.depth = category.path.count(PATH_SEPARATOR) - 2
+                changed.append(category)
+        cls.objects.bulk_update(changed, ['path', 'depth'], batch_size=1000)
+        return len(changed)
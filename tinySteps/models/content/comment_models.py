@@ -18,6 +18,7 @@ class Comment_Model(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['content_type', 'object_id']),
+            models.Index(fields=['content_type', 'object_id', 'created_at', 'id']),
         ]
         verbose_name = _("Comment")
         verbose_name_plural = _("Comments")
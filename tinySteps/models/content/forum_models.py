@@ -30,9 +30,18 @@ class ParentsForum_Model(models.Model, CommentableMixin, LikeableMixin):
     comments = GenericRelation('Comment_Model', related_query_name='forum')
     likes = models.ManyToManyField(User, related_name='liked_posts', blank=True)
     
+    # Denormalized counters, kept in sync by LikeableMixin and the counter signals
+    likes_count = models.PositiveIntegerField(_("Likes"), default=0, editable=False)
+    comments_count = models.PositiveIntegerField(_("Comments"), default=0, editable=False)
+    
+    # Time-decayed ranking, recomputed periodically by Trending_Service
+    hot_score = models.FloatField(_("Hot score"), default=0, editable=False)
+    
     class Meta:
         indexes = [
             models.Index(fields=['created_at', 'title']),
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['-hot_score', '-id'], name='forum_hot_score_idx'),
         ]
         verbose_name = _("Parents Forum Post")
         verbose_name_plural = _("Parents Forum Posts")
@@ -41,5 +50,51 @@ class ParentsForum_Model(models.Model, CommentableMixin, LikeableMixin):
         truncated_desc = (self.desc[:30] + "...") if len(self.desc) > 30 else self.desc
         return f"{self.title} - {truncated_desc}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored category so the category counters can follow changes
+        if 'category' in field_names:
+            instance._loaded_category = values[field_names.index('category')]
+        return instance
+
     def get_absolute_url(self):
-        return reverse('forum:view_post', kwargs={'post_id': self.pk})
\ No newline at end of file
+        return reverse('forum:view_post', kwargs={'post_id': self.pk})
+
+
+class ForumCategoryCount_Manager(models.Manager):
+    """Manager for the per-category post counters"""
+    def move(self, category, delta):
+        """Add delta to the counter of a category with a single F() update"""
+        if not category or not delta:
+            return
+        counters = self.filter(category=category)
+        if delta < 0:
+            counters = counters.filter(posts_count__gte=-delta)
+        if not counters.update(posts_count=models.F('posts_count') + delta) and delta > 0:
+            # First post of a category without a counter row yet
+            self.bulk_create([self.model(category=category, posts_count=0)], ignore_conflicts=True)
+            self.filter(category=category).update(posts_count=models.F('posts_count') + delta)
+
+    def as_dict(self):
+        return dict(self.values_list('category', 'posts_count'))
+
+
+class ForumCategoryCount_Model(models.Model):
+    """Number of forum posts of each category"""
+    category = models.CharField(
+        _("Category"),
+        max_length=20,
+        choices=ParentsForum_Model.CATEGORY_CHOICES,
+        unique=True
+    )
+    posts_count = models.PositiveIntegerField(_("Posts"), default=0)
+
+    objects = ForumCategoryCount_Manager()
+
+    class Meta:
+        verbose_name = _("Forum Category Count")
+        verbose_name_plural = _("Forum Category Counts")
+
+    def __str__(self):
+        return f"{self.category}: {self.posts_count}"
\ No newline at end of file
@@ -11,6 +11,7 @@ from django.templatetags.static import static
 
 from tinySteps.models.base.mixins import CommentableMixin
 from tinySteps.models.content.category_models import Category_Model
+from tinySteps.models.content.tag_models import Tag_Model, format_tags, parse_tags, sync_guide_tags
 from tinySteps.models.external.article_models import ExternalArticle_Model
 
 
@@ -98,6 +99,14 @@ class Guides_Model(Guide_Interface, CommentableMixin):
         blank=True,
         help_text=_("Comma-separated tags for the guide.")
     )
+    # Normalized copy of ``tags``, kept in sync on save: tag queries go through this index
+    tag_index = models.ManyToManyField(
+        Tag_Model,
+        through='GuideTag_Model',
+        related_name='guides',
+        blank=True,
+        verbose_name=_("Tag index")
+    )
 
     # Optional fields
     # These fields are optional and can be set to null or blank if we want
@@ -116,6 +125,8 @@ class Guides_Model(Guide_Interface, CommentableMixin):
     # Relations
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='guides')
     comments = GenericRelation('Comment_Model', related_query_name='guide')
+    comments_count = models.PositiveIntegerField(_("Comments"), default=0, editable=False)
+    hot_score = models.FloatField(_("Hot score"), default=0, editable=False)
     category = models.ForeignKey(
         Category_Model, 
         on_delete=models.SET_NULL, 
@@ -148,6 +159,7 @@ class Guides_Model(Guide_Interface, CommentableMixin):
             models.Index(fields=['status']),
             models.Index(fields=['guide_type']),
             models.Index(fields=['author']),
+            models.Index(fields=['guide_type', 'status', '-hot_score'], name='guide_hot_score_idx'),
         ]
         permissions = [
             ("can_moderate_guide", "Can moderate guides"),
@@ -170,6 +182,15 @@ class Guides_Model(Guide_Interface, CommentableMixin):
     def __str__(self):
         return self.title
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored tags so save() only re-indexes them when they change,
+        # and the stored status for the receivers of post_save
+        instance._saved_tags = instance.__dict__.get('tags')
+        instance._saved_status = instance.__dict__.get('status')
+        return instance
+    
     def save(self, *args, **kwargs):
         # Auto-generate slug if not provided
         if not self.slug:
@@ -178,8 +199,20 @@ class Guides_Model(Guide_Interface, CommentableMixin):
         # Set published_at when approved
         if self.status == 'approved' and not self.published_at:
             self.published_at = timezone.now()
+        
+        update_fields = kwargs.get('update_fields')
+        if self._state.adding:
+            tags_changed = bool(self.tags)
+        else:
+            tags_changed = self.tags != getattr(self, '_saved_tags', None)
+        tags_changed = tags_changed and (update_fields is None or 'tags' in update_fields)
             
         super().save(*args, **kwargs)
+        self._saved_status = self.status
+        
+        if tags_changed:
+            sync_guide_tags({self.pk: parse_tags(self.tags)})
+            self._saved_tags = self.tags
 
     def get_absolute_url(self):
         return reverse(f'{self.guide_type}_guide_details', kwargs={'pk': self.pk})
@@ -194,12 +227,9 @@ class Guides_Model(Guide_Interface, CommentableMixin):
         return self.PREDEFINED_TAGS.get(self.guide_type, [])
         
     def set_tags(self, tags):
-        """Set tags for the guide as a comma-separated string"""
-        if isinstance(tags, list):
-            self.tags = ','.join(tags)
-        else:
-            self.tags = tags
-        self.save(update_fields=['tags'])
+        """Set tags for the guide from a comma-separated string or a list, and save them"""
+        self.tags = format_tags(tags)
+        self.save(update_fields=['tags', 'updated_at'])
     
     @classmethod
     def create_from_form(cls, form, guide_type, user):
@@ -213,19 +243,14 @@ class Guides_Model(Guide_Interface, CommentableMixin):
             image=form.cleaned_data.get('image'),
             author=user,
             guide_type=guide_type,
-            slug=f"{slugify(form.cleaned_data['title'])}-{int(time.time())}"
+            slug=f"{slugify(form.cleaned_data['title'])}-{int(time.time())}",
+            tags=format_tags(form.cleaned_data.get('tags', ''))
         )
         
         if form.cleaned_data.get('category'):
             guide.category = form.cleaned_data.get('category')
             
         guide.save()
-        
-        # Handle tags from the form
-        tags_text = form.cleaned_data.get('tags', '')
-        if tags_text:
-            guide.set_tags(tags_text)
-            
         return guide
 
 
@@ -0,0 +1,39 @@
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+class SearchDocument_Model(models.Model):
+    """Searchable copy of a forum post, guide or article
+
+    One row per indexed object, kept in sync by the search signals. The full-text
+    index lives next to it: a GIN index on ``search_vector`` on PostgreSQL, an
+    FTS5 table fed by triggers on SQLite (see migration 0019).
+    """
+    KIND_CHOICES = [
+        ('forum', _('Forum post')),
+        ('parents_guide', _('Parents guide')),
+        ('nutrition_guide', _('Nutrition guide')),
+        ('article', _('Article')),
+    ]
+
+    kind = models.CharField(_("Kind"), max_length=20, choices=KIND_CHOICES)
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    content_object = GenericForeignKey('content_type', 'object_id')
+    title = models.CharField(_("Title"), max_length=255)
+    body = models.TextField(_("Body"), blank=True)
+    created_at = models.DateTimeField(_("Created at"))
+    # Only populated on PostgreSQL
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        verbose_name = _("Search Document")
+        verbose_name_plural = _("Search Documents")
+        constraints = [
+            models.UniqueConstraint(fields=['content_type', 'object_id'], name='unique_search_document'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}: {self.title}"
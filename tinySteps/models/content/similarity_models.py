@@ -0,0 +1,44 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+class RelatedGuide_Model(models.Model):
+    """Precomputed neighbour of an approved guide, by TF-IDF cosine similarity
+
+    Rows are written by ``Similarity_Service``; the related guides of a
+    detail page are read with one query on the (guide, score) index.
+    """
+    guide = models.ForeignKey('tinySteps.Guides_Model', on_delete=models.CASCADE, related_name='related_entries')
+    related = models.ForeignKey('tinySteps.Guides_Model', on_delete=models.CASCADE, related_name='related_to')
+    score = models.FloatField(_("Score"))
+
+    class Meta:
+        verbose_name = _("Related Guide")
+        verbose_name_plural = _("Related Guides")
+        constraints = [
+            models.UniqueConstraint(fields=['guide', 'related'], name='unique_related_guide'),
+        ]
+        indexes = [
+            models.Index(fields=['guide', '-score'], name='related_guide_score_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.guide_id} -> {self.related_id} ({self.score:.3f})"
+
+class RelatedArticle_Model(models.Model):
+    """Precomputed neighbour of an external article, by TF-IDF cosine similarity"""
+    article = models.ForeignKey('tinySteps.ExternalArticle_Model', on_delete=models.CASCADE, related_name='related_entries')
+    related = models.ForeignKey('tinySteps.ExternalArticle_Model', on_delete=models.CASCADE, related_name='related_to')
+    score = models.FloatField(_("Score"))
+
+    class Meta:
+        verbose_name = _("Related Article")
+        verbose_name_plural = _("Related Articles")
+        constraints = [
+            models.UniqueConstraint(fields=['article', 'related'], name='unique_related_article'),
+        ]
+        indexes = [
+            models.Index(fields=['article', '-score'], name='related_article_score_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.article_id} -> {self.related_id} ({self.score:.3f})"
@@ -0,0 +1,96 @@
+from django.db import models
+from django.utils.text import slugify
+from django.utils.translation import gettext_lazy as _
+
+MAX_TAG_LENGTH = 50
+
+def parse_tags(value):
+    """Split a comma-separated tag string (or a list of tags) into ``[(slug, name)]``
+
+    Whitespace is collapsed and tags with the same slug are kept once, with
+    the spelling they first appear with.
+    """
+    items = value if isinstance(value, (list, tuple)) else (value or '').split(',')
+    tags = {}
+    for item in items:
+        name = ' '.join(str(item).split())[:MAX_TAG_LENGTH]
+        slug = slugify(name)[:MAX_TAG_LENGTH]
+        if slug and slug not in tags:
+            tags[slug] = name
+    return list(tags.items())
+
+def format_tags(value):
+    """Normalized comma-separated form of a tag string or list, as stored on the guides"""
+    return ','.join(name for _, name in parse_tags(value))
+
+def sync_guide_tags(tags_by_guide, tag_model=None, link_model=None):
+    """Point the tag index of each guide at its parsed tags, in a fixed number of queries
+
+    ``tags_by_guide`` maps guide IDs to ``parse_tags`` results. Missing tags are
+    created, links no longer wanted are deleted and new ones inserted. The
+    models can be passed in so migrations can use their historical versions.
+    """
+    tag_model = tag_model or Tag_Model
+    link_model = link_model or GuideTag_Model
+    if not tags_by_guide:
+        return
+
+    names = {}
+    for tags in tags_by_guide.values():
+        for slug, name in tags:
+            names.setdefault(slug, name)
+
+    tag_ids = {}
+    if names:
+        tag_model.objects.bulk_create(
+            [tag_model(slug=slug, name=name) for slug, name in names.items()], ignore_conflicts=True
+        )
+        tag_ids = dict(tag_model.objects.filter(slug__in=names).values_list('slug', 'id'))
+
+    wanted = {(guide_id, tag_ids[slug]) for guide_id, tags in tags_by_guide.items() for slug, _ in tags}
+    current = {
+        (guide_id, tag_id): pk
+        for pk, guide_id, tag_id in link_model.objects.filter(
+            guide_id__in=list(tags_by_guide)
+        ).values_list('pk', 'guide_id', 'tag_id')
+    }
+
+    stale = [pk for link, pk in current.items() if link not in wanted]
+    if stale:
+        link_model.objects.filter(pk__in=stale).delete()
+    link_model.objects.bulk_create(
+        [link_model(guide_id=guide_id, tag_id=tag_id) for guide_id, tag_id in wanted - current.keys()],
+        ignore_conflicts=True
+    )
+
+class Tag_Model(models.Model):
+    """Model for a tag shared by every guide tagged with it"""
+    name = models.CharField(_("Name"), max_length=MAX_TAG_LENGTH)
+    slug = models.SlugField(_("Slug"), max_length=MAX_TAG_LENGTH, unique=True)
+
+    class Meta:
+        verbose_name = _("Tag")
+        verbose_name_plural = _("Tags")
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+class GuideTag_Model(models.Model):
+    """Model linking a guide to one of its tags, indexed both ways"""
+    guide = models.ForeignKey('tinySteps.Guides_Model', on_delete=models.CASCADE, related_name='guide_tags')
+    tag = models.ForeignKey(Tag_Model, on_delete=models.CASCADE, related_name='guide_tags')
+
+    class Meta:
+        verbose_name = _("Guide Tag")
+        verbose_name_plural = _("Guide Tags")
+        constraints = [
+            models.UniqueConstraint(fields=['guide', 'tag'], name='unique_guide_tag'),
+        ]
+        indexes = [
+            # Guides of a tag; the unique constraint already covers the tags of a guide
+            models.Index(fields=['tag', 'guide'], name='guide_tag_tag_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.guide_id}: {self.tag_id}"
@@ -7,7 +7,7 @@ class ExternalArticle_Model(models.Model):
     source_name = models.CharField(_("Source Name"), max_length=100)
     author = models.CharField(_("Author"), max_length=100, null=True, blank=True)
     description = models.TextField(_("Description"), null=True, blank=True)
-    url = models.URLField(_("URL"))
+    url = models.URLField(_("URL"), max_length=500, unique=True)
     image_url = models.URLField(_("Image URL"), null=True, blank=True)
     published_at = models.DateTimeField(_("Published At"))
     category = models.CharField(_("Category"), max_length=50, choices=[
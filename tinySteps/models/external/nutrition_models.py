@@ -1,9 +1,35 @@
+import re
 from django.db import models
 from django.utils.translation import gettext as _
 
+QUANTITY_PATTERN = re.compile(r'(\d+([.,]\d+)?|\d+/\d+|[½¼¾⅓⅔]|a|an|one|half)')
+QUANTITY_UNIT_PATTERN = re.compile(r'\d+([.,]\d+)?(g|gr|kg|mg|ml|l|oz|lbs?)\.?')
+UNITS = {
+    'g', 'gr', 'gram', 'grams', 'kg', 'kilogram', 'kilograms', 'mg', 'ml', 'milliliter', 'milliliters',
+    'l', 'liter', 'liters', 'litre', 'litres', 'oz', 'ounce', 'ounces', 'lb', 'lbs', 'pound', 'pounds',
+    'cup', 'cups', 'tbsp', 'tablespoon', 'tablespoons', 'tsp', 'teaspoon', 'teaspoons',
+    'pinch', 'pinches', 'slice', 'slices', 'piece', 'pieces', 'clove', 'cloves',
+}
+
+def normalize_ingredient(ingredient):
+    """Normalized lookup key of an ingredient: lowercased, whitespace collapsed,
+    leading quantity and unit removed ("2  Cups of Rice" -> "rice")"""
+    words = (ingredient or '').lower().split()
+    original = ' '.join(words)
+
+    while words and (QUANTITY_PATTERN.fullmatch(words[0]) or QUANTITY_UNIT_PATTERN.fullmatch(words[0])):
+        words.pop(0)
+    if words and words[0].rstrip('.') in UNITS:
+        words.pop(0)
+    if words and words[0] == 'of':
+        words.pop(0)
+
+    return ' '.join(words) or original
+
 class ExternalNutritionData_Model(models.Model):
     """External nutrition data model for ingredients"""
     ingredient = models.CharField(_("Ingredient"), max_length=200)
+    normalized_ingredient = models.CharField(_("Normalized ingredient"), max_length=200, unique=True)
     data = models.JSONField(_("Nutrition Data"))
     created_at = models.DateTimeField(_("Created at"), auto_now_add=True)
     updated_at = models.DateTimeField(_("Updated at"), auto_now=True)
@@ -14,4 +40,8 @@ class ExternalNutritionData_Model(models.Model):
         unique_together = ('ingredient',)
     
     def __str__(self):
-        return f"Nutrition data for {self.ingredient}"
\ No newline at end of file
+        return f"Nutrition data for {self.ingredient}"
+    
+    def save(self, *args, **kwargs):
+        self.normalized_ingredient = normalize_ingredient(self.ingredient)
+        super().save(*args, **kwargs)
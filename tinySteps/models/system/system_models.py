@@ -1,4 +1,7 @@
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.db.models.functions import Greatest
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 class ConnectionError_Model(models.Model):
@@ -27,4 +30,122 @@ class ConnectionError_Model(models.Model):
         verbose_name_plural = _('Connection Errors')
     
     def __str__(self):
-        return f"{self.error_type} at {self.path} ({self.timestamp})"
\ No newline at end of file
+        return f"{self.error_type} at {self.path} ({self.timestamp})"
+
+class AuditLog_Model(models.Model):
+    """Model for the audit trail of moderation, user and system actions"""
+    timestamp = models.DateTimeField(_('Timestamp'), default=timezone.now, db_index=True)
+    entity_type = models.CharField(_('Entity type'), max_length=50)
+    entity_id = models.CharField(_('Entity ID'), max_length=64, blank=True, null=True)
+    entity_name = models.CharField(_('Entity name'), max_length=255, blank=True)
+    action = models.CharField(_('Action'), max_length=100)
+    actor = models.CharField(_('Actor'), max_length=150)
+    details = models.JSONField(_('Details'), default=dict, blank=True, encoder=DjangoJSONEncoder)
+
+    class Meta:
+        ordering = ['-timestamp']
+        verbose_name = _('Audit Log')
+        verbose_name_plural = _('Audit Logs')
+
+    def __str__(self):
+        return f"{self.actor} {self.action} {self.entity_type} {self.entity_id or ''} ({self.timestamp})"
+
+class Task_Model(models.Model):
+    """Job of the database-backed task queue, run by ``manage.py run_worker``"""
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, _('Pending')),
+        (RUNNING, _('Running')),
+        (DONE, _('Done')),
+        (FAILED, _('Failed')),
+    )
+
+    name = models.CharField(_('Task'), max_length=100)
+    payload = models.JSONField(_('Payload'), default=dict, blank=True, encoder=DjangoJSONEncoder)
+    status = models.CharField(_('Status'), max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    idempotency_key = models.CharField(
+        _('Idempotency key'),
+        max_length=255,
+        unique=True,
+        blank=True,
+        null=True,
+        help_text=_('A task is enqueued only once per key')
+    )
+    run_at = models.DateTimeField(_('Run at'), default=timezone.now)
+    attempts = models.PositiveSmallIntegerField(_('Attempts'), default=0)
+    max_attempts = models.PositiveSmallIntegerField(_('Max attempts'), default=5)
+    locked_by = models.CharField(_('Locked by'), max_length=100, blank=True)
+    locked_at = models.DateTimeField(_('Locked at'), blank=True, null=True)
+    last_error = models.TextField(_('Last error'), blank=True)
+    created_at = models.DateTimeField(_('Created at'), auto_now_add=True)
+    finished_at = models.DateTimeField(_('Finished at'), blank=True, null=True)
+
+    class Meta:
+        ordering = ['run_at', 'id']
+        indexes = [
+            # Workers only ever scan the due pending tasks
+            models.Index(
+                fields=['run_at', 'id'],
+                name='task_pending_run_at_idx',
+                condition=models.Q(status='pending')
+            ),
+            models.Index(fields=['status', 'locked_at'], name='task_status_locked_idx'),
+        ]
+        verbose_name = _('Task')
+        verbose_name_plural = _('Tasks')
+
+    def __str__(self):
+        return f"{self.name} ({self.status}, attempt {self.attempts}/{self.max_attempts})"
+
+class SQLFingerprint_Manager(models.Manager):
+    """Manager for the aggregated statistics of the SQL profiler"""
+    def record(self, fingerprint, sql, calls, total_time, max_time, route='', call_site='', n_plus_one=False):
+        """Add the queries of one profiled request to the statistics of their fingerprint"""
+        changes = {
+            'calls': models.F('calls') + calls,
+            'total_time': models.F('total_time') + total_time,
+            'max_time': Greatest('max_time', max_time),
+            'n_plus_one_requests': models.F('n_plus_one_requests') + int(n_plus_one),
+            'route': route[:255],
+            'call_site': call_site,
+            'last_seen': timezone.now(),
+        }
+        if not self.filter(fingerprint=fingerprint).update(**changes):
+            # First time this fingerprint is seen
+            self.bulk_create([self.model(fingerprint=fingerprint, sql=sql)], ignore_conflicts=True)
+            self.filter(fingerprint=fingerprint).update(**changes)
+
+
+class SQLFingerprint_Model(models.Model):
+    """Statistics of one normalized SQL statement, collected by the sampling SQL profiler"""
+    fingerprint = models.CharField(max_length=40, unique=True)
+    sql = models.TextField(_('Normalized SQL'))
+    calls = models.PositiveBigIntegerField(_('Calls'), default=0)
+    total_time = models.FloatField(_('Total time (s)'), default=0)
+    max_time = models.FloatField(_('Max time (s)'), default=0)
+    n_plus_one_requests = models.PositiveIntegerField(
+        _('Requests flagged as N+1'),
+        default=0,
+        help_text=_('Sampled requests that repeated this statement past the N+1 threshold')
+    )
+    route = models.CharField(_('Last route'), max_length=255, blank=True)
+    call_site = models.TextField(_('Last call site'), blank=True)
+    last_seen = models.DateTimeField(_('Last seen'), default=timezone.now)
+
+    objects = SQLFingerprint_Manager()
+
+    class Meta:
+        ordering = ['-total_time']
+        indexes = [models.Index(fields=['-total_time'], name='sql_fingerprint_time_idx')]
+        verbose_name = _('SQL Fingerprint')
+        verbose_name_plural = _('SQL Fingerprints')
+
+    def __str__(self):
+        return f"{self.sql[:60]} ({self.calls} calls)"
+
+    @property
+    def average_time(self):
+        return self.total_time / self.calls if self.calls else 0
@@ -1,4 +1,4 @@
-from django.db.models import Count
+from django.db.models import Count, Q
 from datetime import date, timedelta
 from tinySteps.models.child.child_models import CalendarEvent_Model
 from tinySteps.repositories.base.base_repository import GenericRepository
@@ -6,6 +6,9 @@ from tinySteps.repositories.base.base_repository import GenericRepository
 class CalendarEvent_Repository(GenericRepository):
     """Repository for calendar event-related operations"""
     
+    # Prefix for aggregate aliases so they never clash with model fields
+    STATS_PREFIX = 'stats_'
+    
     def __init__(self):
         super().__init__(CalendarEvent_Model)
     
@@ -55,29 +58,56 @@ class CalendarEvent_Repository(GenericRepository):
         ).order_by('date', 'time')
     
     def get_event_stats(self, child_id):
-        """Get event statistics for a child"""
-        # Count events by type
-        event_counts = self.model.objects.filter(child_id=child_id)\
-            .values('type')\
-            .annotate(count=Count('id'))
+        """Get event statistics for a child in a single query"""
+        totals = self.model.objects.filter(child_id=child_id).aggregate(
+            **self._get_stats_aggregates()
+        )
+        return self._format_stats(totals)
+    
+    def get_event_stats_for_children(self, children):
+        """
+        Get event statistics for many children in a single query
+        :param children: QuerySet or list of child IDs
+        :return: dict mapping each child ID to its statistics
+        """
+        from tinySteps.models import YourChild_Model
         
-        stats = {
-            'doctor': 0,
-            'vaccine': 0,
-            'milestone': 0,
-            'feeding': 0,
-            'other': 0
+        rows = YourChild_Model.objects.filter(pk__in=children).order_by().values('pk').annotate(
+            **self._get_stats_aggregates(prefix='events__')
+        )
+        return {row['pk']: self._format_stats(row) for row in rows}
+    
+    def _get_stats_aggregates(self, prefix=''):
+        """Build the conditional COUNT expressions shared by all statistics queries"""
+        today = date.today()
+        aggregates = {
+            f'{self.STATS_PREFIX}total': Count(f'{prefix}id'),
+            f'{self.STATS_PREFIX}upcoming': Count(f'{prefix}id', filter=Q(**{f'{prefix}date__gte': today})),
         }
         
-        for item in event_counts:
-            stats[item['type']] = item['count']
+        for event_type, _label in self.model.TYPE_CHOICES:
+            aggregates[f'{self.STATS_PREFIX}type_{event_type}'] = Count(
+                f'{prefix}id', filter=Q(**{f'{prefix}type': event_type})
+            )
+            
+        for status, _label in self.model.STATUS_CHOICES:
+            aggregates[f'{self.STATS_PREFIX}status_{status}'] = Count(
+                f'{prefix}id', filter=Q(**{f'{prefix}status': status})
+            )
+        
+        return aggregates
+    
+    def _format_stats(self, totals):
+        """Shape aggregated totals into the statistics dictionary used by views"""
+        stats = {'total': totals[f'{self.STATS_PREFIX}total']}
         
-        # Calculate total and upcoming
-        today = date.today()
-        stats['total'] = sum(stats.values())
-        stats['upcoming'] = self.model.objects.filter(
-            child_id=child_id, 
-            date__gte=today
-        ).count()
+        for event_type, _label in self.model.TYPE_CHOICES:
+            stats[event_type] = totals[f'{self.STATS_PREFIX}type_{event_type}']
+            
+        stats['upcoming'] = totals[f'{self.STATS_PREFIX}upcoming']
+        stats['by_status'] = {
+            status: totals[f'{self.STATS_PREFIX}status_{status}']
+            for status, _label in self.model.STATUS_CHOICES
+        }
         
-        return stats
\ No newline at end of file
+        return stats
@@ -1,5 +1,4 @@
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
 from tinySteps.models import ExternalArticle_Model
 from tinySteps.repositories.base.base_repository import GenericRepository
 
@@ -25,19 +24,29 @@ class Article_Repository(GenericRepository):
         return get_object_or_404(self.model, pk=article_id)
     
     def search_articles(self, query, category=None):
-        """Search articles by query string and optional category"""
-        search_query = Q(title__icontains=query) | Q(description__icontains=query)
+        """Search articles by query string and optional category, best matches first"""
+        from tinySteps.services.search.search_service import Search_Service
         
+        articles = self.model.objects.all()
         if category:
-            search_query &= Q(category=category)
+            articles = articles.filter(category=category)
         
-        return self.model.objects.filter(search_query).order_by('-published_at')
+        return Search_Service().rank_queryset(articles, query, kinds=['article'])
     
     def get_recent_articles(self, limit=5):
         """Get recent articles"""
         return self.model.objects.all().order_by('-published_at')[:limit]
     
     def get_related_articles(self, article_id, limit=3):
-        """Get related articles"""
+        """Get the most similar articles from the precomputed neighbours, else the latest of the category"""
+        related = list(
+            self.model.objects.filter(related_to__article_id=article_id).order_by('-related_to__score')[:limit]
+        )
+        if len(related) >= limit:
+            return related
+        
         article = self.get_article_by_id(article_id)
-        return self.get_articles_by_category(article.category, limit=limit)
\ No newline at end of file
+        return related + list(
+            self.get_articles_by_category(article.category)
+            .exclude(id__in=[article.id] + [related_article.id for related_article in related])[:limit - len(related)]
+        )
\ No newline at end of file
@@ -1,3 +1,7 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
 from tinySteps.repositories.base.base_repository import GenericRepository
 from tinySteps.models import Comment_Model
 
@@ -27,4 +31,14 @@ class Comment_Repository(GenericRepository):
         """Get recent comments across all content types"""
         return self.model.objects.all().select_related(
             'author', 'content_type'
-        ).order_by('-created_at')[:limit]
\ No newline at end of file
+        ).order_by('-created_at')[:limit]
+    
+    def get_count_subquery(self, model_class):
+        """Get a correlated subquery counting the comments of each row of model_class"""
+        content_type = ContentType.objects.get_for_model(model_class)
+        comments = self.model.objects.filter(
+            content_type=content_type,
+            object_id=OuterRef('pk')
+        ).order_by().values('object_id').annotate(total=Count('pk')).values('total')
+        
+        return Coalesce(Subquery(comments, output_field=IntegerField()), Value(0))
@@ -1,5 +1,6 @@
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
 from tinySteps.models import ParentsForum_Model
 from tinySteps.repositories.base.base_repository import GenericRepository
 
@@ -10,21 +11,45 @@ class Forum_Repository(GenericRepository):
         super().__init__(ParentsForum_Model)
     
     def get_latest_posts(self, limit=5):
-        """Get the latest forum posts"""
-        return self.model.objects.all().order_by('-created_at')[:limit]
+        """Get the latest forum posts, all of them when limit is None"""
+        query = self.model.objects.all().order_by('-created_at')
+        
+        if limit:
+            query = query[:limit]
+            
+        return query
+    
+    def get_posts_with_counts(self):
+        """Get forum posts with their author; like/comment counts are stored on the rows"""
+        return self.model.objects.select_related('author').order_by('-created_at')
+    
+    def get_likes_count_subquery(self):
+        """Get a correlated subquery counting the likes of each post"""
+        likes = self.model.likes.through.objects.filter(
+            parentsforum_model=OuterRef('pk')
+        ).order_by().values('parentsforum_model').annotate(total=Count('pk')).values('total')
+        
+        return Coalesce(Subquery(likes, output_field=IntegerField()), Value(0))
     
     def get_post_by_id(self, post_id):
         """Get a specific forum post by ID"""
         return get_object_or_404(self.model, pk=post_id)
     
     def search_posts(self, query_string, category=None):
-        """Search forum posts by query string and optional category"""
-        search_query = Q(title__icontains=query_string) | Q(desc__icontains=query_string)
+        """Search forum posts by query string and optional category, best matches first
+        
+        Without a query string the posts of the category are returned, newest first.
+        """
+        from tinySteps.services.search.search_service import Search_Service
         
+        query = self.model.objects.all()
         if category:
-            search_query &= Q(category=category)
+            query = query.filter(category=category)
         
-        return self.model.objects.filter(search_query).order_by('-created_at')
+        if not (query_string or '').strip():
+            return query.order_by('-created_at')
+        
+        return Search_Service().rank_queryset(query, query_string, kinds=['forum'])
         
     def get_posts_by_category(self, category, limit=None):
         """Get forum posts by category with optional limit"""
@@ -36,15 +61,16 @@ class Forum_Repository(GenericRepository):
         return query
     
     def get_popular_posts(self, days=7, limit=5):
-        """Get popular forum posts from the last N days"""
-        from django.utils import timezone
-        from datetime import timedelta
+        """Get the hottest forum posts, optionally only those of the last N days"""
+        query = self.model.objects.order_by('-hot_score', '-id')
         
-        start_date = timezone.now() - timedelta(days=days)
+        if days:
+            from django.utils import timezone
+            from datetime import timedelta
+            
+            query = query.filter(created_at__gte=timezone.now() - timedelta(days=days))
         
-        return self.model.objects.filter(
-            created_at__gte=start_date
-        ).order_by('-likes')[:limit]
+        return query[:limit]
     
     def get_user_posts(self, user_id):
         """Get forum posts by a specific user"""
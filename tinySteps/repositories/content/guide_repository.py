@@ -1,5 +1,5 @@
-from django.db.models import Q
-from tinySteps.models import Guides_Model
+from django.db.models import Count, Q
+from tinySteps.models.content.tag_models import GuideTag_Model, Tag_Model
 from tinySteps.repositories.base.base_repository import GenericRepository
 
 class Guide_Repository(GenericRepository):
@@ -45,6 +45,24 @@ class Guide_Repository(GenericRepository):
         # Return all results if no pagination
         return query
     
+    def get_popular_guides(self, guide_type, count=4):
+        """Get the hottest approved guides of a type, ranked by the precomputed hot score"""
+        return self.model_class.objects.filter(
+            guide_type=guide_type,
+            status='approved'
+        ).order_by('-hot_score', '-id')[:count]
+    
+    def get_guides_with_counts(self, guide_type=None, tag=None):
+        """Get guides with their author, optionally those carrying a tag slug; comment counts are stored on the rows"""
+        query = self.model_class.objects.select_related('author')
+        
+        if guide_type:
+            query = query.filter(guide_type=guide_type)
+        if tag:
+            query = query.filter(guide_tags__tag__slug=tag)
+            
+        return query.order_by('-created_at')
+    
     def get_guide_by_id(self, guide_id):
         """Get a specific guide by ID"""
         try:
@@ -52,12 +70,60 @@ class Guide_Repository(GenericRepository):
         except self.model_class.DoesNotExist:
             return None
     
+    def get_guides_by_tag(self, tag_slug, guide_type=None, status='approved'):
+        """Get guides carrying a tag, looked up through the tag index"""
+        query = self.model_class.objects.filter(guide_tags__tag__slug=tag_slug)
+        
+        if guide_type:
+            query = query.filter(guide_type=guide_type)
+        if status:
+            query = query.filter(status=status)
+            
+        return query.order_by('-created_at')
+    
+    def get_tag_counts(self, guide_type=None, status='approved', limit=None):
+        """Get ``[{'slug', 'name', 'count'}]`` of the tags of matching guides, in a single GROUP BY"""
+        conditions = {}
+        if guide_type:
+            conditions['guide_tags__guide__guide_type'] = guide_type
+        if status:
+            conditions['guide_tags__guide__status'] = status
+            
+        # One filter() call so every condition and the count share the same join
+        counts = Tag_Model.objects.filter(**conditions).values('slug', 'name').annotate(count=Count('guide_tags')).order_by('-count', 'name')
+        return list(counts[:limit] if limit else counts)
+    
     def get_related_guides(self, guide, count=3):
-        """Get guides related to the given guide"""
-        return self.model_class.objects.filter(
+        """Get the most similar approved guides from the precomputed neighbours
+
+        Guides without enough neighbours yet (just approved, or with little
+        text in common) are completed with the guides sharing the most tags,
+        then with the latest ones.
+        """
+        related = list(
+            self.model_class.objects.filter(related_to__guide=guide, status='approved')
+            .order_by('-related_to__score')[:count]
+        )
+        if len(related) >= count:
+            return related
+        
+        others = self.model_class.objects.filter(
             guide_type=guide.guide_type,
             status='approved'
-        ).exclude(id=guide.id).order_by('-created_at')[:count]
+        ).exclude(id__in=[guide.id] + [related_guide.id for related_guide in related])
+        
+        # Filtering before annotating makes the count use the join on the shared tags only
+        related += list(
+            others.filter(guide_tags__tag_id__in=GuideTag_Model.objects.filter(guide=guide).values('tag_id'))
+            .annotate(shared_tags=Count('guide_tags'))
+            .order_by('-shared_tags', '-created_at')[:count - len(related)]
+        )
+        if len(related) < count:
+            related += list(
+                others.exclude(id__in=[related_guide.id for related_guide in related])
+                .order_by('-created_at')[:count - len(related)]
+            )
+        return related
     
     def get_guide_comments(self, guide_id):
         """Get comments for a specific guide"""
@@ -80,25 +146,35 @@ class Guide_Repository(GenericRepository):
         return guides[:count]
     
     def search_guides(self, query_text, guide_type=None, status='approved', page=None):
-        """Search guides by text"""
-        search_query = Q(title__icontains=query_text) | Q(description__icontains=query_text)
-        
-        filters = Q(status=status)
+        """Search guides by text, best matches first"""
+        query = self.model_class.objects.filter(status=status)
         if guide_type:
-            filters &= Q(guide_type=guide_type)
+            query = query.filter(guide_type=guide_type)
             
-        return self.model_class.objects.filter(search_query, filters).order_by('-created_at')
+        return self._search(query, query_text, status)
     
     def search_all_guides(self, query_text, status='approved', limit=10):
         """Search all guides regardless of type"""
-        search_query = Q(title__icontains=query_text) | Q(description__icontains=query_text)
-        result = self.model_class.objects.filter(search_query, status=status).order_by('-created_at')
+        result = self._search(self.model_class.objects.filter(status=status), query_text, status)
         
         if limit:
             result = result[:limit]
             
         return result
     
+    def _search(self, query, query_text, status):
+        """Private method to rank guides with the search index
+        
+        Only approved guides are indexed, other statuses are matched on title and description.
+        """
+        if status != 'approved':
+            return query.filter(
+                Q(title__icontains=query_text) | Q(desc__icontains=query_text)
+            ).order_by('-created_at')
+        
+        from tinySteps.services.search.search_service import Search_Service
+        return Search_Service().rank_queryset(query, query_text)
+    
     def get_all(self):
         """Get all guides"""
         return self.model_class.objects.all().order_by('-created_at')
@@ -1,6 +1,7 @@
 from django.shortcuts import get_object_or_404
 
 from tinySteps.models import ExternalNutritionData_Model
+from tinySteps.models.external.nutrition_models import normalize_ingredient
 from tinySteps.repositories.base.base_repository import GenericRepository
 
 class Nutrition_Repository(GenericRepository):
@@ -11,12 +12,12 @@ class Nutrition_Repository(GenericRepository):
     
     def get_by_ingredient(self, ingredient):
         """Get nutrition data for a specific ingredient"""
-        return get_object_or_404(self.model, ingredient__iexact=ingredient)
+        return get_object_or_404(self.model, normalized_ingredient=normalize_ingredient(ingredient))
     
     def get_or_none(self, ingredient):
         """Get nutrition data for a specific ingredient or None if not found"""
         try:
-            return self.model.objects.get(ingredient__iexact=ingredient)
+            return self.model.objects.get(normalized_ingredient=normalize_ingredient(ingredient))
         except self.model.DoesNotExist:
             return None
     
@@ -35,7 +36,7 @@ class Nutrition_Repository(GenericRepository):
     def save_nutrition_data(self, ingredient, data):
         """Save nutrition data for an ingredient"""
         nutrition_data, created = self.model.objects.update_or_create(
-            ingredient__iexact=ingredient,
+            normalized_ingredient=normalize_ingredient(ingredient),
             defaults={
                 'ingredient': ingredient.lower(),
                 'data': data
@@ -3,7 +3,12 @@
 # Core services
 from tinySteps.services.core.admin_service import AdminGuide_Service, Notification_Repository
 from tinySteps.services.core.child_service import Child_Service
+from tinySteps.services.core.counter_service import Counter_Service
+from tinySteps.services.core.dashboard_service import Dashboard_Service
 from tinySteps.services.core.forum_service import Forum_Service
+from tinySteps.services.core.growth_service import Growth_Service
+from tinySteps.services.core.trending_service import Trending_Service
+from tinySteps.services.core.vaccine_schedule_service import VaccineSchedule_Service
 
 # Guide services
 from tinySteps.services.guides.base_service import Guide_Service
@@ -15,6 +20,13 @@ from tinySteps.services.guides.parent_service import ParentGuide_Service
 from tinySteps.services.external.article_service import Article_Service
 from tinySteps.services.external.nutrition_data_service import NutritionData_Service
 
+# Search services
+from tinySteps.services.search.search_service import Search_Service
+from tinySteps.services.search.similarity_service import Similarity_Service
+
+# Media services
+from tinySteps.services.media.image_service import Image_Service
+
 # API integrations
 from tinySteps.services.apis.currents_service import CurrentsAPI_Service
 from tinySteps.services.apis.edamam_service import EdamamAPI_Service
@@ -28,14 +40,22 @@ __all__ = [
     'Article_Service',
     'Child_Service',
     'Contact_Service',
+    'Counter_Service',
     'CurrentsAPI_Service',
+    'Dashboard_Service',
     'EdamamAPI_Service',
     'Forum_Service',
+    'Growth_Service',
     'Guide_Service',
     'GuideContext_Service',
+    'Image_Service',
     'NewsAPI_Service',
     'Notification_Repository',
     'NutritionData_Service',
     'NutritionGuide_Service',
-    'ParentGuide_Service'
+    'ParentGuide_Service',
+    'Search_Service',
+    'Similarity_Service',
+    'Trending_Service',
+    'VaccineSchedule_Service'
 ]
\ No newline at end of file
@@ -1,28 +1,30 @@
 import requests
 import logging
 from django.conf import settings
-from django.core.cache import cache
+from tinySteps.services.apis.http_client import get_http_client
+from tinySteps.utils.helpers.cache_helper import EXTERNAL_API_CACHE, StaleWhileRevalidate_Cache
 
 logger = logging.getLogger(__name__)
 
 class CurrentsAPI_Service:
     BASE_URL = 'https://api.currentsapi.services/v1/latest-news'
     CACHE_DURATION = 300  # 5min
+    cache = StaleWhileRevalidate_Cache(EXTERNAL_API_CACHE, ttl=CACHE_DURATION)
     
     def __init__(self):
         self.api_key = settings.CURRENTS_API_KEY
     
     # Public methods
-    def get_first_time_parent_news(self, page=1, page_size=10, force_refresh=True):
+    def get_first_time_parent_news(self, page=1, page_size=10, force_refresh=False):
         return self._get_news('first-time parents', page, page_size, force_refresh)
         
-    def get_parenting_tips(self, page=1, page_size=10, force_refresh=True):
+    def get_parenting_tips(self, page=1, page_size=10, force_refresh=False):
         return self._get_news('parenting tips', page, page_size, force_refresh)
         
-    def get_baby_development_news(self, page=1, page_size=10, force_refresh=True):
+    def get_baby_development_news(self, page=1, page_size=10, force_refresh=False):
         return self._get_news('baby development', page, page_size, force_refresh)
     
-    def get_news_by_topic(self, topic, page=1, page_size=10, force_refresh=True):
+    def get_news_by_topic(self, topic, page=1, page_size=10, force_refresh=False):
         topics = {
             'newborn': 'newborn care',
             'sleep': 'baby sleep',
@@ -38,13 +40,13 @@ class CurrentsAPI_Service:
         return self._get_news(search_term, page, page_size, force_refresh)
     
     # Private methods
-    def _get_news(self, search_term, page=1, page_size=10, force_refresh=True):
+    def _get_news(self, search_term, page=1, page_size=10, force_refresh=False):
         cache_key = f"currents_{search_term.replace(' ', '_')}_{page}_{page_size}"
-        cached_data = None if force_refresh else cache.get(cache_key)
-        
-        if cached_data:
-            return cached_data
-        
+        return self.cache.get_or_fetch(
+            cache_key, lambda: self._fetch_news(search_term, page, page_size), force_refresh
+        )
+    
+    def _fetch_news(self, search_term, page, page_size):
         params = {
             'apiKey': self.api_key,
             'language': 'en',
@@ -54,12 +56,9 @@ class CurrentsAPI_Service:
         }
         
         try:
-            response = requests.get(self.BASE_URL, params=params)
+            response = get_http_client().get(self.BASE_URL, params=params)
             response.raise_for_status()
-            data = response.json()
-            
-            cache.set(cache_key, data, self.CACHE_DURATION)
-            return data
+            return response.json()
         
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching news articles from Currents API: {e}")
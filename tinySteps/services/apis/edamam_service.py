@@ -1,7 +1,6 @@
-import requests
 import logging
 from django.conf import settings
-from django.core.cache import cache
+from tinySteps.services.apis.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -9,8 +8,6 @@ class EdamamAPI_Service:
     """Service for interacting with Edamam Nutrition API"""
     
     BASE_URL = "https://api.edamam.com/api/nutrition-data"
-    CACHE_PREFIX = "edamam_"
-    CACHE_DURATION = 604800  # 1 week
     
     def __init__(self):
         self.app_id = settings.EDAMAM_APP_ID
@@ -18,20 +15,21 @@ class EdamamAPI_Service:
     
     def get_nutrition_data(self, ingredient, force_refresh=False):
         """Get nutrition data for an ingredient"""
-        # This ckecks if we already have this data saved in our database
-        if not force_refresh:
-            from tinySteps.services.external.nutrition_data_service import NutritionData_Service
-            existing_data = NutritionData_Service.get_ingredient_data(ingredient)
-            if existing_data:
-                return existing_data
+        from tinySteps.models.external.nutrition_models import normalize_ingredient
+        from tinySteps.services.external.nutrition_data_service import NutritionData_Service
         
-        # If not, fetch from API
-        cache_key = f"{self.CACHE_PREFIX}{ingredient.lower()}"
+        # Lookups (local cache, shared cache, database, API) live in the data service
         if not force_refresh:
-            cached_data = cache.get(cache_key)
-            if cached_data:
-                return cached_data
+            return NutritionData_Service.get_ingredient_data(ingredient)
+        
+        data = self.fetch_nutrition_data(normalize_ingredient(ingredient))
+        if data is not None:
+            NutritionData_Service.update_ingredient_data(ingredient, data)
         
+        return data
+    
+    def fetch_nutrition_data(self, ingredient):
+        """Fetch nutrition data for an ingredient from the API, without touching the cache or the database"""
         try:
             params = {
                 'app_id': self.app_id,
@@ -39,19 +37,11 @@ class EdamamAPI_Service:
                 'ingr': ingredient
             }
             
-            response = requests.get(self.BASE_URL, params=params)
+            response = get_http_client().get(self.BASE_URL, params=params)
             response.raise_for_status()
             
-            data = response.json()
-            
-            # Save to database and cache
-            from tinySteps.services.external.nutrition_data_service import NutritionData_Service
-            NutritionData_Service.update_ingredient_data(ingredient, data)
-            
-            cache.set(cache_key, data, self.CACHE_DURATION)
-            
-            return data
+            return response.json()
             
         except Exception as e:
             logger.error(f"Error fetching nutrition data for {ingredient}: {str(e)}")
-            return None
\ No newline at end of file
+            return None
@@ -0,0 +1,193 @@
+import logging
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+from tinySteps.utils.helpers.metrics_helper import EXTERNAL_RETRIES, observe_external_call
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'TIMEOUT': (3.05, 10),      # connect, read (seconds)
+    'MAX_RETRIES': 2,           # retries after the first attempt
+    'BACKOFF_BASE': 0.3,        # seconds, doubled on every retry
+    'BACKOFF_MAX': 5,
+    'POOL_CONNECTIONS': 10,     # number of hosts kept in the pool
+    'POOL_MAXSIZE': 20,         # connections kept per host
+    'BREAKER_THRESHOLD': 5,     # consecutive failures that open the circuit
+    'BREAKER_RESET': 30,        # seconds before a trial request is let through
+}
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+class CircuitOpen_Error(requests.exceptions.RequestException):
+    """Raised when the circuit of an upstream host is open"""
+
+class Circuit_Breaker:
+    """Per-host circuit breaker
+
+    After ``threshold`` consecutive failures the circuit opens and requests fail
+    fast. Once ``reset_timeout`` has passed a single trial request is let through
+    (half-open): success closes the circuit, failure opens it again.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, threshold, reset_timeout):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    def allow_request(self):
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+class HTTP_Client:
+    """HTTP client shared by the external API services
+
+    Wraps a pooled ``requests.Session`` with default timeouts, bounded retries
+    with jittered exponential backoff, a circuit breaker per upstream host and
+    latency/error metrics per endpoint.
+    """
+
+    def __init__(self, **options):
+        self.options = {**DEFAULTS, **getattr(settings, 'EXTERNAL_HTTP', {}), **options}
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.options['POOL_CONNECTIONS'],
+            pool_maxsize=self.options['POOL_MAXSIZE'],
+            max_retries=0
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._breakers = {}
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None, timeout=None, endpoint=None, **kwargs):
+        """Send a GET request, retrying connection errors and retryable statuses
+
+        Returns the last response (the caller decides with ``raise_for_status``)
+        or raises the last ``requests`` exception.
+        """
+        parts = urlsplit(url)
+        endpoint = endpoint or f"{parts.netloc}{parts.path}"
+        breaker = self.get_breaker(parts.netloc)
+        timeout = timeout or self.options['TIMEOUT']
+        max_retries = self.options['MAX_RETRIES']
+
+        for attempt in range(max_retries + 1):
+            if not breaker.allow_request():
+                self._record(endpoint, error=True)
+                raise CircuitOpen_Error(f"Circuit open for {parts.netloc}")
+
+            if attempt:
+                self._record(endpoint, retry=True)
+                time.sleep(self._backoff(attempt))
+
+            started = time.monotonic()
+            try:
+                response = self.session.get(url, params=params, timeout=timeout, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                self._record(endpoint, latency=time.monotonic() - started, error=True)
+                breaker.record_failure()
+                if attempt == max_retries:
+                    raise
+                logger.warning(f"Request to {endpoint} failed ({e}), retrying")
+                continue
+            except requests.exceptions.RequestException:
+                # Malformed responses, redirect loops, invalid URLs: not retried, but still a
+                # failure, so a half-open circuit does not wait for an outcome forever
+                self._record(endpoint, latency=time.monotonic() - started, error=True)
+                breaker.record_failure()
+                raise
+
+            latency = time.monotonic() - started
+            if response.status_code in RETRY_STATUSES:
+                self._record(endpoint, latency=latency, error=True)
+                breaker.record_failure()
+                if attempt == max_retries:
+                    return response
+                logger.warning(f"Request to {endpoint} returned {response.status_code}, retrying")
+                continue
+
+            self._record(endpoint, latency=latency, error=response.status_code >= 400)
+            breaker.record_success()
+            return response
+
+    def get_breaker(self, host):
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = Circuit_Breaker(
+                    self.options['BREAKER_THRESHOLD'], self.options['BREAKER_RESET']
+                )
+            return self._breakers[host]
+
+    def get_metrics(self):
+        """Get a snapshot of the per-endpoint request metrics"""
+        with self._lock:
+            return {endpoint: dict(values) for endpoint, values in self._metrics.items()}
+
+    def _backoff(self, attempt):
+        """Full jitter: a random delay up to the exponential backoff of the attempt"""
+        ceiling = min(self.options['BACKOFF_MAX'], self.options['BACKOFF_BASE'] * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+    def _record(self, endpoint, latency=None, error=False, retry=False):
+        if retry:
+            EXTERNAL_RETRIES.labels(endpoint=endpoint).inc()
+        elif latency is not None:
+            observe_external_call(endpoint, latency, error=error)
+
+        with self._lock:
+            metrics = self._metrics.setdefault(endpoint, {
+                'requests': 0, 'errors': 0, 'retries': 0, 'latency_total': 0.0, 'latency_max': 0.0
+            })
+            if retry:
+                metrics['retries'] += 1
+                return
+            metrics['requests'] += 1
+            if error:
+                metrics['errors'] += 1
+            if latency is not None:
+                metrics['latency_total'] += latency
+                metrics['latency_max'] = max(metrics['latency_max'], latency)
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_http_client():
+    """Get the HTTP client shared by every external API service of this process"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HTTP_Client()
+        return _client
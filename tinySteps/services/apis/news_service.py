@@ -1,7 +1,8 @@
 import requests
 import logging
 from django.conf import settings
-from django.core.cache import cache
+from tinySteps.services.apis.http_client import get_http_client
+from tinySteps.utils.helpers.cache_helper import EXTERNAL_API_CACHE, StaleWhileRevalidate_Cache
 
 logger = logging.getLogger(__name__)
 
@@ -10,15 +11,16 @@ class NewsAPI_Service:
     
     BASE_URL = 'https://newsapi.org/v2/everything'
     CACHE_DURATION = 300  # 5 minutes in seconds
+    cache = StaleWhileRevalidate_Cache(EXTERNAL_API_CACHE, ttl=CACHE_DURATION)
     
     def __init__(self):
         self.api_key = settings.NEWS_API_KEY
     
     # Public methods
-    def get_parenting_articles(self, query="\"first-time parents\" OR \"new parents\" OR \"newborn care\" OR \"infant development\" OR \"baby milestones\"", page=1, page_size=10, force_refresh=True):
+    def get_parenting_articles(self, query="\"first-time parents\" OR \"new parents\" OR \"newborn care\" OR \"infant development\" OR \"baby milestones\"", page=1, page_size=10, force_refresh=False):
         return self._get_articles('parenting', query, page, page_size, force_refresh)
     
-    def get_nutrition_articles(self, query=None, page=1, page_size=10, force_refresh=True):
+    def get_nutrition_articles(self, query=None, page=1, page_size=10, force_refresh=False):
         if query is None:
             query = (
                 "\"baby food\" OR \"infant nutrition\" OR \"first foods\" OR "
@@ -27,7 +29,7 @@ class NewsAPI_Service:
             )
         return self._get_articles('nutrition', query, page, page_size, force_refresh)
     
-    def get_parenting_articles_by_topic(self, topic, page=1, page_size=10, force_refresh=True):
+    def get_parenting_articles_by_topic(self, topic, page=1, page_size=10, force_refresh=False):
         topic_queries = {
             'newborn': '"newborn care" OR "first month" OR "newborn sleep" OR "newborn feeding"',
             'sleep': '"baby sleep" OR "infant sleep" OR "sleep training" OR "sleep schedule"',
@@ -46,11 +48,11 @@ class NewsAPI_Service:
     # Private methods
     def _get_articles(self, category, query, page=1, page_size=10, force_refresh=False):
         cache_key = f"newsapi_{category}_{query.replace(' ', '_')}_{page}_{page_size}"
-        cached_data = None if force_refresh else cache.get(cache_key)
-        
-        if cached_data:
-            return cached_data
-        
+        return self.cache.get_or_fetch(
+            cache_key, lambda: self._fetch_articles(query, page, page_size), force_refresh
+        )
+    
+    def _fetch_articles(self, query, page, page_size):
         params = {
             'apiKey': self.api_key,
             'q': query,
@@ -61,12 +63,9 @@ class NewsAPI_Service:
         }
         
         try:
-            response = requests.get(self.BASE_URL, params=params)
+            response = get_http_client().get(self.BASE_URL, params=params)
             response.raise_for_status()
-            data = response.json()
-            
-            cache.set(cache_key, data, self.CACHE_DURATION)
-            return data
+            return response.json()
         
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching news articles: {e}")
@@ -1,10 +1,10 @@
 import logging
-from django.core.mail import send_mail
 from django.template.loader import render_to_string
 from django.utils.translation import gettext as _
 from django.conf import settings
 
 from tinySteps.models import Contact_Model
+from tinySteps.services.tasks.task_queue_service import enqueue_email
 
 logger = logging.getLogger(__name__)
 
@@ -24,7 +24,7 @@ class Contact_Service:
         return contact
     
     def _send_confirmation_email(self, contact):
-        """Send confirmation email to the contact"""
+        """Queue the confirmation email to the contact"""
         subject = _('Request Received - Tiny Steps')
         message = render_to_string('contact/emails/confirmation.txt', {
             'name': contact.name,
@@ -34,17 +34,16 @@ class Contact_Service:
         recipient_email = contact.email
         
         try:
-            logger.debug(f"Sending email with: FROM: {from_email}, TO: {recipient_email}")
-            logger.debug(f"SMTP Settings: HOST={settings.EMAIL_HOST}, PORT={settings.EMAIL_PORT}, USER={settings.EMAIL_HOST_USER}")
+            logger.debug(f"Queueing email with: FROM: {from_email}, TO: {recipient_email}")
             
-            send_mail(
+            enqueue_email(
                 subject,
                 message,
-                from_email,
                 [recipient_email],
-                fail_silently=False,
+                from_email=from_email,
+                key=f"contact-confirmation:{contact.id}"
             )
             
-            logger.info(f"Confirmation email sent to {recipient_email}")
+            logger.info(f"Confirmation email queued for {recipient_email}")
         except Exception as e:
-            logger.error(f"Failed to send confirmation email: {str(e)}", exc_info=True)
\ No newline at end of file
+            logger.error(f"Failed to queue confirmation email: {str(e)}", exc_info=True)
\ No newline at end of file
@@ -29,7 +29,7 @@ class AdminGuide_Service:
             count (int, optional): Number of related guides to return
             
         Returns:
-            QuerySet: A queryset of related guides
+            list: The related guides
         """
         try:
             # Get the current guide
@@ -37,22 +37,8 @@ class AdminGuide_Service:
             if not guide:
                 return []
                 
-            # Find guides of the same type, excluding the current one
-            related_guides = self.guide_repository.get_guides_by_type(
-                guide_type=guide.guide_type, 
-                status='approved',
-                count=count,
-                exclude_id=guide_id
-            )
-            
-            # If the guide has tags, we can filter by them
-            if hasattr(guide, 'tags') and guide.tags.exists():
-                tag_ids = guide.tags.values_list('id', flat=True)
-                
-                # More complex query would need to be implemented in the repository
-                # For now, we'll just return guides of the same type if we have more time :)
-                
-            return related_guides
+            # Guides of the same type sharing the most tags, then the latest ones
+            return self.guide_repository.get_related_guides(guide, count=count)
             
         except Exception as e:
             print(f"Error retrieving related guides: {e}")
@@ -1,5 +1,10 @@
 import logging
+import math
 from datetime import date, timedelta
+from functools import reduce
+from operator import or_
+from django.core.exceptions import ValidationError
+from django.db import transaction
 from django.utils import timezone
 from django.shortcuts import get_object_or_404
 from django.utils.translation import gettext as _
@@ -12,12 +17,25 @@ from tinySteps.models import (
     VaccineCard_Model,
     Vaccine_Model
 )
+from tinySteps.repositories import CalendarEvent_Repository
+from tinySteps.services.core.dashboard_service import Dashboard_Service
+from tinySteps.services.core.growth_service import DAYS_PER_MONTH, Growth_Service
+from tinySteps.services.core.vaccine_schedule_service import VaccineSchedule_Service
 
 logger = logging.getLogger(__name__)
 
+# Vaccine fields a batch update may change
+VACCINE_BATCH_FIELDS = ('name', 'date', 'administered', 'next_dose_date', 'notes')
+
+# Keys of the growth indicators in the growth data sent to the charts
+GROWTH_KEYS = {'weight': 'weight', 'height': 'height', 'head_circumference': 'headCircumference'}
+
 class Child_Service:
     """Service for child-related operations"""
     
+    def __init__(self, event_repository=None):
+        self.event_repository = event_repository or CalendarEvent_Repository()
+    
     def get_children_for_user(self, user):
         """Get all children for a user"""
         return YourChild_Model.objects.filter(user=user).order_by('name')
@@ -97,14 +115,13 @@ class Child_Service:
     def get_event_statistics(self, child_id, user=None):
         """Get event statistics for a child"""
         child = self.get_child_by_id(child_id, user)
-        
-        return {
-            'doctor': CalendarEvent_Model.objects.filter(child=child, type='doctor').count(),
-            'vaccine': CalendarEvent_Model.objects.filter(child=child, type='vaccine').count(),
-            'milestone': CalendarEvent_Model.objects.filter(child=child, type='milestone').count(),
-            'feeding': CalendarEvent_Model.objects.filter(child=child, type='feeding').count(),
-            'other': CalendarEvent_Model.objects.filter(child=child, type='other').count(),
-        }
+        return self.event_repository.get_event_stats(child.id)
+    
+    def get_event_statistics_for_user(self, user):
+        """Get event statistics for every child of a user, keyed by child ID"""
+        return self.event_repository.get_event_stats_for_children(
+            YourChild_Model.objects.filter(user=user).values('pk')
+        )
     
     def get_upcoming_reminders(self, child_id, user=None, days=30, limit=5):
         """Get upcoming reminders for a child"""
@@ -324,52 +341,158 @@ class Child_Service:
     
     def batch_update_vaccines(self, child_id, user, updates):
         """
-        Batch update multiple vaccines
+        Batch update multiple vaccines in one transaction
+        
+        The whole batch is validated before anything is written: items with
+        invalid fields or unknown vaccines are reported and skipped, the
+        others are written together. The vaccines are loaded with one query
+        and saved with one bulk update; the calendar events of newly
+        administered vaccines (with create_event) are created, and those of
+        vaccines no longer administered deleted, in bulk.
         
         Args:
             child_id: ID of the child
             user: User performing the action
-            updates: List of dicts with vaccine_id and fields to update
+            updates: List of dicts with vaccine id and fields to update
         
         Returns:
-            dict: Summary of updates
+            dict: Summary of updates, with one result per item in order
         """
+        vaccine_card = self.get_or_create_vaccine_card(child_id, user)
+        items = [self._validate_vaccine_update(update) for update in updates]
+        
+        seen = set()
+        for item in items:
+            if item['id'] is None:
+                continue
+            if not item['errors'] and item['id'] in seen:
+                item['errors']['id'] = [_("Duplicate vaccine ID in batch")]
+            seen.add(item['id'])
+        
+        vaccines = Vaccine_Model.objects.filter(vaccine_card=vaccine_card).in_bulk(
+            [item['id'] for item in items if not item['errors']]
+        )
+        
+        changed = {}
+        changed_fields = set()
+        events_to_create = []
+        events_to_delete = []
+        for item in items:
+            if item['errors']:
+                continue
+            vaccine = vaccines.get(item['id'])
+            if vaccine is None:
+                item['errors']['id'] = [_("Vaccine not found")]
+                continue
+            
+            was_administered = vaccine.administered
+            previous = (vaccine.name, vaccine.date)
+            for field, value in item['changes'].items():
+                if getattr(vaccine, field) != value:
+                    setattr(vaccine, field, value)
+                    changed[vaccine.pk] = vaccine
+                    changed_fields.add(field)
+            item['status'] = 'updated' if vaccine.pk in changed else 'unchanged'
+            
+            if not was_administered and vaccine.administered and item['create_event']:
+                events_to_create.append(self._build_vaccine_event(vaccine_card.child, vaccine))
+                item['event'] = 'created'
+            elif was_administered and not vaccine.administered:
+                events_to_delete.append(previous)
+                item['event'] = 'deleted'
+        
+        try:
+            with transaction.atomic():
+                if changed:
+                    Vaccine_Model.objects.bulk_update(changed.values(), sorted(changed_fields))
+                if events_to_delete:
+                    CalendarEvent_Model.objects.filter(
+                        reduce(or_, (self._vaccine_event_filter(*previous) for previous in events_to_delete)),
+                        child=vaccine_card.child
+                    ).delete()
+                if events_to_create:
+                    CalendarEvent_Model.objects.bulk_create(events_to_create)
+        except Exception as e:
+            logger.error(f"Error updating vaccines of child {child_id}: {str(e)}")
+            raise
+        
+        # Bulk writes send no signals: drop the caches derived from the card here
+        if changed or events_to_create or events_to_delete:
+            Dashboard_Service().invalidate(vaccine_card.child.user_id)
+            VaccineSchedule_Service().invalidate(vaccine_card.child_id)
+        
         results = {
             'success': 0,
             'failed': 0,
-            'messages': []
+            'messages': [],
+            'results': []
         }
-        
-        for update in updates:
-            try:
-                vaccine_id = update.pop('id', None)
-                if not vaccine_id:
-                    results['failed'] += 1
-                    results['messages'].append(f"Missing vaccine ID in update")
-                    continue
-                
-                self.update_vaccine(vaccine_id, user, update)
-                results['success'] += 1
-                
-            except Exception as e:
+        for item in items:
+            if item['errors']:
                 results['failed'] += 1
-                results['messages'].append(f"Error updating vaccine {vaccine_id}: {str(e)}")
+                results['messages'].append(f"Error updating vaccine {item['id']}: {item['errors']}")
+                results['results'].append({'id': item['id'], 'status': 'failed', 'errors': item['errors']})
+            else:
+                results['success'] += 1
+                results['results'].append({'id': item['id'], 'status': item['status'], 'event': item['event']})
         
         return results
     
+    def _validate_vaccine_update(self, update):
+        """Clean the fields of one batch update with the model fields, collecting the errors"""
+        item = {'id': None, 'changes': {}, 'create_event': False, 'event': None, 'errors': {}}
+        if not isinstance(update, dict):
+            item['errors']['non_field_errors'] = [_("Each update must be an object")]
+            return item
+        
+        vaccine_id = update.get('id')
+        if vaccine_id is None:
+            item['errors']['id'] = [_("Missing vaccine ID in update")]
+        elif isinstance(vaccine_id, int) and not isinstance(vaccine_id, bool):
+            item['id'] = vaccine_id
+        elif isinstance(vaccine_id, str) and vaccine_id.strip().isascii() and vaccine_id.strip().isdigit():
+            item['id'] = int(vaccine_id)
+        else:
+            # Only integers are kept: the ID is hashed for duplicates and echoed in the results
+            item['errors']['id'] = [_("Invalid vaccine ID in update")]
+        
+        unknown = set(update) - {'id', 'create_event', *VACCINE_BATCH_FIELDS}
+        if unknown:
+            item['errors']['non_field_errors'] = [
+                _("Unknown fields: %(fields)s") % {'fields': ', '.join(sorted(unknown))}
+            ]
+        
+        for field in VACCINE_BATCH_FIELDS:
+            if field not in update:
+                continue
+            try:
+                item['changes'][field] = Vaccine_Model._meta.get_field(field).clean(update[field], None)
+            except ValidationError as e:
+                item['errors'][field] = e.messages
+        
+        item['create_event'] = update.get('create_event') in (True, 'true', 'True', '1', 1)
+        return item
+    
+    def _build_vaccine_event(self, child, vaccine):
+        """Build the (unsaved) calendar event of an administered vaccine"""
+        return CalendarEvent_Model(
+            child=child,
+            title=_("Vaccination: %(name)s") % {'name': vaccine.name},
+            type='vaccine',
+            date=vaccine.date,
+            time=None,
+            description=vaccine.notes if vaccine.notes else _("Vaccine administered"),
+            has_reminder=False
+        )
+    
+    def _vaccine_event_filter(self, name, event_date):
+        """Condition matching the calendar events of a vaccine"""
+        return Q(type='vaccine', date=event_date, title__contains=name)
+    
     def _create_vaccine_event(self, child_id, user, vaccine):
         """Create a calendar event for an administered vaccine"""
-        event_data = {
-            'title': _("Vaccination: %(name)s") % {'name': vaccine.name},
-            'type': 'vaccine',
-            'date': vaccine.date,
-            'time': None,
-            'description': vaccine.notes if vaccine.notes else _("Vaccine administered"),
-            'has_reminder': False
-        }
-        
         try:
-            self.add_calendar_event(child_id, user, event_data)
+            self._build_vaccine_event(self.get_child_by_id(child_id, user), vaccine).save()
             return True
         except Exception as e:
             logger.error(f"Error creating calendar event for vaccine: {str(e)}")
@@ -380,10 +503,8 @@ class Child_Service:
         try:
             # Find events with matching title and date
             events = CalendarEvent_Model.objects.filter(
-                child=vaccine.vaccine_card.child,
-                type='vaccine',
-                date=vaccine.date,
-                title__contains=vaccine.name
+                self._vaccine_event_filter(vaccine.name, vaccine.date),
+                child=vaccine.vaccine_card.child
             )
             
             if events.exists():
@@ -396,63 +517,73 @@ class Child_Service:
     
     def get_recommended_vaccines(self, child_id, user):
         """
-        Get recommended vaccines based on child's age
+        Get the overdue and recommended doses of a child, earliest first,
+        taking the vaccines already recorded on their card into account
         """
         child = self.get_child_by_id(child_id, user)
-        today = timezone.now().date()
-        
-        # Calculate child's age in months
         if not child.birth_date:
             return []
-            
-        birth_date = child.birth_date
-        age_days = (today - birth_date).days
-        age_months = age_days // 30
-        recommendations = []
-        
-        if age_months <= 2:
-            recommendations.append({
-                'name': 'Hepatitis B (HepB)',
-                'recommended_age': '0-2 months'
-            })
-            
-        if 2 <= age_months <= 4:
-            recommendations.extend([
-                {'name': 'Diphtheria, Tetanus, & Pertussis (DTaP)', 'recommended_age': '2 months'},
-                {'name': 'Polio (IPV)', 'recommended_age': '2 months'},
-                {'name': 'Pneumococcal (PCV13)', 'recommended_age': '2 months'},
-                {'name': 'Rotavirus (RV)', 'recommended_age': '2 months'}
-            ])
-            
-        if 4 <= age_months <= 6:
-            recommendations.extend([
-                {'name': 'Diphtheria, Tetanus, & Pertussis (DTaP) - 2nd dose', 'recommended_age': '4 months'},
-                {'name': 'Polio (IPV) - 2nd dose', 'recommended_age': '4 months'},
-                {'name': 'Pneumococcal (PCV13) - 2nd dose', 'recommended_age': '4 months'},
-                {'name': 'Rotavirus (RV) - 2nd dose', 'recommended_age': '4 months'}
-            ])
-        
-        
-        return recommendations
+
+        schedule = VaccineSchedule_Service().get_child_schedule(child)
+        return sorted(schedule['overdue'] + schedule['recommended'], key=lambda dose: dose['due_date'])
+
+    def get_vaccine_schedule(self, child_id, user):
+        """
+        Get the full schedule of a child: overdue, recommended and upcoming
+        doses, completed vaccines and recorded vaccines outside the schedule
+        """
+        child = self.get_child_by_id(child_id, user)
+        return VaccineSchedule_Service().get_child_schedule(child)
     
     # ===== Growth Data Methods =====
     def get_growth_data(self, child_id, user):
-        """Get growth data for a child"""
+        """
+        Get the growth measurements of a child with their WHO z-scores and
+        percentiles, and the percentile curves of the child's sex and age range
+        """
         child = self.get_child_by_id(child_id, user)
+        today = timezone.now().date()
+        growth = Growth_Service()
+        
+        measurements = growth.score_series(child.gender, child.birth_date, list(
+            child.measurements.order_by('date').values('date', *GROWTH_KEYS)
+        ))
+        
+        def at_birth(indicator):
+            return next((m[indicator] for m in measurements if m['date'] == child.birth_date), None)
+        
+        def latest(indicator):
+            return next((m[indicator] for m in reversed(measurements) if m[indicator] is not None), None)
         
-        estimated_birth_weight = 3.5
-        estimated_birth_height = 50.0
+        # Curves span whole years up to the standards' 5 years, so few ranges are ever cached
+        age_months = (today - child.birth_date).days / DAYS_PER_MONTH
+        end_month = min(60, max(24, 12 * math.ceil(age_months / 12)))
         
-        # Basic data structure
         data = {
-            'birthWeight': estimated_birth_weight,
-            'currentWeight': child.weight or 0.0,
-            'birthHeight': estimated_birth_height,
-            'currentHeight': child.height or 0.0,
+            'birthWeight': at_birth('weight'),
+            'currentWeight': latest('weight') or child.weight or 0.0,
+            'birthHeight': at_birth('height'),
+            'currentHeight': latest('height') or child.height or 0.0,
             'birthDate': child.birth_date.strftime('%Y-%m-%d') if child.birth_date else None,
-            'currentDate': timezone.now().strftime('%Y-%m-%d'),
+            'currentDate': today.strftime('%Y-%m-%d'),
             'gender': child.gender,
-            'ageMonths': child.age
+            'ageMonths': child.age,
+            'measurements': [
+                {
+                    'date': m['date'].strftime('%Y-%m-%d'),
+                    'ageMonths': m['age_months'],
+                    **{
+                        f"{key}{suffix}": m[f"{indicator}{field}"]
+                        for indicator, key in GROWTH_KEYS.items()
+                        for field, suffix in (('', ''), ('_z', 'Z'), ('_percentile', 'Percentile'))
+                    }
+                }
+                for m in measurements
+            ],
+            'curves': {
+                key: growth.get_curves(indicator, child.gender, 0, end_month)
+                for indicator, key in GROWTH_KEYS.items()
+            }
         }
         
         return data
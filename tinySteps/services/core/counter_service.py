@@ -0,0 +1,93 @@
+import logging
+from django.db import transaction
+from django.db.models import Count, F, Q
+
+from tinySteps.models import ForumCategoryCount_Model, Guides_Model, ParentsForum_Model
+from tinySteps.repositories import Forum_Repository
+from tinySteps.repositories.content.comment_repository import Comment_Repository
+
+logger = logging.getLogger(__name__)
+
+class Counter_Service:
+    """Service for repairing the denormalized like, comment and category counters
+
+    The counters are moved incrementally on every write; reconciliation
+    recomputes them from the source rows in primary-key batches and rewrites
+    only the rows that drifted.
+    """
+
+    BATCH_SIZE = 500
+
+    def reconcile(self, batch_size=None):
+        """Repair every counter, returning the number of fixed rows per counter"""
+        batch_size = batch_size or self.BATCH_SIZE
+        comments = Comment_Repository()
+
+        repaired = {
+            'forum_posts': self._reconcile_rows(
+                ParentsForum_Model,
+                {
+                    'likes_count': Forum_Repository().get_likes_count_subquery(),
+                    'comments_count': comments.get_count_subquery(ParentsForum_Model),
+                },
+                batch_size
+            ),
+            'guides': self._reconcile_rows(
+                Guides_Model,
+                {'comments_count': comments.get_count_subquery(Guides_Model)},
+                batch_size
+            ),
+            'categories': self._reconcile_categories(),
+        }
+        logger.info(f"Counter reconciliation: {repaired}")
+
+        return repaired
+
+    def _reconcile_rows(self, model, expressions, batch_size):
+        """Private method to rewrite the counters of rows whose stored value differs from the actual one"""
+        actual = {f'actual_{field}': expression for field, expression in expressions.items()}
+        drifted = Q()
+        for field in expressions:
+            drifted |= ~Q(**{field: F(f'actual_{field}')})
+
+        repaired = 0
+        last_pk = 0
+        while True:
+            batch = list(
+                model._base_manager.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:batch_size]
+            )
+            if not batch:
+                return repaired
+            last_pk = batch[-1]
+
+            with transaction.atomic():
+                rows = list(
+                    model._base_manager.filter(pk__in=batch).annotate(**actual).filter(drifted)
+                    .select_for_update().only('pk', *expressions)
+                )
+                for row in rows:
+                    for field in expressions:
+                        setattr(row, field, getattr(row, f'actual_{field}'))
+                model._base_manager.bulk_update(rows, list(expressions))
+            repaired += len(rows)
+
+    def _reconcile_categories(self):
+        """Private method to recount the posts of every category"""
+        actual = dict(
+            ParentsForum_Model.objects.order_by().values_list('category').annotate(total=Count('pk'))
+        )
+        stored = ForumCategoryCount_Model.objects.as_dict()
+        categories = {value for value, _ in ParentsForum_Model.CATEGORY_CHOICES} | set(actual) | set(stored)
+        drifted = [
+            ForumCategoryCount_Model(category=category, posts_count=actual.get(category, 0))
+            for category in sorted(categories)
+            if stored.get(category) != actual.get(category, 0)
+        ]
+
+        ForumCategoryCount_Model.objects.bulk_create(
+            drifted,
+            update_conflicts=True,
+            unique_fields=['category'],
+            update_fields=['posts_count']
+        )
+        return len(drifted)
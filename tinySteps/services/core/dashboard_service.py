@@ -0,0 +1,90 @@
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from tinySteps.models import (
+    YourChild_Model,
+    Milestone_Model,
+    CalendarEvent_Model,
+    Vaccine_Model
+)
+from tinySteps.utils.helpers.cache_helper import QUERY_CACHE, get_cache
+
+cache = get_cache(QUERY_CACHE)
+
+class Dashboard_Service:
+    """Service for the per-user statistics shown on the children dashboard"""
+
+    CACHE_PREFIX = "dashboard_stats_"
+    CACHE_DURATION = 600  # 10 minutes
+    UPCOMING_EVENT_DAYS = 7
+    RECENT_MILESTONE_DAYS = 30
+
+    def get_user_statistics(self, user):
+        """Get dashboard statistics for a user, served from cache when possible"""
+        cache_key = self._get_cache_key(user.pk)
+        stats = cache.get(cache_key)
+
+        if stats is None:
+            stats = self._compute_statistics(user.pk)
+            cache.set(cache_key, stats, self.CACHE_DURATION)
+
+        return stats
+
+    def invalidate(self, user_id):
+        """Drop the cached statistics of a user"""
+        cache.delete(self._get_cache_key(user_id))
+
+    def _compute_statistics(self, user_id):
+        """Compute every dashboard counter with a single query on the user row"""
+        today = timezone.now().date()
+
+        row = User.objects.filter(pk=user_id).annotate(
+            total_children=self._count(
+                YourChild_Model.objects.all(), 'user'
+            ),
+            total_vaccines=self._count(
+                Vaccine_Model.objects.all(), 'vaccine_card__child__user'
+            ),
+            vaccines_up_to_date=self._count(
+                Vaccine_Model.objects.filter(administered=True), 'vaccine_card__child__user'
+            ),
+            upcoming_events=self._count(
+                CalendarEvent_Model.objects.filter(
+                    date__gte=today,
+                    date__lte=today + timedelta(days=self.UPCOMING_EVENT_DAYS)
+                ),
+                'child__user'
+            ),
+            recent_milestones=self._count(
+                Milestone_Model.objects.filter(
+                    achieved_date__gte=today - timedelta(days=self.RECENT_MILESTONE_DAYS)
+                ),
+                'child__user'
+            ),
+        ).values(
+            'total_children', 'total_vaccines', 'vaccines_up_to_date',
+            'upcoming_events', 'recent_milestones'
+        ).first()
+
+        return row or {
+            'total_children': 0,
+            'total_vaccines': 0,
+            'vaccines_up_to_date': 0,
+            'upcoming_events': 0,
+            'recent_milestones': 0,
+        }
+
+    @staticmethod
+    def _count(queryset, user_field):
+        """Correlated COUNT subquery of queryset rows owned by the outer user"""
+        counts = queryset.filter(
+            **{user_field: OuterRef('pk')}
+        ).order_by().values(user_field).annotate(total=Count('pk')).values('total')
+
+        return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+    def _get_cache_key(self, user_id):
+        return f"{self.CACHE_PREFIX}{user_id}"
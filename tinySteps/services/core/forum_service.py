@@ -1,7 +1,6 @@
 from django.contrib.contenttypes.models import ContentType
-from tinySteps.models import ParentsForum_Model, Comment_Model
+from tinySteps.models import ForumCategoryCount_Model, ParentsForum_Model, Comment_Model
 from tinySteps.repositories import Forum_Repository
-from django.db.models import Count
 
 class Forum_Service:
     """Service for forum operations"""
@@ -24,7 +23,7 @@ class Forum_Service:
         elif category:
             posts = self.repository.get_posts_by_category(category)
         else:
-            posts = self.repository.get_latest_posts(limit=100)
+            posts = self.repository.get_latest_posts(limit=None)
             
         return posts
     
@@ -32,19 +31,17 @@ class Forum_Service:
         """Get a specific post by ID"""
         return self.repository.get_post_by_id(post_id)
     
+    def get_popular_posts(self, days=7, limit=5):
+        """Get the hottest posts, ranked by the precomputed hot score"""
+        return self.repository.get_popular_posts(days=days, limit=limit)
+    
     def get_categories(self):
         """Get all forum categories"""
         return ParentsForum_Model.CATEGORY_CHOICES
     
     def get_category_counts(self):
         """Get counts of posts for each category"""
-        counts = {}
-        categories = ParentsForum_Model.objects.values('category').annotate(count=Count('id'))
-        
-        for item in categories:
-            counts[item['category']] = item['count']
-            
-        return counts
+        return ForumCategoryCount_Model.objects.as_dict()
     
     # Post manipulation methods
     def create_post(self, user, title, desc, category):
@@ -73,15 +70,8 @@ class Forum_Service:
     
     # Interaction methods
     def toggle_like(self, post_id, user):
-        """Toggle like for a post"""
-        post = self.get_post(post_id)
-        
-        if post.likes.filter(id=user.id).exists():
-            post.likes.remove(user)
-            return False  # Unliked
-        else:
-            post.likes.add(user)
-            return True  # Liked
+        """Toggle like for a post, returning whether it is now liked"""
+        return self.get_post(post_id).toggle_like(user)
     
     # Comment methods
     def get_post_comments(self, post_id):
@@ -0,0 +1,140 @@
+import json
+from functools import lru_cache
+
+import numpy as np
+from django.conf import settings
+
+from tinySteps.utils.helpers.cache_helper import QUERY_CACHE, get_cache
+
+cache = get_cache(QUERY_CACHE)
+
+DAYS_PER_MONTH = 30.4375
+INDICATORS = ('weight', 'height', 'head_circumference')
+
+# Indicators with a skewed distribution, whose extreme z-scores use the WHO restricted LMS method
+SKEWED_INDICATORS = ('weight',)
+
+# z-score of each percentile that may be drawn as a reference curve
+PERCENTILE_Z = {
+    1: -2.326348, 3: -1.880794, 5: -1.644854, 10: -1.281552, 15: -1.036433, 25: -0.674490,
+    50: 0.0, 75: 0.674490, 85: 1.036433, 90: 1.281552, 95: 1.644854, 97: 1.880794, 99: 2.326348,
+}
+
+class LMS_Table:
+    """LMS parameters of one indicator and sex, interpolated at any age in days"""
+
+    def __init__(self, rows):
+        rows = np.asarray(sorted(rows), dtype=float)
+        self.ages = rows[:, 0] * DAYS_PER_MONTH
+        self.l, self.m, self.s = rows[:, 1], rows[:, 2], rows[:, 3]
+
+    def at(self, age_days):
+        """L, M and S at each age, NaN outside the ages covered by the table"""
+        ages = np.asarray(age_days, dtype=float)
+        outside = (ages < self.ages[0]) | (ages > self.ages[-1]) | np.isnan(ages)
+        return tuple(
+            np.where(outside, np.nan, np.interp(ages, self.ages, column))
+            for column in (self.l, self.m, self.s)
+        )
+
+@lru_cache(maxsize=None)
+def load_reference(path):
+    """Read the LMS reference file once per process into ``{(indicator, sex): LMS_Table}``"""
+    with open(path, encoding='utf-8') as reference_file:
+        data = json.load(reference_file)
+    return {
+        (indicator, sex): LMS_Table(rows)
+        for indicator, tables in data['indicators'].items()
+        for sex, rows in tables.items() if sex in ('M', 'F')
+    }
+
+def normal_cdf(z):
+    """Standard normal CDF of an array (Abramowitz & Stegun 7.1.26, error below 1.5e-7)"""
+    z = np.asarray(z, dtype=float)
+    x = np.abs(z) / np.sqrt(2)
+    t = 1 / (1 + 0.3275911 * x)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    erf = 1 - poly * np.exp(-x * x)
+    return 0.5 * (1 + np.sign(z) * erf)
+
+def values_at(l, m, s, z):
+    """Measurement at z-score ``z`` of the LMS distribution"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(np.abs(l) < 1e-7, m * np.exp(s * z), m * np.power(1 + l * s * z, 1 / l))
+
+class Growth_Service:
+    """Service comparing children's measurements with the WHO growth standards
+
+    The LMS tables are read once per process into NumPy arrays, so the
+    z-scores and percentiles of a whole measurement series are computed in a
+    few array operations. Reference curves depend only on the sex and the
+    age range, and are cached per (indicator, sex, range) for every child.
+    """
+
+    CACHE_PREFIX = "growth_curves_"
+    CACHE_DURATION = 86400 * 7  # reference data, only changes with the file
+
+    def __init__(self, path=None):
+        self.options = settings.GROWTH_STANDARDS
+        self.tables = load_reference(str(path or self.options['FILE']))
+
+    def get_table(self, indicator, sex):
+        try:
+            return self.tables[(indicator, sex)]
+        except KeyError:
+            raise ValueError(f"No growth standard for {indicator} ({sex})")
+
+    def zscores(self, indicator, sex, age_days, values):
+        """z-scores of measurements taken at the given ages, NaN where unknown or out of range"""
+        l, m, s = self.get_table(indicator, sex).at(age_days)
+        x = np.asarray(values, dtype=float)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z = np.where(np.abs(l) < 1e-7, np.log(x / m) / s, (np.power(x / m, l) - 1) / (l * s))
+            if indicator in SKEWED_INDICATORS:
+                # Beyond +/-3 SD the distance is measured in units of the 2-3 SD band (WHO restricted method)
+                sd3, sd2 = values_at(l, m, s, 3), values_at(l, m, s, 2)
+                z = np.where(z > 3, 3 + (x - sd3) / (sd3 - sd2), z)
+                sd3, sd2 = values_at(l, m, s, -3), values_at(l, m, s, -2)
+                z = np.where(z < -3, -3 + (x - sd3) / (sd2 - sd3), z)
+        return z
+
+    def percentiles(self, indicator, sex, age_days, values):
+        """Percentiles (0-100) of measurements taken at the given ages"""
+        return 100 * normal_cdf(self.zscores(indicator, sex, age_days, values))
+
+    def score_series(self, sex, birth_date, measurements):
+        """Add the age, z-score and percentile of every indicator to a list of measurement dicts
+
+        Each indicator of the whole series is scored with one vectorized call.
+        """
+        ages = np.array([(measurement['date'] - birth_date).days for measurement in measurements], dtype=float)
+        scored = [
+            {**measurement, 'age_months': round(float(age) / DAYS_PER_MONTH, 1)}
+            for measurement, age in zip(measurements, ages)
+        ]
+        for indicator in INDICATORS:
+            values = [measurement.get(indicator) for measurement in measurements]
+            values = np.array([np.nan if value is None else value for value in values], dtype=float)
+            z = self.zscores(indicator, sex, ages, values)
+            percentiles = 100 * normal_cdf(z)
+            for measurement, score, percentile in zip(scored, z, percentiles):
+                known = not np.isnan(score)
+                measurement[f'{indicator}_z'] = round(float(score), 2) if known else None
+                measurement[f'{indicator}_percentile'] = round(float(percentile), 1) if known else None
+        return scored
+
+    def get_curves(self, indicator, sex, start_month=0, end_month=60, percentiles=None):
+        """Reference curves of an indicator: ``{'ages': [months], 'P50': [values], ...}``"""
+        percentiles = tuple(percentiles or self.options['PERCENTILES'])
+        cache_key = f"{self.CACHE_PREFIX}{indicator}_{sex}_{start_month}_{end_month}_{'-'.join(map(str, percentiles))}"
+        curves = cache.get(cache_key)
+        if curves is None:
+            months = np.arange(start_month, end_month + 1, self.options['CURVE_STEP_MONTHS'], dtype=float)
+            l, m, s = self.get_table(indicator, sex).at(months * DAYS_PER_MONTH)
+            curves = {'ages': months.tolist()}
+            for percentile in percentiles:
+                values = values_at(l, m, s, PERCENTILE_Z[percentile])
+                curves[f'P{percentile}'] = [None if np.isnan(value) else round(float(value), 2) for value in values]
+            cache.set(cache_key, curves, self.CACHE_DURATION)
+        return curves
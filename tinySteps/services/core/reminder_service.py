@@ -0,0 +1,99 @@
+import logging
+from datetime import timedelta
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import formats, timezone
+from django.utils.translation import gettext as _
+
+from tinySteps.models import CalendarEvent_Model, Notification_Model
+from tinySteps.services.tasks.task_queue_service import TaskQueue_Service, email_payload
+
+logger = logging.getLogger(__name__)
+
+class Reminder_Service:
+    """Service sending the due reminders of calendar events
+
+    Reminders are found through the precomputed ``remind_at`` and its partial
+    index on unsent reminders, so a run never scans the events table. Each
+    batch is claimed with ``SELECT ... FOR UPDATE SKIP LOCKED`` where the
+    database supports it, so several dispatchers can run side by side, and is
+    written with one insert of notifications, one insert of email tasks and one
+    update marking the batch sent. SQLite has no SKIP LOCKED, so run a
+    single dispatcher there.
+    """
+
+    def __init__(self, **options):
+        self.options = {**settings.CALENDAR_REMINDERS, **options}
+
+    def dispatch(self, now=None, batch_size=None):
+        """Send every reminder due at ``now``, batch after batch"""
+        now = now or timezone.now()
+        batch_size = batch_size or self.options['BATCH_SIZE']
+        totals = {'sent': 0, 'skipped': 0}
+
+        while True:
+            sent, skipped = self.dispatch_batch(now, batch_size)
+            totals['sent'] += sent
+            totals['skipped'] += skipped
+            if sent + skipped < batch_size:
+                return totals
+
+    def dispatch_batch(self, now, batch_size):
+        """Claim, notify and mark sent one batch of due reminders, returning (sent, skipped)"""
+        due = CalendarEvent_Model.objects.filter(
+            reminder_sent=False, remind_at__isnull=False, remind_at__lte=now
+        ).order_by('remind_at')
+
+        with transaction.atomic():
+            if connection.features.has_select_for_update_skip_locked:
+                # Reminders claimed by another dispatcher are skipped instead of waited for
+                due = due.select_for_update(skip_locked=True, of=('self',))
+            # Plain rows: building full model instances would dominate large batches
+            events = list(due.values(
+                'pk', 'title', 'date', 'time', 'is_all_day', 'remind_at',
+                'child__name', 'child__user_id', 'child__user__email'
+            )[:batch_size])
+            if not events:
+                return 0, 0
+
+            # Reminders too late to be useful (e.g. events created in the past) are only marked sent
+            too_late = now - timedelta(seconds=self.options['MAX_DELAY'])
+            to_send = [event for event in events if event['remind_at'] >= too_late]
+            messages = self.get_messages(to_send)
+
+            Notification_Model.objects.bulk_create([
+                Notification_Model(user_id=event['child__user_id'], message=messages[event['pk']])
+                for event in to_send
+            ])
+            subject = _("Reminder: {0}")
+            TaskQueue_Service().enqueue_many('send_email', [
+                (
+                    email_payload(subject.format(event['title']), messages[event['pk']], [event['child__user__email']]),
+                    f"event-reminder:{event['pk']}:{event['remind_at'].isoformat()}"
+                )
+                for event in to_send if event['child__user__email']
+            ])
+            # Guarded by remind_at so a reminder moved meanwhile stays due
+            CalendarEvent_Model.objects.filter(
+                pk__in=[event['pk'] for event in events], remind_at__lte=now
+            ).update(reminder_sent=True)
+
+        if len(events) > len(to_send):
+            logger.info(f"Skipped {len(events) - len(to_send)} reminders more than {self.options['MAX_DELAY']}s late")
+        return len(to_send), len(events) - len(to_send)
+
+    def get_messages(self, events):
+        """Text of the notification and email of each reminder, keyed by event ID"""
+        template = _("Reminder: {title} for {child} on {when}")
+        # Reminders due together mostly share their date and time: format each one once
+        moments = {}
+        messages = {}
+        for event in events:
+            moment = (event['date'], None if event['is_all_day'] else event['time'])
+            if moment not in moments:
+                when = formats.date_format(moment[0], 'DATE_FORMAT')
+                if moment[1]:
+                    when = f"{when} {formats.time_format(moment[1], 'TIME_FORMAT')}"
+                moments[moment] = when
+            messages[event['pk']] = template.format(title=event['title'], child=event['child__name'], when=moments[moment])
+        return messages
@@ -0,0 +1,241 @@
+import hashlib
+import json
+import re
+from datetime import date
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from tinySteps.models import VaccineSchedule_Model, Vaccine_Model, YourChild_Model
+from tinySteps.utils.helpers.age_helper import format_age_display
+from tinySteps.utils.helpers.cache_helper import QUERY_CACHE, get_cache
+
+cache = get_cache(QUERY_CACHE)
+
+OVERDUE = 'overdue'
+RECOMMENDED = 'recommended'
+UPCOMING = 'upcoming'
+
+# Day ordinals standing in for "no previous dose" and "no maximum age"
+_NO_DOSE = -10 ** 9
+_NO_LIMIT = 10 ** 9
+
+_NON_ALPHANUMERIC = re.compile(r'[^0-9a-z]+')
+
+def normalize_vaccine_name(name):
+    """Lowercase a vaccine name and reduce its punctuation to single spaces, e.g. ``DTaP-IPV`` -> ``dtap ipv``"""
+    return _NON_ALPHANUMERIC.sub(' ', (name or '').lower()).strip()
+
+class VaccineSchedule_Service:
+    """Service projecting the recommended vaccine schedule onto the children's vaccine cards
+
+    The schedule (one row per dose: minimum and maximum age, interval from
+    the previous dose) is read from VaccineSchedule_Model. Recorded vaccines
+    are matched to schedule vaccines through their aliases, so a combined
+    vaccine such as "Hexavalent" counts for every vaccine it covers. The due
+    date of the next dose of every vaccine is computed with NumPy for all the
+    children at once: two queries and array arithmetic, whatever the number
+    of children.
+    """
+
+    CACHE_PREFIX = "vaccine_schedule_"
+    CACHE_DURATION = 86400  # 1 day, results are also keyed by date
+    TABLE_CACHE_KEY = "vaccine_schedule_table"
+
+    def __init__(self, upcoming_days=None):
+        self.upcoming_days = upcoming_days or settings.VACCINE_SCHEDULE['UPCOMING_DAYS']
+
+    # ===== Schedule table =====
+    def load(self, path=None):
+        """Replace the schedule with the content of a JSON data file, returning the number of doses"""
+        with open(path or settings.VACCINE_SCHEDULE['FILE'], encoding='utf-8') as schedule_file:
+            data = json.load(schedule_file)
+
+        rows = [
+            VaccineSchedule_Model(
+                vaccine=vaccine['code'],
+                name=vaccine['name'],
+                aliases=[normalize_vaccine_name(alias) for alias in vaccine.get('aliases', [])],
+                dose=dose['dose'],
+                min_age_days=dose['min_age_days'],
+                max_age_days=dose.get('max_age_days'),
+                min_interval_days=dose.get('min_interval_days', 0)
+            )
+            for vaccine in data['vaccines']
+            for dose in vaccine['doses']
+        ]
+        with transaction.atomic():
+            VaccineSchedule_Model.objects.all().delete()
+            VaccineSchedule_Model.objects.bulk_create(rows)
+        self.invalidate_schedule()
+        return len(rows)
+
+    def get_schedule(self):
+        """Get the schedule grouped by vaccine, with a version identifying its content"""
+        schedule = cache.get(self.TABLE_CACHE_KEY)
+        if schedule is None:
+            vaccines = {}
+            for row in VaccineSchedule_Model.objects.order_by('vaccine', 'dose'):
+                vaccine = vaccines.setdefault(row.vaccine, {
+                    'code': row.vaccine,
+                    'name': row.name,
+                    'aliases': [normalize_vaccine_name(alias) for alias in [row.vaccine, *row.aliases]],
+                    'doses': [],
+                })
+                vaccine['doses'].append({
+                    'dose': row.dose,
+                    'min_age_days': row.min_age_days,
+                    'max_age_days': row.max_age_days,
+                    'min_interval_days': row.min_interval_days,
+                })
+            vaccines = list(vaccines.values())
+            schedule = {
+                'version': hashlib.sha1(json.dumps(vaccines, sort_keys=True).encode()).hexdigest()[:12],
+                'vaccines': vaccines,
+            }
+            cache.set(self.TABLE_CACHE_KEY, schedule, self.CACHE_DURATION)
+        return schedule
+
+    def invalidate_schedule(self):
+        """Drop the cached schedule table; child schedules are keyed by its version and expire with it"""
+        cache.delete(self.TABLE_CACHE_KEY)
+
+    # ===== Projection =====
+    def get_child_schedule(self, child, today=None):
+        """Get the overdue, recommended and upcoming doses of one child, cached until their card changes"""
+        today = today or timezone.now().date()
+        cache_key = self._get_cache_key(child.pk)
+        cached = cache.get(cache_key)
+        if cached is not None and cached['date'] == today:
+            return cached['schedule']
+
+        schedule = self.project(YourChild_Model.objects.filter(pk=child.pk), today).get(child.pk, self._empty())
+        cache.set(cache_key, {'date': today, 'schedule': schedule}, self.CACHE_DURATION)
+        return schedule
+
+    def invalidate(self, child_id):
+        """Drop the cached schedule of a child"""
+        cache.delete(self._get_cache_key(child_id))
+
+    def project(self, children=None, today=None):
+        """Project the schedule onto every child of a queryset (all children by default) in one pass
+
+        Returns ``{child_id: {'overdue': [...], 'recommended': [...],
+        'upcoming': [...], 'completed': [...], 'unmatched': [...]}}`` where
+        each dose lists its vaccine, dose number, due and late dates and the
+        date of a recorded but not yet administered vaccine planned for it.
+        """
+        today = today or timezone.now().date()
+        children = YourChild_Model.objects.all() if children is None else children
+        vaccines = self.get_schedule()['vaccines']
+
+        rows = [(pk, birth_date) for pk, birth_date in children.values_list('pk', 'birth_date') if birth_date]
+        if not rows:
+            return {}
+        child_ids = [pk for pk, _ in rows]
+        position = {pk: index for index, pk in enumerate(child_ids)}
+        results = {pk: self._empty() for pk in child_ids}
+        if not vaccines:
+            return results
+
+        # Doses given and date of the last one, per child and vaccine
+        given = np.zeros((len(rows), len(vaccines)), dtype=np.int64)
+        last_dose = np.full((len(rows), len(vaccines)), _NO_DOSE, dtype=np.int64)
+        planned = {}
+        matcher = self._get_matcher(vaccines)
+        records = Vaccine_Model.objects.filter(
+            vaccine_card__child__in=child_ids
+        ).values_list('vaccine_card__child_id', 'name', 'date', 'administered').order_by('date', 'pk')
+
+        for child_id, name, given_on, administered in records:
+            matches = matcher(name)
+            if not matches:
+                results[child_id]['unmatched'].append(name)
+            for column in matches:
+                if administered:
+                    given[position[child_id], column] += 1
+                    last_dose[position[child_id], column] = given_on.toordinal()
+                else:
+                    planned.setdefault((child_id, column), given_on)
+
+        # Requirements of the next dose of every (child, vaccine) pair
+        min_age, max_age, interval, dose_counts = self._get_arrays(vaccines)
+        complete = given >= dose_counts
+        next_dose = np.minimum(given, min_age.shape[1] - 1)
+        columns = np.arange(len(vaccines))[np.newaxis, :]
+        births = np.array([birth_date.toordinal() for _, birth_date in rows], dtype=np.int64)[:, np.newaxis]
+
+        due = np.maximum(births + min_age[columns, next_dose], last_dose + interval[columns, next_dose])
+        late = births + max_age[columns, next_dose]
+        day = today.toordinal()
+
+        overdue = ~complete & (day > late)
+        recommended = ~complete & ~overdue & (day >= due)
+        upcoming = ~complete & (due > day) & (due <= day + self.upcoming_days)
+
+        for status, mask in ((OVERDUE, overdue), (RECOMMENDED, recommended), (UPCOMING, upcoming)):
+            for row, column in zip(*np.nonzero(mask)):
+                child_id = child_ids[row]
+                dose = vaccines[column]['doses'][next_dose[row, column]]
+                results[child_id][status].append({
+                    'vaccine': vaccines[column]['code'],
+                    'name': vaccines[column]['name'],
+                    'dose': dose['dose'],
+                    'status': status,
+                    'due_date': date.fromordinal(int(due[row, column])),
+                    'late_date': date.fromordinal(int(late[row, column])) if dose['max_age_days'] is not None else None,
+                    'recommended_age': format_age_display(round(dose['min_age_days'] / 30.4375)),
+                    'planned_date': planned.get((child_id, column)),
+                })
+        for row, column in zip(*np.nonzero(complete)):
+            results[child_ids[row]]['completed'].append(vaccines[column]['code'])
+
+        for result in results.values():
+            for status in (OVERDUE, RECOMMENDED, UPCOMING):
+                result[status].sort(key=lambda item: (item['due_date'], item['vaccine']))
+        return results
+
+    @staticmethod
+    def _get_arrays(vaccines):
+        """Private method to lay the schedule out as (vaccine, dose) arrays
+
+        A last column past every vaccine's final dose keeps the lookups of
+        completed vaccines in bounds.
+        """
+        width = max(len(vaccine['doses']) for vaccine in vaccines) + 1
+        min_age = np.zeros((len(vaccines), width), dtype=np.int64)
+        max_age = np.full((len(vaccines), width), _NO_LIMIT, dtype=np.int64)
+        interval = np.zeros((len(vaccines), width), dtype=np.int64)
+        for column, vaccine in enumerate(vaccines):
+            for index, dose in enumerate(vaccine['doses']):
+                min_age[column, index] = dose['min_age_days']
+                if dose['max_age_days'] is not None:
+                    max_age[column, index] = dose['max_age_days']
+                interval[column, index] = dose['min_interval_days']
+        dose_counts = np.array([len(vaccine['doses']) for vaccine in vaccines], dtype=np.int64)[np.newaxis, :]
+        return min_age, max_age, interval, dose_counts
+
+    @staticmethod
+    def _get_matcher(vaccines):
+        """Private method to build a function mapping a recorded name to the schedule vaccines it covers"""
+        patterns = [
+            re.compile(r'\b(?:' + '|'.join(re.escape(alias) for alias in vaccine['aliases'] if alias) + r')\b')
+            for vaccine in vaccines
+        ]
+        matches = {}
+
+        def match(name):
+            normalized = normalize_vaccine_name(name)
+            if normalized not in matches:
+                matches[normalized] = [column for column, pattern in enumerate(patterns) if pattern.search(normalized)]
+            return matches[normalized]
+        return match
+
+    @staticmethod
+    def _empty():
+        return {OVERDUE: [], RECOMMENDED: [], UPCOMING: [], 'completed': [], 'unmatched': []}
+
+    def _get_cache_key(self, child_id):
+        return f"{self.CACHE_PREFIX}{child_id}_{self.get_schedule()['version']}"
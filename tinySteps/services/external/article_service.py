@@ -1,13 +1,20 @@
-from datetime import datetime
-from django.core.cache import cache
-from django.db.models import Q
+import logging
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from tinySteps.models import ExternalArticle_Model
+from tinySteps.repositories import Article_Repository
+from tinySteps.utils.helpers.cache_helper import QUERY_CACHE, get_cache
+
+logger = logging.getLogger(__name__)
+cache = get_cache(QUERY_CACHE)
 
 class Article_Service:
     """Service for managing external articles"""
     
     CACHE_PREFIX = "articles_"
     CACHE_DURATION = 3600  # 1 hour
+    UPSERT_BATCH_SIZE = 500
+    UPSERT_FIELDS = ['title', 'source_name', 'author', 'description', 'image_url', 'published_at', 'content']
     
     @staticmethod
     def get_articles_by_category(category, limit=None):
@@ -49,100 +56,131 @@ class Article_Service:
     
     @staticmethod
     def search_articles(query, category=None):
-        """Search articles by query string and optional category"""
-        search_query = Q(title__icontains=query) | Q(description__icontains=query)
-        
-        if category:
-            search_query &= Q(category=category)
-        
-        return ExternalArticle_Model.objects.filter(search_query).order_by('-published_at')
+        """Search articles by query string and optional category, best matches first"""
+        return Article_Repository().search_articles(query, category)
     
     @staticmethod
     def update_from_apis(topic=None):
-        """Update articles from external APIs"""
+        """Fetch articles from the external APIs and upsert them in one batch
+        
+        Returns the number of inserted, updated and skipped articles.
+        """
         from tinySteps.services.apis.news_service import NewsAPI_Service
         from tinySteps.services.apis.currents_service import CurrentsAPI_Service
         
         news_service = NewsAPI_Service()
         currents_service = CurrentsAPI_Service()
+        category = 'nutrition' if topic == 'nutrition' else 'parenting'
         
-        if topic:
+        if topic == 'nutrition':
+            articles = news_service.get_nutrition_articles(force_refresh=True)
+        elif topic:
             articles = news_service.get_parenting_articles_by_topic(topic, force_refresh=True)
-            news = currents_service.get_news_by_topic(topic, force_refresh=True)
         else:
             articles = news_service.get_parenting_articles(force_refresh=True)
-            news = currents_service.get_news_by_topic('nutrition', force_refresh=True)
+        news = currents_service.get_news_by_topic(topic or 'first_time', force_refresh=True)
         
-        if articles:
-            Article_Service._update_articles(articles)
-
-        if news:
-            Article_Service._update_news(news)
+        records = (
+            [Article_Service._normalize_newsapi(item, category) for item in (articles or {}).get('articles', [])] +
+            [Article_Service._normalize_currents(item, category) for item in (news or {}).get('news', [])]
+        )
+        counts = Article_Service.upsert_articles(records)
+        logger.info(f"Article ingestion: {counts}")
+        
+        return counts
+    
+    @staticmethod
+    def upsert_articles(records):
+        """Write normalized article records with a single upsert keyed on the URL"""
+        articles = {}
+        skipped = 0
+        
+        for record in records:
+            if not record or not record['url'] or not record['title'] or record['url'] in articles:
+                skipped += 1
+                continue
+            articles[record['url']] = ExternalArticle_Model(**record)
+        
+        if not articles:
+            return {'inserted': 0, 'updated': 0, 'skipped': skipped}
         
-        return True
+        existing = set(
+            ExternalArticle_Model.objects.filter(url__in=articles.keys()).values_list('url', flat=True)
+        )
+        ExternalArticle_Model.objects.bulk_create(
+            articles.values(),
+            batch_size=Article_Service.UPSERT_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=['url'],
+            update_fields=Article_Service.UPSERT_FIELDS
+        )
+        # bulk_create does not send post_save, index the batch here
+        from tinySteps.services.search.search_service import Search_Service
+        Search_Service().index_many(ExternalArticle_Model.objects.filter(url__in=articles.keys()))
+        
+        return {
+            'inserted': len(articles) - len(existing),
+            'updated': len(existing),
+            'skipped': skipped
+        }
+    
+    @staticmethod
+    def _normalize_newsapi(item, category):
+        """Private method to map a NewsAPI article to an ExternalArticle_Model record"""
+        if item.get('title') == '[Removed]':
+            return None
+        
+        return Article_Service._build_record(
+            title=item.get('title'),
+            source_name=(item.get('source') or {}).get('name'),
+            author=item.get('author'),
+            description=item.get('description'),
+            url=item.get('url'),
+            image_url=item.get('urlToImage'),
+            published_at=item.get('publishedAt'),
+            content=item.get('content'),
+            category=category
+        )
     
     @staticmethod
-    def _update_articles(articles):
-        """Private method to update articles from NewsAPI"""
-        for article in articles:
-            try:
-                # Extract relevant data
-                title = article.get('title', '')
-                source = article.get('source', {}).get('name', 'Unknown')
-                url = article.get('url', '')
-                published_at_str = article.get('publishedAt', '')
-                
-                # Parse the date
-                if published_at_str:
-                    try:
-                        published_at = datetime.fromisoformat(published_at_str.replace('Z', '+00:00'))
-                    except ValueError:
-                        published_at = datetime.now()
-                else:
-                    published_at = datetime.now()
-                
-                # Create or update the article
-                ExternalArticle_Model.objects.update_or_create(
-                    url=url,
-                    defaults={
-                        'title': title,
-                        'source': source,
-                        'published_at': published_at,
-                        'api_source': 'NewsAPI'
-                    }
-                )
-            except Exception as e:
-                print(f"Error updating article: {e}")
+    def _normalize_currents(item, category):
+        """Private method to map a Currents news item to an ExternalArticle_Model record"""
+        return Article_Service._build_record(
+            title=item.get('title'),
+            source_name='Currents',
+            author=item.get('author'),
+            description=item.get('description'),
+            url=item.get('url'),
+            image_url=item.get('image') if item.get('image') != 'None' else None,
+            published_at=item.get('published'),
+            content=None,
+            category=category
+        )
     
     @staticmethod
-    def _update_news(news_items):
-        """Private method to update news from CurrentsAPI"""
-        for item in news_items:
-            try:
-                # Extract relevant data
-                title = item.get('title', '')
-                source = item.get('author', 'Unknown')
-                url = item.get('url', '')
-                published_at_str = item.get('published', '')
-                
-                # Parse the date
-                if published_at_str:
-                    try:
-                        published_at = datetime.fromisoformat(published_at_str.replace('Z', '+00:00'))
-                    except ValueError:
-                        published_at = datetime.now()
-                else:
-                    published_at = datetime.now()
-                
-                # Create or update the article
-                ExternalArticle_Model.objects.update_or_create(
-                    url=url,
-                    defaults={
-                        'title': title,
-                        'source': source,
-                        'published_at': published_at,
-                        'api_source': 'CurrentsAPI'
-                    }
-                )
-            except Exception as e:
-                print(f"Error updating news item: {e}")
\ No newline at end of file
+    def _build_record(title, source_name, author, description, url, image_url, published_at, content, category):
+        """Private method to clean the values of an article record"""
+        try:
+            published = parse_datetime(published_at) if published_at else None
+        except ValueError:
+            published = None
+        if published is None:
+            published = timezone.now()
+        elif timezone.is_naive(published):
+            published = timezone.make_aware(published)
+        
+        url = (url or '').strip()
+        max_url = ExternalArticle_Model._meta.get_field('url').max_length
+        max_image_url = ExternalArticle_Model._meta.get_field('image_url').max_length
+        
+        return {
+            'title': (title or '').strip()[:255],
+            'source_name': (source_name or 'Unknown')[:100],
+            'author': author[:100] if author else None,
+            'description': description,
+            'url': url if len(url) <= max_url else '',  # Truncated URLs are useless, skip them
+            'image_url': image_url if image_url and len(image_url) <= max_image_url else None,
+            'published_at': published,
+            'content': content,
+            'category': category
+        }
@@ -1,54 +1,186 @@
-from django.core.cache import cache
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import partial
 from tinySteps.models import ExternalNutritionData_Model
+from tinySteps.models.external.nutrition_models import normalize_ingredient
+from tinySteps.utils.helpers.cache_helper import EXTERNAL_API_CACHE, LRU_Cache, Single_Flight, get_cache
+
+logger = logging.getLogger(__name__)
+cache = get_cache(EXTERNAL_API_CACHE)
 
 class NutritionData_Service:
-    """Service for accessing nutrition data"""
-    
+    """Service for accessing nutrition data
+
+    Ingredients are looked up by their normalized key (see normalize_ingredient)
+    through an in-process LRU, the shared cache, the database and finally the
+    Edamam API. Concurrent misses for the same key are resolved only once.
+    """
+
     CACHE_PREFIX = "nutrition_data_"
     CACHE_DURATION = 86400  # 24 hours
-    
+    FETCH_WORKERS = 5
+    FETCH_DEADLINE = 8  # seconds to wait for the API before returning partial results
+
+    local_cache = LRU_Cache(maxsize=512, ttl=300)
+    single_flight = Single_Flight()
+
     @staticmethod
     def get_ingredient_data(ingredient):
         """Get nutrition data for an ingredient"""
-        cache_key = f"{NutritionData_Service.CACHE_PREFIX}{ingredient.lower()}"
-        cached_data = cache.get(cache_key)
-        
-        if cached_data:
-            return cached_data
-        
-        # Try to get from database
-        try:
-            nutrition_data = ExternalNutritionData_Model.objects.get(ingredient__iexact=ingredient)
-            cache.set(cache_key, nutrition_data.data, NutritionData_Service.CACHE_DURATION)
-            return nutrition_data.data
-        except ExternalNutritionData_Model.DoesNotExist:
-            from tinySteps.services.apis.edamam_service import EdamamAPI_Service
-            api_service = EdamamAPI_Service()
-            data = api_service.get_nutrition_data(ingredient, force_refresh=True)  # We force refresh to avoid infinite recursion
-            
-            # We dont need to store in DB since the API service already does that
-            if data and data.get('totalNutrients'):
-                return data
+        key = normalize_ingredient(ingredient)
+        if not key:
             return None
-    
+
+        data = NutritionData_Service.local_cache.get(key)
+        if data is None:
+            data = NutritionData_Service.single_flight.do(
+                key, partial(NutritionData_Service._resolve, key)
+            )
+
+        return data
+
+    @staticmethod
+    def get_ingredients_data(ingredients, deadline=None):
+        """Get nutrition data for several ingredients at once
+
+        Cached ingredients are read with one get_many, the rest with one database
+        query, and the remaining misses are fetched from the API concurrently.
+        Ingredients the API does not answer before the deadline map to None.
+        """
+        ingredients = list(dict.fromkeys(i.strip() for i in ingredients if i and i.strip()))
+        keys = {ingredient: normalize_ingredient(ingredient) for ingredient in ingredients}
+        found = {}
+
+        for key in set(keys.values()):
+            data = NutritionData_Service.local_cache.get(key)
+            if data is not None:
+                found[key] = data
+
+        missing = [key for key in set(keys.values()) if key not in found]
+        if missing:
+            cached = cache.get_many(NutritionData_Service._cache_key(key) for key in missing)
+            found.update({key: cached[NutritionData_Service._cache_key(key)]
+                          for key in missing if NutritionData_Service._cache_key(key) in cached})
+            missing = [key for key in missing if key not in found]
+
+        if missing:
+            stored = dict(ExternalNutritionData_Model.objects.filter(
+                normalized_ingredient__in=missing
+            ).values_list('normalized_ingredient', 'data'))
+            NutritionData_Service._cache_many(stored)
+            found.update(stored)
+            missing = [key for key in missing if key not in stored]
+
+        if missing:
+            fetched = NutritionData_Service._fetch_from_api(
+                missing, deadline or NutritionData_Service.FETCH_DEADLINE
+            )
+            NutritionData_Service._store_fetched_data(fetched)
+            found.update(fetched)
+
+        for key, data in found.items():
+            NutritionData_Service.local_cache.set(key, data)
+
+        return {ingredient: found.get(key) for ingredient, key in keys.items()}
+
     @staticmethod
     def update_ingredient_data(ingredient, data):
         """Update or create nutrition data for an ingredient"""
+        key = normalize_ingredient(ingredient)
         obj, _ = ExternalNutritionData_Model.objects.update_or_create(
-            ingredient__iexact=ingredient,
+            normalized_ingredient=key,
             defaults={
                 'ingredient': ingredient,
                 'data': data
             }
         )
-        
+
         # Update cache
-        cache_key = f"{NutritionData_Service.CACHE_PREFIX}{ingredient.lower()}"
-        cache.set(cache_key, data, NutritionData_Service.CACHE_DURATION)
-        
+        NutritionData_Service._cache_many({key: data})
+        NutritionData_Service.local_cache.set(key, data)
+
         return obj
-    
+
     @staticmethod
     def get_all_ingredients():
         """Get all available ingredients"""
-        return ExternalNutritionData_Model.objects.values_list('ingredient', flat=True)
\ No newline at end of file
+        return ExternalNutritionData_Model.objects.values_list('ingredient', flat=True)
+
+    @staticmethod
+    def _resolve(key):
+        """Private method to resolve one normalized key from the shared cache, the database or the API"""
+        data = cache.get(NutritionData_Service._cache_key(key))
+
+        if data is None:
+            data = ExternalNutritionData_Model.objects.filter(
+                normalized_ingredient=key
+            ).values_list('data', flat=True).first()
+
+            if data is None:
+                from tinySteps.services.apis.edamam_service import EdamamAPI_Service
+                data = EdamamAPI_Service().fetch_nutrition_data(key)
+                if data is None:
+                    return None
+                NutritionData_Service._store_fetched_data({key: data})
+
+            NutritionData_Service._cache_many({key: data})
+
+        NutritionData_Service.local_cache.set(key, data)
+        return data
+
+    @staticmethod
+    def _fetch_from_api(keys, deadline):
+        """Private method to fetch ingredients concurrently, returning what arrived before the deadline"""
+        from tinySteps.services.apis.edamam_service import EdamamAPI_Service
+        api_service = EdamamAPI_Service()
+
+        executor = ThreadPoolExecutor(
+            max_workers=min(NutritionData_Service.FETCH_WORKERS, len(keys)),
+            thread_name_prefix='nutrition-fetch'
+        )
+        futures = {
+            executor.submit(
+                NutritionData_Service.single_flight.do, key, partial(api_service.fetch_nutrition_data, key)
+            ): key
+            for key in keys
+        }
+        done, not_done = wait(futures, timeout=deadline)
+        # Late requests finish in the background, bounded by the HTTP client timeouts
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        if not_done:
+            logger.warning(f"Nutrition data for {sorted(futures[f] for f in not_done)} not received before the deadline")
+
+        return {
+            futures[future]: future.result()
+            for future in done
+            if future.exception() is None and future.result() is not None
+        }
+
+    @staticmethod
+    def _store_fetched_data(fetched):
+        """Private method to save fetched ingredients with one upsert"""
+        if not fetched:
+            return
+
+        ExternalNutritionData_Model.objects.bulk_create(
+            [
+                ExternalNutritionData_Model(ingredient=key, normalized_ingredient=key, data=data)
+                for key, data in fetched.items()
+            ],
+            update_conflicts=True,
+            unique_fields=['normalized_ingredient'],
+            update_fields=['data', 'updated_at']
+        )
+        NutritionData_Service._cache_many(fetched)
+
+    @staticmethod
+    def _cache_many(data_by_key):
+        cache.set_many(
+            {NutritionData_Service._cache_key(key): data for key, data in data_by_key.items()},
+            NutritionData_Service.CACHE_DURATION
+        )
+
+    @staticmethod
+    def _cache_key(key):
+        return f"{NutritionData_Service.CACHE_PREFIX}{key}"
@@ -4,6 +4,7 @@ from django.utils.text import slugify
 import time
 from tinySteps.repositories import Guide_Repository
 from tinySteps.models import Guides_Model, ExternalArticle_Model, Comment_Model
+from tinySteps.models.content.tag_models import format_tags
 from tinySteps.registry import GuideType_Registry
 
 class Guide_Service:
@@ -41,19 +42,26 @@ class Guide_Service:
             image=form.cleaned_data.get('image'),
             author=user,
             guide_type=self.guide_type,
-            slug=f"{slugify(form.cleaned_data['title'])}-{int(time.time())}"
+            slug=f"{slugify(form.cleaned_data['title'])}-{int(time.time())}",
+            tags=format_tags(form.cleaned_data.get('tags', ''))
         )
         
         guide.save()
-        
-        tags_text = form.cleaned_data.get('tags', '')
-        if tags_text:
-            guide.set_tags(tags_text)
-            
         return guide
     
+    def get_popular_guides(self, limit=4):
+        """Get the hottest approved guides of this type"""
+        return self.repository.get_popular_guides(self.guide_type, count=limit)
+    
+    def sort_by_popularity(self, guides):
+        """Order a guide queryset by the precomputed hot score"""
+        return guides.order_by('-hot_score', '-id')
+    
     def get_related_guides(self, guide_id, limit=3):
-        """Get related guides"""
+        """Get related guides, ranked by the tags they share with the guide"""
+        guide = self.repository.get_by_id(guide_id)
+        if guide:
+            return self.repository.get_related_guides(guide, count=limit)
         return self.repository.get_guides_by_type(
             self.guide_type, 
             exclude_id=guide_id,
@@ -1,68 +1,147 @@
-from tinySteps.models import Category_Model, ParentsGuides_Model, NutritionGuides_Model
+from tinySteps.models import Category_Model, Guides_Model
 from django.db.models import Count
+from tinySteps.utils.helpers.cache_helper import QUERY_CACHE, get_cache
+
+cache = get_cache(QUERY_CACHE)
 
 class Category_Service:
-    """Service for category management"""
-    
+    """Service for category management
+
+    The hierarchy is read with one query and cached as a tree of plain
+    dicts, rebuilt when a category is written. Approved guide counts are
+    read with one GROUP BY per category and guide type and cached apart,
+    since guides change more often than categories. Ancestor chains,
+    subtree counts and the nested tree are then computed from the cache.
+    """
+
+    TREE_CACHE_KEY = "category_tree"
+    COUNTS_CACHE_KEY = "category_guide_counts"
+    CACHE_DURATION = 86400  # invalidated on writes
+
     def get_all_categories(self):
         """Get all categories"""
         return Category_Model.objects.all().order_by('name')
-    
+
     def get_category_by_id(self, category_id):
         """Get a category by ID"""
         try:
             return Category_Model.objects.get(id=category_id)
         except Category_Model.DoesNotExist:
             return None
-    
+
+    # ===== Cached tree =====
+    def get_tree(self):
+        """Get ``{id: node}`` for every category, with its ``name``, ``parent_id``, ``path``, ``depth`` and ``children`` IDs"""
+        tree = cache.get(self.TREE_CACHE_KEY)
+        if tree is None:
+            tree = {
+                row['id']: {**row, 'children': []}
+                for row in Category_Model.objects.order_by('name').values('id', 'name', 'parent_id', 'path', 'depth')
+            }
+            for node in tree.values():
+                if node['parent_id'] in tree:
+                    tree[node['parent_id']]['children'].append(node['id'])
+            cache.set(self.TREE_CACHE_KEY, tree, self.CACHE_DURATION)
+        return tree
+
+    def get_guide_counts(self):
+        """Get ``{category_id: {guide_type: count}}`` of the approved guides filed directly under each category"""
+        counts = cache.get(self.COUNTS_CACHE_KEY)
+        if counts is None:
+            counts = {}
+            rows = Guides_Model.objects.filter(
+                status='approved',
+                category__isnull=False
+            ).values('category_id', 'guide_type').annotate(count=Count('id')).order_by()
+            for row in rows:
+                counts.setdefault(row['category_id'], {})[row['guide_type']] = row['count']
+            cache.set(self.COUNTS_CACHE_KEY, counts, self.CACHE_DURATION)
+        return counts
+
+    def get_subtree_counts(self, guide_type=None):
+        """Get ``{category_id: count}`` of the approved guides of a category and its subcategories"""
+        tree = self.get_tree()
+        totals = dict.fromkeys(tree, 0)
+        for category_id, counts in self.get_guide_counts().items():
+            count = counts.get(guide_type, 0) if guide_type else sum(counts.values())
+            node = tree.get(category_id)
+            if node is None or not count:
+                continue
+            for ancestor_id in self._path_ids(node):
+                if ancestor_id in totals:
+                    totals[ancestor_id] += count
+        return totals
+
+    def invalidate_tree(self):
+        """Drop the cached hierarchy and counts after a category is written"""
+        cache.delete_many([self.TREE_CACHE_KEY, self.COUNTS_CACHE_KEY])
+
+    def invalidate_counts(self):
+        """Drop the cached guide counts after a guide is written"""
+        cache.delete(self.COUNTS_CACHE_KEY)
+
+    def _path_ids(self, node):
+        """Private method to get the IDs from the root down to a node"""
+        return [int(part) for part in node['path'].strip('/').split('/') if part]
+
+    # ===== Queries =====
+    def get_ancestors(self, category_id):
+        """Get ``[{'id', 'name'}]`` from the root down to the category, itself included"""
+        tree = self.get_tree()
+        node = tree.get(category_id)
+        if node is None:
+            return []
+        return [
+            {'id': tree[ancestor_id]['id'], 'name': tree[ancestor_id]['name']}
+            for ancestor_id in self._path_ids(node) if ancestor_id in tree
+        ]
+
+    def get_full_name(self, category_id):
+        """Get the hierarchical name of a category, e.g. ``Health > Sleep``"""
+        return ' > '.join(ancestor['name'] for ancestor in self.get_ancestors(category_id))
+
+    def get_descendant_ids(self, category_id):
+        """Get the IDs of a category and of every category below it"""
+        tree = self.get_tree()
+        ids, pending = [], [category_id] if category_id in tree else []
+        while pending:
+            current = pending.pop()
+            ids.append(current)
+            pending.extend(tree[current]['children'])
+        return ids
+
     def get_guide_categories(self, guide_type='parent'):
-        """Get categories that have guides of the specified type"""
-        if guide_type == 'parent':
-            # Get all parent guides
-            guides = ParentsGuides_Model.objects.filter(
-                guide_type='parent',
-                status='approved'
-            )
-        else:
-            # Get all nutrition guides
-            guides = NutritionGuides_Model.objects.filter(
-                guide_type='nutrition',
-                status='approved'
-            )
-        
-        # Get the category IDs used by these guides
-        category_ids = guides.values_list('category_id', flat=True).distinct()
-        
-        # Get the categories and annotate with counts
-        categories = Category_Model.objects.filter(
-            id__in=category_ids
-        ).annotate(
-            article_count=Count('parentsguides_model')
-        ).order_by('name')
-        
+        """Get categories that have approved guides of the specified type, in them or in a subcategory
+
+        Each category carries its subtree guide count as ``article_count``.
+        """
+        counts = self.get_subtree_counts(guide_type)
+        categories = list(Category_Model.objects.filter(
+            id__in=[category_id for category_id, count in counts.items() if count]
+        ).order_by('name'))
+
+        for category in categories:
+            category.article_count = counts[category.id]
+
         return categories
-    
-    def get_nested_categories(self):
-        """Get categories in a nested structure"""
-        # Get all top-level categories (no parent)
-        top_level = Category_Model.objects.filter(parent=None).order_by('name')
-        
-        result = []
-        for category in top_level:
-            category_data = {
-                'id': category.id,
-                'name': category.name,
-                'children': []
+
+    def get_nested_categories(self, guide_type=None):
+        """Get categories in a nested structure
+
+        Every node has its ``id``, ``name``, ``depth``, ``guide_count`` (approved
+        guides of the type in its subtree, every type by default) and ``children``.
+        """
+        tree = self.get_tree()
+        counts = self.get_subtree_counts(guide_type)
+
+        def build(category_id):
+            node = tree[category_id]
+            return {
+                'id': node['id'],
+                'name': node['name'],
+                'depth': node['depth'],
+                'guide_count': counts[category_id],
+                'children': [build(child_id) for child_id in node['children']],
             }
-            
-            # Get children for this category
-            children = Category_Model.objects.filter(parent=category).order_by('name')
-            for child in children:
-                category_data['children'].append({
-                    'id': child.id,
-                    'name': child.name
-                })
-            
-            result.append(category_data)
-        
-        return result
\ No newline at end of file
+
+        return [build(category_id) for category_id, node in tree.items() if node['parent_id'] not in tree]
@@ -2,11 +2,10 @@ from django.utils import timezone
 import logging
 from django.utils import timezone
 from django.utils.translation import gettext as _
-from django.core.mail import send_mail
-from django.conf import settings
 
 from tinySteps.models.content.guide_models import Guides_Model
 from tinySteps.services.logger.audit_logger import Audit_Logger
+from tinySteps.services.tasks.task_queue_service import enqueue_email
 
 logger = logging.getLogger(__name__)
 audit_logger = Audit_Logger()
@@ -93,30 +92,28 @@ class GuideModeration_Service:
         return guides.order_by('-created_at')
 
     def _send_approval_email(self, guide):
-        """Send approval notification email to guide author"""
+        """Queue the approval notification email to the guide author"""
         try:
-            send_mail(
+            enqueue_email(
                 subject=_("Your guide has been approved"),
                 message=_(f"Your guide '{guide.title}' has been approved and is now published."),
-                from_email=settings.DEFAULT_FROM_EMAIL,
                 recipient_list=[guide.author.email],
-                fail_silently=True,
+                key=f"guide-approved:{guide.id}:{guide.approved_at.isoformat()}"
             )
         except Exception as e:
-            logger.error(f"Error sending approval email: {str(e)}")
+            logger.error(f"Error queueing approval email: {str(e)}")
     
     def _send_rejection_email(self, guide):
-        """Send rejection notification email to guide author"""
+        """Queue the rejection notification email to the guide author"""
         try:
-            send_mail(
+            enqueue_email(
                 subject=_("Your guide needs revision"),
                 message=_(f"Your guide '{guide.title}' was not approved for the following reason: {guide.rejection_reason}"),
-                from_email=settings.DEFAULT_FROM_EMAIL,
                 recipient_list=[guide.author.email],
-                fail_silently=True,
+                key=f"guide-rejected:{guide.id}:{guide.rejected_at.isoformat()}"
             )
         except Exception as e:
-            logger.error(f"Error sending rejection email: {str(e)}")
+            logger.error(f"Error queueing rejection email: {str(e)}")
     
     def _log_moderation_action(self, guide, action, moderator=None, reason=None):
         """Log moderation action for auditing"""
@@ -24,9 +24,11 @@ class NutritionGuide_Service(Guide_Service):
     
     def get_nutrition_data(self, ingredient):
         """Get nutrition data for an ingredient"""
-        from tinySteps.services.apis.edamam_service import EdamamAPI_Service
-        service = EdamamAPI_Service()
-        return service.get_nutrition_data(ingredient)
+        return self.get_nutrition_data_batch([ingredient]).get(ingredient.strip())
+    
+    def get_nutrition_data_batch(self, ingredients, deadline=None):
+        """Get nutrition data for several ingredients, fetching the missing ones concurrently"""
+        return NutritionData_Service.get_ingredients_data(ingredients, deadline=deadline)
     
     def analyze_request(self, request):
         """Analyze nutrition request from view"""
@@ -59,35 +61,17 @@ class NutritionGuide_Service(Guide_Service):
     
     def compare_nutrition_data(self, ingredients):
         """Compare nutritional values of different ingredients"""
-        results = {}
-        
-        for ingredient in ingredients:
-            data = self.get_nutrition_data(ingredient)
-            if data and data.get('totalNutrients'):
-                results[ingredient] = data
-        
-        return results
+        return {
+            ingredient: data
+            for ingredient, data in self.get_nutrition_data_batch(ingredients).items()
+            if data and data.get('totalNutrients')
+        }
     
     def save_ingredient_for_user(self, ingredient, user):
         """Save ingredient to the users profile"""
+        # Resolving the ingredient already stores it under its normalized key
         data = self.get_nutrition_data(ingredient)
-        if not data:
-            return False
-            
-        try:
-            existing = ExternalNutritionData_Model.objects.filter(
-                ingredient__iexact=ingredient
-            ).first()
-            
-            if not existing:
-                ExternalNutritionData_Model.objects.create(
-                    ingredient=ingredient,
-                    data=data
-                )
-            
-            return True
-        except Exception:
-            return False
+        return bool(data)
     
     def get_popular_ingredients(self, limit=10):
         """Get popular saved ingredients"""
@@ -1,6 +1,7 @@
 from .base_service import Guide_Service
 from tinySteps.models import ParentsGuides_Model, Category_Model, Guides_Model
 from django.db.models import Count, Q
+from django.utils.text import slugify
 from tinySteps.services.guides.category_service import Category_Service
 
 class ParentGuide_Service(Guide_Service):
@@ -85,7 +86,11 @@ class ParentGuide_Service(Guide_Service):
             try:
                 category_id = int(category_id)
                 category = Category_Model.objects.get(id=category_id)
-                query = query.filter(tags__icontains=category.name)
+                # Guides filed under the category or a subcategory, or tagged with its name
+                query = query.filter(
+                    Q(category_id__in=self.category_service.get_descendant_ids(category.id)) |
+                    Q(guide_tags__tag__slug=slugify(category.name))
+                ).distinct()
             except (ValueError, Category_Model.DoesNotExist):
                 pass
         
@@ -116,18 +121,10 @@ class ParentGuide_Service(Guide_Service):
     
     def get_popular_articles(self, limit=3):
         """Obtener artículos populares para padres"""
-        guides = ParentsGuides_Model.objects.filter(
+        return ParentsGuides_Model.objects.filter(
             guide_type='parent', 
             status='approved'
-        ).order_by('-published_at', '-created_at')[:limit]
-        
-        if not guides.exists():
-            guides = ParentsGuides_Model.objects.filter(
-                guide_type='parent',
-                status='approved'
-            ).order_by('-created_at')[:limit]
-        
-        return guides
+        ).order_by('-hot_score', '-id')[:limit]
     
     def get_article_detail(self, article_id):
         """Obtener detalles de un artículo específico por ID"""
@@ -143,24 +140,11 @@ class ParentGuide_Service(Guide_Service):
             return None
     
     def _get_related_articles(self, article, limit=3):
-        """Obtener artículos relacionados basados en tags o categoría"""
+        """Obtener artículos relacionados por tags compartidos, completando con los más recientes"""
         if not article:
             return []
             
-        if article.tags:
-            related = ParentsGuides_Model.objects.filter(
-                guide_type='parent',
-                status='approved',
-                tags__icontains=article.tags
-            ).exclude(id=article.id).order_by('-published_at')[:limit]
-            
-            if related.count() >= limit:
-                return related
-        
-        return ParentsGuides_Model.objects.filter(
-            guide_type='parent',
-            status='approved'
-        ).exclude(id=article.id).order_by('-published_at')[:limit]
+        return self.repository.get_related_guides(article, count=limit)
     
     def get_article_comment_count(self, article_id):
         """Obtener el número de comentarios para un artículo"""
@@ -1,8 +1,21 @@
 import logging
 import json
 from typing import Optional, Dict, Any
+from django.core.serializers.json import DjangoJSONEncoder
 from django.utils import timezone
 
+from tinySteps.services.logger.log_pipeline import get_log_pipeline
+
+
+class _Json:
+    """Serialize the audit data only when the record is formatted, in the log pipeline's listener"""
+
+    def __init__(self, data: Dict[str, Any]):
+        self.data = data
+
+    def __str__(self) -> str:
+        return json.dumps(self.data, cls=DjangoJSONEncoder)
+
 
 class AuditLogger:
     """Logger for system audit actions with standardized logging formats."""
@@ -10,13 +23,14 @@ class AuditLogger:
     def __init__(self):
         """Initialize the audit logger."""
         self.logger = logging.getLogger('audit')
+        self.pipeline = get_log_pipeline()
     
     def _format_log_data(self, entity_type: str, entity_id: Optional[str], 
                          entity_name: str, action: str, actor: str, 
                          details: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Format log data in a consistent structure."""
         return {
-            'timestamp': timezone.now().isoformat(),
+            'timestamp': timezone.now(),
             'entity_type': entity_type,
             'entity_id': entity_id,
             'entity_name': entity_name,
@@ -24,6 +38,13 @@ class AuditLogger:
             'actor': actor,
             'details': details or {}
         }
+
+    def _write(self, prefix: str, log_data: Dict[str, Any]) -> None:
+        """Enqueue the log line and the audit row; neither is written on the calling thread."""
+        from tinySteps.models import AuditLog_Model
+
+        self.logger.info("%s%s", prefix, _Json(log_data))
+        self.pipeline.add_row(AuditLog_Model, **log_data)
     
     def log_action(self, actor: str, action: str, resource_id: Optional[str] = None, 
                   resource_type: Optional[str] = None, message: Optional[str] = None) -> None:
@@ -39,8 +60,7 @@ class AuditLogger:
             details=details
         )
         
-        self.logger.info(f"AUDIT:{json.dumps(log_data)}")
-        print(f"AUDIT: {json.dumps(log_data)}")  # For development
+        self._write("AUDIT:", log_data)
 
     def log_moderation_action(self, guide_id: str, guide_title: str, 
                              action: str, moderator: Optional[str] = None, 
@@ -57,7 +77,7 @@ class AuditLogger:
             details=details
         )
         
-        self.logger.info(f"AUDIT:MODERATION:{json.dumps(log_data)}")
+        self._write("AUDIT:MODERATION:", log_data)
         
     def log_user_action(self, user_id: str, username: str, 
                        action: str, details: Optional[Dict[str, Any]] = None) -> None:
@@ -71,7 +91,7 @@ class AuditLogger:
             details=details
         )
         
-        self.logger.info(f"AUDIT:USER:{json.dumps(log_data)}")
+        self._write("AUDIT:USER:", log_data)
 
 
 # Add this alias for backward compatibility
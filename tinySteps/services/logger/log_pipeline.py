@@ -0,0 +1,229 @@
+import atexit
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from tinySteps.utils.helpers.metrics_helper import LOG_RECORDS_DROPPED
+
+DEFAULTS = {
+    'ENABLED': True,        # False processes every item synchronously (tests)
+    'QUEUE_SIZE': 10000,    # items buffered before back-pressure
+    'PUT_TIMEOUT': 0.01,    # seconds a full queue blocks the producer before dropping
+    'BATCH_SIZE': 500,      # items handled per listener wake-up
+    'SHUTDOWN_TIMEOUT': 5,  # seconds given to flush the queue on exit
+    'LOGGERS': [],          # loggers whose handlers are moved behind the queue
+}
+
+_STOP = object()
+
+class Log_Pipeline:
+    """Bounded in-memory queue between request threads and the log and audit sinks
+
+    Producers only enqueue: log records (formatted and written later) and
+    database rows (audit entries, connection errors). A background listener
+    drains the queue in batches, hands the records to their handlers and
+    bulk-inserts the rows, one ``bulk_create`` per model and batch. When the
+    queue is full a producer waits at most PUT_TIMEOUT and then drops the
+    item, counting it. The queue is flushed when the process exits.
+    """
+
+    def __init__(self, **options):
+        self.options = {**DEFAULTS, **getattr(settings, 'LOG_PIPELINE', {}), **options}
+        self.dropped = Counter()
+        self._lock = threading.Lock()
+        self._pid = None
+        self._queue = None
+        self._thread = None
+
+    # Producers
+    def log(self, record, handlers):
+        """Enqueue a log record for the given handlers"""
+        return self._put('log', ('log', record, handlers))
+
+    def add_row(self, model, **fields):
+        """Enqueue a row to insert; callable values are evaluated by the listener"""
+        return self._put('db', ('db', model, fields))
+
+    def _put(self, kind, item):
+        if not self.options['ENABLED']:
+            self.process([item])
+            return True
+
+        self._ensure_started()
+        try:
+            if self.options['PUT_TIMEOUT']:
+                self._queue.put(item, timeout=self.options['PUT_TIMEOUT'])
+            else:
+                self._queue.put_nowait(item)
+            return True
+        except queue.Full:
+            self._drop(kind, 1)
+            return False
+
+    # Listener
+    def _ensure_started(self):
+        """Private method to start the listener, again in every forked worker"""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            first_start = self._pid is None
+            self._queue = queue.Queue(maxsize=self.options['QUEUE_SIZE'])
+            self._thread = threading.Thread(target=self._run, name='log-pipeline', daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+        if first_start:
+            atexit.register(self.stop)
+
+    def _run(self):
+        pending = self._queue
+        while True:
+            batch = [pending.get()]
+            while len(batch) < self.options['BATCH_SIZE']:
+                try:
+                    batch.append(pending.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = _STOP in batch
+            try:
+                self.process([item for item in batch if item is not _STOP])
+            finally:
+                for _ in batch:
+                    pending.task_done()
+            if stop:
+                return
+
+    def process(self, batch):
+        """Write the log records of a batch and bulk-insert its rows"""
+        rows = defaultdict(list)
+
+        for item in batch:
+            try:
+                if item[0] == 'log':
+                    _, record, handlers = item
+                    for handler in handlers:
+                        if record.levelno >= handler.level:
+                            handler.handle(record)
+                else:
+                    _, model, fields = item
+                    rows[model].append(model(**{
+                        name: value() if callable(value) else value for name, value in fields.items()
+                    }))
+            except Exception as e:
+                self._drop(item[0], 1, e)
+
+        if rows:
+            self._insert(rows)
+
+    def _insert(self, rows):
+        """Private method to bulk-insert the rows of a batch, isolating the rows that fail"""
+        if self.options['ENABLED']:
+            close_old_connections()
+        try:
+            with transaction.atomic():
+                for model, objects in rows.items():
+                    model.objects.bulk_create(objects)
+            return
+        except Exception:
+            pass
+
+        # One invalid row must not cost the rest of the batch
+        for objects in rows.values():
+            for obj in objects:
+                try:
+                    with transaction.atomic():
+                        obj.save(force_insert=True)
+                except Exception as e:
+                    self._drop('db', 1, e)
+
+    def _drop(self, kind, count, error=None):
+        """Private method to count items that were not written"""
+        with self._lock:
+            self.dropped[kind] += count
+        LOG_RECORDS_DROPPED.labels(kind=kind).inc(count)
+        if error is not None:
+            # Not through logging: the failure could loop back into this queue
+            sys.stderr.write(f"Log pipeline dropped {count} {kind} item(s): {error}\n")
+
+    # Lifecycle
+    def flush(self, timeout=None):
+        """Wait until every enqueued item has been handled, returning whether it was"""
+        if self._pid != os.getpid():
+            return True
+        deadline = time.monotonic() + (timeout if timeout is not None else self.options['SHUTDOWN_TIMEOUT'])
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def stop(self, timeout=None):
+        """Flush the queue and stop the listener (registered to run at exit)"""
+        if self._pid != os.getpid() or not self._thread.is_alive():
+            return
+        timeout = timeout if timeout is not None else self.options['SHUTDOWN_TIMEOUT']
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                'queued': self._queue.qsize() if self._queue else 0,
+                'dropped': dict(self.dropped),
+            }
+
+class Pipeline_Handler(logging.Handler):
+    """Logging handler that enqueues records for the handlers it replaced"""
+
+    def __init__(self, pipeline, handlers):
+        super().__init__()
+        self.pipeline = pipeline
+        self.handlers = handlers
+
+    def handle(self, record):
+        # No handler lock: the queue is thread-safe and formatting happens in the listener
+        allowed = self.filter(record)
+        if allowed:
+            self.pipeline.log(record, self.handlers)
+        return allowed
+
+    def emit(self, record):
+        self.pipeline.log(record, self.handlers)
+
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
+def get_log_pipeline():
+    """Get the log pipeline of this process"""
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is None:
+            _pipeline = Log_Pipeline()
+        return _pipeline
+
+def install_log_pipeline():
+    """Move the handlers of the LOG_PIPELINE['LOGGERS'] loggers behind the queue"""
+    pipeline = get_log_pipeline()
+    if not pipeline.options['ENABLED']:
+        return
+
+    for name in pipeline.options['LOGGERS']:
+        logger = logging.getLogger(name)
+        handlers = [handler for handler in logger.handlers if not isinstance(handler, Pipeline_Handler)]
+        if handlers:
+            for handler in handlers:
+                logger.removeHandler(handler)
+            logger.addHandler(Pipeline_Handler(pipeline, handlers))
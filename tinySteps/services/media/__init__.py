@@ -0,0 +1 @@
+"""Media processing services package"""
@@ -0,0 +1,182 @@
+import io
+import logging
+import posixpath
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.urls import reverse
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from tinySteps.utils.helpers.cache_helper import QUERY_CACHE, get_cache
+
+logger = logging.getLogger(__name__)
+
+cache = get_cache(QUERY_CACHE)
+
+DEFAULTS = {
+    'SIZES': {'thumbnail': 160, 'card': 480, 'full': 1280},
+    'FORMATS': ['webp', 'jpeg'],
+    'QUALITY': {'webp': 80, 'jpeg': 82},
+    'DIRECTORY': 'derivatives',
+    # Upload directories whose images get derivatives (the lazy view refuses any other path)
+    'SOURCES': ['child_photos/', 'milestone_photos/', 'guide_images/', 'profile_photos/'],
+}
+
+EXTENSIONS = {'webp': 'webp', 'jpeg': 'jpg'}
+
+class Image_Service:
+    """Service generating the resized derivatives of uploaded photos
+
+    Every image gets one derivative per size (bounded by width, never
+    upscaled) and format, stored under a key derived from the original name:
+    ``derivatives/child_photos/lucia.card.webp``. EXIF data is dropped after
+    applying its orientation. Derivatives are generated by the task queue
+    after an upload, by ``generate_image_derivatives`` for existing media,
+    or on the first request of a missing one through the ``image_derivative``
+    view. Their widths are cached so pages can build ``srcset`` attributes
+    without touching the storage.
+    """
+
+    CACHE_PREFIX = "image_derivatives_"
+    CACHE_DURATION = 86400 * 30
+    MISSING = 'missing'
+
+    def __init__(self, storage=None, **options):
+        self.storage = storage or default_storage
+        self.options = {**DEFAULTS, **getattr(settings, 'IMAGE_DERIVATIVES', {}), **options}
+
+    @property
+    def sizes(self):
+        return self.options['SIZES']
+
+    @property
+    def formats(self):
+        return self.options['FORMATS']
+
+    def is_source(self, name):
+        """Whether a stored name is an original image derivatives can be made of"""
+        name = str(name or '')
+        return (
+            bool(name) and '..' not in name.split('/') and not name.startswith('/')
+            and any(name.startswith(prefix) for prefix in self.options['SOURCES'])
+        )
+
+    def derivative_name(self, name, size, image_format):
+        """Storage key of a derivative, e.g. ``derivatives/child_photos/lucia.card.webp``"""
+        stem = posixpath.splitext(name)[0]
+        return f"{self.options['DIRECTORY']}/{stem}.{size}.{EXTENSIONS[image_format]}"
+
+    def _cache_key(self, name):
+        return f"{self.CACHE_PREFIX}{name}"
+
+    # ===== Generation =====
+    def render(self, source):
+        """Resize an open image file into ``{(size, format): (bytes, width)}``, without EXIF"""
+        with Image.open(source) as original:
+            image = ImageOps.exif_transpose(original)
+            image.load()
+
+        has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+
+        rendered = {}
+        for size, width in sorted(self.sizes.items(), key=lambda item: item[1]):
+            resized = image
+            if image.width > width:
+                resized = image.resize((width, max(1, round(image.height * width / image.width))), Image.LANCZOS)
+
+            for image_format in self.formats:
+                frame = resized
+                if image_format == 'jpeg' and frame.mode == 'RGBA':
+                    # JPEG has no alpha channel: flatten on white
+                    frame = Image.new('RGB', resized.size, (255, 255, 255))
+                    frame.paste(resized, mask=resized.getchannel('A'))
+                output = io.BytesIO()
+                # Only the color profile is carried over: EXIF (GPS, camera) and XMP are not written
+                frame.save(
+                    output, format=image_format.upper(), quality=self.options['QUALITY'][image_format],
+                    icc_profile=image.info.get('icc_profile'),
+                    optimize=image_format == 'jpeg', progressive=image_format == 'jpeg'
+                )
+                rendered[(size, image_format)] = (output.getvalue(), frame.width)
+        return rendered
+
+    def generate(self, name, remember=True):
+        """Write every derivative of a stored image, returning ``{size: width}`` or None if it is not an image"""
+        try:
+            with self.storage.open(name, 'rb') as source:
+                rendered = self.render(source)
+        except (FileNotFoundError, UnidentifiedImageError, OSError) as e:
+            logger.warning(f"No derivatives for {name}: {e}")
+            return None
+
+        widths = {}
+        for (size, image_format), (content, width) in rendered.items():
+            derivative = self.derivative_name(name, size, image_format)
+            if self.storage.exists(derivative):
+                self.storage.delete(derivative)
+            self.storage.save(derivative, ContentFile(content))
+            widths[size] = width
+
+        if remember:
+            self.remember(name, widths)
+        return widths
+
+    def remember(self, name, widths):
+        cache.set(self._cache_key(name), widths, self.CACHE_DURATION)
+
+    def delete(self, name):
+        """Remove the derivatives of an image"""
+        for size in self.sizes:
+            for image_format in self.formats:
+                derivative = self.derivative_name(name, size, image_format)
+                if self.storage.exists(derivative):
+                    self.storage.delete(derivative)
+        cache.delete(self._cache_key(name))
+
+    # ===== Lookup =====
+    def get_widths(self, name):
+        """Get ``{size: width}`` of the derivatives of an image, or None while they do not exist"""
+        widths = cache.get(self._cache_key(name))
+        if widths is None:
+            # Generated by another process, or before the cache was cleared
+            largest = max(self.sizes, key=self.sizes.get)
+            exists = self.storage.exists(self.derivative_name(name, largest, self.formats[0]))
+            widths = dict(self.sizes) if exists else self.MISSING
+            cache.set(self._cache_key(name), widths, self.CACHE_DURATION if exists else 300)
+        return None if widths == self.MISSING else widths
+
+    def url(self, name, size, image_format=None):
+        """URL of a derivative: the stored file, or the view generating it while it is missing"""
+        image_format = image_format or self.formats[0]
+        if self.get_widths(name) is None:
+            return reverse('image_derivative', kwargs={'size': size, 'image_format': image_format, 'name': name})
+        return self.storage.url(self.derivative_name(name, size, image_format))
+
+    def srcset(self, name, image_format=None):
+        """``srcset`` attribute value listing every size of an image in one format"""
+        image_format = image_format or self.formats[0]
+        widths = self.get_widths(name) or self.sizes
+        candidates = {}
+        for size, width in sorted(widths.items(), key=lambda item: item[1]):
+            # Small originals give several derivatives of the same width: list it once
+            candidates.setdefault(width, self.url(name, size, image_format))
+        return ', '.join(f"{url} {width}w" for width, url in candidates.items())
+
+    def describe(self, name):
+        """Every derivative URL of an image, with the srcset of each format (API representation)"""
+        widths = self.get_widths(name) or self.sizes
+        derivatives = {
+            size: {
+                'width': widths[size],
+                **{image_format: self.url(name, size, image_format) for image_format in self.formats}
+            }
+            for size in self.sizes
+        }
+        derivatives['srcset'] = {image_format: self.srcset(name, image_format) for image_format in self.formats}
+        return derivatives
+
+def generate_derivatives(name):
+    """Generate the derivatives of one image in a worker process, returning ``(name, widths)``"""
+    return name, Image_Service().generate(name, remember=False)
@@ -0,0 +1 @@
+"""Full-text search services package"""
\ No newline at end of file
@@ -0,0 +1,167 @@
+import html
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.utils.module_loading import import_string
+
+from tinySteps.models import SearchDocument_Model
+
+FTS_TABLE = 'tinysteps_search_fts'
+
+# Private-use characters mark highlighted terms until the snippet is escaped
+_START, _STOP = '\ue000', '\ue001'
+_TOKEN = re.compile(r'\w+')
+
+def highlight(snippet):
+    """Escape a raw snippet and turn the highlight markers into <mark> tags"""
+    return html.escape(snippet or '').replace(_START, '<mark>').replace(_STOP, '</mark>')
+
+class Search_Backend:
+    """Full-text search over SearchDocument_Model
+
+    ``search`` returns document rows ordered by descending score then id, each as
+    a dict with ``id``, ``kind``, ``object_id``, ``title``, ``created_at``,
+    ``score`` and ``snippet`` (HTML, matches wrapped in <mark>). ``after`` is the
+    ``(score, id)`` of the last row of the previous page. ``object_ids`` (a
+    queryset of primary keys, used with ``content_type``) restricts the search
+    to those objects before the rows are ranked and limited.
+    """
+
+    SNIPPET_WORDS = 24
+
+    def search(self, query, kinds=None, after=None, limit=20, content_type=None, object_ids=None):
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def update_vectors(self, documents):
+        """Refresh the index of documents written without triggers (bulk upserts)"""
+
+class PostgresSearch_Backend(Search_Backend):
+    """Search backend using tsvector columns with a GIN index and ts_rank"""
+
+    def __init__(self, config=None):
+        self.config = config or getattr(settings, 'SEARCH_CONFIG', 'english')
+
+    def search(self, query, kinds=None, after=None, limit=20, content_type=None, object_ids=None):
+        from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+        from django.db.models import F, Q
+
+        search_query = SearchQuery(query, search_type='websearch', config=self.config)
+        queryset = SearchDocument_Model.objects.filter(search_vector=search_query).annotate(
+            score=SearchRank(F('search_vector'), search_query)
+        )
+
+        if kinds:
+            queryset = queryset.filter(kind__in=kinds)
+        if content_type is not None:
+            queryset = queryset.filter(content_type=content_type)
+        if object_ids is not None:
+            queryset = queryset.filter(object_id__in=object_ids)
+        if after:
+            score, last_id = after
+            queryset = queryset.filter(Q(score__lt=score) | Q(score=score, id__lt=last_id))
+
+        # Headlines are computed after the LIMIT, only for the rows of the page
+        page = queryset.order_by('-score', '-id')[:limit]
+        rows = SearchDocument_Model.objects.filter(pk__in=page.values('pk')).annotate(
+            score=SearchRank(F('search_vector'), search_query),
+            snippet=SearchHeadline(
+                'body', search_query, config=self.config,
+                start_sel=_START, stop_sel=_STOP, max_words=self.SNIPPET_WORDS, min_words=10
+            )
+        ).order_by('-score', '-id').values(
+            'id', 'kind', 'object_id', 'title', 'created_at', 'score', 'snippet'
+        )
+
+        return [{**row, 'snippet': highlight(row['snippet'])} for row in rows]
+
+    def update_vectors(self, documents):
+        from django.contrib.postgres.search import SearchVector
+
+        documents.update(
+            search_vector=SearchVector('title', weight='A', config=self.config)
+            + SearchVector('body', weight='B', config=self.config)
+        )
+
+class SQLiteSearch_Backend(Search_Backend):
+    """Search backend using an FTS5 table kept in sync by triggers, ranked with bm25"""
+
+    TITLE_WEIGHT = 10.0
+    BODY_WEIGHT = 1.0
+
+    def search(self, query, kinds=None, after=None, limit=20, content_type=None, object_ids=None):
+        match = self.to_match_expression(query)
+        if not match:
+            return []
+
+        table = connection.ops.quote_name(SearchDocument_Model._meta.db_table)
+        where, params = [], []
+
+        if kinds:
+            where.append(f"d.kind IN ({', '.join('%s' for _ in kinds)})")
+            params.extend(kinds)
+        if content_type is not None:
+            where.append("d.content_type_id = %s")
+            params.append(content_type.pk)
+        if object_ids is not None:
+            subquery, subquery_params = object_ids.query.sql_with_params()
+            where.append(f"d.object_id IN ({subquery})")
+            params.extend(subquery_params)
+        if after:
+            score, last_id = after
+            where.append("(m.score < %s OR (m.score = %s AND d.id < %s))")
+            params.extend([score, score, last_id])
+
+        # LIMIT -1 keeps SQLite from flattening the subquery, so bm25() and
+        # snippet() are evaluated inside the MATCH query they depend on
+        sql = f"""
+            SELECT d.id, d.kind, d.object_id, d.title, d.created_at, m.score, m.snippet
+            FROM (
+                SELECT rowid AS id,
+                       -bm25({FTS_TABLE}, %s, %s) AS score,
+                       snippet({FTS_TABLE}, -1, %s, %s, '…', %s) AS snippet
+                FROM {FTS_TABLE}
+                WHERE {FTS_TABLE} MATCH %s
+                LIMIT -1
+            ) m
+            JOIN {table} d ON d.id = m.id
+            {'WHERE ' + ' AND '.join(where) if where else ''}
+            ORDER BY m.score DESC, d.id DESC
+            LIMIT %s
+        """
+        params = [
+            self.TITLE_WEIGHT, self.BODY_WEIGHT, _START, _STOP, self.SNIPPET_WORDS, match,
+            *params, limit
+        ]
+
+        return [
+            {
+                'id': document.id,
+                'kind': document.kind,
+                'object_id': document.object_id,
+                'title': document.title,
+                'created_at': document.created_at,
+                'score': document.score,
+                'snippet': highlight(document.snippet),
+            }
+            for document in SearchDocument_Model.objects.raw(sql, params)
+        ]
+
+    @staticmethod
+    def to_match_expression(query):
+        """Turn free text into an FTS5 expression: every word required, the last one as a prefix"""
+        tokens = _TOKEN.findall(query or '')
+        if not tokens:
+            return ''
+        terms = [f'"{token}"' for token in tokens]
+        terms[-1] += '*'
+        return ' '.join(terms)
+
+def get_search_backend():
+    """Get the search backend for the default database, or the one named by SEARCH_BACKEND"""
+    backend_path = getattr(settings, 'SEARCH_BACKEND', None)
+    if backend_path:
+        return import_string(backend_path)()
+    if connection.vendor == 'postgresql':
+        return PostgresSearch_Backend()
+    return SQLiteSearch_Backend()
@@ -0,0 +1,185 @@
+import base64
+import binascii
+import json
+import logging
+
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Case, IntegerField, Value, When
+
+from tinySteps.models import (
+    ExternalArticle_Model,
+    Guides_Model,
+    ParentsForum_Model,
+    SearchDocument_Model
+)
+from tinySteps.services.search.backends import get_search_backend
+
+logger = logging.getLogger(__name__)
+
+class Search_Service:
+    """Service for the full-text index of forum posts, guides and articles
+
+    Indexed objects are copied into SearchDocument_Model, which the search
+    backend indexes. Only approved guides are searchable.
+    """
+
+    KINDS = ('forum', 'parents_guide', 'nutrition_guide', 'article')
+    GUIDE_KINDS = {'parent': 'parents_guide', 'nutrition': 'nutrition_guide'}
+    MAX_PAGE_SIZE = 50
+    MAX_RANKED = 500  # results ranked when narrowing a queryset
+
+    def __init__(self, backend=None):
+        self.backend = backend or get_search_backend()
+
+    # Indexing
+    def index(self, instance):
+        """Add, refresh or remove the document of one object"""
+        self.index_many([instance])
+
+    def index_many(self, instances):
+        """Upsert the documents of several objects of the same model with one query"""
+        instances = list(instances)
+        if not instances:
+            return
+
+        content_type = ContentType.objects.get_for_model(instances[0])
+        documents, removed = [], []
+
+        for instance in instances:
+            document = self.build_document(instance)
+            if document is None:
+                removed.append(instance.pk)
+            else:
+                documents.append(SearchDocument_Model(content_type=content_type, object_id=instance.pk, **document))
+
+        if removed:
+            SearchDocument_Model.objects.filter(content_type=content_type, object_id__in=removed).delete()
+
+        if documents:
+            SearchDocument_Model.objects.bulk_create(
+                documents,
+                update_conflicts=True,
+                unique_fields=['content_type', 'object_id'],
+                update_fields=['kind', 'title', 'body', 'created_at']
+            )
+            self.backend.update_vectors(SearchDocument_Model.objects.filter(
+                content_type=content_type,
+                object_id__in=[document.object_id for document in documents]
+            ))
+
+    def remove(self, instance):
+        """Remove the document of an object"""
+        SearchDocument_Model.objects.filter(
+            content_type=ContentType.objects.get_for_model(instance),
+            object_id=instance.pk
+        ).delete()
+
+    def rebuild(self, batch_size=500):
+        """Index every forum post, guide and article again, returning the number of documents"""
+        SearchDocument_Model.objects.all().delete()
+
+        for queryset in (
+            ParentsForum_Model.objects.order_by('pk'),
+            Guides_Model.objects.filter(status='approved').order_by('pk'),
+            ExternalArticle_Model.objects.order_by('pk'),
+        ):
+            batch = []
+            for instance in queryset.iterator(chunk_size=batch_size):
+                batch.append(instance)
+                if len(batch) == batch_size:
+                    self.index_many(batch)
+                    batch = []
+            self.index_many(batch)
+
+        return SearchDocument_Model.objects.count()
+
+    def build_document(self, instance):
+        """Get the searchable fields of an object, or None when it must not be searchable"""
+        if isinstance(instance, ParentsForum_Model):
+            return {
+                'kind': 'forum',
+                'title': instance.title,
+                'body': instance.desc,
+                'created_at': instance.created_at,
+            }
+
+        if isinstance(instance, Guides_Model):
+            if instance.status != 'approved':
+                return None
+            return {
+                'kind': self.GUIDE_KINDS.get(instance.guide_type, 'parents_guide'),
+                'title': instance.title,
+                'body': '\n'.join(filter(None, [instance.summary, instance.desc, instance.tags])),
+                'created_at': instance.published_at or instance.created_at,
+            }
+
+        if isinstance(instance, ExternalArticle_Model):
+            return {
+                'kind': 'article',
+                'title': instance.title,
+                'body': '\n'.join(filter(None, [instance.description, instance.content])),
+                'created_at': instance.published_at,
+            }
+
+        raise TypeError(f"{type(instance).__name__} is not searchable")
+
+    # Querying
+    def search(self, query, kinds=None, cursor=None, limit=20):
+        """Search every kind of content, best matches first
+
+        Returns ``{'results': [...], 'next_cursor': str or None}``. Each result
+        has the document ``kind``, the ``object_id`` of the indexed object, its
+        ``title``, an HTML ``snippet`` and the ``score``.
+        """
+        limit = max(1, min(limit, self.MAX_PAGE_SIZE))
+        query = (query or '').strip()
+        if not query:
+            return {'results': [], 'next_cursor': None}
+
+        rows = self.backend.search(
+            query, kinds=kinds, after=self.decode_cursor(cursor), limit=limit + 1
+        )
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = self.encode_cursor(rows[-1]['score'], rows[-1]['id'])
+
+        return {'results': rows, 'next_cursor': next_cursor}
+
+    def rank_queryset(self, queryset, query, kinds=None):
+        """Narrow a queryset to the objects matching query, ordered by relevance
+
+        The queryset filters are applied inside the search query, so the
+        MAX_RANKED best matches are taken among the objects of the queryset.
+        """
+        rows = self.backend.search(
+            query,
+            kinds=kinds,
+            limit=self.MAX_RANKED,
+            content_type=ContentType.objects.get_for_model(queryset.model),
+            object_ids=queryset.order_by().values('pk')
+        )
+        ids = [row['object_id'] for row in rows]
+
+        return queryset.filter(pk__in=ids).order_by(
+            Case(
+                *[When(pk=pk, then=Value(position)) for position, pk in enumerate(ids)],
+                output_field=IntegerField()
+            )
+        )
+
+    @staticmethod
+    def encode_cursor(score, doc_id):
+        return base64.urlsafe_b64encode(json.dumps([score, doc_id]).encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor):
+        """Decode a cursor, ignoring malformed ones"""
+        if not cursor:
+            return None
+        try:
+            score, doc_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return float(score), int(doc_id)
+        except (binascii.Error, ValueError, TypeError):
+            logger.warning(f"Ignoring invalid search cursor {cursor!r}")
+            return None
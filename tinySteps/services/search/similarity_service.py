@@ -0,0 +1,309 @@
+import logging
+import re
+from collections import Counter, defaultdict
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from scipy import sparse
+
+from tinySteps.models import ExternalArticle_Model, Guides_Model, RelatedArticle_Model, RelatedGuide_Model
+from tinySteps.utils.helpers.cache_helper import QUERY_CACHE, get_cache
+
+logger = logging.getLogger(__name__)
+
+cache = get_cache(QUERY_CACHE)
+
+DEFAULTS = {
+    'NEIGHBOURS': 6,
+    'MIN_SCORE': 0.05,
+    'MAX_FEATURES': 50000,
+    'BLOCK_SIZE': 512,
+}
+
+TOKEN_PATTERN = re.compile(r"[^\W\d_]{3,}")
+
+# Common English and Spanish words, which would otherwise make every document look alike
+STOP_WORDS = frozenset("""
+    about after also and are because been before but can could does each for from had has have her his how
+    into its just more most not only other our out over she should some such than that the their them then
+    there these they this those through too very was were what when where which while who why will with
+    would you your yours
+    algo ante como con contra cual cuando del desde donde durante ella ellas ellos entre era eres esa ese
+    eso esta este esto estos estas fue hay los las mas mismo muy nos nuestro para pero poco por porque
+    que quien sin sobre son sus tambien tiene todo todos una uno unos unas usted
+""".split())
+
+def tokenize(text):
+    """Lowercase words of three letters or more, without stop words"""
+    return [token for token in TOKEN_PATTERN.findall((text or '').lower()) if token not in STOP_WORDS]
+
+class Tfidf_Vectorizer:
+    """TF-IDF vectors with sublinear term frequencies and L2-normalized rows
+
+    Vectors are ``scipy.sparse`` CSR rows, so memory grows with the words
+    of the documents rather than with the vocabulary, which is capped to
+    the ``max_features`` most frequent terms. Terms found in a single
+    document are kept: a document added later can share them. A fitted
+    vocabulary and IDF can be passed back in to ``transform`` new
+    documents without refitting the group.
+    """
+
+    def __init__(self, max_features=None, vocabulary=None, idf=None):
+        self.max_features = max_features
+        self.vocabulary = vocabulary or {}
+        self.idf = np.empty(0, dtype=np.float32) if idf is None else idf
+
+    def fit_transform(self, documents):
+        counts = [Counter(tokenize(document)) for document in documents]
+        frequencies = Counter(term for document_counts in counts for term in document_counts)
+        terms = sorted(frequencies, key=lambda term: (-frequencies[term], term))[:self.max_features]
+
+        self.vocabulary = {term: column for column, term in enumerate(terms)}
+        document_frequencies = np.array([frequencies[term] for term in terms], dtype=np.float32)
+        self.idf = (np.log((1 + len(documents)) / (1 + document_frequencies)) + 1).astype(np.float32)
+        return self._vectors(counts)
+
+    def transform(self, documents):
+        """Vectors of new documents with the fitted vocabulary; unknown terms are ignored"""
+        return self._vectors([Counter(tokenize(document)) for document in documents])
+
+    def _vectors(self, counts):
+        indptr, columns, values = [0], [], []
+        for document_counts in counts:
+            known = sorted(
+                (self.vocabulary[term], count) for term, count in document_counts.items() if term in self.vocabulary
+            )
+            columns.extend(column for column, _ in known)
+            values.extend(1 + np.log(count) for _, count in known)
+            indptr.append(len(columns))
+
+        matrix = sparse.csr_matrix(
+            (np.array(values, dtype=np.float32), np.array(columns, dtype=np.int32), np.array(indptr, dtype=np.int64)),
+            shape=(len(counts), len(self.vocabulary))
+        )
+        matrix = matrix.multiply(self.idf).tocsr()
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        return sparse.diags(1 / norms).dot(matrix).astype(np.float32).tocsr()
+
+def nearest_neighbours(matrix, k, block_size=512, min_score=0.0):
+    """Top ``k`` cosine neighbours of every row of an L2-normalized sparse matrix
+
+    Returns one ``(rows, scores)`` pair of arrays per row, best first. The
+    similarities are sparse products computed ``block_size`` rows at a time,
+    so only the pairs of documents sharing a term are ever materialized.
+    """
+    matrix = sparse.csr_matrix(matrix)
+    transposed = matrix.T.tocsc()
+    neighbours = []
+    for start in range(0, matrix.shape[0], block_size):
+        similarities = (matrix[start:start + block_size] @ transposed).tocsr()
+        for offset in range(similarities.shape[0]):
+            begin, end = similarities.indptr[offset], similarities.indptr[offset + 1]
+            rows, scores = similarities.indices[begin:end], similarities.data[begin:end]
+            keep = (scores > min_score) & (rows != start + offset)
+            rows, scores = rows[keep], scores[keep]
+            if len(rows) > k:
+                top = np.argpartition(-scores, k - 1)[:k]
+                rows, scores = rows[top], scores[top]
+            # Best first, ties by position, as a rebuild is expected to be deterministic
+            order = np.lexsort((rows, -scores))
+            neighbours.append((rows[order], scores[order]))
+    return neighbours
+
+class Similarity_Service:
+    """Service for the precomputed related guides and articles
+
+    Guides are compared with the approved guides of the same type, articles
+    with the articles of the same category, on TF-IDF vectors of their
+    text. ``rebuild`` recomputes the top NEIGHBOURS of every item; when a
+    guide is approved or edited, ``update_guide`` only rewrites its own
+    neighbours and the lists it now belongs to. Detail pages read the
+    stored rows, so related content costs a single indexed query.
+
+    The fitted vocabulary, IDF and vectors of each guide type are cached,
+    so an update only vectorizes the guide that changed. Terms new to the
+    group are ignored until the next rebuild, which refits it.
+    """
+
+    BATCH_SIZE = 1000
+    CACHE_PREFIX = "similarity_guides_"
+    CACHE_DURATION = 86400 * 7  # refreshed by every rebuild
+
+    def __init__(self, **options):
+        self.options = {**DEFAULTS, **getattr(settings, 'RELATED_CONTENT', {}), **options}
+
+    # Documents
+    def guide_document(self, guide):
+        """Text of a guide from its values: the title counts twice"""
+        return '\n'.join(filter(None, [
+            guide['title'], guide['title'], guide['summary'], guide['desc'], (guide['tags'] or '').replace(',', ' ')
+        ]))
+
+    def article_document(self, article):
+        """Text of an article from its values: the title counts twice"""
+        return '\n'.join(filter(None, [
+            article['title'], article['title'], article['description'], article['content']
+        ]))
+
+    def _guide_groups(self, guide_type=None):
+        """Private method to read the approved guides as ``{guide_type: (ids, documents)}``"""
+        guides = Guides_Model.objects.filter(status='approved')
+        if guide_type:
+            guides = guides.filter(guide_type=guide_type)
+        return self._groups(
+            guides.values('id', 'guide_type', 'title', 'summary', 'desc', 'tags'), 'guide_type', self.guide_document
+        )
+
+    def _article_groups(self):
+        """Private method to read the articles as ``{category: (ids, documents)}``"""
+        return self._groups(
+            ExternalArticle_Model.objects.values('id', 'category', 'title', 'description', 'content'),
+            'category', self.article_document
+        )
+
+    def _groups(self, rows, group_field, document):
+        groups = defaultdict(lambda: ([], []))
+        for row in rows.order_by('id').iterator(chunk_size=self.BATCH_SIZE):
+            ids, documents = groups[row[group_field]]
+            ids.append(row['id'])
+            documents.append(document(row))
+        return groups
+
+    def _fit(self, documents):
+        vectorizer = Tfidf_Vectorizer(self.options['MAX_FEATURES'])
+        return vectorizer, vectorizer.fit_transform(documents)
+
+    # Fitted guide groups
+    def _cache_key(self, guide_type):
+        return f"{self.CACHE_PREFIX}{guide_type}"
+
+    def _store_group(self, guide_type, vectorizer, ids, matrix):
+        cache.set(self._cache_key(guide_type), {
+            'vocabulary': vectorizer.vocabulary, 'idf': vectorizer.idf, 'ids': list(ids), 'matrix': matrix
+        }, self.CACHE_DURATION)
+
+    def _guide_group(self, guide_type):
+        """Private method to get ``(vectorizer, ids, matrix)`` of a guide type, fitting it on a cache miss"""
+        group = cache.get(self._cache_key(guide_type))
+        if group is not None:
+            vectorizer = Tfidf_Vectorizer(self.options['MAX_FEATURES'], group['vocabulary'], group['idf'])
+            return vectorizer, group['ids'], group['matrix']
+
+        ids, documents = self._guide_groups(guide_type)[guide_type]
+        vectorizer, matrix = self._fit(documents)
+        self._store_group(guide_type, vectorizer, ids, matrix)
+        return vectorizer, ids, matrix
+
+    # Full rebuild
+    def rebuild(self):
+        """Recompute the related guides and articles, returning the number of stored rows of each"""
+        counts = {'guides': self.rebuild_guides(), 'articles': self.rebuild_articles()}
+        logger.info(f"Related content rebuilt: {counts}")
+        return counts
+
+    def rebuild_guides(self):
+        groups = self._guide_groups()
+        for guide_type in {value for value, _ in Guides_Model.GUIDE_TYPE_CHOICES} - set(groups):
+            cache.delete(self._cache_key(guide_type))
+        return self._rebuild(groups, RelatedGuide_Model, 'guide', self._store_group)
+
+    def rebuild_articles(self):
+        return self._rebuild(self._article_groups(), RelatedArticle_Model, 'article')
+
+    def _rebuild(self, groups, link_model, source_field, store=None):
+        """Private method replacing every stored neighbour of a model"""
+        links = []
+        for group, (ids, documents) in groups.items():
+            vectorizer, matrix = self._fit(documents)
+            if store:
+                store(group, vectorizer, ids, matrix)
+            neighbours = nearest_neighbours(
+                matrix, self.options['NEIGHBOURS'], self.options['BLOCK_SIZE'], self.options['MIN_SCORE']
+            )
+            for source_id, (rows, scores) in zip(ids, neighbours):
+                links.extend(
+                    link_model(**{f'{source_field}_id': source_id}, related_id=ids[row], score=float(score))
+                    for row, score in zip(rows, scores)
+                )
+
+        with transaction.atomic():
+            link_model.objects.all().delete()
+            link_model.objects.bulk_create(links, batch_size=self.BATCH_SIZE)
+        return len(links)
+
+    # Incremental updates
+    def update_guide(self, guide_id):
+        """Recompute the neighbours of one guide and add it to the lists it now ranks in
+
+        Lists it drops out of keep one entry less until the next rebuild.
+        """
+        guide = Guides_Model.objects.filter(id=guide_id).values(
+            'id', 'guide_type', 'status', 'title', 'summary', 'desc', 'tags'
+        ).first()
+        if guide is None:
+            return 0
+        if guide['status'] != 'approved':
+            self.remove_guide(guide_id)
+            return 0
+
+        # Only the changed guide is vectorized, with the vocabulary of its group
+        vectorizer, ids, matrix = self._guide_group(guide['guide_type'])
+        vector = vectorizer.transform([self.guide_document(guide)])
+        if guide_id in ids:
+            position = ids.index(guide_id)
+            matrix = sparse.vstack([matrix[:position], vector, matrix[position + 1:]], format='csr')
+        else:
+            position, ids = len(ids), ids + [guide_id]
+            matrix = sparse.vstack([matrix, vector], format='csr')
+        self._store_group(guide['guide_type'], vectorizer, ids, matrix)
+
+        similarities = (matrix @ vector.T).toarray().ravel()
+        similarities[position] = -np.inf
+        k, min_score = self.options['NEIGHBOURS'], self.options['MIN_SCORE']
+
+        links, replaced = [], []
+        for row in np.argsort(-similarities, kind='stable')[:k]:
+            if similarities[row] > min_score:
+                links.append(RelatedGuide_Model(guide_id=guide_id, related_id=ids[row], score=float(similarities[row])))
+
+        with transaction.atomic():
+            self.remove_guide(guide_id)
+            current = defaultdict(list)
+            for pk, source_id, score in RelatedGuide_Model.objects.filter(
+                guide__guide_type=guide['guide_type']
+            ).values_list('pk', 'guide_id', 'score'):
+                current[source_id].append((score, pk))
+
+            for row, source_id in enumerate(ids):
+                score = float(similarities[row])
+                if source_id == guide_id or score <= min_score:
+                    continue
+                entries = current[source_id]
+                if len(entries) < k:
+                    links.append(RelatedGuide_Model(guide_id=source_id, related_id=guide_id, score=score))
+                else:
+                    lowest = min(entries)
+                    if score > lowest[0]:
+                        replaced.append(lowest[1])
+                        links.append(RelatedGuide_Model(guide_id=source_id, related_id=guide_id, score=score))
+
+            if replaced:
+                RelatedGuide_Model.objects.filter(pk__in=replaced).delete()
+            RelatedGuide_Model.objects.bulk_create(links, batch_size=self.BATCH_SIZE)
+        return len(links)
+
+    def remove_guide(self, guide_id, guide_type=None):
+        """Drop a guide from the related guides, as an item and as a neighbour"""
+        RelatedGuide_Model.objects.filter(guide_id=guide_id).delete()
+        RelatedGuide_Model.objects.filter(related_id=guide_id).delete()
+
+        guide_type = guide_type or Guides_Model.objects.filter(id=guide_id).values_list('guide_type', flat=True).first()
+        group = cache.get(self._cache_key(guide_type)) if guide_type else None
+        if group is not None and guide_id in group['ids']:
+            keep = np.array([pk != guide_id for pk in group['ids']])
+            vectorizer = Tfidf_Vectorizer(self.options['MAX_FEATURES'], group['vocabulary'], group['idf'])
+            self._store_group(
+                guide_type, vectorizer, [pk for pk in group['ids'] if pk != guide_id], group['matrix'][keep]
+            )
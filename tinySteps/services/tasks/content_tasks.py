@@ -0,0 +1,7 @@
+from tinySteps.services.search.similarity_service import Similarity_Service
+from tinySteps.services.tasks.task_queue_service import TaskQueue_Service
+
+@TaskQueue_Service.register('update_related_guides', pending_key=True)
+def update_related_guides(payload, context):
+    """Recompute the related guides of an approved or edited guide"""
+    Similarity_Service().update_guide(payload['guide_id'])
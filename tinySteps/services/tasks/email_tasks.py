@@ -0,0 +1,21 @@
+from django.core.mail import EmailMessage, mail_admins
+
+from tinySteps.services.tasks.task_queue_service import TaskQueue_Service
+
+@TaskQueue_Service.register('send_email')
+def send_email(payload, context):
+    """Send one email over the connection shared by the batch"""
+    if not payload['recipient_list']:
+        return
+    EmailMessage(
+        subject=payload['subject'],
+        body=payload['message'],
+        from_email=payload['from_email'],
+        to=payload['recipient_list'],
+        connection=context.mail_connection
+    ).send()
+
+@TaskQueue_Service.register('mail_admins')
+def send_mail_admins(payload, context):
+    """Send an email to the ADMINS over the connection shared by the batch"""
+    mail_admins(payload['subject'], payload['message'], connection=context.mail_connection)
@@ -0,0 +1,7 @@
+from tinySteps.services.media.image_service import Image_Service
+from tinySteps.services.tasks.task_queue_service import TaskQueue_Service
+
+@TaskQueue_Service.register('generate_image_derivatives', pending_key=True)
+def generate_image_derivatives(payload, context):
+    """Resize an uploaded image into its thumbnail, card and full derivatives"""
+    Image_Service().generate(payload['name'])
@@ -0,0 +1,232 @@
+import logging
+import random
+import uuid
+from datetime import timedelta
+from django.conf import settings
+from django.core.mail import get_connection
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from tinySteps.models import Task_Model
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'BATCH_SIZE': 50,
+    'POLL_INTERVAL': 2,
+    'MAX_ATTEMPTS': 5,
+    'RETRY_BACKOFF': 30,
+    'RETRY_BACKOFF_MAX': 3600,
+    'LOCK_TIMEOUT': 600,
+    'RETENTION_DAYS': 7,
+}
+
+class Task_Context:
+    """Resources shared by the tasks of one batch, opened lazily and closed with the batch"""
+
+    def __init__(self):
+        self._mail_connection = None
+
+    @property
+    def mail_connection(self):
+        """One SMTP connection reused by every email of the batch"""
+        if self._mail_connection is None:
+            self._mail_connection = get_connection()
+            self._mail_connection.open()
+        return self._mail_connection
+
+    def reset(self):
+        """Drop the shared resources after a failure so the next task starts clean"""
+        self.close()
+
+    def close(self):
+        if self._mail_connection is not None:
+            try:
+                self._mail_connection.close()
+            except Exception as e:
+                logger.warning(f"Could not close the mail connection: {e}")
+            self._mail_connection = None
+
+class TaskQueue_Service:
+    """Service for the database-backed queue of slow side effects (emails, notifications)
+
+    Tasks are registered by name with ``@TaskQueue_Service.register(name)`` and
+    enqueued when the current transaction commits. ``run_worker`` claims due
+    tasks in batches, with ``SELECT ... FOR UPDATE SKIP LOCKED`` where the
+    database supports it, and retries failures with exponential backoff.
+    """
+    _handlers = {}
+    _pending_keys = set()
+
+    def __init__(self, **options):
+        self.options = {**DEFAULTS, **getattr(settings, 'TASK_QUEUE', {}), **options}
+
+    @classmethod
+    def register(cls, name, pending_key=False):
+        """Decorator registering ``handler(payload, context)`` as the task ``name``
+
+        With ``pending_key`` the idempotency key of a task is released when a
+        worker claims it, so it only deduplicates the tasks still pending: a
+        change made while the task runs enqueues it again.
+        """
+        def decorator(handler):
+            cls._handlers[name] = handler
+            if pending_key:
+                cls._pending_keys.add(name)
+            else:
+                cls._pending_keys.discard(name)
+            return handler
+        return decorator
+
+    @classmethod
+    def get_handler(cls, name):
+        return cls._handlers.get(name)
+
+    # Producers
+    def enqueue(self, name, payload=None, key=None, run_at=None, max_attempts=None, on_commit=True):
+        """Enqueue a task, once per idempotency key, after the current transaction commits"""
+        self.enqueue_many(name, [(payload, key)], run_at=run_at, max_attempts=max_attempts, on_commit=on_commit)
+
+    def enqueue_many(self, name, items, run_at=None, max_attempts=None, on_commit=True):
+        """Enqueue one task per ``(payload, key)`` item with a single insert"""
+        if name not in self._handlers:
+            raise ValueError(f"Unknown task: {name}")
+
+        run_at = run_at or timezone.now()
+        tasks = [
+            Task_Model(
+                name=name,
+                payload=payload or {},
+                idempotency_key=key[:255] if key else None,
+                run_at=run_at,
+                max_attempts=max_attempts or self.options['MAX_ATTEMPTS']
+            )
+            for payload, key in items
+        ]
+        if not tasks:
+            return
+
+        def insert():
+            # Tasks already enqueued with the same key are kept as they are
+            Task_Model.objects.bulk_create(tasks, batch_size=1000, ignore_conflicts=True)
+
+        if on_commit:
+            transaction.on_commit(insert)
+        else:
+            insert()
+
+    # Worker
+    def claim(self, worker, batch_size=None):
+        """Lock a batch of due tasks for this worker and return them, oldest first"""
+        batch_size = batch_size or self.options['BATCH_SIZE']
+        now = timezone.now()
+        token = f"{worker}:{uuid.uuid4().hex[:8]}"[-100:]
+        due = Task_Model.objects.filter(status=Task_Model.PENDING, run_at__lte=now).order_by('run_at', 'id')
+
+        with transaction.atomic():
+            if connection.features.has_select_for_update_skip_locked:
+                # Rows locked by another worker are skipped instead of waited for
+                ids = list(due.select_for_update(skip_locked=True).values_list('id', flat=True)[:batch_size])
+                claimed = Task_Model.objects.filter(id__in=ids)
+            else:
+                # SQLite serializes writers: the status condition keeps a task from being claimed twice
+                ids = list(due.values_list('id', flat=True)[:batch_size])
+                claimed = Task_Model.objects.filter(id__in=ids, status=Task_Model.PENDING)
+            claimed.update(
+                status=Task_Model.RUNNING,
+                locked_by=token,
+                locked_at=now,
+                attempts=F('attempts') + 1
+            )
+            if self._pending_keys:
+                Task_Model.objects.filter(locked_by=token, name__in=self._pending_keys).update(idempotency_key=None)
+
+        return list(Task_Model.objects.filter(locked_by=token, status=Task_Model.RUNNING).order_by('run_at', 'id'))
+
+    def run_batch(self, tasks):
+        """Run claimed tasks sharing one context, returning how many succeeded"""
+        context = Task_Context()
+        done = []
+        try:
+            for task in tasks:
+                handler = self.get_handler(task.name)
+                try:
+                    if handler is None:
+                        raise LookupError(f"No handler registered for task {task.name}")
+                    handler(task.payload, context)
+                    done.append(task.id)
+                except Exception as e:
+                    context.reset()
+                    self._fail(task, e, retry=handler is not None)
+        finally:
+            context.close()
+
+        if done:
+            Task_Model.objects.filter(id__in=done).update(
+                status=Task_Model.DONE, finished_at=timezone.now(), locked_by='', last_error=''
+            )
+        return len(done)
+
+    def _fail(self, task, error, retry=True):
+        """Private method to schedule the retry of a failed task, or give up on it"""
+        changes = {'locked_by': '', 'last_error': f"{type(error).__name__}: {error}"[:2000]}
+        if retry and task.attempts < task.max_attempts:
+            changes.update(status=Task_Model.PENDING, run_at=timezone.now() + self.get_backoff(task.attempts))
+            logger.warning(f"Task {task.name} #{task.id} failed (attempt {task.attempts}), retrying: {error}")
+        else:
+            changes.update(status=Task_Model.FAILED, finished_at=timezone.now())
+            logger.error(f"Task {task.name} #{task.id} failed after {task.attempts} attempts: {error}")
+        Task_Model.objects.filter(id=task.id).update(**changes)
+
+    def get_backoff(self, attempts):
+        """Exponential delay before the next attempt, with jitter so retries do not arrive together"""
+        delay = min(self.options['RETRY_BACKOFF_MAX'], self.options['RETRY_BACKOFF'] * 2 ** max(attempts - 1, 0))
+        return timedelta(seconds=delay * random.uniform(0.9, 1.1))
+
+    def release_stale(self):
+        """Put back the tasks of workers that died while running them"""
+        cutoff = timezone.now() - timedelta(seconds=self.options['LOCK_TIMEOUT'])
+        return Task_Model.objects.filter(status=Task_Model.RUNNING, locked_at__lt=cutoff).update(
+            status=Task_Model.PENDING, locked_by=''
+        )
+
+    def purge(self):
+        """Delete the finished tasks older than RETENTION_DAYS"""
+        cutoff = timezone.now() - timedelta(days=self.options['RETENTION_DAYS'])
+        deleted, _ = Task_Model.objects.filter(status=Task_Model.DONE, finished_at__lt=cutoff).delete()
+        return deleted
+
+    def run_pending(self, worker='inline', batch_size=None):
+        """Run every due task now, batch after batch (management commands and tests)"""
+        total = 0
+        while True:
+            tasks = self.claim(worker, batch_size)
+            if not tasks:
+                return total
+            total += self.run_batch(tasks)
+
+def email_payload(subject, message, recipient_list, from_email=None):
+    """Payload of a ``send_email`` task"""
+    return {
+        'subject': str(subject),
+        'message': str(message),
+        'from_email': from_email or settings.DEFAULT_FROM_EMAIL,
+        'recipient_list': [address for address in recipient_list if address],
+    }
+
+def enqueue_email(subject, message, recipient_list, from_email=None, key=None):
+    """Enqueue an email to be sent by the worker"""
+    TaskQueue_Service().enqueue('send_email', email_payload(subject, message, recipient_list, from_email), key=key)
+
+def enqueue_mail_admins(subject, message, key=None):
+    """Enqueue an email to the ADMINS to be sent by the worker"""
+    TaskQueue_Service().enqueue('mail_admins', {'subject': str(subject), 'message': str(message)}, key=key)
+
+def enqueue_related_guides_update(guide_id):
+    """Enqueue the refresh of the related guides of a guide, once while one is pending"""
+    TaskQueue_Service().enqueue('update_related_guides', {'guide_id': guide_id}, key=f"related-guides:{guide_id}")
+
+def enqueue_image_derivatives(name):
+    """Enqueue the generation of the resized derivatives of an uploaded image, once while one is pending"""
+    TaskQueue_Service().enqueue('generate_image_derivatives', {'name': name}, key=f"image-derivatives:{name}")
@@ -0,0 +1,26 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from tinySteps.models import Category_Model, Guides_Model, NutritionGuides_Model, ParentsGuides_Model
+from tinySteps.services.guides.category_service import Category_Service
+
+@receiver(post_save, sender=Category_Model)
+def category_saved(sender, instance, raw=False, **kwargs):
+    """Drop the cached category tree when a category is created, renamed or moved"""
+    # After the commit: the path is written after post_save, and readers must not cache the old rows
+    transaction.on_commit(Category_Service().invalidate_tree)
+
+@receiver(post_delete, sender=Category_Model)
+def category_deleted(sender, instance, **kwargs):
+    """Re-root the subcategories of a deleted category and drop the cached tree"""
+    # Its children lost their parent (SET_NULL) without being saved, so their paths are stale
+    Category_Model.rebuild_paths()
+    transaction.on_commit(Category_Service().invalidate_tree)
+
+@receiver([post_save, post_delete], sender=Guides_Model)
+@receiver([post_save, post_delete], sender=ParentsGuides_Model)
+@receiver([post_save, post_delete], sender=NutritionGuides_Model)
+def guide_changed(sender, instance, **kwargs):
+    """Drop the cached guide counts of the categories when a guide is written"""
+    Category_Service().invalidate_counts()
@@ -0,0 +1,72 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from tinySteps.models import Comment_Model, ForumCategoryCount_Model, ParentsForum_Model
+from tinySteps.repositories import Forum_Repository
+
+def move_comments_count(content_type_id, object_id, delta):
+    """Add delta to the comments_count of the object a comment belongs to"""
+    model = ContentType.objects.get_for_id(content_type_id).model_class()
+    if model is None or 'comments_count' not in {field.name for field in model._meta.concrete_fields}:
+        return
+
+    rows = model._base_manager.filter(pk=object_id)
+    if delta < 0:
+        rows = rows.filter(comments_count__gte=-delta)
+    rows.update(comments_count=F('comments_count') + delta)
+
+@receiver(post_save, sender=Comment_Model)
+def comment_saved(sender, instance, created, raw=False, **kwargs):
+    """Count a new comment on its post or guide"""
+    if created and not raw:
+        move_comments_count(instance.content_type_id, instance.object_id, 1)
+
+@receiver(post_delete, sender=Comment_Model)
+def comment_deleted(sender, instance, **kwargs):
+    """Uncount a deleted comment"""
+    move_comments_count(instance.content_type_id, instance.object_id, -1)
+
+@receiver(post_save, sender=ParentsForum_Model)
+def forum_post_saved(sender, instance, created, raw=False, **kwargs):
+    """Follow new posts and category changes in the category counters"""
+    if raw:
+        return
+    if created:
+        ForumCategoryCount_Model.objects.move(instance.category, 1)
+        return
+
+    previous = getattr(instance, '_loaded_category', instance.category)
+    if previous != instance.category:
+        ForumCategoryCount_Model.objects.move(previous, -1)
+        ForumCategoryCount_Model.objects.move(instance.category, 1)
+    instance._loaded_category = instance.category
+
+@receiver(post_delete, sender=ParentsForum_Model)
+def forum_post_deleted(sender, instance, **kwargs):
+    """Uncount a deleted post from its category"""
+    ForumCategoryCount_Model.objects.move(getattr(instance, '_loaded_category', instance.category), -1)
+
+@receiver(m2m_changed, sender=ParentsForum_Model.likes.through)
+def forum_likes_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """Recount likes written through the related manager (admin, shell, fixtures)
+
+    LikeableMixin writes likes without the manager and moves the counter itself.
+    """
+    if action == 'pre_clear' and reverse:
+        instance._cleared_post_ids = list(instance.liked_posts.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        post_ids = [instance.pk]
+    elif action == 'post_clear':
+        post_ids = getattr(instance, '_cleared_post_ids', [])
+    else:
+        post_ids = pk_set or []
+
+    ParentsForum_Model.objects.filter(pk__in=post_ids).update(
+        likes_count=Forum_Repository().get_likes_count_subquery()
+    )
@@ -0,0 +1,36 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from tinySteps.models import (
+    YourChild_Model,
+    Milestone_Model,
+    CalendarEvent_Model,
+    Vaccine_Model
+)
+from tinySteps.services.core.dashboard_service import Dashboard_Service
+
+@receiver([post_save, post_delete], sender=YourChild_Model)
+def child_changed(sender, instance, **kwargs):
+    """Invalidate dashboard statistics when a child is added or removed"""
+    Dashboard_Service().invalidate(instance.user_id)
+
+@receiver([post_save, post_delete], sender=Milestone_Model)
+@receiver([post_save, post_delete], sender=CalendarEvent_Model)
+def child_record_changed(sender, instance, **kwargs):
+    """Invalidate dashboard statistics when a milestone or event changes"""
+    user_id = YourChild_Model.objects.filter(
+        pk=instance.child_id
+    ).values_list('user_id', flat=True).first()
+
+    if user_id is not None:
+        Dashboard_Service().invalidate(user_id)
+
+@receiver([post_save, post_delete], sender=Vaccine_Model)
+def vaccine_changed(sender, instance, **kwargs):
+    """Invalidate dashboard statistics when a vaccine changes"""
+    user_id = YourChild_Model.objects.filter(
+        vaccine_card__id=instance.vaccine_card_id
+    ).values_list('user_id', flat=True).first()
+
+    if user_id is not None:
+        Dashboard_Service().invalidate(user_id)
@@ -1,16 +1,22 @@
 from django.db.models.signals import post_save
 from django.dispatch import receiver
-from django.core.mail import mail_admins
 from django.conf import settings
 from django.utils.translation import gettext as _
 
 # Ajusta la importación según tu estructura
-from tinySteps.models.content.guide_models import Guides_Model
+from tinySteps.models.content.guide_models import Guides_Model, NutritionGuides_Model, ParentsGuides_Model
+from tinySteps.services.search.similarity_service import Similarity_Service
+from tinySteps.services.tasks.task_queue_service import enqueue_mail_admins, enqueue_related_guides_update
+
+# Fields the related guides are computed from
+SIMILARITY_FIELDS = {'status', 'title', 'summary', 'desc', 'tags'}
 
 @receiver(post_save, sender=Guides_Model)
-def guide_status_changed(sender, instance, created, **kwargs):
+@receiver(post_save, sender=ParentsGuides_Model)
+@receiver(post_save, sender=NutritionGuides_Model)
+def guide_status_changed(sender, instance, created, raw=False, **kwargs):
     """Manejador de señal para cambios de estado en guías"""
-    if created:
+    if created and not raw:
         # Notificar a los admins sobre nueva guía sometida
         subject = _("Nueva Guía Enviada: {0}").format(instance.title)
         message = _("""
@@ -29,9 +35,22 @@ def guide_status_changed(sender, instance, created, **kwargs):
             id=instance.id
         )
         
+        # El worker envía el email cuando la transacción se confirma
         try:
-            mail_admins(subject, message, fail_silently=True)
+            enqueue_mail_admins(subject, message, key=f"guide-submitted:{instance.id}")
         except Exception as e:
             import logging
             logger = logging.getLogger(__name__)
-            logger.error(f"Error al enviar email a los administradores: {str(e)}")
\ No newline at end of file
+            logger.error(f"Error al encolar el email a los administradores: {str(e)}")
+
+@receiver(post_save, sender=Guides_Model)
+@receiver(post_save, sender=ParentsGuides_Model)
+@receiver(post_save, sender=NutritionGuides_Model)
+def guide_content_changed(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Refresh the related guides when an approved guide changes, drop them when it is unpublished"""
+    if raw or (update_fields and not SIMILARITY_FIELDS & set(update_fields)):
+        return
+    if instance.status == 'approved':
+        enqueue_related_guides_update(instance.pk)
+    elif getattr(instance, '_saved_status', None) == 'approved':
+        Similarity_Service().remove_guide(instance.pk)
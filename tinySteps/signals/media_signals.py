@@ -0,0 +1,49 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from tinySteps.models import (
+    Guides_Model,
+    Milestone_Model,
+    NutritionGuides_Model,
+    ParentsGuides_Model,
+    Profile_Model,
+    YourChild_Model
+)
+from tinySteps.services.media.image_service import Image_Service
+from tinySteps.services.tasks.task_queue_service import enqueue_image_derivatives
+
+# Uploaded image field of each model with derivatives
+IMAGE_FIELDS = {
+    YourChild_Model: 'image',
+    Milestone_Model: 'photo',
+    Guides_Model: 'image',
+    ParentsGuides_Model: 'image',
+    NutritionGuides_Model: 'image',
+    Profile_Model: 'image',
+}
+
+@receiver(post_save, sender=YourChild_Model)
+@receiver(post_save, sender=Milestone_Model)
+@receiver(post_save, sender=Guides_Model)
+@receiver(post_save, sender=ParentsGuides_Model)
+@receiver(post_save, sender=NutritionGuides_Model)
+@receiver(post_save, sender=Profile_Model)
+def image_saved(sender, instance, raw=False, **kwargs):
+    """Queue the derivatives of a newly uploaded image"""
+    name = getattr(instance, IMAGE_FIELDS[sender]).name
+    service = Image_Service()
+    if not raw and service.is_source(name) and service.get_widths(name) is None:
+        enqueue_image_derivatives(name)
+
+@receiver(post_delete, sender=YourChild_Model)
+@receiver(post_delete, sender=Milestone_Model)
+@receiver(post_delete, sender=Guides_Model)
+@receiver(post_delete, sender=ParentsGuides_Model)
+@receiver(post_delete, sender=NutritionGuides_Model)
+@receiver(post_delete, sender=Profile_Model)
+def image_deleted(sender, instance, **kwargs):
+    """Remove the derivatives of the image of a deleted object"""
+    name = getattr(instance, IMAGE_FIELDS[sender]).name
+    service = Image_Service()
+    if service.is_source(name):
+        service.delete(name)
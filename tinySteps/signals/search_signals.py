@@ -0,0 +1,30 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from tinySteps.models import (
+    ExternalArticle_Model,
+    Guides_Model,
+    NutritionGuides_Model,
+    ParentsForum_Model,
+    ParentsGuides_Model
+)
+from tinySteps.services.search.search_service import Search_Service
+
+@receiver(post_save, sender=ParentsForum_Model)
+@receiver(post_save, sender=Guides_Model)
+@receiver(post_save, sender=ParentsGuides_Model)
+@receiver(post_save, sender=NutritionGuides_Model)
+@receiver(post_save, sender=ExternalArticle_Model)
+def searchable_saved(sender, instance, raw=False, **kwargs):
+    """Refresh the search document of a saved post, guide or article"""
+    if not raw:
+        Search_Service().index(instance)
+
+@receiver(post_delete, sender=ParentsForum_Model)
+@receiver(post_delete, sender=Guides_Model)
+@receiver(post_delete, sender=ParentsGuides_Model)
+@receiver(post_delete, sender=NutritionGuides_Model)
+@receiver(post_delete, sender=ExternalArticle_Model)
+def searchable_deleted(sender, instance, **kwargs):
+    """Drop the search document of a deleted post, guide or article"""
+    Search_Service().remove(instance)
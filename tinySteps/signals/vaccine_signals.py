@@ -0,0 +1,26 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from tinySteps.models import VaccineCard_Model, VaccineSchedule_Model, Vaccine_Model, YourChild_Model
+from tinySteps.services.core.vaccine_schedule_service import VaccineSchedule_Service
+
+@receiver(post_save, sender=YourChild_Model)
+def child_changed(sender, instance, created=False, **kwargs):
+    """Invalidate the vaccine schedule of a child whose birth date may have changed"""
+    if not created:
+        VaccineSchedule_Service().invalidate(instance.pk)
+
+@receiver([post_save, post_delete], sender=Vaccine_Model)
+def vaccine_changed(sender, instance, **kwargs):
+    """Invalidate the vaccine schedule of the child when a vaccine is recorded, changed or removed"""
+    child_id = VaccineCard_Model.objects.filter(
+        pk=instance.vaccine_card_id
+    ).values_list('child_id', flat=True).first()
+
+    if child_id is not None:
+        VaccineSchedule_Service().invalidate(child_id)
+
+@receiver([post_save, post_delete], sender=VaccineSchedule_Model)
+def schedule_changed(sender, instance, **kwargs):
+    """Drop the cached schedule when a dose is edited (e.g. from the admin)"""
+    VaccineSchedule_Service().invalidate_schedule()
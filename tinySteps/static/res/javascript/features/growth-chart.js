@@ -123,7 +123,7 @@ class GrowthChartManager {
         this.weightChart = new Chart(canvas, {
             type: 'line',
             data: this.getWeightChartData(data),
-            options: this.getChartOptions('Weight (kg)')
+            options: this.getChartOptions('Weight (kg)', !!data.curves)
         });
     }
     
@@ -134,18 +134,21 @@ class GrowthChartManager {
         this.heightChart = new Chart(canvas, {
             type: 'line',
             data: this.getHeightChartData(data),
-            options: this.getChartOptions('Height (cm)')
+            options: this.getChartOptions('Height (cm)', !!data.curves)
         });
     }
 
     // Data preparation methods
     getWeightChartData(data) {
+        if (data.curves) {
+            return this.getPercentileChartData(data, 'weight', 'rgba(66, 133, 244, 1)');
+        }
         return {
             labels: ['Birth', '3m', '6m', '9m', '12m', '18m', '24m', '36m', '48m', '60m'],
             datasets: [
                 {
                     label: 'Your Child',
-                    data: data.weightHistory || [data.birthWeight, 5.2, 7.1, 8.3, 9.5, 10.8, 12.1, 14.2, 16.1, data.currentWeight],
+                    data: [data.birthWeight, 5.2, 7.1, 8.3, 9.5, 10.8, 12.1, 14.2, 16.1, data.currentWeight],
                     borderColor: 'rgba(66, 133, 244, 1)',
                     backgroundColor: 'rgba(66, 133, 244, 0.1)',
                     pointBackgroundColor: 'rgba(66, 133, 244, 1)',
@@ -168,12 +171,15 @@ class GrowthChartManager {
     }
     
     getHeightChartData(data) {
+        if (data.curves) {
+            return this.getPercentileChartData(data, 'height', 'rgba(234, 67, 53, 1)');
+        }
         return {
             labels: ['Birth', '3m', '6m', '9m', '12m', '18m', '24m', '36m', '48m', '60m'],
             datasets: [
                 {
                     label: 'Your Child',
-                    data: data.heightHistory || [data.birthHeight, 61, 67, 72, 76, 82, 88, 96, 103, data.currentHeight],
+                    data: [data.birthHeight, 61, 67, 72, 76, 82, 88, 96, 103, data.currentHeight],
                     borderColor: 'rgba(234, 67, 53, 1)',
                     backgroundColor: 'rgba(234, 67, 53, 0.1)',
                     pointBackgroundColor: 'rgba(234, 67, 53, 1)',
@@ -195,13 +201,56 @@ class GrowthChartManager {
         };
     }
     
+    // Child measurements over the WHO percentile curves computed by the API, by age in months
+    getPercentileChartData(data, indicator, color) {
+        const curves = data.curves[indicator];
+        const percentiles = Object.keys(curves).filter(key => key !== 'ages');
+        
+        const referenceDatasets = percentiles.map(key => ({
+            label: `${key.slice(1)}th Percentile`,
+            data: curves.ages.map((age, index) => ({ x: age, y: curves[key][index] })),
+            borderColor: key === 'P50' ? 'rgba(128, 128, 128, 0.7)' : 'rgba(128, 128, 128, 0.3)',
+            borderDash: [5, 5],
+            pointRadius: 0,
+            borderWidth: key === 'P50' ? 2 : 1,
+            fill: false
+        }));
+        
+        const measurements = (data.measurements || []).filter(m => m[indicator] !== null);
+        const childDataset = {
+            label: 'Your Child',
+            data: measurements.map(m => ({
+                x: m.ageMonths,
+                y: m[indicator],
+                percentile: m[`${indicator}Percentile`]
+            })),
+            borderColor: color,
+            backgroundColor: color.replace(', 1)', ', 0.1)'),
+            pointBackgroundColor: color,
+            borderWidth: 3,
+            pointRadius: 4,
+            fill: false,
+            tension: 0.4
+        };
+        
+        return { datasets: [childDataset, ...referenceDatasets] };
+    }
+    
     // Common chart options - reusable configuration
-    getChartOptions(yAxisLabel) {
+    getChartOptions(yAxisLabel, byAge = false) {
         return {
             responsive: true,
             plugins: {
                 legend: {
                     position: 'top',
+                },
+                tooltip: {
+                    callbacks: {
+                        afterLabel: (context) => {
+                            const percentile = context.raw?.percentile;
+                            return percentile !== undefined && percentile !== null ? `Percentile: ${percentile}` : '';
+                        }
+                    }
                 }
             },
             scales: {
@@ -213,9 +262,10 @@ class GrowthChartManager {
                     beginAtZero: false
                 },
                 x: {
+                    type: byAge ? 'linear' : 'category',
                     title: {
                         display: true,
-                        text: 'Age'
+                        text: byAge ? 'Age (months)' : 'Age'
                     }
                 }
             }
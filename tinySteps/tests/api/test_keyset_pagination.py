@@ -0,0 +1,104 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from tinySteps.models import ParentsForum_Model
+from tinySteps.utils.helpers.pagination_helper import Keyset_Paginator
+
+
+class KeysetPaginator_Tests(TestCase):
+    """Pages seek on (created_at, id) and walk the whole feed in both directions"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='poster', password='testpass')
+        now = timezone.now()
+        for number in range(7):
+            post = ParentsForum_Model.objects.create(title=f'Post {number}', desc='Body', author=self.user)
+            # Pairs of posts share a timestamp so the id breaks the tie
+            ParentsForum_Model.objects.filter(pk=post.pk).update(created_at=now - timedelta(minutes=number // 2))
+        self.expected = list(ParentsForum_Model.objects.order_by('-created_at', '-id'))
+
+    def walk(self, paginator):
+        pages, page = [], paginator.page()
+        while True:
+            pages.append(list(page))
+            if not page.has_next():
+                return pages, page
+            page = paginator.page(page.next_cursor)
+
+    def test_forward_and_backward(self):
+        paginator = Keyset_Paginator(ParentsForum_Model.objects.all(), 3)
+
+        pages, last = self.walk(paginator)
+
+        self.assertEqual([post for page in pages for post in page], self.expected)
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        self.assertTrue(last.has_previous())
+
+        previous = paginator.page(last.previous_cursor)
+        self.assertEqual(list(previous), pages[1])
+        first = paginator.page(previous.previous_cursor)
+        self.assertEqual(list(first), pages[0])
+        self.assertFalse(first.has_previous())
+
+    def test_deep_pages_do_not_count_or_offset(self):
+        paginator = Keyset_Paginator(ParentsForum_Model.objects.all(), 2)
+        cursor = paginator.page(paginator.page().next_cursor).next_cursor
+
+        with CaptureQueriesContext(connection) as context:
+            paginator.page(cursor)
+
+        self.assertEqual(len(context), 1)
+        self.assertNotIn('COUNT(', context[0]['sql'].upper())
+        self.assertNotIn('OFFSET', context[0]['sql'].upper())
+
+    def test_invalid_cursor_returns_first_page(self):
+        page = Keyset_Paginator(ParentsForum_Model.objects.all(), 3).page('not-a-cursor')
+
+        self.assertEqual(list(page), self.expected[:3])
+
+    def test_approximate_count(self):
+        paginator = Keyset_Paginator(ParentsForum_Model.objects.all(), 3)
+        paginator.COUNT_CAP = 5
+
+        self.assertEqual(paginator.approximate_count, 5)
+        self.assertTrue(paginator.count_is_capped)
+
+
+class KeysetPaginationAPI_Tests(TestCase):
+    """Time-ordered API collections page with cursors and an optional approximate count"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='reader', password='testpass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        for number in range(5):
+            ParentsForum_Model.objects.create(title=f'Post {number}', desc='Body', author=self.user)
+
+    def test_forum_pages(self):
+        response = self.client.get(reverse('api:forum-list'), {'page_size': 2, 'count': 'true'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 5)
+        self.assertIsNone(response.data['previous'])
+        self.assertEqual([post['title'] for post in response.data['results']], ['Post 4', 'Post 3'])
+
+        titles = [post['title'] for post in response.data['results']]
+        while response.data['next']:
+            response = self.client.get(response.data['next'])
+            titles.extend(post['title'] for post in response.data['results'])
+
+        self.assertEqual(titles, [f'Post {number}' for number in range(4, -1, -1)])
+        self.assertIsNotNone(response.data['previous'])
+
+    def test_count_is_optional(self):
+        response = self.client.get(reverse('api:forum-list'))
+
+        self.assertNotIn('count', response.data)
+        self.assertEqual(len(response.data['results']), 5)
@@ -0,0 +1,80 @@
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from tinySteps.models import Comment_Model, Guides_Model, ParentsForum_Model
+
+
+class ListEndpointQueryCount_Tests(TestCase):
+    """The forum and guide list endpoints must not issue per-row queries"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='reader', password='testpass')
+        self.client.force_authenticate(self.user)
+
+    def _create_posts(self, count):
+        content_type = ContentType.objects.get_for_model(ParentsForum_Model)
+        for _ in range(count):
+            number = ParentsForum_Model.objects.count()
+            author = User.objects.create_user(username=f'poster{number}')
+            post = ParentsForum_Model.objects.create(
+                title=f'Post {number}', desc='Forum post body', author=author
+            )
+            post.likes.add(self.user, author)
+            Comment_Model.objects.create(
+                content_type=content_type, object_id=post.id, author=author, text='Comment'
+            )
+
+    def _create_guides(self, count, guide_type):
+        content_type = ContentType.objects.get_for_model(Guides_Model)
+        for _ in range(count):
+            number = Guides_Model.objects.count()
+            author = User.objects.create_user(username=f'{guide_type}{number}')
+            guide = Guides_Model.objects.create(
+                title=f'Guide {number}', desc='Guide body', author=author,
+                guide_type=guide_type, status='approved'
+            )
+            Comment_Model.objects.create(
+                content_type=content_type, object_id=guide.id, author=author, text='Comment'
+            )
+
+    def _count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context), response.data
+
+    def _assert_constant_queries(self, url, create_rows):
+        create_rows(1)
+        self._count_queries(url)  # warm the content type cache
+        small_page, _ = self._count_queries(url)
+
+        create_rows(5)
+        full_page, data = self._count_queries(url)
+
+        self.assertEqual(len(data['results']), 6)
+        self.assertEqual(small_page, full_page)
+        return data['results']
+
+    def test_forum_list_query_count(self):
+        results = self._assert_constant_queries(reverse('api:forum-list'), self._create_posts)
+        self.assertTrue(all(post['likes_count'] == 2 for post in results))
+        self.assertTrue(all(post['comments_count'] == 1 for post in results))
+        self.assertTrue(all(post['author_name'].startswith('poster') for post in results))
+
+    def test_parents_guide_list_query_count(self):
+        results = self._assert_constant_queries(
+            reverse('api:parents-guide-list'), lambda count: self._create_guides(count, 'parent')
+        )
+        self.assertTrue(all(guide['comments_count'] == 1 for guide in results))
+
+    def test_nutrition_guide_list_query_count(self):
+        results = self._assert_constant_queries(
+            reverse('api:nutrition-guide-list'), lambda count: self._create_guides(count, 'nutrition')
+        )
+        self.assertTrue(all(guide['comments_count'] == 1 for guide in results))
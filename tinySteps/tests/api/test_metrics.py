@@ -0,0 +1,70 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from prometheus_client import REGISTRY
+
+from tinySteps.models import ParentsForum_Model
+from tinySteps.services.apis.http_client import HTTP_Client
+from tinySteps.tests.stub_server import Stub_Server
+
+
+class Metrics_Tests(TestCase):
+    """Requests and external calls are measured and exposed to staff in the Prometheus format"""
+
+    def setUp(self):
+        self.staff = User.objects.create_user(username='staff', password='testpass', is_staff=True)
+        self.parent = User.objects.create_user(username='parent', password='testpass')
+
+    def sample(self, name, **labels):
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+    def test_request_latency_status_and_queries_per_route(self):
+        for number in range(3):
+            ParentsForum_Model.objects.create(author=self.parent, title=f'Post {number}', desc='Body')
+        route = {'route': '/forum/'}
+        requests_before = self.sample('tinysteps_http_requests_total', method='GET', status='200', **route)
+        queries_before = self.sample('tinysteps_http_request_db_queries_sum', **route)
+        latency_before = self.sample('tinysteps_http_request_duration_seconds_count', method='GET', **route)
+
+        self.assertEqual(self.client.get(reverse('forum:parent_forum')).status_code, 200)
+
+        self.assertEqual(
+            self.sample('tinysteps_http_requests_total', method='GET', status='200', **route), requests_before + 1
+        )
+        self.assertEqual(
+            self.sample('tinysteps_http_request_duration_seconds_count', method='GET', **route), latency_before + 1
+        )
+        self.assertGreater(self.sample('tinysteps_http_request_db_queries_sum', **route), queries_before)
+
+    def test_unmatched_routes_share_one_label(self):
+        before = self.sample('tinysteps_http_requests_total', method='GET', route='<unmatched>', status='404')
+
+        self.client.get('/no-such-page/1/')
+        self.client.get('/no-such-page/2/')
+
+        self.assertEqual(
+            self.sample('tinysteps_http_requests_total', method='GET', route='<unmatched>', status='404'), before + 2
+        )
+
+    def test_external_call_latency(self):
+        before = self.sample('tinysteps_external_request_duration_seconds_count', endpoint='news', outcome='error')
+
+        with Stub_Server([(503, {}), (200, {})]) as server:
+            HTTP_Client(BACKOFF_BASE=0).get(f"{server.url}/news", endpoint='news')
+
+        self.assertEqual(
+            self.sample('tinysteps_external_request_duration_seconds_count', endpoint='news', outcome='error'),
+            before + 1
+        )
+        self.assertGreaterEqual(self.sample('tinysteps_external_request_retries_total', endpoint='news'), 1)
+
+    def test_endpoint_is_staff_only(self):
+        self.client.force_login(self.parent)
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse('metrics'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        self.assertIn(b'# TYPE tinysteps_http_request_duration_seconds histogram', response.content)
@@ -0,0 +1,126 @@
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from tinySteps.models import CalendarEvent_Model, VaccineCard_Model, Vaccine_Model, YourChild_Model
+from tinySteps.services.core.child_service import Child_Service
+
+
+class BatchVaccineUpdate_Tests(TestCase):
+    """A vaccine card is synced in one transaction, with a number of queries independent of its size"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='parent', password='testpass')
+        self.child = YourChild_Model.objects.create(
+            user=self.user, name='Lucia', birth_date=date(2025, 1, 1), gender='F', age=12
+        )
+        self.card = VaccineCard_Model.objects.create(child=self.child)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_vaccines(self, count, administered=False):
+        return [
+            Vaccine_Model.objects.create(
+                vaccine_card=self.card, name=f'Dose {number}',
+                date=date(2025, 3, 1) + timedelta(days=number), administered=administered
+            )
+            for number in range(count)
+        ]
+
+    def administer(self, vaccines):
+        return [{'id': vaccine.pk, 'administered': True, 'create_event': True} for vaccine in vaccines]
+
+    def test_valid_items_are_applied_and_invalid_ones_reported(self):
+        first, second, third = self.create_vaccines(3)
+        other_child = YourChild_Model.objects.create(
+            user=self.user, name='Pablo', birth_date=date(2023, 1, 1), gender='M', age=3
+        )
+        foreign = Vaccine_Model.objects.create(
+            vaccine_card=VaccineCard_Model.objects.create(child=other_child), name='MMR', date=date(2025, 5, 1)
+        )
+
+        results = Child_Service().batch_update_vaccines(self.child.pk, self.user, [
+            {'id': first.pk, 'administered': True, 'create_event': True, 'notes': 'Left arm'},
+            {'id': second.pk, 'date': 'not a date'},
+            {'id': third.pk, 'name': third.name},
+            {'id': foreign.pk, 'administered': True},
+            {'name': 'No ID'},
+        ])
+
+        self.assertEqual((results['success'], results['failed']), (2, 3))
+        self.assertEqual(
+            [item['status'] for item in results['results']],
+            ['updated', 'failed', 'unchanged', 'failed', 'failed']
+        )
+        self.assertIn('date', results['results'][1]['errors'])
+        first.refresh_from_db()
+        self.assertEqual((first.administered, first.notes), (True, 'Left arm'))
+        self.assertFalse(Vaccine_Model.objects.get(pk=foreign.pk).administered)
+        self.assertEqual(list(CalendarEvent_Model.objects.values_list('title', 'date')), [
+            ('Vaccination: Dose 0', first.date)
+        ])
+
+    def test_unadministered_vaccines_lose_their_events(self):
+        vaccines = self.create_vaccines(3)
+        Child_Service().batch_update_vaccines(self.child.pk, self.user, self.administer(vaccines))
+        self.assertEqual(CalendarEvent_Model.objects.filter(type='vaccine').count(), 3)
+
+        results = Child_Service().batch_update_vaccines(self.child.pk, self.user, [
+            {'id': vaccine.pk, 'administered': False} for vaccine in vaccines[:2]
+        ])
+
+        self.assertEqual([item['event'] for item in results['results']], ['deleted', 'deleted'])
+        self.assertEqual(list(CalendarEvent_Model.objects.values_list('title', flat=True)), ['Vaccination: Dose 2'])
+
+    def test_queries_do_not_grow_with_the_card(self):
+        small = self.administer(self.create_vaccines(2))
+        large = self.administer(self.create_vaccines(40))
+
+        with CaptureQueriesContext(connection) as small_queries:
+            Child_Service().batch_update_vaccines(self.child.pk, self.user, small)
+        with CaptureQueriesContext(connection) as large_queries:
+            Child_Service().batch_update_vaccines(self.child.pk, self.user, large)
+
+        self.assertEqual(len(small_queries), len(large_queries))
+        self.assertLessEqual(len(large_queries), 8)
+        self.assertEqual(CalendarEvent_Model.objects.count(), 42)
+
+    def test_endpoint(self):
+        vaccines = self.create_vaccines(2)
+        url = reverse('api:vaccine-card-batch-update', kwargs={'pk': self.card.pk})
+
+        response = self.client.post(url, {'updates': self.administer(vaccines)}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['success'], 2)
+        self.assertEqual(Vaccine_Model.objects.filter(administered=True).count(), 2)
+        self.assertEqual(self.client.post(url, {'updates': []}, format='json').status_code, 400)
+
+        intruder = User.objects.create_user(username='intruder', password='testpass')
+        self.client.force_authenticate(intruder)
+        self.assertEqual(self.client.post(url, {'updates': self.administer(vaccines)}, format='json').status_code, 404)
+
+    def test_malformed_ids_are_reported_per_item(self):
+        vaccine, = self.create_vaccines(1)
+        url = reverse('api:vaccine-card-batch-update', kwargs={'pk': self.card.pk})
+
+        response = self.client.post(url, {'updates': [
+            {'id': [vaccine.pk], 'administered': True},
+            {'id': {'pk': vaccine.pk}},
+            {'id': True},
+            {'id': 1.5},
+            {'id': '²'},
+            {'id': '-1'},
+            {'id': str(vaccine.pk), 'administered': True},
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual([item['status'] for item in results], ['failed'] * 6 + ['updated'])
+        self.assertEqual([item['id'] for item in results], [None] * 6 + [vaccine.pk])
+        self.assertTrue(Vaccine_Model.objects.get(pk=vaccine.pk).administered)
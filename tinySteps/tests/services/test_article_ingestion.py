@@ -0,0 +1,69 @@
+from datetime import datetime, timezone as dt_timezone
+from unittest import mock
+
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase
+
+from tinySteps.models import ExternalArticle_Model, SearchDocument_Model
+from tinySteps.services.external.article_service import Article_Service
+
+NEWSAPI_RESPONSE = {
+    'articles': [
+        {
+            'source': {'name': 'Parents Weekly'}, 'author': 'Ana', 'title': 'Sleep tips',
+            'description': 'How to sleep', 'url': 'https://example.com/sleep',
+            'urlToImage': 'https://example.com/sleep.png', 'publishedAt': '2025-01-02T10:00:00Z',
+            'content': 'Body'
+        },
+        {'source': {'name': 'Parents Weekly'}, 'title': 'Sleep tips (copy)', 'url': 'https://example.com/sleep'},
+        {'source': {'name': None}, 'title': '[Removed]', 'url': 'https://removed.com'},
+        {'source': {'name': 'Blog'}, 'title': 'No link', 'url': None},
+    ]
+}
+CURRENTS_RESPONSE = {
+    'news': [
+        {
+            'title': 'First foods', 'description': 'Solids', 'url': 'https://example.com/solids',
+            'author': 'Luis', 'image': 'None', 'published': '2025-01-03 08:30:00 +0000'
+        },
+    ]
+}
+
+
+class ArticleIngestion_Tests(TestCase):
+    """Articles from both APIs are normalized, deduplicated and upserted in one statement"""
+
+    def ingest(self, newsapi=NEWSAPI_RESPONSE, currents=CURRENTS_RESPONSE):
+        with mock.patch('tinySteps.services.apis.news_service.NewsAPI_Service.get_parenting_articles', return_value=newsapi), \
+                mock.patch('tinySteps.services.apis.currents_service.CurrentsAPI_Service.get_news_by_topic', return_value=currents):
+            return Article_Service.update_from_apis()
+
+    def test_first_run_inserts_normalized_records(self):
+        ContentType.objects.get_for_model(ExternalArticle_Model)
+        # existing URLs, article upsert, then the search index: articles and documents upsert
+        with self.assertNumQueries(4):
+            counts = self.ingest()
+
+        self.assertEqual(counts, {'inserted': 2, 'updated': 0, 'skipped': 3})
+        sleep = ExternalArticle_Model.objects.get(url='https://example.com/sleep')
+        self.assertEqual(sleep.source_name, 'Parents Weekly')
+        self.assertEqual(sleep.image_url, 'https://example.com/sleep.png')
+        self.assertEqual(sleep.published_at, datetime(2025, 1, 2, 10, tzinfo=dt_timezone.utc))
+        solids = ExternalArticle_Model.objects.get(url='https://example.com/solids')
+        self.assertEqual((solids.source_name, solids.image_url, solids.category), ('Currents', None, 'parenting'))
+        self.assertEqual(solids.published_at, datetime(2025, 1, 3, 8, 30, tzinfo=dt_timezone.utc))
+        self.assertEqual(SearchDocument_Model.objects.filter(kind='article').count(), 2)
+
+    def test_second_run_updates_existing_rows(self):
+        self.ingest()
+        changed = {'articles': [dict(NEWSAPI_RESPONSE['articles'][0], title='Better sleep tips')]}
+
+        counts = self.ingest(newsapi=changed, currents=None)
+
+        self.assertEqual(counts, {'inserted': 0, 'updated': 1, 'skipped': 0})
+        self.assertEqual(ExternalArticle_Model.objects.count(), 2)
+        self.assertEqual(ExternalArticle_Model.objects.get(url='https://example.com/sleep').title, 'Better sleep tips')
+
+    def test_empty_responses(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(self.ingest(newsapi=None, currents=None), {'inserted': 0, 'updated': 0, 'skipped': 0})
@@ -0,0 +1,59 @@
+from django.conf import settings
+from django.test import TestCase
+
+from tinySteps.services.apis.news_service import NewsAPI_Service
+from tinySteps.services.external import article_service, nutrition_data_service
+from tinySteps.utils.decorators.caching import cache_result
+from tinySteps.utils.helpers.cache_helper import (
+    EXTERNAL_API_CACHE,
+    QUERY_CACHE,
+    get_cache,
+    get_cache_stats,
+    reset_cache_stats
+)
+
+
+class CacheAliases_Tests(TestCase):
+    """Each subsystem uses its own cache alias and hits/misses are counted per alias"""
+
+    def setUp(self):
+        for alias in settings.CACHES:
+            get_cache(alias).clear()
+        reset_cache_stats()
+
+    def test_aliases_are_configured(self):
+        self.assertTrue({'default', 'external_api', 'fragments', 'queries', 'sessions'} <= set(settings.CACHES))
+        self.assertEqual(settings.SESSION_CACHE_ALIAS, 'sessions')
+
+    def test_services_use_their_alias(self):
+        self.assertEqual(NewsAPI_Service.cache.alias, EXTERNAL_API_CACHE)
+        self.assertEqual(nutrition_data_service.cache.alias, EXTERNAL_API_CACHE)
+        self.assertEqual(article_service.cache.alias, QUERY_CACHE)
+
+    def test_aliases_are_isolated(self):
+        get_cache(EXTERNAL_API_CACHE).set('key', 'api')
+        self.assertIsNone(get_cache(QUERY_CACHE).get('key'))
+        self.assertEqual(get_cache(EXTERNAL_API_CACHE).get('key'), 'api')
+
+    def test_hit_and_miss_counters(self):
+        cache = get_cache(EXTERNAL_API_CACHE)
+        cache.get('missing')
+        cache.set('present', False)
+        cache.get('present')
+        cache.get_many(['present', 'missing'])
+
+        self.assertEqual(get_cache_stats()[EXTERNAL_API_CACHE], {'hits': 2, 'misses': 2})
+        self.assertNotIn(QUERY_CACHE, get_cache_stats())
+
+    def test_cache_result_uses_query_alias(self):
+        calls = []
+
+        @cache_result(timeout=60)
+        def double(value):
+            calls.append(value)
+            return value * 2
+
+        self.assertEqual(double(2), 4)
+        self.assertEqual(double(2), 4)
+        self.assertEqual(calls, [2])
+        self.assertEqual(get_cache_stats()[QUERY_CACHE], {'hits': 1, 'misses': 1})
@@ -0,0 +1,110 @@
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from django.urls import reverse
+
+from tinySteps.models import Category_Model, Guides_Model
+from tinySteps.services.guides.category_service import Category_Service, cache
+from tinySteps.services.guides.parent_service import ParentGuide_Service
+
+
+class CategoryTree_Tests(TestCase):
+    """Categories keep a materialized path, and the tree and its counts are served from the cache"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='author', password='testpass')
+        self.service = Category_Service()
+        self.health = Category_Model.objects.create(name='Health')
+        self.sleep = Category_Model.objects.create(name='Sleep', parent=self.health)
+        self.naps = Category_Model.objects.create(name='Naps', parent=self.sleep)
+        self.food = Category_Model.objects.create(name='Food')
+
+    def create_guide(self, category, guide_type='parent', status='approved'):
+        return Guides_Model.objects.create(
+            author=self.user, title=f'Guide {Guides_Model.objects.count()}', desc='Guide body',
+            guide_type=guide_type, status=status, category=category
+        )
+
+    def test_paths_follow_moves_and_deletions(self):
+        self.assertEqual((self.naps.path, self.naps.depth), (f'/{self.health.pk}/{self.sleep.pk}/{self.naps.pk}/', 2))
+        self.assertEqual(self.naps.full_name, 'Health > Sleep > Naps')
+
+        self.sleep.parent = self.food
+        self.sleep.save()
+        self.naps.refresh_from_db()
+        self.assertEqual(self.naps.path, f'/{self.food.pk}/{self.sleep.pk}/{self.naps.pk}/')
+
+        with self.assertRaises(ValidationError):
+            self.sleep.parent = self.naps
+            self.sleep.full_clean()
+
+        self.food.delete()
+        self.naps.refresh_from_db()
+        self.assertEqual((self.naps.path, self.naps.depth), (f'/{self.sleep.pk}/{self.naps.pk}/', 1))
+
+    def test_tree_and_counts_are_cached(self):
+        self.create_guide(self.naps)
+        self.create_guide(self.sleep)
+        self.create_guide(self.sleep, guide_type='nutrition')
+        self.create_guide(self.food, status='pending')
+        self.service.get_nested_categories()
+
+        with self.assertNumQueries(0):
+            tree = self.service.get_nested_categories(guide_type='parent')
+            self.assertEqual(self.service.get_ancestors(self.naps.pk), [
+                {'id': self.health.pk, 'name': 'Health'},
+                {'id': self.sleep.pk, 'name': 'Sleep'},
+                {'id': self.naps.pk, 'name': 'Naps'},
+            ])
+            self.assertEqual(self.service.get_subtree_counts()[self.health.pk], 3)
+
+        self.assertEqual([(node['name'], node['guide_count']) for node in tree], [('Food', 0), ('Health', 2)])
+        self.assertEqual(tree[1]['children'][0]['children'][0]['name'], 'Naps')
+
+        categories = self.service.get_guide_categories(guide_type='nutrition')
+        self.assertEqual([(category.name, category.article_count) for category in categories], [('Health', 1), ('Sleep', 1)])
+
+    def test_writes_invalidate_the_cache(self):
+        self.service.get_nested_categories()
+        with self.captureOnCommitCallbacks(execute=True):
+            Category_Model.objects.create(name='Teething', parent=self.health)
+        self.create_guide(self.food)
+
+        tree = self.service.get_nested_categories()
+
+        self.assertEqual([child['name'] for child in tree[1]['children']], ['Sleep', 'Teething'])
+        self.assertEqual(tree[0]['guide_count'], 1)
+
+    def test_tree_is_dropped_after_the_path_is_written(self):
+        self.service.get_tree()
+        cached = []
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            teething = Category_Model.objects.create(name='Teething', parent=self.health)
+            # A reader before the commit keeps the old tree, which is dropped afterwards
+            cached.append(teething.pk in self.service.get_tree())
+        self.assertEqual(len(callbacks), 1)
+
+        self.assertEqual(cached, [False])
+        self.assertEqual(self.service.get_tree()[teething.pk]['path'], f'/{self.health.pk}/{teething.pk}/')
+
+    def test_admin_bulk_moderation_drops_the_counts(self):
+        admin_user = User.objects.create_superuser(username='admin', password='adminpass', email='admin@example.com')
+        self.client.force_login(admin_user)
+        guide = self.create_guide(self.food, status='pending')
+        url = reverse('admin:tinySteps_guides_model_changelist')
+        self.assertEqual(self.service.get_subtree_counts()[self.food.pk], 0)
+
+        self.client.post(url, {'action': 'approve_guides', '_selected_action': [guide.pk]})
+        self.assertEqual(self.service.get_subtree_counts()[self.food.pk], 1)
+
+        self.client.post(url, {
+            'action': 'reject_guides', '_selected_action': [guide.pk], 'apply': '1', 'rejection_reason': 'Duplicated'
+        })
+        self.assertEqual(self.service.get_subtree_counts()[self.food.pk], 0)
+
+    def test_articles_of_a_category_include_its_subcategories(self):
+        guide = self.create_guide(self.naps)
+        self.create_guide(self.food)
+
+        self.assertEqual(list(ParentGuide_Service().get_articles(category_id=self.health.pk)), [guide])
@@ -0,0 +1,131 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from tinySteps.models import (
+    Comment_Model,
+    ForumCategoryCount_Model,
+    Guides_Model,
+    ParentsForum_Model
+)
+from tinySteps.services.core.counter_service import Counter_Service
+from tinySteps.services.core.forum_service import Forum_Service
+
+
+class Counters_Tests(TestCase):
+    """Like, comment and category counters follow every write path"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='parent', password='testpass')
+        self.other = User.objects.create_user(username='other', password='testpass')
+        self.post = ParentsForum_Model.objects.create(
+            author=self.user, title='Naps', desc='How many naps?', category='sleep'
+        )
+
+    def stored(self, obj, field):
+        return type(obj).objects.values_list(field, flat=True).get(pk=obj.pk)
+
+    def test_like_and_unlike_are_idempotent(self):
+        self.assertTrue(self.post.like(self.user))
+        self.assertFalse(self.post.like(self.user))
+        self.post.like(self.other)
+        self.assertEqual(self.stored(self.post, 'likes_count'), 2)
+
+        self.assertTrue(self.post.unlike(self.user))
+        self.assertFalse(self.post.unlike(self.user))
+        self.assertEqual(self.stored(self.post, 'likes_count'), 1)
+        self.assertEqual(list(self.post.likes.all()), [self.other])
+
+    def test_toggle_like(self):
+        service = Forum_Service()
+
+        self.assertTrue(service.toggle_like(self.post.pk, self.user))
+        self.assertFalse(service.toggle_like(self.post.pk, self.user))
+        self.assertEqual(self.stored(self.post, 'likes_count'), 0)
+
+    def test_like_is_one_statement_per_change(self):
+        with self.assertNumQueries(4):  # savepoint, INSERT, UPDATE counter, release
+            self.post.like(self.user)
+        with self.assertNumQueries(3):  # savepoint, INSERT (no-op), release
+            self.post.like(self.user)
+
+    def test_likes_written_through_the_manager_are_recounted(self):
+        self.post.likes.add(self.user, self.other)
+        self.assertEqual(self.stored(self.post, 'likes_count'), 2)
+
+        self.other.liked_posts.clear()
+        self.assertEqual(self.stored(self.post, 'likes_count'), 1)
+
+    def test_comments_count(self):
+        guide = Guides_Model.objects.create(
+            author=self.user, title='Guide title', desc='x' * 300, status='approved'
+        )
+        comment = self.post.add_comment(self.other, 'Three naps')
+        self.post.add_comment(self.user, 'Thanks')
+        guide.add_comment(self.other, 'Great guide')
+
+        self.assertEqual(self.stored(self.post, 'comments_count'), 2)
+        self.assertEqual(self.stored(guide, 'comments_count'), 1)
+
+        comment.delete()
+        self.assertEqual(self.stored(self.post, 'comments_count'), 1)
+
+    def test_category_counters(self):
+        ParentsForum_Model.objects.create(author=self.user, title='Bottle', desc='Which one?', category='feeding')
+        post = ParentsForum_Model.objects.get(pk=self.post.pk)
+        post.category = 'health'
+        post.save()
+
+        counts = Forum_Service().get_category_counts()
+        self.assertEqual((counts['sleep'], counts['health'], counts['feeding']), (0, 1, 1))
+
+        post.delete()
+        self.assertEqual(Forum_Service().get_category_counts()['health'], 0)
+
+    def test_reconcile_repairs_drift(self):
+        self.post.like(self.user)
+        Comment_Model.objects.create(
+            content_type=ContentType.objects.get_for_model(ParentsForum_Model),
+            object_id=self.post.pk, author=self.user, text='Hi'
+        )
+        ParentsForum_Model.objects.filter(pk=self.post.pk).update(likes_count=7, comments_count=0)
+        ForumCategoryCount_Model.objects.filter(category='sleep').update(posts_count=9)
+
+        repaired = Counter_Service().reconcile(batch_size=1)
+
+        self.assertEqual(repaired, {'forum_posts': 1, 'guides': 0, 'categories': 1})
+        self.assertEqual(self.stored(self.post, 'likes_count'), 1)
+        self.assertEqual(self.stored(self.post, 'comments_count'), 1)
+        self.assertEqual(ForumCategoryCount_Model.objects.get(category='sleep').posts_count, 1)
+        self.assertEqual(Counter_Service().reconcile(), {'forum_posts': 0, 'guides': 0, 'categories': 0})
+
+    def test_reconcile_command(self):
+        ParentsForum_Model.objects.filter(pk=self.post.pk).update(likes_count=3)
+
+        output = StringIO()
+        call_command('reconcile_counters', batch_size=10, stdout=output)
+        self.assertIn('forum posts: 1, guides: 0', output.getvalue())
+
+        self.assertEqual(self.stored(self.post, 'likes_count'), 0)
+
+
+class LikeAPI_Tests(TestCase):
+    """The like endpoint toggles on POST and likes/unlikes idempotently on PUT/DELETE"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='parent', password='testpass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.post = ParentsForum_Model.objects.create(author=self.user, title='Naps', desc='How many naps?')
+        self.url = reverse('api:forum-like', kwargs={'pk': self.post.pk})
+
+    def test_like_endpoint(self):
+        self.assertEqual(self.client.put(self.url).data, {'liked': True, 'likes_count': 1})
+        self.assertEqual(self.client.put(self.url).data, {'liked': True, 'likes_count': 1})
+        self.assertEqual(self.client.post(self.url).data, {'liked': False, 'likes_count': 0})
+        self.assertEqual(self.client.delete(self.url).data, {'liked': False, 'likes_count': 0})
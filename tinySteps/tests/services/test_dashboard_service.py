@@ -0,0 +1,94 @@
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from tinySteps.models import (
+    CalendarEvent_Model,
+    Milestone_Model,
+    Vaccine_Model,
+    VaccineCard_Model,
+    YourChild_Model
+)
+from tinySteps.services.core.dashboard_service import Dashboard_Service
+from tinySteps.utils.helpers.cache_helper import QUERY_CACHE, get_cache
+
+
+class DashboardService_Tests(TestCase):
+    """Dashboard statistics are computed in one query and cached per user"""
+
+    def setUp(self):
+        get_cache(QUERY_CACHE).clear()
+        self.user = User.objects.create_user(username='parent', password='testpass')
+        self.other_user = User.objects.create_user(username='other', password='testpass')
+        self.child = YourChild_Model.objects.create(
+            user=self.user, name='Lucia', birth_date=date(2024, 1, 1), gender='F', age=10
+        )
+        other_child = YourChild_Model.objects.create(
+            user=self.other_user, name='Pablo', birth_date=date(2023, 1, 1), gender='M', age=22
+        )
+        today = date.today()
+
+        self.card = VaccineCard_Model.objects.create(child=self.child)
+        Vaccine_Model.objects.create(vaccine_card=self.card, name='MMR', date=today, administered=True)
+        Vaccine_Model.objects.create(vaccine_card=self.card, name='DTaP', date=today)
+
+        CalendarEvent_Model.objects.create(child=self.child, title='Doctor', date=today + timedelta(days=2))
+        CalendarEvent_Model.objects.create(child=self.child, title='Later', date=today + timedelta(days=30))
+        CalendarEvent_Model.objects.create(child=other_child, title='Other', date=today)
+
+        Milestone_Model.objects.create(child=self.child, title='Crawl', achieved_date=today - timedelta(days=3))
+        Milestone_Model.objects.create(child=self.child, title='Smile', achieved_date=today - timedelta(days=90))
+
+        self.service = Dashboard_Service()
+
+    def test_statistics_in_one_query(self):
+        with self.assertNumQueries(1):
+            stats = self.service.get_user_statistics(self.user)
+
+        self.assertEqual(stats, {
+            'total_children': 1,
+            'total_vaccines': 2,
+            'vaccines_up_to_date': 1,
+            'upcoming_events': 1,
+            'recent_milestones': 1,
+        })
+
+    def test_statistics_are_cached(self):
+        self.service.get_user_statistics(self.user)
+
+        with self.assertNumQueries(0):
+            self.service.get_user_statistics(self.user)
+
+    def test_writes_invalidate_cache(self):
+        self.service.get_user_statistics(self.user)
+        CalendarEvent_Model.objects.create(child=self.child, title='Checkup', date=date.today())
+        self.assertEqual(self.service.get_user_statistics(self.user)['upcoming_events'], 2)
+
+        Vaccine_Model.objects.filter(vaccine_card=self.card, administered=False).get().delete()
+        self.assertEqual(self.service.get_user_statistics(self.user)['total_vaccines'], 1)
+
+        YourChild_Model.objects.create(
+            user=self.user, name='Mateo', birth_date=date(2022, 1, 1), gender='M', age=34
+        )
+        self.assertEqual(self.service.get_user_statistics(self.user)['total_children'], 2)
+
+        Milestone_Model.objects.create(child=self.child, title='Walk', achieved_date=date.today())
+        self.assertEqual(self.service.get_user_statistics(self.user)['recent_milestones'], 2)
+
+    def test_user_without_children(self):
+        stats = Dashboard_Service().get_user_statistics(User.objects.create_user(username='new'))
+        self.assertEqual(set(stats.values()), {0})
+
+    def test_dashboard_endpoints(self):
+        self.client.login(username='parent', password='testpass')
+        response = self.client.get(reverse('children:child_statistics_api'))
+        self.assertEqual(response.json()['status'], 'success')
+        self.assertEqual(response.json()['recent_milestones'], 1)
+
+        api_client = APIClient()
+        api_client.force_authenticate(self.user)
+        response = api_client.get(reverse('api:current-user-dashboard-stats'))
+        self.assertEqual(response.data['vaccines_up_to_date'], 1)
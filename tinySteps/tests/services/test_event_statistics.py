@@ -0,0 +1,53 @@
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from tinySteps.models import CalendarEvent_Model, YourChild_Model
+from tinySteps.repositories import CalendarEvent_Repository
+from tinySteps.services.core.child_service import Child_Service
+
+
+class EventStatistics_Tests(TestCase):
+    """Calendar statistics are computed with one conditional-aggregation query"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='parent', password='testpass')
+        self.child = YourChild_Model.objects.create(
+            user=self.user, name='Lucia', birth_date=date(2024, 1, 1), gender='F', age=10
+        )
+        self.sibling = YourChild_Model.objects.create(
+            user=self.user, name='Mateo', birth_date=date(2022, 1, 1), gender='M', age=34
+        )
+        today = date.today()
+        for event_type, status, offset in [
+            ('doctor', 'pending', 3),
+            ('doctor', 'completed', -10),
+            ('vaccine', 'cancelled', 5),
+            ('feeding', 'pending', -1),
+        ]:
+            CalendarEvent_Model.objects.create(
+                child=self.child, title=event_type, type=event_type,
+                status=status, date=today + timedelta(days=offset)
+            )
+        self.repository = CalendarEvent_Repository()
+
+    def test_single_child_stats(self):
+        with self.assertNumQueries(1):
+            stats = self.repository.get_event_stats(self.child.id)
+
+        self.assertEqual(stats['total'], 4)
+        self.assertEqual(stats['doctor'], 2)
+        self.assertEqual(stats['vaccine'], 1)
+        self.assertEqual(stats['milestone'], 0)
+        self.assertEqual(stats['upcoming'], 2)
+        self.assertEqual(stats['by_status'], {'pending': 2, 'completed': 1, 'cancelled': 1})
+
+    def test_stats_for_all_children_of_a_user(self):
+        with self.assertNumQueries(1):
+            stats = Child_Service().get_event_statistics_for_user(self.user)
+
+        self.assertEqual(set(stats), {self.child.id, self.sibling.id})
+        self.assertEqual(stats[self.child.id], self.repository.get_event_stats(self.child.id))
+        self.assertEqual(stats[self.sibling.id]['total'], 0)
+        self.assertEqual(stats[self.sibling.id]['by_status']['pending'], 0)
@@ -0,0 +1,88 @@
+from datetime import date, timedelta
+
+import numpy as np
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from tinySteps.models import GrowthMeasurement_Model, YourChild_Model
+from tinySteps.services.core.growth_service import DAYS_PER_MONTH, Growth_Service, cache, normal_cdf
+
+
+class GrowthStandards_Tests(SimpleTestCase):
+    """Measurements are scored against the WHO LMS tables with vectorized z-scores"""
+
+    def setUp(self):
+        self.service = Growth_Service()
+        self.weight = self.service.get_table('weight', 'M')
+
+    def test_median_is_the_50th_percentile(self):
+        l, m, s = self.weight.at(self.weight.ages)
+
+        np.testing.assert_allclose(self.service.zscores('weight', 'M', self.weight.ages, m), 0, atol=1e-9)
+        np.testing.assert_allclose(self.service.percentiles('weight', 'M', self.weight.ages, m), 50, atol=1e-5)
+
+    def test_series_matches_single_measurements(self):
+        ages = np.array([0, 45, 200, 400, 1000, 1800])
+        values = np.array([3.1, 5.0, 8.2, 10.1, 14.0, 19.5])
+
+        series = self.service.zscores('weight', 'F', ages, values)
+        single = [self.service.zscores('weight', 'F', [age], [value])[0] for age, value in zip(ages, values)]
+
+        np.testing.assert_allclose(series, single)
+
+    def test_known_scores(self):
+        # Two standard deviations above the median length at birth (L = 1)
+        z = self.service.zscores('height', 'M', [0], [49.8842 * (1 + 2 * 0.03795)])
+        self.assertAlmostEqual(z[0], 2, places=6)
+        self.assertAlmostEqual(float(normal_cdf(1.959964)), 0.975, places=6)
+        # Beyond 3 SD the restricted method keeps extreme weights from exploding
+        self.assertLess(self.service.zscores('weight', 'M', [0], [8.0])[0], 12)
+
+    def test_out_of_range_and_missing_values(self):
+        z = self.service.zscores('weight', 'M', [-1, 100, 61 * DAYS_PER_MONTH], [3.0, np.nan, 20.0])
+        self.assertTrue(np.isnan(z).all())
+
+    def test_curves_are_cached(self):
+        cache.clear()
+        curves = self.service.get_curves('height', 'F', 0, 24)
+
+        self.assertEqual(len(curves['ages']), 25)
+        self.assertEqual(curves['P50'][0], 49.15)
+        self.assertTrue(all(low < high for low, high in zip(curves['P3'], curves['P97'])))
+        self.assertEqual(cache.get(f"{Growth_Service.CACHE_PREFIX}height_F_0_24_3-15-50-85-97"), curves)
+
+
+class GrowthData_Tests(TestCase):
+    """growth-data returns the scored measurements and the curves of the child's sex and age"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='parent', password='testpass')
+        self.child = YourChild_Model.objects.create(
+            user=self.user, name='Lucia', birth_date=date.today() - timedelta(days=400), gender='F', age=13,
+            weight=9.0, height=74.0
+        )
+        self.client = APIClient()
+        # growth-data is also behind LoginRequiredMixin, which needs a session
+        self.client.force_login(self.user)
+
+    def test_measurements_and_curves(self):
+        measurements_url = reverse('api:child-measurement-list', kwargs={'child_pk': self.child.pk})
+        for days, weight, height in ((0, 3.2, 49.1), (183, 7.3, None), (365, 8.9, 74.0)):
+            response = self.client.post(measurements_url, {
+                'date': str(self.child.birth_date + timedelta(days=days)), 'weight': weight, 'height': height
+            }, format='json')
+            self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.client.post(measurements_url, {'date': str(date.today())}, format='json').status_code, 400)
+
+        response = self.client.get(reverse('api:child-growth-data', kwargs={'child_pk': self.child.pk}))
+
+        data = response.json()
+        self.assertEqual((data['birthWeight'], data['currentWeight'], data['currentHeight']), (3.2, 8.9, 74.0))
+        self.assertEqual([m['ageMonths'] for m in data['measurements']], [0.0, 6.0, 12.0])
+        self.assertAlmostEqual(data['measurements'][2]['weightPercentile'], 50, delta=3)
+        self.assertIsNone(data['measurements'][1]['heightZ'])
+        self.assertEqual(data['curves']['weight']['ages'][-1], 24)
+        self.assertIn('P97', data['curves']['headCircumference'])
+        self.assertEqual(GrowthMeasurement_Model.objects.filter(child=self.child).count(), 3)
@@ -0,0 +1,122 @@
+import time
+from unittest import mock
+
+import requests
+from django.test import SimpleTestCase, TestCase
+
+from tinySteps.services.apis.currents_service import CurrentsAPI_Service
+from tinySteps.services.apis.edamam_service import EdamamAPI_Service
+from tinySteps.services.apis.http_client import Circuit_Breaker, CircuitOpen_Error, HTTP_Client
+from tinySteps.services.apis.news_service import NewsAPI_Service
+from tinySteps.tests.stub_server import Stub_Server
+from tinySteps.utils.helpers.cache_helper import EXTERNAL_API_CACHE, get_cache
+
+
+class HTTPClient_Tests(SimpleTestCase):
+    """The shared HTTP client pools connections, retries, and opens its circuit on failures"""
+
+    def make_client(self, **options):
+        return HTTP_Client(BACKOFF_BASE=0, **options)
+
+    def test_connections_are_reused(self):
+        client = self.make_client()
+        with Stub_Server() as server:
+            for _ in range(3):
+                self.assertEqual(client.get(f"{server.url}/news").status_code, 200)
+
+        self.assertEqual(len({request['client_port'] for request in server.requests}), 1)
+
+    def test_retryable_status_is_retried(self):
+        client = self.make_client()
+        with Stub_Server([(503, {}), (200, {'ok': True})]) as server:
+            response = client.get(f"{server.url}/news", endpoint='news')
+
+        self.assertEqual(response.json(), {'ok': True})
+        self.assertEqual(len(server.requests), 2)
+        metrics = client.get_metrics()['news']
+        self.assertEqual((metrics['requests'], metrics['errors'], metrics['retries']), (2, 1, 1))
+
+    def test_client_errors_are_not_retried(self):
+        client = self.make_client()
+        with Stub_Server([(404, {})]) as server:
+            self.assertEqual(client.get(f"{server.url}/missing").status_code, 404)
+        self.assertEqual(len(server.requests), 1)
+
+    def test_read_timeout_gives_up_after_retry_budget(self):
+        client = self.make_client(TIMEOUT=(1, 0.1), MAX_RETRIES=1)
+        with Stub_Server([(200, {}, 0.5)]) as server:
+            with self.assertRaises(requests.exceptions.Timeout):
+                client.get(f"{server.url}/slow", endpoint='slow')
+
+        self.assertEqual(client.get_metrics()['slow']['errors'], 2)
+
+    def test_circuit_opens_and_recovers(self):
+        client = self.make_client(MAX_RETRIES=0, BREAKER_THRESHOLD=2, BREAKER_RESET=0.1)
+        with Stub_Server([(500, {}), (500, {}), (200, {})]) as server:
+            client.get(f"{server.url}/news")
+            client.get(f"{server.url}/news")
+            with self.assertRaises(CircuitOpen_Error):
+                client.get(f"{server.url}/news")
+            self.assertEqual(len(server.requests), 2)
+
+            time.sleep(0.15)
+            self.assertEqual(client.get(f"{server.url}/news").status_code, 200)
+
+        self.assertEqual(client.get_breaker(server.url.split('//')[1]).state, Circuit_Breaker.CLOSED)
+
+    def test_malformed_half_open_trial_reopens_circuit(self):
+        client = self.make_client(MAX_RETRIES=0, BREAKER_THRESHOLD=1, BREAKER_RESET=0)
+        malformed = b'HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\nnot a chunk\r\n'
+        with Stub_Server([(500, {}), (200, malformed), (200, {})]) as server:
+            client.get(f"{server.url}/news", endpoint='news')
+            with self.assertRaises(requests.exceptions.ChunkedEncodingError):
+                client.get(f"{server.url}/news", endpoint='news')
+
+            breaker = client.get_breaker(server.url.split('//')[1])
+            self.assertEqual(breaker.state, Circuit_Breaker.OPEN)
+            self.assertEqual(client.get(f"{server.url}/news").status_code, 200)
+
+        self.assertEqual(breaker.state, Circuit_Breaker.CLOSED)
+        self.assertEqual(client.get_metrics()['news']['errors'], 2)
+
+    def test_half_open_failure_reopens_circuit(self):
+        breaker = Circuit_Breaker(threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        self.assertTrue(breaker.allow_request())
+        self.assertEqual(breaker.state, Circuit_Breaker.HALF_OPEN)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, Circuit_Breaker.OPEN)
+
+
+class ExternalServices_StubServer_Tests(TestCase):
+    """The external API services go through the shared client"""
+
+    def setUp(self):
+        get_cache(EXTERNAL_API_CACHE).clear()
+        patcher = mock.patch('tinySteps.services.apis.http_client._client', HTTP_Client(BACKOFF_BASE=0))
+        self.client = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_news_service(self):
+        with Stub_Server([(200, {'articles': [{'title': 'Sleep'}]})]) as server:
+            with mock.patch.object(NewsAPI_Service, 'BASE_URL', f"{server.url}/v2/everything"):
+                data = NewsAPI_Service().get_parenting_articles()
+
+        self.assertEqual(data['articles'][0]['title'], 'Sleep')
+        self.assertIn('q=', server.requests[0]['path'])
+
+    def test_currents_service_upstream_failure(self):
+        with Stub_Server([(502, {})]) as server:
+            with mock.patch.object(CurrentsAPI_Service, 'BASE_URL', f"{server.url}/v1/latest-news"):
+                self.assertIsNone(CurrentsAPI_Service().get_parenting_tips())
+
+        self.assertEqual(len(server.requests), 1 + self.client.options['MAX_RETRIES'])
+
+    def test_edamam_service(self):
+        nutrients = {'calories': 52, 'totalNutrients': {'SUGAR': {'quantity': 10}}}
+        with Stub_Server([(200, nutrients)]) as server:
+            with mock.patch.object(EdamamAPI_Service, 'BASE_URL', f"{server.url}/api/nutrition-data"):
+                data = EdamamAPI_Service().get_nutrition_data('1 apple', force_refresh=True)
+
+        self.assertEqual(data['calories'], 52)
+        self.assertIn(f"{server.url.split('//')[1]}/api/nutrition-data", self.client.get_metrics())
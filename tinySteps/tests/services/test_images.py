@@ -0,0 +1,127 @@
+import io
+import shutil
+import tempfile
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from tinySteps.models import YourChild_Model
+from tinySteps.services.media.image_service import Image_Service, cache
+from tinySteps.services.tasks.task_queue_service import TaskQueue_Service
+
+
+def photo(width=2000, height=1000, orientation=None, mode='RGB', image_format='JPEG'):
+    """Encoded test image, optionally with an EXIF orientation and a GPS tag"""
+    image = Image.new(mode, (width, height), (255, 0, 0, 128) if mode == 'RGBA' else 'red')
+    exif = Image.Exif()
+    exif[0x8825] = {1: 'N'}  # GPS info
+    if orientation:
+        exif[0x0112] = orientation
+    output = io.BytesIO()
+    image.save(output, format=image_format, exif=exif.tobytes() if image_format == 'JPEG' else None)
+    return output.getvalue()
+
+
+class ImageDerivatives_Tests(TestCase):
+    """Uploaded photos get width-bounded WebP and JPEG derivatives under deterministic keys"""
+
+    def setUp(self):
+        cache.clear()
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        self.service = Image_Service()
+        self.user = User.objects.create_user(username='parent', password='testpass')
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def store(self, name, content):
+        return default_storage.save(name, io.BytesIO(content))
+
+    def open_derivative(self, name, size, image_format):
+        return Image.open(default_storage.open(self.service.derivative_name(name, size, image_format)))
+
+    def test_sizes_formats_and_exif(self):
+        name = self.store('child_photos/lucia.jpg', photo(orientation=6))
+
+        self.assertEqual(self.service.generate(name), {'thumbnail': 160, 'card': 480, 'full': 1000})
+
+        self.assertEqual(self.service.derivative_name(name, 'card', 'webp'), 'derivatives/child_photos/lucia.card.webp')
+        card = self.open_derivative(name, 'card', 'jpeg')
+        # The orientation is applied (portrait) before the EXIF data is dropped
+        self.assertEqual(card.size, (480, 960))
+        self.assertEqual(dict(card.getexif()), {})
+        self.assertEqual(self.open_derivative(name, 'thumbnail', 'webp').format, 'WEBP')
+        self.assertEqual(
+            self.service.srcset(name, 'jpeg'),
+            '/media/derivatives/child_photos/lucia.thumbnail.jpg 160w, '
+            '/media/derivatives/child_photos/lucia.card.jpg 480w, '
+            '/media/derivatives/child_photos/lucia.full.jpg 1000w'
+        )
+
+    def test_transparent_images_and_small_originals(self):
+        name = self.store('guide_images/logo.png', photo(300, 100, mode='RGBA', image_format='PNG'))
+
+        self.assertEqual(self.service.generate(name), {'thumbnail': 160, 'card': 300, 'full': 300})
+
+        self.assertEqual(self.open_derivative(name, 'full', 'webp').mode, 'RGBA')
+        self.assertEqual(self.open_derivative(name, 'full', 'jpeg').mode, 'RGB')
+        self.assertEqual(self.service.srcset(name).count('w,'), 1)
+
+    def test_upload_queues_the_derivatives(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            child = YourChild_Model.objects.create(
+                user=self.user, name='Lucia', birth_date=date(2025, 1, 1), gender='F', age=12,
+                image=SimpleUploadedFile('lucia.jpg', photo(), content_type='image/jpeg')
+            )
+        name = child.image.name
+        self.assertIn('/images/thumbnail/webp/child_photos/', self.service.url(name, 'thumbnail'))
+
+        TaskQueue_Service().run_pending()
+
+        self.assertEqual(
+            self.service.url(name, 'thumbnail'), f"/media/{self.service.derivative_name(name, 'thumbnail', 'webp')}"
+        )
+        html = Template('{% load custom_filters %}{% picture child.image alt=child.name %}').render(Context({'child': child}))
+        self.assertIn('<source type="image/webp" srcset="/media/derivatives/child_photos/', html)
+        self.assertIn('alt="Lucia"', html)
+
+        child.delete()
+        self.assertFalse(default_storage.exists(self.service.derivative_name(name, 'card', 'webp')))
+
+        # The key of the finished task does not keep the image from being queued again
+        with self.captureOnCommitCallbacks(execute=True):
+            YourChild_Model.objects.create(
+                user=self.user, name='Lucia', birth_date=date(2025, 1, 1), gender='F', age=12, image=name
+            )
+        TaskQueue_Service().run_pending()
+        self.assertTrue(default_storage.exists(self.service.derivative_name(name, 'card', 'webp')))
+
+    def test_missing_derivatives_are_made_on_first_request(self):
+        name = self.store('profile_photos/me.jpg', photo())
+
+        response = self.client.get(f'/images/card/jpeg/{name}')
+
+        self.assertRedirects(response, '/media/derivatives/profile_photos/me.card.jpg', fetch_redirect_response=False)
+        self.assertTrue(default_storage.exists('derivatives/profile_photos/me.card.jpg'))
+        self.assertEqual(self.client.get('/images/card/jpeg/../settings.py').status_code, 404)
+        self.assertEqual(self.client.get('/images/huge/jpeg/profile_photos/me.jpg').status_code, 404)
+
+    def test_backfill_command(self):
+        YourChild_Model.objects.create(
+            user=self.user, name='Pablo', birth_date=date(2024, 1, 1), gender='M', age=24,
+            image=self.store('child_photos/pablo.jpg', photo())
+        )
+        cache.clear()
+
+        call_command('generate_image_derivatives', workers=1, stdout=io.StringIO())
+
+        self.assertEqual(self.service.get_widths('child_photos/pablo.jpg'), {'thumbnail': 160, 'card': 480, 'full': 1280})
@@ -0,0 +1,119 @@
+import threading
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+
+from tinySteps.models import ExternalNutritionData_Model
+from tinySteps.models.external.nutrition_models import normalize_ingredient
+from tinySteps.services.apis.edamam_service import EdamamAPI_Service
+from tinySteps.services.external.nutrition_data_service import NutritionData_Service
+from tinySteps.utils.helpers.cache_helper import EXTERNAL_API_CACHE, LRU_Cache, Single_Flight, get_cache
+
+NUTRIENTS = {'calories': 130, 'totalNutrients': {'PROCNT': {'quantity': 2.7}}}
+
+
+class NormalizeIngredient_Tests(SimpleTestCase):
+
+    def test_normalization(self):
+        for raw, expected in [
+            ('Rice', 'rice'),
+            ('  brown   RICE ', 'brown rice'),
+            ('2 cups of rice', 'rice'),
+            ('1 1/2 tbsp olive oil', 'olive oil'),
+            ('200g chicken breast', 'chicken breast'),
+            ('a pinch of salt', 'salt'),
+            ('apple', 'apple'),
+            ('200 g', '200 g'),
+        ]:
+            self.assertEqual(normalize_ingredient(raw), expected, raw)
+
+
+class LookupHelpers_Tests(SimpleTestCase):
+
+    def test_lru_evicts_least_recently_used(self):
+        lru = LRU_Cache(maxsize=2, ttl=60)
+        lru.set('a', 1)
+        lru.set('b', 2)
+        lru.get('a')
+        lru.set('c', 3)
+        self.assertEqual((lru.get('a'), lru.get('b'), lru.get('c')), (1, None, 3))
+
+    def test_lru_entries_expire(self):
+        lru = LRU_Cache(ttl=0)
+        lru.set('a', 1)
+        self.assertIsNone(lru.get('a'))
+
+    def test_single_flight_runs_once_for_concurrent_callers(self):
+        flight = Single_Flight()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            time.sleep(0.2)
+            return 'value'
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(flight.do('key', slow))) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ['value'] * 6)
+
+
+class IngredientLookup_Tests(TestCase):
+    """One miss costs one database lookup and at most one upstream call"""
+
+    def setUp(self):
+        get_cache(EXTERNAL_API_CACHE).clear()
+        NutritionData_Service.local_cache.clear()
+        patcher = mock.patch.object(EdamamAPI_Service, 'fetch_nutrition_data', return_value=NUTRIENTS)
+        self.fetch = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_miss_then_tiers(self):
+        with self.assertNumQueries(2):  # lookup + upsert
+            self.assertEqual(NutritionData_Service.get_ingredient_data('Rice'), NUTRIENTS)
+        self.fetch.assert_called_once_with('rice')
+
+        with self.assertNumQueries(0):  # in-process LRU
+            self.assertEqual(NutritionData_Service.get_ingredient_data('2 cups of rice'), NUTRIENTS)
+
+        NutritionData_Service.local_cache.clear()
+        with self.assertNumQueries(0):  # shared cache
+            NutritionData_Service.get_ingredient_data('rice')
+
+        NutritionData_Service.local_cache.clear()
+        get_cache(EXTERNAL_API_CACHE).clear()
+        with self.assertNumQueries(1):  # database, by normalized key
+            NutritionData_Service.get_ingredient_data('RICE')
+        self.assertEqual(self.fetch.call_count, 1)
+        self.assertEqual(ExternalNutritionData_Model.objects.get().normalized_ingredient, 'rice')
+
+    def test_edamam_service_does_not_probe_twice(self):
+        with self.assertNumQueries(2):
+            EdamamAPI_Service().get_nutrition_data('Rice')
+        self.assertEqual(self.fetch.call_count, 1)
+
+    def test_concurrent_misses_resolve_once(self):
+        calls = []
+
+        def slow_resolve(key):
+            calls.append(key)
+            time.sleep(0.2)
+            return NUTRIENTS
+
+        with mock.patch.object(NutritionData_Service, '_resolve', side_effect=slow_resolve):
+            threads = [
+                threading.Thread(target=NutritionData_Service.get_ingredient_data, args=(name,))
+                for name in ['Rice', 'rice ', '1 cup rice', 'RICE']
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(calls, ['rice'])
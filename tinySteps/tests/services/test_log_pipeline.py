@@ -0,0 +1,116 @@
+import io
+import logging
+import threading
+from contextlib import redirect_stderr
+from django.contrib.auth.models import User
+from django.test import RequestFactory, TestCase
+
+from tinySteps.models import AuditLog_Model, ConnectionError_Model
+from tinySteps.services.logger.audit_logger import AuditLogger
+from tinySteps.services.logger.log_pipeline import Log_Pipeline, Pipeline_Handler
+from tinySteps.utils.middleware.error_handling import ErrorHandler_Middleware
+
+
+class Collecting_Handler(logging.Handler):
+    """Handler keeping the formatted messages, optionally blocking until released"""
+
+    def __init__(self, gate=None):
+        super().__init__()
+        self.gate = gate
+        self.messages = []
+        self.threads = set()
+
+    def emit(self, record):
+        if self.gate is not None:
+            self.gate.wait(5)
+        self.threads.add(threading.current_thread().name)
+        self.messages.append(self.format(record))
+
+
+def make_logger(name, pipeline, handler):
+    logger = logging.getLogger(f'tests.log_pipeline.{name}')
+    logger.handlers = [Pipeline_Handler(pipeline, [handler])]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+class LogPipeline_Tests(TestCase):
+    """Producers only enqueue; the listener writes records and rows in batches"""
+
+    def test_records_are_written_by_the_listener(self):
+        pipeline = Log_Pipeline(ENABLED=True, QUEUE_SIZE=100, BATCH_SIZE=10)
+        handler = Collecting_Handler()
+        logger = make_logger('listener', pipeline, handler)
+
+        for number in range(25):
+            logger.info("Message %s", number)
+
+        self.assertTrue(pipeline.flush(timeout=5))
+        self.assertEqual(handler.messages, [f"Message {number}" for number in range(25)])
+        self.assertEqual(handler.threads, {'log-pipeline'})
+        pipeline.stop(timeout=5)
+        self.assertFalse(pipeline._thread.is_alive())
+
+    def test_full_queue_drops_and_counts(self):
+        gate = threading.Event()
+        pipeline = Log_Pipeline(ENABLED=True, QUEUE_SIZE=2, BATCH_SIZE=1, PUT_TIMEOUT=0)
+        handler = Collecting_Handler(gate)
+        logger = make_logger('full', pipeline, handler)
+
+        # The listener blocks in the first record, two more fill the queue
+        for number in range(10):
+            logger.info("Message %s", number)
+        gate.set()
+
+        self.assertTrue(pipeline.flush(timeout=5))
+        self.assertGreater(pipeline.dropped['log'], 0)
+        self.assertEqual(len(handler.messages) + pipeline.dropped['log'], 10)
+        self.assertEqual(pipeline.get_stats()['dropped'], {'log': pipeline.dropped['log']})
+        pipeline.stop(timeout=5)
+
+    def test_invalid_row_does_not_drop_the_batch(self):
+        pipeline = Log_Pipeline(ENABLED=False)
+
+        with redirect_stderr(io.StringIO()) as stderr:
+            pipeline.process([
+                ('db', ConnectionError_Model, {'error_type': 'timeout', 'path': '/a/', 'method': 'GET'}),
+                ('db', ConnectionError_Model, {'error_type': 'timeout', 'path': '/b/', 'method': 'GET', 'client_ip': None}),
+                ('db', ConnectionError_Model, {'error_type': 'timeout', 'path': '/c/', 'method': 'GET',
+                                               'traceback': lambda: 'formatted later'}),
+            ])
+
+        self.assertEqual(
+            list(ConnectionError_Model.objects.order_by('path').values_list('path', 'traceback')),
+            [('/a/', None), ('/c/', 'formatted later')]
+        )
+        self.assertEqual(pipeline.dropped['db'], 1)
+        self.assertIn('dropped 1 db item(s)', stderr.getvalue())
+
+
+class AuditLogger_Tests(TestCase):
+    """Audit entries and connection errors end up in the database through the pipeline"""
+
+    def test_audit_action_is_saved(self):
+        with self.assertLogs('audit', level='INFO') as logs:
+            AuditLogger().log_moderation_action('7', 'Sleep guide', 'approved', moderator='staff', reason='Good')
+
+        entry = AuditLog_Model.objects.get()
+        self.assertEqual((entry.entity_type, entry.entity_id, entry.action, entry.actor), ('guide', '7', 'approved', 'staff'))
+        self.assertEqual(entry.details, {'reason': 'Good'})
+        self.assertIn('AUDIT:MODERATION:{"timestamp": ', logs.output[0])
+
+    def test_broken_pipe_is_recorded(self):
+        request = RequestFactory().get('/forum/', REMOTE_ADDR='10.0.0.1')
+        request.user = User.objects.create_user(username='parent', password='testpass')
+
+        try:
+            raise BrokenPipeError("client went away")
+        except BrokenPipeError as exception:
+            with self.assertLogs('connection_errors', level='WARNING'):
+                response = ErrorHandler_Middleware(lambda request: None).process_exception(request, exception)
+
+        self.assertEqual(response.status_code, 500)
+        error = ConnectionError_Model.objects.get()
+        self.assertEqual((error.error_type, error.path, error.user), ('BrokenPipeError', '/forum/', 'parent'))
+        self.assertIn('client went away', error.traceback)
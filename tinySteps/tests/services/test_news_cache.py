@@ -0,0 +1,84 @@
+import threading
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from tinySteps.services.apis.news_service import NewsAPI_Service
+from tinySteps.tests.stub_server import Stub_Server
+from tinySteps.utils.helpers.cache_helper import EXTERNAL_API_CACHE, StaleWhileRevalidate_Cache
+
+
+class StaleWhileRevalidate_Tests(SimpleTestCase):
+    """External API responses are refreshed once per key and TTL, stale data is served meanwhile"""
+
+    def setUp(self):
+        self.cache = StaleWhileRevalidate_Cache(EXTERNAL_API_CACHE, ttl=60)
+        self.cache.cache.clear()
+        self.calls = []
+        self.background = []
+        self.cache.run_in_background = lambda func, *args: self.background.append((func, args))
+
+    def fetch(self, value='fresh'):
+        self.calls.append(value)
+        return value
+
+    def expire(self, key):
+        entry = self.cache.cache.get(key)
+        entry['fresh_until'] = time.time() - 1
+        self.cache.cache.set(key, entry)
+
+    def test_fresh_entries_do_not_call_upstream(self):
+        self.assertEqual(self.cache.get_or_fetch('news', self.fetch), 'fresh')
+        self.assertEqual(self.cache.get_or_fetch('news', self.fetch), 'fresh')
+        self.assertEqual(self.calls, ['fresh'])
+
+    def test_stale_entry_is_served_while_refreshing_once(self):
+        self.cache.get_or_fetch('news', lambda: 'old')
+        self.expire('news')
+
+        self.assertEqual(self.cache.get_or_fetch('news', self.fetch), 'old')
+        self.assertEqual(self.cache.get_or_fetch('news', self.fetch), 'old')
+        self.assertEqual(len(self.background), 1)
+
+        func, args = self.background[0]
+        func(*args)
+        self.assertEqual(self.cache.get_or_fetch('news', self.fetch), 'fresh')
+        self.assertEqual(self.calls, ['fresh'])
+
+    def test_last_good_value_is_kept_when_upstream_fails(self):
+        self.cache.get_or_fetch('news', lambda: 'good')
+        self.expire('news')
+
+        self.assertEqual(self.cache.get_or_fetch('news', lambda: None, force_refresh=True), 'good')
+        self.assertEqual(self.cache.get_or_fetch('news', self.fetch), 'good')
+        self.assertEqual(self.calls, [])
+
+    def test_concurrent_misses_call_upstream_once(self):
+        started = threading.Event()
+
+        def slow_fetch():
+            started.set()
+            time.sleep(0.2)
+            return self.fetch()
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.cache.get_or_fetch('news', slow_fetch)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.calls, ['fresh'])
+        self.assertEqual(results, ['fresh'] * 8)
+
+    def test_news_service_calls_upstream_once_per_ttl(self):
+        with Stub_Server([(200, {'articles': []})]) as server:
+            with mock.patch.object(NewsAPI_Service, 'BASE_URL', server.url):
+                NewsAPI_Service().get_parenting_articles()
+                NewsAPI_Service().get_parenting_articles()
+
+        self.assertEqual(len(server.requests), 1)
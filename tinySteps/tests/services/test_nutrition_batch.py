@@ -0,0 +1,67 @@
+import time
+from unittest import mock
+
+from django.test import TestCase
+
+from tinySteps.models import ExternalNutritionData_Model
+from tinySteps.services.apis.edamam_service import EdamamAPI_Service
+from tinySteps.services.apis.http_client import HTTP_Client
+from tinySteps.services.external.nutrition_data_service import NutritionData_Service
+from tinySteps.services.guides.nutrition_service import NutritionGuide_Service
+from tinySteps.tests.stub_server import Stub_Server
+from tinySteps.utils.helpers.cache_helper import EXTERNAL_API_CACHE, get_cache
+
+NUTRIENTS = {'calories': 52, 'totalNutrients': {'SUGAR': {'quantity': 10}}}
+
+
+class NutritionBatch_Tests(TestCase):
+    """Several ingredients are resolved from cache and database in bulk, misses are fetched concurrently"""
+
+    def setUp(self):
+        get_cache(EXTERNAL_API_CACHE).clear()
+        NutritionData_Service.local_cache.clear()
+        patcher = mock.patch('tinySteps.services.apis.http_client._client', HTTP_Client(MAX_RETRIES=0))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.service = NutritionGuide_Service()
+
+    def stub(self, server):
+        return mock.patch.object(EdamamAPI_Service, 'BASE_URL', f"{server.url}/api/nutrition-data")
+
+    def test_misses_are_fetched_concurrently_and_stored(self):
+        ExternalNutritionData_Model.objects.create(ingredient='Apple', data=NUTRIENTS)
+        ingredients = ['apple', 'banana', 'carrot', 'pear', 'rice']
+
+        with Stub_Server([(200, NUTRIENTS, 0.3)]) as server, self.stub(server):
+            started = time.monotonic()
+            with self.assertNumQueries(2):
+                results = self.service.compare_nutrition_data(ingredients)
+            elapsed = time.monotonic() - started
+
+        self.assertEqual(set(results), set(ingredients))
+        self.assertEqual(len(server.requests), 4)
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(ExternalNutritionData_Model.objects.count(), 5)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(set(self.service.get_nutrition_data_batch(ingredients)), set(ingredients))
+
+    def test_partial_results_after_deadline(self):
+        with Stub_Server([(200, NUTRIENTS), (200, NUTRIENTS, 2)]) as server, self.stub(server):
+            started = time.monotonic()
+            results = self.service.get_nutrition_data_batch(['kale', 'leek'], deadline=0.5)
+            elapsed = time.monotonic() - started
+
+        self.assertLess(elapsed, 1.5)
+        self.assertEqual(sorted(data is not None for data in results.values()), [False, True])
+        self.assertEqual(ExternalNutritionData_Model.objects.count(), 1)
+
+    def test_single_ingredient_uses_batch_path(self):
+        with Stub_Server([(200, NUTRIENTS)]) as server, self.stub(server):
+            self.assertEqual(self.service.get_nutrition_data(' Mango '), NUTRIENTS)
+        self.assertTrue(ExternalNutritionData_Model.objects.filter(normalized_ingredient='mango').exists())
+
+    def test_failed_ingredients_are_left_out_of_comparison(self):
+        with Stub_Server([(500, {})]) as server, self.stub(server):
+            self.assertEqual(self.service.compare_nutrition_data(['plum', 'fig']), {})
+        self.assertFalse(ExternalNutritionData_Model.objects.exists())
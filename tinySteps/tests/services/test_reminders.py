@@ -0,0 +1,111 @@
+from datetime import date, datetime, time, timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from tinySteps.models import CalendarEvent_Model, Notification_Model, Task_Model, YourChild_Model
+from tinySteps.services.core.reminder_service import Reminder_Service
+
+
+def local(day, hour, minute=0):
+    return timezone.make_aware(datetime.combine(day, time(hour, minute)), timezone.get_default_timezone())
+
+
+class RemindAt_Tests(TestCase):
+    """remind_at is precomputed on save from the date, time and reminder settings"""
+
+    def setUp(self):
+        user = User.objects.create_user(username='parent', password='testpass')
+        self.child = YourChild_Model.objects.create(
+            user=user, name='Lucia', birth_date=date(2024, 1, 1), gender='F', age=10
+        )
+        self.day = date(2030, 5, 10)
+
+    def create_event(self, **fields):
+        return CalendarEvent_Model.objects.create(
+            child=self.child, title='Check-up', type='doctor', date=self.day, **fields
+        )
+
+    def test_remind_at(self):
+        self.assertEqual(
+            self.create_event(time=time(10, 0), has_reminder=True, reminder_minutes=60).remind_at,
+            local(self.day, 9)
+        )
+        # All-day events are reminded relative to ALL_DAY_TIME, 30 minutes by default
+        self.assertEqual(self.create_event(is_all_day=True, has_reminder=True).remind_at, local(self.day, 8, 30))
+        self.assertIsNone(self.create_event(time=time(10, 0)).remind_at)
+        self.assertIsNone(self.create_event(has_reminder=True, status='cancelled').remind_at)
+
+    def test_moving_a_sent_reminder_makes_it_due_again(self):
+        event = self.create_event(time=time(10, 0), has_reminder=True, reminder_minutes=60)
+        CalendarEvent_Model.objects.filter(pk=event.pk).update(reminder_sent=True)
+        event.refresh_from_db()
+
+        event.title = 'Renamed'
+        event.save()
+        self.assertTrue(event.reminder_sent)
+
+        event.time = time(12, 0)
+        event.save(update_fields=['time'])
+        event.refresh_from_db()
+        self.assertEqual((event.remind_at, event.reminder_sent), (local(self.day, 11), False))
+
+
+class ReminderDispatch_Tests(TestCase):
+    """Due reminders become notifications and queued emails, in a constant number of queries per batch"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='parent', email='parent@example.com', password='testpass')
+        self.child = YourChild_Model.objects.create(
+            user=self.user, name='Lucia', birth_date=date(2024, 1, 1), gender='F', age=10
+        )
+        self.now = timezone.now()
+
+    def create_events(self, count, remind_in):
+        starts_at = timezone.localtime(self.now + remind_in + timedelta(minutes=30))
+        for number in range(count):
+            CalendarEvent_Model.objects.create(
+                child=self.child, title=f'Event {number}', type='doctor',
+                date=starts_at.date(), time=starts_at.time().replace(microsecond=0),
+                has_reminder=True, reminder_minutes=30
+            )
+
+    def test_due_reminders_are_sent_once(self):
+        self.create_events(3, remind_in=-timedelta(minutes=5))
+        self.create_events(2, remind_in=timedelta(hours=2))
+        self.create_events(1, remind_in=-timedelta(days=2))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            totals = Reminder_Service().dispatch(now=self.now)
+
+        self.assertEqual(totals, {'sent': 3, 'skipped': 1})
+        self.assertEqual(Notification_Model.objects.filter(user=self.user).count(), 3)
+        self.assertEqual(Task_Model.objects.filter(name='send_email').count(), 3)
+        self.assertEqual(CalendarEvent_Model.objects.filter(reminder_sent=True).count(), 4)
+        self.assertIn('Lucia', Notification_Model.objects.first().message)
+
+        self.assertEqual(Reminder_Service().dispatch(now=self.now), {'sent': 0, 'skipped': 0})
+
+    def test_queries_do_not_grow_with_the_batch(self):
+        self.create_events(3, remind_in=-timedelta(minutes=5))
+        with CaptureQueriesContext(connection) as small:
+            Reminder_Service().dispatch(now=self.now, batch_size=100)
+
+        self.create_events(40, remind_in=-timedelta(minutes=5))
+        with CaptureQueriesContext(connection) as large:
+            Reminder_Service().dispatch(now=self.now, batch_size=100)
+
+        self.assertEqual(len(small), len(large))
+
+    def test_command(self):
+        self.create_events(2, remind_in=-timedelta(minutes=5))
+        out = StringIO()
+
+        call_command('dispatch_reminders', stdout=out)
+
+        self.assertIn('Reminders sent: 2', out.getvalue())
@@ -0,0 +1,176 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from tinySteps.models import (
+    ExternalArticle_Model,
+    Guides_Model,
+    Notification_Model,
+    ParentsForum_Model,
+    SearchDocument_Model
+)
+from tinySteps.repositories import Forum_Repository, Guide_Repository
+from tinySteps.services.search.search_service import Search_Service
+
+GUIDE_BODY = "Weaning is a gradual process that every family lives differently. " * 6
+
+
+class Search_Tests(TestCase):
+    """The search index follows saves and deletes and ranks results across content types"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='parent', password='testpass')
+        self.sleep_post = ParentsForum_Model.objects.create(
+            author=self.user, title='Sleep regression at four months',
+            desc='Our baby stopped sleeping through the night, any sleep advice?', category='sleep'
+        )
+        self.feeding_post = ParentsForum_Model.objects.create(
+            author=self.user, title='Picky eater',
+            desc='He only eats bananas. Sometimes he falls asleep after lunch.', category='feeding'
+        )
+        self.guide = Guides_Model.objects.create(
+            author=self.user, title='Weaning without stress', desc=GUIDE_BODY,
+            guide_type='nutrition', status='approved'
+        )
+        self.article = ExternalArticle_Model.objects.create(
+            title='Safe sleep guidelines', source_name='Health', url='https://example.com/safe-sleep',
+            description='What pediatricians recommend for infant sleep', published_at=timezone.now(),
+            category='parenting'
+        )
+
+    def test_ranked_results_across_content_types(self):
+        results = Search_Service().search('sleep')['results']
+
+        self.assertEqual(
+            {(row['kind'], row['object_id']) for row in results},
+            {('forum', self.sleep_post.pk), ('article', self.article.pk)}
+        )
+        scores = [row['score'] for row in results]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertIn('<mark>sleep</mark>', results[0]['snippet'])
+
+    def test_last_word_matches_as_prefix(self):
+        results = Search_Service().search('wean')['results']
+
+        self.assertEqual([(row['kind'], row['object_id']) for row in results], [('nutrition_guide', self.guide.pk)])
+
+    def test_snippet_is_escaped(self):
+        self.feeding_post.desc = '<script>alert(1)</script> bananas'
+        self.feeding_post.save()
+
+        snippet = Search_Service().search('bananas')['results'][0]['snippet']
+
+        self.assertNotIn('<script>', snippet)
+        self.assertIn('&lt;script&gt;', snippet)
+        self.assertIn('<mark>bananas</mark>', snippet)
+
+    def test_index_follows_updates_and_deletes(self):
+        self.sleep_post.title = 'Night waking'
+        self.sleep_post.desc = 'Our baby wakes up every hour'
+        self.sleep_post.save()
+        self.article.delete()
+
+        self.assertEqual(Search_Service().search('sleep')['results'], [])
+        self.assertEqual(len(Search_Service().search('waking')['results']), 1)
+
+    def test_only_approved_guides_are_searchable(self):
+        self.guide.status = 'rejected'
+        self.guide.save()
+
+        self.assertEqual(Search_Service().search('weaning')['results'], [])
+        self.assertFalse(SearchDocument_Model.objects.filter(object_id=self.guide.pk, kind='nutrition_guide').exists())
+
+    def test_admin_bulk_moderation_updates_the_index(self):
+        admin_user = User.objects.create_superuser(username='admin', password='adminpass', email='admin@example.com')
+        self.client.force_login(admin_user)
+        pending = Guides_Model.objects.create(
+            author=self.user, title='Weaning at night', desc=GUIDE_BODY, guide_type='parent', status='pending'
+        )
+        url = reverse('admin:tinySteps_guides_model_changelist')
+
+        # From the changelist filtered to pending guides, which the update empties
+        self.client.post(f'{url}?status__exact=pending', {'action': 'approve_guides', '_selected_action': [pending.pk]})
+        self.assertEqual(
+            {row['object_id'] for row in Search_Service().search('weaning')['results']}, {self.guide.pk, pending.pk}
+        )
+        self.assertTrue(Notification_Model.objects.filter(user=self.user, message__contains='Weaning at night').exists())
+
+        self.client.post(f'{url}?status__exact=approved', {
+            'action': 'reject_guides', '_selected_action': [self.guide.pk, pending.pk],
+            'apply': '1', 'rejection_reason': 'Duplicated'
+        })
+        self.assertEqual(Search_Service().search('weaning')['results'], [])
+
+    def test_cursor_pagination(self):
+        for number in range(5):
+            ParentsForum_Model.objects.create(
+                author=self.user, title=f'Teething question {number}', desc='Teething and drooling', category='health'
+            )
+        service = Search_Service()
+
+        seen, cursor = [], None
+        while True:
+            page = service.search('teething', cursor=cursor, limit=2)
+            seen.extend(row['object_id'] for row in page['results'])
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+
+        self.assertEqual(len(seen), 5)
+        self.assertEqual(len(set(seen)), 5)
+
+    def test_repositories_rank_with_the_index(self):
+        self.assertEqual(list(Forum_Repository().search_posts('sleep')), [self.sleep_post])
+        self.assertEqual(list(Forum_Repository().search_posts('', 'feeding')), [self.feeding_post])
+        self.assertEqual(list(Guide_Repository(Guides_Model).search_guides('weaning', 'nutrition')), [self.guide])
+
+    def test_filters_apply_before_the_ranking_limit(self):
+        for number in range(3):
+            ParentsForum_Model.objects.create(
+                author=self.user, title=f'Sleep sleep sleep {number}', desc='Sleep tips', category='health'
+            )
+
+        with mock.patch.object(Search_Service, 'MAX_RANKED', 2):
+            # The sleep category post ranks below the three health posts
+            self.assertEqual(list(Forum_Repository().search_posts('sleep', 'sleep')), [self.sleep_post])
+
+    def test_rebuild(self):
+        SearchDocument_Model.objects.all().delete()
+
+        self.assertEqual(Search_Service().rebuild(), 4)
+        self.assertEqual(len(Search_Service().search('sleep')['results']), 2)
+
+
+class SearchAPI_Tests(TestCase):
+    """The search endpoint returns ranked results with a next link"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='parent', password='testpass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        for number in range(3):
+            ParentsForum_Model.objects.create(
+                author=self.user, title=f'Potty training {number}', desc='Tips for potty training', category='care'
+            )
+
+    def test_search_pages(self):
+        response = self.client.get(reverse('api:search'), {'q': 'potty', 'type': 'forum', 'page_size': 2})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertEqual(response.data['results'][0]['type'], 'forum')
+        self.assertIsNotNone(response.data['next'])
+
+        response = self.client.get(response.data['next'])
+
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertIsNone(response.data['next'])
+
+    def test_unknown_type(self):
+        response = self.client.get(reverse('api:search'), {'q': 'potty', 'type': 'recipes'})
+
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,157 @@
+from unittest import mock
+
+import numpy as np
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from scipy import sparse
+from scipy.sparse.linalg import norm as sparse_norm
+
+from tinySteps.models import ExternalArticle_Model, Guides_Model, RelatedGuide_Model, Task_Model
+from tinySteps.repositories import Guide_Repository
+from tinySteps.repositories.content.article_repository import Article_Repository
+from tinySteps.services.search.similarity_service import (
+    Similarity_Service,
+    Tfidf_Vectorizer,
+    cache,
+    nearest_neighbours,
+    tokenize
+)
+from tinySteps.services.tasks.task_queue_service import TaskQueue_Service
+
+
+class Tfidf_Tests(SimpleTestCase):
+    """Documents are compared on L2-normalized TF-IDF vectors"""
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize('The baby and the 2 bottles: Sueño del bebé'), ['baby', 'bottles', 'sueño', 'bebé'])
+
+    def test_vectors_and_neighbours(self):
+        matrix = Tfidf_Vectorizer().fit_transform([
+            'sleep routine for the baby at night',
+            'night sleep and naps routine',
+            'first solid food purees',
+            'solid food allergies',
+        ])
+
+        self.assertTrue(sparse.isspmatrix_csr(matrix))
+        np.testing.assert_allclose(sparse_norm(matrix, axis=1), 1, rtol=1e-6)
+        neighbours = nearest_neighbours(matrix, k=2, block_size=3, min_score=0.01)
+        self.assertEqual([list(rows) for rows, scores in neighbours], [[1], [0], [3], [2]])
+        self.assertTrue(all(0 < score <= 1 for rows, scores in neighbours for score in scores))
+
+
+class RelatedContent_Tests(TestCase):
+    """Related guides and articles are read from the precomputed neighbours"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='author', password='testpass')
+        self.service = Similarity_Service(NEIGHBOURS=2)
+        self.repository = Guide_Repository(Guides_Model)
+
+    def create_guide(self, title, desc, guide_type='parent', status='approved'):
+        return Guides_Model.objects.create(
+            author=self.user, title=title, desc=desc, guide_type=guide_type, status=status
+        )
+
+    def related_ids(self, guide):
+        return list(RelatedGuide_Model.objects.filter(guide=guide).order_by('-score').values_list('related_id', flat=True))
+
+    def test_rebuild_and_single_query_read(self):
+        sleep = self.create_guide('Baby sleep routine', 'A calm night routine helps the baby sleep through the night')
+        naps = self.create_guide('Naps and night sleep', 'Short naps during the day and longer sleep at night')
+        food = self.create_guide('First solid food', 'Start solid food with smooth purees and watch for allergies')
+        self.create_guide('Solid food allergies', 'Introduce solid food one at a time to spot allergies')
+        self.create_guide('Sleep for toddlers', 'Toddler night sleep and naps', guide_type='nutrition')
+
+        self.assertEqual(self.service.rebuild_guides(), 4)
+
+        self.assertEqual(self.related_ids(sleep), [naps.pk])
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.repository.get_related_guides(food, count=1)[0].title, 'Solid food allergies')
+        self.assertEqual(len(queries), 1)
+
+    def test_updates_reuse_the_fitted_group(self):
+        sleep = self.create_guide('Baby sleep routine', 'A calm night routine helps the baby sleep through the night')
+        self.create_guide('Naps and night sleep', 'Short naps during the day and longer sleep at night')
+        self.service.rebuild_guides()
+        naps = self.create_guide('Night naps', 'A night routine with short naps', status='pending')
+        naps.status = 'approved'
+        naps.save()
+
+        with mock.patch.object(Tfidf_Vectorizer, 'fit_transform') as fit_transform:
+            self.service.update_guide(naps.pk)
+
+        fit_transform.assert_not_called()
+        self.assertIn(sleep.pk, self.related_ids(naps))
+
+    def test_approval_updates_the_neighbours_incrementally(self):
+        sleep = self.create_guide('Baby sleep routine', 'A calm night routine helps the baby sleep through the night')
+        self.create_guide('First solid food', 'Start solid food with smooth purees and watch for allergies')
+        self.service.rebuild_guides()
+        self.assertEqual(self.related_ids(sleep), [])
+
+        naps = self.create_guide('Naps and night sleep', 'Short naps and a night routine', status='pending')
+        naps.status = 'approved'
+        with self.captureOnCommitCallbacks(execute=True):
+            naps.save()
+        TaskQueue_Service().run_pending()
+
+        self.assertEqual(self.related_ids(sleep), [naps.pk])
+        self.assertEqual(self.related_ids(naps), [sleep.pk])
+
+        naps.status = 'rejected'
+        naps.save()
+        self.assertFalse(RelatedGuide_Model.objects.filter(related=naps).exists())
+
+    def test_reapproval_after_unpublishing_is_not_deduplicated(self):
+        sleep = self.create_guide('Baby sleep routine', 'A calm night routine helps the baby sleep through the night')
+        naps = self.create_guide('Naps and night sleep', 'Short naps and a night routine', status='pending')
+        for status in ('approved', 'pending', 'approved'):
+            naps.status = status
+            with self.captureOnCommitCallbacks(execute=True):
+                naps.save()
+            TaskQueue_Service().run_pending()
+
+        self.assertEqual(self.related_ids(sleep), [naps.pk])
+        self.assertEqual(self.related_ids(naps), [sleep.pk])
+
+    def test_edit_while_the_update_runs_is_queued_again(self):
+        sleep = self.create_guide('Baby sleep routine', 'A calm night routine helps the baby sleep through the night')
+        naps = self.create_guide('Naps', 'Short naps during the day', status='pending')
+        naps.status = 'approved'
+        with self.captureOnCommitCallbacks(execute=True):
+            naps.save()
+        queue = TaskQueue_Service()
+        running = queue.claim('worker')
+
+        # Saved after the running task may have read the old text
+        naps.desc = 'Short naps and a calm night routine for the baby'
+        with self.captureOnCommitCallbacks(execute=True):
+            naps.save()
+        self.assertEqual(Task_Model.objects.filter(name='update_related_guides', status=Task_Model.PENDING).count(), 1)
+
+        queue.run_batch(running)
+        queue.run_pending()
+        self.assertEqual(self.related_ids(sleep), [naps.pk])
+
+    def test_articles_fall_back_to_their_category(self):
+        articles = [
+            ExternalArticle_Model.objects.create(
+                title=title, source_name='Health', url=f'https://example.com/{number}',
+                description=description, published_at=timezone.now(), category='parenting'
+            )
+            for number, (title, description) in enumerate([
+                ('Toddler tantrums', 'Calm answers to toddler tantrums'),
+                ('Handling tantrums', 'What to do when tantrums start'),
+                ('Screen time', 'How much screen time is fine'),
+            ])
+        ]
+        self.service.rebuild_articles()
+
+        related = Article_Repository().get_related_articles(articles[0].pk, limit=2)
+
+        self.assertEqual(related, [articles[1], articles[2]])
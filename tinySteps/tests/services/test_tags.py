@@ -0,0 +1,88 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from tinySteps.models import GuideTag_Model, Guides_Model, Tag_Model
+from tinySteps.models.content.tag_models import parse_tags, sync_guide_tags
+from tinySteps.repositories import Guide_Repository
+
+
+class GuideTags_Tests(TestCase):
+    """The comma-separated tags of a guide are mirrored into an indexed tag table"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='author', password='testpass')
+        self.repository = Guide_Repository(Guides_Model)
+
+    def create_guide(self, title, tags, guide_type='parent', status='approved'):
+        return Guides_Model.objects.create(
+            author=self.user, title=title, desc='Guide body', guide_type=guide_type, status=status, tags=tags
+        )
+
+    def tag_slugs(self, guide):
+        return sorted(guide.tag_index.values_list('slug', flat=True))
+
+    def test_parse_tags(self):
+        self.assertEqual(parse_tags(' Sleep ,  baby  food,sleep,, '), [('sleep', 'Sleep'), ('baby-food', 'baby food')])
+        self.assertEqual(parse_tags(['Sleep', 'Teething']), [('sleep', 'Sleep'), ('teething', 'Teething')])
+        self.assertEqual(parse_tags(None), [])
+
+    def test_save_keeps_the_index_in_sync(self):
+        guide = self.create_guide('Sleep basics', 'Sleep, Routines')
+        self.assertEqual(self.tag_slugs(guide), ['routines', 'sleep'])
+
+        guide = Guides_Model.objects.get(pk=guide.pk)
+        guide.set_tags(['routines', 'Naps'])
+        self.assertEqual(guide.tags, 'routines,Naps')
+        self.assertEqual(self.tag_slugs(guide), ['naps', 'routines'])
+
+        # Saving without touching the tags does not query the index
+        with CaptureQueriesContext(connection) as queries:
+            guide.save(update_fields=['title'])
+            Guides_Model.objects.get(pk=guide.pk).save()
+        self.assertFalse(any('tag_model' in query['sql'].lower() for query in queries.captured_queries))
+
+        self.assertEqual(Tag_Model.objects.count(), 3)
+
+    def test_sync_is_batched(self):
+        guides = [self.create_guide(f'Guide {number}', '') for number in range(20)]
+
+        with CaptureQueriesContext(connection) as queries:
+            sync_guide_tags({guide.pk: parse_tags('Sleep, Food') for guide in guides})
+
+        self.assertLessEqual(len(queries), 5)
+        self.assertEqual(GuideTag_Model.objects.count(), 40)
+
+    def test_facets_filters_and_related_guides(self):
+        guide = self.create_guide('Sleep basics', 'Sleep, Routines, Naps')
+        close = self.create_guide('Nap schedules', 'naps, routines')
+        loose = self.create_guide('Bedtime stories', 'Sleep')
+        self.create_guide('Draft', 'Sleep', status='pending')
+        self.create_guide('Purees', 'Sleep', guide_type='nutrition')
+        latest = self.create_guide('Teething', 'Teeth')
+
+        self.assertEqual(self.repository.get_tag_counts(guide_type='parent'), [
+            {'slug': 'naps', 'name': 'Naps', 'count': 2},
+            {'slug': 'routines', 'name': 'Routines', 'count': 2},
+            {'slug': 'sleep', 'name': 'Sleep', 'count': 2},
+            {'slug': 'teeth', 'name': 'Teeth', 'count': 1},
+        ])
+        self.assertEqual(
+            list(self.repository.get_guides_by_tag('naps', guide_type='parent')), [close, guide]
+        )
+        self.assertEqual(self.repository.get_related_guides(guide, count=3), [close, loose, latest])
+
+    def test_api_tag_filter_and_facets(self):
+        sleep = self.create_guide('Sleep basics', 'Sleep')
+        self.create_guide('Teething', 'Teeth')
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = client.get(reverse('api:parents-guide-list'), {'tag': 'sleep'})
+        self.assertEqual([item['id'] for item in response.json()['results']], [sleep.pk])
+
+        response = client.get(reverse('api:parents-guide-tags'))
+        self.assertEqual([facet['slug'] for facet in response.json()], ['sleep', 'teeth'])
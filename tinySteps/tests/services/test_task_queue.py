@@ -0,0 +1,117 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from tinySteps.models import ParentsGuides_Model, Task_Model
+from tinySteps.services.guides.moderation_service import GuideModeration_Service
+from tinySteps.services.tasks import task_queue_service
+from tinySteps.services.tasks.task_queue_service import TaskQueue_Service, enqueue_email
+
+
+class TaskQueue_Tests(TestCase):
+    """Tasks are enqueued on commit, claimed once, retried with backoff and run in batches"""
+
+    def setUp(self):
+        self.service = TaskQueue_Service(MAX_ATTEMPTS=2, RETRY_BACKOFF=60)
+        self.calls = []
+
+        @TaskQueue_Service.register('test_flaky')
+        def flaky(payload, context):
+            self.calls.append(payload['n'])
+            if payload.get('fail'):
+                raise RuntimeError("temporary failure")
+
+        self.addCleanup(TaskQueue_Service._handlers.pop, 'test_flaky')
+
+    def test_enqueued_on_commit_once_per_key(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.service.enqueue('test_flaky', {'n': 1}, key='once')
+            self.assertFalse(Task_Model.objects.exists())
+        self.service.enqueue('test_flaky', {'n': 2}, key='once', on_commit=False)
+
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(list(Task_Model.objects.values_list('payload', flat=True)), [{'n': 1}])
+        with self.assertRaises(ValueError):
+            self.service.enqueue('no_such_task')
+
+    def test_claimed_tasks_are_not_claimed_again(self):
+        for n in range(5):
+            self.service.enqueue('test_flaky', {'n': n}, on_commit=False)
+        self.service.enqueue('test_flaky', {'n': 99}, run_at=timezone.now() + timedelta(hours=1), on_commit=False)
+
+        first = self.service.claim('worker-a', batch_size=3)
+        second = self.service.claim('worker-b', batch_size=10)
+
+        self.assertEqual([task.payload['n'] for task in first], [0, 1, 2])
+        self.assertEqual([task.payload['n'] for task in second], [3, 4])
+        self.assertEqual(self.service.claim('worker-c'), [])
+        self.assertEqual(self.service.run_batch(first + second), 5)
+        self.assertEqual(Task_Model.objects.filter(status=Task_Model.DONE).count(), 5)
+
+    def test_failure_is_retried_with_backoff_then_given_up(self):
+        self.service.enqueue('test_flaky', {'n': 1, 'fail': True}, on_commit=False)
+
+        with self.assertLogs(task_queue_service.logger, level='WARNING'):
+            self.assertEqual(self.service.run_pending(), 0)
+        task = Task_Model.objects.get()
+        self.assertEqual((task.status, task.attempts), (Task_Model.PENDING, 1))
+        self.assertGreater(task.run_at, timezone.now() + timedelta(seconds=50))
+        self.assertIn('temporary failure', task.last_error)
+
+        Task_Model.objects.update(run_at=timezone.now())
+        with self.assertLogs(task_queue_service.logger, level='ERROR'):
+            self.service.run_pending()
+        task.refresh_from_db()
+        self.assertEqual((task.status, task.attempts), (Task_Model.FAILED, 2))
+        self.assertEqual(self.calls, [1, 1])
+
+    def test_stale_tasks_are_released(self):
+        self.service.enqueue('test_flaky', {'n': 1}, on_commit=False)
+        self.service.claim('dead-worker')
+        Task_Model.objects.update(locked_at=timezone.now() - timedelta(hours=1))
+
+        self.assertEqual(self.service.release_stale(), 1)
+        self.assertEqual(self.service.run_pending(), 1)
+
+
+class EmailTasks_Tests(TestCase):
+    """Emails leave the request and are sent in batches over one connection"""
+
+    def setUp(self):
+        self.author = User.objects.create_user(username='author', email='author@example.com', password='testpass')
+        self.moderator = User.objects.create_user(username='mod', password='testpass', is_staff=True)
+
+    def test_emails_share_one_connection(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for n in range(3):
+                enqueue_email(f"Subject {n}", "Body", [f"parent{n}@example.com"])
+        self.assertEqual(len(mail.outbox), 0)
+
+        with mock.patch.object(task_queue_service, 'get_connection', wraps=task_queue_service.get_connection) as opened:
+            out = StringIO()
+            call_command('run_worker', '--once', stdout=out)
+
+        self.assertEqual(opened.call_count, 1)
+        self.assertEqual([message.to for message in mail.outbox], [[f"parent{n}@example.com"] for n in range(3)])
+        self.assertIn('3 tasks done', out.getvalue())
+
+    def test_moderation_email_is_queued(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            guide = ParentsGuides_Model.objects.create(
+                title='Sleeping routines', desc='x' * 300, author=self.author, guide_type='parent', status='pending'
+            )
+            GuideModeration_Service().approve_guide(guide.id, self.moderator)
+        self.assertEqual(len(mail.outbox), 0)
+
+        self.assertEqual(
+            sorted(Task_Model.objects.values_list('name', flat=True)),
+            ['mail_admins', 'send_email', 'update_related_guides']
+        )
+        TaskQueue_Service().run_pending()
+        self.assertEqual(mail.outbox[-1].to, ['author@example.com'])
+        self.assertIn('Sleeping routines', mail.outbox[-1].body)
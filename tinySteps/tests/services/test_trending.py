@@ -0,0 +1,78 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from tinySteps.models import Guides_Model, ParentsForum_Model
+from tinySteps.services import Forum_Service, ParentGuide_Service
+from tinySteps.services.core.trending_service import Trending_Service
+
+
+class Trending_Tests(TestCase):
+    """Hot scores decay with age, are refreshed incrementally and drive the popular lists"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='parent', password='testpass')
+        self.service = Trending_Service()
+
+    def create_post(self, title, likes=0, comments=0, age=timedelta()):
+        post = ParentsForum_Model.objects.create(author=self.user, title=title, desc='Body')
+        ParentsForum_Model.objects.filter(pk=post.pk).update(
+            likes_count=likes, comments_count=comments, created_at=timezone.now() - age
+        )
+        return post
+
+    def test_score_decays_with_age(self):
+        now = timezone.now()
+        decay = timedelta(seconds=self.service.decay_seconds)
+
+        self.assertGreater(self.service.score(5, 0, now), self.service.score(5, 0, now - timedelta(hours=1)))
+        # Ten times the engagement makes up for one decay period of age
+        self.assertAlmostEqual(
+            self.service.score(9, 0, now - decay), self.service.score(0, 0, now), places=4
+        )
+        self.assertGreater(self.service.score(0, 1, now), self.service.score(1, 0, now))
+
+    def test_refresh_only_rewrites_changed_rows(self):
+        post = self.create_post('Naps', likes=3)
+        self.create_post('Bottles')
+
+        self.assertEqual(self.service.refresh(batch_size=1), {'forum_posts': 2, 'guides': 0})
+        self.assertEqual(self.service.refresh(), {'forum_posts': 0, 'guides': 0})
+
+        ParentsForum_Model.objects.filter(pk=post.pk).update(likes_count=4)
+        self.assertEqual(self.service.refresh(), {'forum_posts': 1, 'guides': 0})
+
+    def test_popular_posts(self):
+        self.create_post('Old but loved', likes=500, age=timedelta(days=1))
+        self.create_post('Fresh', likes=2)
+        self.create_post('Quiet', age=timedelta(hours=1))
+        self.create_post('Last month', likes=1000, age=timedelta(days=30))
+        output = StringIO()
+        call_command('refresh_trending', stdout=output)
+        self.assertIn('forum posts: 4, guides: 0', output.getvalue())
+
+        titles = [post.title for post in Forum_Service().get_popular_posts(days=7, limit=5)]
+
+        self.assertEqual(titles, ['Old but loved', 'Fresh', 'Quiet'])
+        self.assertEqual(Forum_Service().get_popular_posts(days=None, limit=5)[3].title, 'Last month')
+
+    def test_popular_guides(self):
+        for title, comments, status in [('Sleep guide', 1, 'approved'), ('Feeding guide', 6, 'approved'),
+                                        ('Pending guide', 50, 'pending')]:
+            guide = Guides_Model.objects.create(
+                author=self.user, title=title, desc='x' * 300, guide_type='parent', status=status
+            )
+            Guides_Model.objects.filter(pk=guide.pk).update(comments_count=comments)
+        self.service.refresh()
+        service = ParentGuide_Service()
+
+        self.assertEqual(
+            [guide.title for guide in service.get_popular_articles(limit=3)], ['Feeding guide', 'Sleep guide']
+        )
+        self.assertEqual(
+            [guide.title for guide in service.sort_by_popularity(Guides_Model.objects.all())][0], 'Pending guide'
+        )
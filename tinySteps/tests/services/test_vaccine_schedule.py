@@ -0,0 +1,127 @@
+from datetime import date, timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from tinySteps.models import VaccineCard_Model, VaccineSchedule_Model, Vaccine_Model, YourChild_Model
+from tinySteps.services.core.child_service import Child_Service
+from tinySteps.services.core.vaccine_schedule_service import VaccineSchedule_Service
+from tinySteps.utils.helpers.cache_helper import QUERY_CACHE, get_cache
+
+
+def codes(doses):
+    return [dose['vaccine'] for dose in doses]
+
+
+class VaccineSchedule_Tests(TestCase):
+    """Due doses are projected from the schedule table and the vaccines recorded on the card"""
+
+    def setUp(self):
+        get_cache(QUERY_CACHE).clear()
+        VaccineSchedule_Service().load()
+        self.user = User.objects.create_user(username='parent', password='testpass')
+        self.today = date(2026, 6, 1)
+        self.child = self.create_child('Lucia', self.today - timedelta(days=70))
+        self.service = VaccineSchedule_Service()
+
+    def create_child(self, name, birth_date):
+        child = YourChild_Model.objects.create(user=self.user, name=name, birth_date=birth_date, gender='F', age=2)
+        VaccineCard_Model.objects.create(child=child)
+        return child
+
+    def record(self, child, name, age_days, administered=True):
+        return Vaccine_Model.objects.create(
+            vaccine_card=child.vaccine_card, name=name,
+            date=child.birth_date + timedelta(days=age_days), administered=administered
+        )
+
+    def test_nothing_recorded(self):
+        schedule = self.service.get_child_schedule(self.child, self.today)
+
+        self.assertEqual(codes(schedule['overdue']), ['HepB'])
+        self.assertEqual(sorted(codes(schedule['recommended'])), ['DTaP', 'Hib', 'IPV', 'PCV', 'RV'])
+        self.assertEqual(schedule['upcoming'], [])
+        self.assertEqual(schedule['overdue'][0]['late_date'], self.child.birth_date + timedelta(days=60))
+        self.assertEqual(schedule['recommended'][0]['recommended_age'], '1 month')
+
+    def test_recorded_vaccines_are_diffed(self):
+        self.record(self.child, 'HepB', 1)
+        self.record(self.child, 'Hexavalent (DTaP-IPV-Hib-HepB)', 60)
+        self.record(self.child, 'DTaP-IPV', 90, administered=False)
+        self.record(self.child, 'Yellow fever', 65)
+
+        schedule = self.service.get_child_schedule(self.child, self.today)
+
+        # Second doses follow the combined vaccine by its 28 day interval
+        upcoming = {dose['vaccine']: dose for dose in schedule['upcoming']}
+        self.assertEqual(sorted(upcoming), ['DTaP', 'Hib', 'IPV'])
+        self.assertEqual(upcoming['DTaP']['dose'], 2)
+        self.assertEqual(upcoming['DTaP']['due_date'], self.child.birth_date + timedelta(days=88))
+        self.assertEqual(upcoming['IPV']['planned_date'], self.child.birth_date + timedelta(days=90))
+        self.assertIsNone(upcoming['Hib']['planned_date'])
+        self.assertEqual(sorted(codes(schedule['recommended'])), ['PCV', 'RV'])
+        self.assertEqual(schedule['overdue'], [])
+        self.assertEqual(schedule['unmatched'], ['Yellow fever'])
+
+    def test_completed_vaccine(self):
+        for age_days in (0, 30, 170):
+            self.record(self.child, 'Hepatitis B', age_days)
+
+        schedule = self.service.get_child_schedule(self.child, self.today)
+
+        self.assertEqual(schedule['completed'], ['HepB'])
+        self.assertNotIn('HepB', codes(schedule['overdue'] + schedule['recommended'] + schedule['upcoming']))
+
+    def test_bulk_projection_matches_and_does_not_grow_queries(self):
+        self.record(self.child, 'Hexavalent', 60)
+        self.service.get_schedule()
+        with CaptureQueriesContext(connection) as single:
+            expected = self.service.project(YourChild_Model.objects.filter(pk=self.child.pk), self.today)
+
+        for number in range(20):
+            child = self.create_child(f'Child {number}', self.today - timedelta(days=30 * number))
+            self.record(child, 'MMR', 400)
+        with CaptureQueriesContext(connection) as bulk:
+            projected = self.service.project(today=self.today)
+
+        self.assertEqual(len(single), len(bulk))
+        self.assertEqual(len(projected), 21)
+        self.assertEqual(projected[self.child.pk], expected[self.child.pk])
+
+    def test_cache_follows_the_card(self):
+        self.service.get_child_schedule(self.child, self.today)
+        with CaptureQueriesContext(connection) as cached:
+            self.service.get_child_schedule(self.child, self.today)
+        self.assertEqual(len(cached), 0)
+
+        self.record(self.child, 'HepB', 1)
+        self.assertNotIn('HepB', codes(self.service.get_child_schedule(self.child, self.today)['overdue']))
+
+        self.child.birth_date = self.today - timedelta(days=400)
+        self.child.save()
+        self.assertIn('MMR', codes(self.service.get_child_schedule(self.child, self.today)['recommended']))
+
+        VaccineSchedule_Model.objects.filter(vaccine='MMR').delete()
+        self.assertNotIn('MMR', codes(self.service.get_child_schedule(self.child, self.today)['recommended']))
+
+    def test_recommended_vaccines(self):
+        recommended = Child_Service().get_recommended_vaccines(self.child.pk, self.user)
+
+        self.assertTrue(recommended)
+        for dose in recommended:
+            self.assertIn(dose['status'], ('overdue', 'recommended'))
+            self.assertIn('name', dose)
+            self.assertIn('recommended_age', dose)
+
+    def test_command(self):
+        VaccineSchedule_Model.objects.all().delete()
+        out = StringIO()
+
+        call_command('load_vaccine_schedule', stdout=out)
+
+        self.assertIn(f"{VaccineSchedule_Model.objects.count()} doses", out.getvalue())
+        self.assertTrue(VaccineSchedule_Model.objects.filter(vaccine='MMR', dose=2).exists())
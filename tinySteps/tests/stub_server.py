@@ -0,0 +1,66 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class Stub_Server:
+    """Local HTTP server returning scripted responses, for the external API client tests
+
+    ``responses`` is a list of ``(status, body)`` or ``(status, body, delay)``
+    tuples served in order; the last one is repeated once the list runs out.
+    A ``bytes`` body is written as is in place of the whole response, to
+    serve malformed ones.
+    """
+
+    def __init__(self, responses=None):
+        self.responses = list(responses or [(200, {})])
+        self.requests = []
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), self._make_handler())
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _next_response(self, handler):
+        with self._lock:
+            self.requests.append({'path': handler.path, 'client_port': handler.client_address[1]})
+            response = self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+        status, body, *delay = response
+        return status, body, delay[0] if delay else 0
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                status, body, delay = stub._next_response(self)
+                if delay:
+                    time.sleep(delay)
+                if isinstance(body, bytes):
+                    self.wfile.write(body)
+                    self.close_connection = True
+                    return
+                payload = json.dumps(body).encode()
+                try:
+                    self.send_response(status)
+                    self.send_header('Content-Type', 'application/json')
+                    self.send_header('Content-Length', str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,30 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from tinySteps.models import ParentsForum_Model
+
+
+class ForumPage_Tests(TestCase):
+    """The forum page pages through every post with cursors"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='poster', password='testpass')
+        for number in range(105):
+            ParentsForum_Model.objects.create(title=f'Post {number}', desc='Body', author=self.user)
+
+    def test_feed_is_not_capped(self):
+        url = reverse('forum:parent_forum')
+        response = self.client.get(url)
+        seen = []
+
+        while True:
+            self.assertEqual(response.status_code, 200)
+            page = response.context['posts']
+            seen.extend(post.pk for post in page)
+            if not page.has_next():
+                break
+            response = self.client.get(url, {'cursor': page.next_cursor})
+
+        self.assertEqual(len(seen), 105)
+        self.assertEqual(len(set(seen)), 105)
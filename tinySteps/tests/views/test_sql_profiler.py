@@ -0,0 +1,102 @@
+from django.contrib.auth.models import User
+from django.http import HttpResponse
+from django.test import TestCase, override_settings
+from django.urls import path, reverse
+
+from tinySteps.models import ParentsForum_Model, SQLFingerprint_Model
+from tinySteps.utils.helpers.profiler_helper import fingerprint_sql, normalize_sql
+
+PROFILE_EVERY_REQUEST = {'SAMPLE_RATE': 1, 'SLOW_QUERY_MS': 10_000, 'N_PLUS_ONE_THRESHOLD': 3, 'STACK_DEPTH': 4}
+
+
+class SQLFingerprint_Tests(TestCase):
+    """Statements differing only in their literals share one fingerprint"""
+
+    def test_normalize_sql(self):
+        self.assertEqual(
+            normalize_sql("SELECT * FROM t WHERE id IN (1, 2, 3) AND name = 'O''Brien'  AND x = %s"),
+            "SELECT * FROM t WHERE id IN (...) AND name = ? AND x = ?"
+        )
+        self.assertEqual(
+            normalize_sql('INSERT INTO "t" ("a", "b") VALUES (%s, %s), (%s, %s), (%s, %s)'),
+            'INSERT INTO "t" ("a", "b") VALUES (?, ?), ...'
+        )
+        self.assertEqual(
+            fingerprint_sql('SELECT "U0"."id" FROM "t1" WHERE "U0"."id" = 7')[0],
+            fingerprint_sql('SELECT "U0"."id" FROM "t1" WHERE "U0"."id" = 42')[0]
+        )
+
+
+class SQLProfiler_Tests(TestCase):
+    """Sampled requests are fingerprinted, N+1s are flagged and staff can rank the statements"""
+
+    def setUp(self):
+        self.staff = User.objects.create_user(username='staff', password='testpass', is_staff=True)
+        for number in range(4):
+            author = User.objects.create_user(username=f'parent{number}', password='testpass')
+            ParentsForum_Model.objects.create(author=author, title=f'Post {number}', desc='Body')
+
+    @override_settings(SQL_PROFILER=PROFILE_EVERY_REQUEST)
+    def test_sampled_request_is_profiled(self):
+        with self.assertLogs('sql_profiler', level='INFO') as logs:
+            response = self.client.get(reverse('forum:parent_forum'))
+
+        report = response.wsgi_request.sql_profile
+        self.assertEqual(report['route'], '/forum/')
+        self.assertEqual(report['queries'], sum(entry['calls'] for entry in report['fingerprints']))
+        self.assertTrue(all(entry['call_site'] for entry in report['fingerprints']))
+        self.assertTrue(any('Profiled /forum/' in line for line in logs.output))
+
+        stored = SQLFingerprint_Model.objects.get(fingerprint=report['fingerprints'][0]['fingerprint'])
+        self.assertEqual(stored.calls, report['fingerprints'][0]['calls'])
+        self.assertEqual(stored.route, '/forum/')
+
+    @override_settings(SQL_PROFILER=PROFILE_EVERY_REQUEST)
+    def test_repeated_statement_is_flagged_as_n_plus_one(self):
+        # One author lookup per post when authors are not joined in
+        with self.settings(ROOT_URLCONF='tinySteps.tests.views.test_sql_profiler'):
+            response = self.client.get('/n-plus-one/')
+
+        report = response.wsgi_request.sql_profile
+        self.assertEqual(len(report['n_plus_one']), 1)
+        self.assertEqual(report['n_plus_one'][0]['calls'], 4)
+        self.assertIn('auth_user', report['n_plus_one'][0]['sql'])
+        self.assertIn('n_plus_one_view', report['n_plus_one'][0]['call_site'])
+        self.assertEqual(
+            SQLFingerprint_Model.objects.get(fingerprint=report['n_plus_one'][0]['fingerprint']).n_plus_one_requests, 1
+        )
+
+    def test_requests_are_not_profiled_by_default_in_tests(self):
+        response = self.client.get(reverse('forum:parent_forum'))
+
+        self.assertFalse(hasattr(response.wsgi_request, 'sql_profile'))
+        self.assertFalse(SQLFingerprint_Model.objects.exists())
+
+    def test_staff_page(self):
+        SQLFingerprint_Model.objects.record('a' * 40, 'SELECT ?', calls=2, total_time=0.5, max_time=0.3)
+        SQLFingerprint_Model.objects.record('b' * 40, 'UPDATE t SET x = ?', calls=9, total_time=0.1, max_time=0.01)
+        SQLFingerprint_Model.objects.record('a' * 40, 'SELECT ?', calls=1, total_time=0.1, max_time=0.4)
+        self.client.force_login(self.staff)
+
+        response = self.client.get(reverse('sql_profile'))
+        self.assertEqual([entry.sql for entry in response.context['fingerprints']], ['SELECT ?', 'UPDATE t SET x = ?'])
+        first = response.context['fingerprints'][0]
+        self.assertEqual((first.calls, round(first.max_ms), round(first.total_ms)), (3, 400, 600))
+
+        response = self.client.get(reverse('sql_profile'), {'sort': 'calls'})
+        self.assertEqual(response.context['fingerprints'][0].sql, 'UPDATE t SET x = ?')
+
+        self.client.post(reverse('sql_profile'), {'reset': '1'})
+        self.assertFalse(SQLFingerprint_Model.objects.exists())
+
+    def test_staff_only(self):
+        self.client.force_login(User.objects.get(username='parent0'))
+
+        self.assertNotEqual(self.client.get(reverse('sql_profile')).status_code, 200)
+
+
+def n_plus_one_view(request):
+    return HttpResponse(', '.join(post.author.username for post in ParentsForum_Model.objects.all()))
+
+
+urlpatterns = [path('n-plus-one/', n_plus_one_view)]
@@ -2,7 +2,7 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.urls import path, include
 
-from tinySteps.views.base import home_views
+from tinySteps.views.base import home_views, media_views
 from tinySteps.views.guides import guide_views, submission_views
 
 from tinySteps.factories import (
@@ -17,6 +17,9 @@ urlpatterns = [
     path('', home_views.index, name='index'),
     path('about/', home_views.about, name='about'),
     
+    # Resized images, generated on their first request when the worker has not made them yet
+    path('images/<str:size>/<str:image_format>/<path:name>', media_views.image_derivative, name='image_derivative'),
+    
     # Auth routes
     *AuthUrl_Factory.create_urls(),
     
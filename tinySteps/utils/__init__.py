@@ -12,7 +12,9 @@ from .decorators.permissions import (
 
 # Middleware
 from .middleware.error_handling import ErrorHandler_Middleware
+from .middleware.metrics import Metrics_Middleware
 from .middleware.request_logging import RequestLogging_Middleware
+from .middleware.sql_profiler import SQLProfiler_Middleware
 
 __all__ = [
     # Helpers
@@ -25,5 +27,5 @@ __all__ = [
     'ajax_required', 'staff_or_403', 'child_owner_required',
     
     # Middleware
-    'ErrorHandler_Middleware', 'RequestLogging_Middleware'
+    'ErrorHandler_Middleware', 'Metrics_Middleware', 'RequestLogging_Middleware', 'SQLProfiler_Middleware'
 ]
\ No newline at end of file
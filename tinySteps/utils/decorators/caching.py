@@ -1,10 +1,12 @@
 import hashlib
 import json
 import functools
-from django.core.cache import cache
+from tinySteps.utils.helpers.cache_helper import QUERY_CACHE, get_cache
 
-def cache_result(timeout=300):
+def cache_result(timeout=300, alias=QUERY_CACHE):
     """Decorator to cache function results (has a timeout of 5 minutes by default)"""
+    cache = get_cache(alias)
+
     def decorator(func):
         """Decorator to cache function results"""
         @functools.wraps(func)
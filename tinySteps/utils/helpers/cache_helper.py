@@ -0,0 +1,224 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+# Cache aliases (see CACHES in project/settings.py)
+EXTERNAL_API_CACHE = 'external_api'
+FRAGMENT_CACHE = 'fragments'
+QUERY_CACHE = 'queries'
+SESSION_CACHE = 'sessions'
+
+_MISSING = object()
+_stats_lock = threading.Lock()
+_stats = {}
+
+def _record(alias, hits=0, misses=0):
+    """Add hits and misses to the counters of a cache alias"""
+    with _stats_lock:
+        counters = _stats.setdefault(alias, {'hits': 0, 'misses': 0})
+        counters['hits'] += hits
+        counters['misses'] += misses
+
+def get_cache_stats():
+    """Get a snapshot of the hit/miss counters of every cache alias used by this process"""
+    with _stats_lock:
+        return {alias: dict(counters) for alias, counters in _stats.items()}
+
+def reset_cache_stats():
+    """Reset the hit/miss counters"""
+    with _stats_lock:
+        _stats.clear()
+
+class Instrumented_Cache:
+    """Proxy to a cache alias that counts hits and misses on reads
+
+    The backend is resolved from ``caches`` on every access because Django
+    keeps one connection per thread for each alias.
+    """
+
+    def __init__(self, alias):
+        self.alias = alias
+
+    @property
+    def backend(self):
+        return caches[self.alias]
+
+    def get(self, key, default=None, version=None):
+        value = self.backend.get(key, _MISSING, version=version)
+        if value is _MISSING:
+            _record(self.alias, misses=1)
+            return default
+        _record(self.alias, hits=1)
+        return value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        found = self.backend.get_many(keys, version=version)
+        _record(self.alias, hits=len(found), misses=len(keys) - len(found))
+        return found
+
+    def __getattr__(self, name):
+        # set, delete, add, clear, touch, ... go straight to the backend
+        return getattr(self.backend, name)
+
+def get_cache(alias):
+    """Get the instrumented cache for an alias"""
+    return Instrumented_Cache(alias)
+
+class StaleWhileRevalidate_Cache:
+    """Cache for slow upstream data that never makes callers wait on a refresh
+
+    Entries are stored as ``{'value', 'fresh_until'}`` and kept for ``stale_ttl``
+    seconds. A fresh entry is returned as is; a stale one is returned right away
+    while a background thread refreshes it. Only the caller that wins the lock
+    key (``cache.add`` is atomic on shared backends) talks to the upstream, so
+    there is at most one upstream call per key and TTL across all workers. When
+    the upstream fails the last good value is kept and served until the next TTL.
+    """
+
+    LOCK_SUFFIX = ':lock'
+    WAIT_INTERVAL = 0.05
+
+    def __init__(self, alias, ttl, stale_ttl=86400, lock_timeout=30):
+        self.alias = alias
+        self.cache = get_cache(alias)
+        self.ttl = ttl
+        self.stale_ttl = max(stale_ttl, ttl)
+        self.lock_timeout = lock_timeout
+
+    def get_or_fetch(self, key, fetch, force_refresh=False):
+        """Get the value for key, calling fetch() when it must be refreshed
+
+        fetch() returns the new value, or None when the upstream failed.
+        """
+        entry = self.cache.get(key)
+
+        if entry is not None and not force_refresh:
+            if entry['fresh_until'] > time.time():
+                return entry['value']
+            if self._acquire(key):
+                self.run_in_background(self._refresh, key, fetch, entry)
+            return entry['value']
+
+        if self._acquire(key):
+            return self._refresh(key, fetch, entry)
+
+        # Another caller is already fetching this key
+        return self._wait_for(key, entry)
+
+    def run_in_background(self, func, *args):
+        threading.Thread(target=func, args=args, daemon=True).start()
+
+    def _refresh(self, key, fetch, entry):
+        try:
+            try:
+                value = fetch()
+            except Exception as e:
+                logger.error(f"Error refreshing cache key {key}: {e}")
+                value = None
+
+            if value is not None:
+                self._store(key, value)
+                return value
+
+            if entry is not None:
+                # Keep serving the last good value, retry after one TTL
+                self._store(key, entry['value'])
+                return entry['value']
+            return None
+        finally:
+            self.cache.delete(key + self.LOCK_SUFFIX)
+
+    def _wait_for(self, key, entry):
+        deadline = time.monotonic() + self.lock_timeout
+        while time.monotonic() < deadline:
+            time.sleep(self.WAIT_INTERVAL)
+            if self.cache.backend.get(key + self.LOCK_SUFFIX) is None:
+                break
+
+        latest = self.cache.get(key)
+        if latest is not None:
+            return latest['value']
+        return entry['value'] if entry is not None else None
+
+    def _acquire(self, key):
+        return self.cache.add(key + self.LOCK_SUFFIX, True, self.lock_timeout)
+
+    def _store(self, key, value):
+        self.cache.set(
+            key, {'value': value, 'fresh_until': time.time() + self.ttl}, self.stale_ttl
+        )
+
+class LRU_Cache:
+    """Small in-process LRU cache with a TTL, to sit in front of a shared cache alias"""
+
+    def __init__(self, maxsize=256, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+class Single_Flight:
+    """Collapse concurrent calls for the same key into a single execution
+
+    The first caller runs the function; callers arriving while it runs wait
+    for and share its result (or exception).
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = Future()
+
+        if not leader:
+            return call.result()
+
+        try:
+            result = func()
+        except Exception as e:
+            call.set_exception(e)
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
@@ -0,0 +1,124 @@
+import os
+import time
+from django.conf import settings
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest
+)
+from prometheus_client import multiprocess
+
+# With PROMETHEUS_MULTIPROC_DIR set (before the first import of this module),
+# every gunicorn worker writes its samples to memory-mapped files in that
+# directory and render_metrics() aggregates them; the directory must be
+# emptied whenever the server is (re)started.
+MULTIPROCESS_DIR = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+REQUEST_LATENCY = Histogram(
+    'tinysteps_http_request_duration_seconds',
+    "Time spent serving a request, per route",
+    ['method', 'route'],
+    buckets=LATENCY_BUCKETS
+)
+REQUESTS = Counter(
+    'tinysteps_http_requests',
+    "Requests served, per route and status code",
+    ['method', 'route', 'status']
+)
+REQUEST_DB_QUERIES = Histogram(
+    'tinysteps_http_request_db_queries',
+    "Database queries run while serving a request, per route",
+    ['route'],
+    buckets=QUERY_COUNT_BUCKETS
+)
+REQUEST_DB_TIME = Histogram(
+    'tinysteps_http_request_db_duration_seconds',
+    "Time spent in the database while serving a request, per route",
+    ['route'],
+    buckets=LATENCY_BUCKETS
+)
+EXTERNAL_LATENCY = Histogram(
+    'tinysteps_external_request_duration_seconds',
+    "Latency of the calls to external APIs, per endpoint and outcome",
+    ['endpoint', 'outcome'],
+    buckets=LATENCY_BUCKETS
+)
+EXTERNAL_RETRIES = Counter(
+    'tinysteps_external_request_retries',
+    "Retried calls to external APIs, per endpoint",
+    ['endpoint']
+)
+LOG_RECORDS_DROPPED = Counter(
+    'tinysteps_log_records_dropped',
+    "Log records and audit/error rows dropped by the log pipeline (queue full or insert failed)",
+    ['kind']
+)
+
+UNMATCHED_ROUTE = '<unmatched>'
+
+class Query_Timer:
+    """Database execute wrapper counting the queries of a request and the time spent in them
+
+    Install with ``connection.execute_wrapper(timer)`` for the duration of the request.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.monotonic()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.monotonic() - started
+
+def get_route(request):
+    """Get the URL pattern a request was resolved to, which keeps the label set bounded
+
+    The language prefix of i18n_patterns is dropped so every language shares one route.
+    """
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return UNMATCHED_ROUTE
+    if not match.route:
+        return match.view_name or UNMATCHED_ROUTE
+
+    route = match.route
+    language, _, rest = route.partition('/')
+    if language in dict(settings.LANGUAGES):
+        route = rest
+    return f"/{route}"
+
+def observe_request(request, status, duration, timer):
+    """Record the latency, status and database work of a served request"""
+    route = get_route(request)
+    REQUEST_LATENCY.labels(method=request.method, route=route).observe(duration)
+    REQUESTS.labels(method=request.method, route=route, status=str(status)).inc()
+    REQUEST_DB_QUERIES.labels(route=route).observe(timer.count)
+    REQUEST_DB_TIME.labels(route=route).observe(timer.duration)
+
+def observe_external_call(endpoint, latency, error=False):
+    """Record the latency of one call to an external API"""
+    EXTERNAL_LATENCY.labels(endpoint=endpoint, outcome='error' if error else 'ok').observe(latency)
+
+def render_metrics():
+    """Get the metrics in the Prometheus text format, aggregated over every worker when multiprocess"""
+    if MULTIPROCESS_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry, path=MULTIPROCESS_DIR)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+def mark_process_dead(pid):
+    """Drop the live samples of a dead worker (call from gunicorn's ``child_exit`` hook)"""
+    if MULTIPROCESS_DIR:
+        multiprocess.mark_process_dead(pid, MULTIPROCESS_DIR)
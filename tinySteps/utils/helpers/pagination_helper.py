@@ -0,0 +1,139 @@
+import base64
+import binascii
+import json
+import logging
+
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import Q
+
+logger = logging.getLogger(__name__)
+
+class Keyset_Paginator:
+    """Paginate a queryset by seeking past the edge row of the previous page
+
+    Rows are ordered on a unique key (``created_at`` then ``id`` by default) and
+    each page filters on the key of the last row it follows instead of using
+    OFFSET, so deep pages cost the same as the first one and no COUNT(*) is run.
+    Pages are addressed by opaque cursors; ``approximate_count`` gives a cheap
+    total for display.
+    """
+
+    COUNT_CAP = 1000  # rows counted at most when the database cannot estimate
+
+    def __init__(self, queryset, per_page, ordering=('-created_at', '-id')):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = [(field.lstrip('-'), field.startswith('-')) for field in ordering]
+        self._approximate_count = None
+        self.count_is_capped = False
+
+    def page(self, cursor=None):
+        """Get the page addressed by cursor, or the first page"""
+        position, backwards = self.decode_cursor(cursor)
+        queryset = self.queryset
+
+        if position is not None:
+            queryset = queryset.filter(self._seek(position, backwards))
+
+        ordering = [
+            f"{'-' if descending != backwards else ''}{field}" for field, descending in self.ordering
+        ]
+        rows = list(queryset.order_by(*ordering)[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+
+        if backwards:
+            rows.reverse()
+            return Keyset_Page(rows, self, has_next=True, has_previous=has_more)
+        return Keyset_Page(rows, self, has_next=has_more, has_previous=position is not None)
+
+    @property
+    def approximate_count(self):
+        """Estimated number of rows: the planner estimate on PostgreSQL, a capped count elsewhere"""
+        if self._approximate_count is None:
+            queryset = self.queryset.order_by()
+            connection = connections[queryset.db]
+
+            if connection.vendor == 'postgresql':
+                sql, params = queryset.query.sql_with_params()
+                with connection.cursor() as cursor:
+                    cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+                    self._approximate_count = int(cursor.fetchone()[0][0]['Plan']['Plan Rows'])
+            else:
+                count = queryset[:self.COUNT_CAP + 1].count()
+                self.count_is_capped = count > self.COUNT_CAP
+                self._approximate_count = min(count, self.COUNT_CAP)
+
+        return self._approximate_count
+
+    def encode_cursor(self, row, backwards=False):
+        values = [getattr(row, 'pk' if field == 'id' else field) for field, _ in self.ordering]
+        # Full isoformat: the key must round-trip exactly, microseconds included
+        values = [value.isoformat() if hasattr(value, 'isoformat') else value for value in values]
+        payload = json.dumps([values, backwards])
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def decode_cursor(self, cursor):
+        """Decode a cursor into the key values it points at, ignoring malformed ones"""
+        if not cursor:
+            return None, False
+        try:
+            values, backwards = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            if len(values) != len(self.ordering):
+                raise ValueError("cursor does not match the ordering")
+            position = [
+                self.queryset.model._meta.get_field(field).to_python(value)
+                for (field, _), value in zip(self.ordering, values)
+            ]
+            return position, bool(backwards)
+        except (binascii.Error, ValueError, TypeError, ValidationError):
+            logger.warning(f"Ignoring invalid page cursor {cursor!r}")
+            return None, False
+
+    def _seek(self, position, backwards):
+        """Rows strictly after position in the pagination order (before it when backwards)"""
+        condition = Q()
+        equal = {}
+
+        for (field, descending), value in zip(self.ordering, position):
+            lookup = 'lt' if descending != backwards else 'gt'
+            condition |= Q(**equal, **{f"{field}__{lookup}": value})
+            equal[field] = value
+
+        return condition
+
+class Keyset_Page:
+    """One page of a Keyset_Paginator"""
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next and bool(object_list)
+        self._has_previous = has_previous and bool(object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        return self.paginator.encode_cursor(self.object_list[-1]) if self._has_next else None
+
+    @property
+    def previous_cursor(self):
+        return self.paginator.encode_cursor(self.object_list[0], backwards=True) if self._has_previous else None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
@@ -0,0 +1,150 @@
+import hashlib
+import logging
+import os
+import re
+import time
+import traceback
+from django.conf import settings
+
+logger = logging.getLogger('sql_profiler')
+
+DEFAULTS = {
+    'SAMPLE_RATE': 0.01,
+    'SLOW_QUERY_MS': 200,
+    'N_PLUS_ONE_THRESHOLD': 5,
+    'STACK_DEPTH': 4,
+}
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|\?")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_VALUES_ROWS = re.compile(r"\bVALUES\s*(\([^()]*\))(?:\s*,\s*\([^()]*\))+", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+# Frames of the profiling machinery itself are left out of the call sites
+_OWN_FRAMES = (os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + os.sep + 'middleware', __file__)
+
+def get_profiler_settings():
+    return {**DEFAULTS, **getattr(settings, 'SQL_PROFILER', {})}
+
+def normalize_sql(sql):
+    """Replace the literals and parameters of a statement so that repeated shapes compare equal"""
+    sql = _STRING.sub('?', sql)
+    sql = _PLACEHOLDER.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _IN_LIST.sub('IN (...)', sql)
+    sql = _VALUES_ROWS.sub(r'VALUES \1, ...', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+def fingerprint_sql(sql):
+    """Get the normalized form of a statement and a stable hash of it"""
+    normalized = normalize_sql(sql)
+    return hashlib.sha1(normalized.encode()).hexdigest(), normalized
+
+def get_call_site(depth):
+    """Summarize the innermost project frames of the current stack, e.g. ``views/forum_views.py:23 index``"""
+    root = str(settings.BASE_DIR)
+    frames = [
+        frame for frame in traceback.extract_stack()[:-2]
+        if frame.filename.startswith(root) and 'site-packages' not in frame.filename
+        and not frame.filename.startswith(_OWN_FRAMES)
+    ]
+    return ' < '.join(
+        f"{frame.filename[len(root) + 1:]}:{frame.lineno} {frame.name}" for frame in reversed(frames[-depth:])
+    )
+
+class SQL_Profiler:
+    """Database execute wrapper recording the fingerprint, duration and call site of every query
+
+    One profiler is installed with ``connection.execute_wrapper`` for the
+    duration of a sampled request; ``report()`` then summarizes the request
+    and ``save()`` adds it to the aggregated statistics.
+    """
+
+    def __init__(self, route_getter=None):
+        self.options = get_profiler_settings()
+        self.route_getter = route_getter or (lambda: '')
+        self.queries = {}
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.monotonic()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self._record(sql, time.monotonic() - started)
+
+    def _record(self, sql, duration):
+        fingerprint, normalized = fingerprint_sql(sql)
+        entry = self.queries.get(fingerprint)
+        if entry is None:
+            entry = self.queries[fingerprint] = {
+                'sql': normalized,
+                'calls': 0,
+                'total_time': 0.0,
+                'max_time': 0.0,
+                'call_site': get_call_site(self.options['STACK_DEPTH']),
+            }
+        entry['calls'] += 1
+        entry['total_time'] += duration
+        entry['max_time'] = max(entry['max_time'], duration)
+        self.count += 1
+        self.duration += duration
+
+        if duration * 1000 >= self.options['SLOW_QUERY_MS']:
+            logger.warning(
+                f"Slow query ({duration * 1000:.1f} ms) on {self.route_getter()}: {sql[:2000]} "
+                f"| at {get_call_site(self.options['STACK_DEPTH'])}"
+            )
+
+    def get_n_plus_one(self):
+        """Fingerprints repeated at least N_PLUS_ONE_THRESHOLD times, most repeated first"""
+        threshold = self.options['N_PLUS_ONE_THRESHOLD']
+        return sorted(
+            (fingerprint for fingerprint, entry in self.queries.items() if entry['calls'] >= threshold),
+            key=lambda fingerprint: -self.queries[fingerprint]['calls']
+        )
+
+    def report(self):
+        """Summary of the request: totals, its statements by total time and the likely N+1s"""
+        n_plus_one = self.get_n_plus_one()
+        report = {
+            'route': self.route_getter(),
+            'queries': self.count,
+            'duration': self.duration,
+            'fingerprints': sorted(
+                ({'fingerprint': fingerprint, **entry} for fingerprint, entry in self.queries.items()),
+                key=lambda entry: -entry['total_time']
+            ),
+            'n_plus_one': [{'fingerprint': fingerprint, **self.queries[fingerprint]} for fingerprint in n_plus_one],
+        }
+
+        for entry in report['n_plus_one']:
+            logger.warning(
+                f"Likely N+1 on {report['route']}: {entry['calls']} x {entry['sql'][:500]} | at {entry['call_site']}"
+            )
+        logger.info(
+            f"Profiled {report['route']}: {self.count} queries in {self.duration * 1000:.1f} ms, "
+            f"{len(self.queries)} distinct, {len(n_plus_one)} likely N+1"
+        )
+        return report
+
+    def save(self):
+        """Add the queries of this request to the aggregated per-fingerprint statistics"""
+        from tinySteps.models import SQLFingerprint_Model
+
+        route = self.route_getter()
+        n_plus_one = set(self.get_n_plus_one())
+        for fingerprint, entry in self.queries.items():
+            SQLFingerprint_Model.objects.record(
+                fingerprint,
+                entry['sql'],
+                calls=entry['calls'],
+                total_time=entry['total_time'],
+                max_time=entry['max_time'],
+                route=route,
+                call_site=entry['call_site'],
+                n_plus_one=fingerprint in n_plus_one
+            )
@@ -1,7 +1,9 @@
 import logging
 import traceback
 from django.http import HttpResponse
-from django.utils import timezone
+
+from tinySteps.models import ConnectionError_Model
+from tinySteps.services.logger.log_pipeline import get_log_pipeline
 
 logger = logging.getLogger('connection_errors')
 
@@ -23,34 +25,22 @@ class ErrorHandler_Middleware:
             user_agent = request.META.get('HTTP_USER_AGENT', 'unknown')
             user = request.user.username if request.user.is_authenticated else 'anonymous'
             
-            tb = traceback.format_exc()
-            
+            # Formatting the traceback and saving the row are left to the log pipeline's listener
             logger.warning(
-                f"Connection error at {timezone.now()}\n"
-                f"Error type: {type(exception).__name__}\n"
-                f"Path: {request.path}\n"
-                f"Method: {request.method}\n"
-                f"Client IP: {client_ip}\n"
-                f"User: {user}\n"
-                f"User Agent: {user_agent}\n"
-                f"Traceback: {tb}"
+                "Connection error %s on %s %s from %s (user=%s, agent=%s)",
+                type(exception).__name__, request.method, request.path, client_ip, user, user_agent,
+                exc_info=exception
+            )
+            get_log_pipeline().add_row(
+                ConnectionError_Model,
+                error_type=type(exception).__name__,
+                path=request.path[:255],
+                method=request.method,
+                client_ip=client_ip,
+                user=user,
+                user_agent=user_agent,
+                traceback=lambda: ''.join(traceback.format_exception(exception))[:2000]
             )
-            
-            # Try to record the error if ConnectionError_Model exists
-            try:
-                from tinySteps.models import ConnectionError_Model
-                ConnectionError_Model.objects.create(
-                    error_type=type(exception).__name__,
-                    path=request.path,
-                    method=request.method,
-                    client_ip=client_ip,
-                    user=user,
-                    user_agent=user_agent,
-                    traceback=tb[:2000]
-                )
-            except ImportError:
-                # Model doesn't exist, just log the error
-                pass
             
             return HttpResponse("Connection broken. Please try again.", status=500)
         
@@ -0,0 +1,23 @@
+import time
+from contextlib import ExitStack
+from django.db import connections
+
+from tinySteps.utils.helpers.metrics_helper import Query_Timer, observe_request
+
+class Metrics_Middleware:
+    """Middleware recording per-route latency, status codes and database work of every request"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timer = Query_Timer()
+        started = time.monotonic()
+
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+            response = self.get_response(request)
+
+        observe_request(request, response.status_code, time.monotonic() - started, timer)
+        return response
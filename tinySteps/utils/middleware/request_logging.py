@@ -14,9 +14,9 @@ class RequestLogging_Middleware:
         self._log_request(request)
         
         # Start a timer to calculate request time and calculate the response time
-        start_time = time.time()
+        start_time = time.monotonic()
         response = self.get_response(request)
-        request_time = time.time() - start_time
+        request_time = time.monotonic() - start_time
         self._log_response(request, response, request_time)
         
         return response
@@ -0,0 +1,40 @@
+import logging
+import random
+from contextlib import ExitStack
+from django.db import DatabaseError, connections
+
+from tinySteps.utils.helpers.metrics_helper import get_route
+from tinySteps.utils.helpers.profiler_helper import SQL_Profiler, get_profiler_settings
+
+logger = logging.getLogger('sql_profiler')
+
+class SQLProfiler_Middleware:
+    """Middleware profiling the SQL of a sampled fraction of the requests
+
+    Sampled requests get their queries fingerprinted, timed and attributed to
+    a call site; slow queries and likely N+1 patterns are logged and the
+    statistics are aggregated for the staff SQL profile page.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = get_profiler_settings()['SAMPLE_RATE']
+
+    def __call__(self, request):
+        if not self.sample_rate or random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        profiler = SQL_Profiler(route_getter=lambda: get_route(request))
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(profiler))
+            response = self.get_response(request)
+
+        # Outside the wrappers, so the profiler does not profile its own writes
+        request.sql_profile = profiler.report()
+        try:
+            profiler.save()
+        except DatabaseError as e:
+            logger.error(f"Could not save the SQL profile of {request.path}: {e}")
+
+        return response
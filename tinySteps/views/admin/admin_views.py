@@ -2,10 +2,11 @@ import logging
 from django.contrib import messages
 from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required, user_passes_test
+from django.db.models import ExpressionWrapper, F, FloatField
 from django.shortcuts import render, redirect, get_object_or_404
 from django.utils.translation import gettext as _
 
-from tinySteps.models import Guides_Model
+from tinySteps.models import Guides_Model, SQLFingerprint_Model
 from tinySteps.services.core.admin_service import AdminGuide_Service
 from tinySteps.views.guides.guide_views import admin_guides_panel_view
 from tinySteps.views.admin.moderation_views import review_guides as moderation_review_guides
@@ -90,6 +91,46 @@ def admin_dashboard(request):
     
     return render(request, 'admin/dashboard.html', context)
 
+@login_required
+@user_passes_test(lambda u: u.is_staff)
+def sql_profile(request):
+    """Statements seen by the sampling SQL profiler, ranked by total time by default"""
+    from tinySteps.utils.helpers.profiler_helper import get_profiler_settings
+
+    if request.method == 'POST' and 'reset' in request.POST:
+        SQLFingerprint_Model.objects.all().delete()
+        messages.success(request, _("SQL profile statistics reset"))
+        return redirect('sql_profile')
+
+    sort_options = [
+        ('total', _("Total time")),
+        ('calls', _("Calls")),
+        ('max', _("Slowest")),
+        ('n_plus_one', _("N+1")),
+    ]
+    orderings = {
+        'total': '-total_time',
+        'calls': '-calls',
+        'max': '-max_time',
+        'n_plus_one': '-n_plus_one_requests',
+    }
+    sort = request.GET.get('sort') if request.GET.get('sort') in orderings else 'total'
+
+    fingerprints = SQLFingerprint_Model.objects.annotate(
+        total_ms=ExpressionWrapper(F('total_time') * 1000, output_field=FloatField()),
+        average_ms=ExpressionWrapper(F('total_time') * 1000 / F('calls'), output_field=FloatField()),
+        max_ms=ExpressionWrapper(F('max_time') * 1000, output_field=FloatField()),
+    ).filter(calls__gt=0).order_by(orderings[sort], '-total_time')[:100]
+
+    context = {
+        'fingerprints': fingerprints,
+        'sort': sort,
+        'sort_options': sort_options,
+        'sample_rate': f"{get_profiler_settings()['SAMPLE_RATE']:.0%}",
+    }
+    
+    return render(request, 'admin/sql_profile.html', context)
+
 @staff_member_required
 def admin_guides_panel_view(request):
     """Admin guides panel that calls the function from guide_views.py"""
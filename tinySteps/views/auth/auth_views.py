@@ -3,7 +3,6 @@ from django.contrib.auth import login, views as auth_views
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
 from django.contrib.messages.views import SuccessMessageMixin
-from django.db import models
 from django.shortcuts import render, redirect
 from django.urls import reverse_lazy
 from django.utils.decorators import method_decorator
@@ -86,9 +85,7 @@ class Register_View(SuccessMessageMixin, CreateView):
 def profile(request):
     """User profile view"""
     children = YourChild_Model.objects.filter(user=request.user)
-    forum_posts = ParentsForum_Model.objects.filter(author=request.user)\
-        .annotate(comments_count=models.Count('comments'))\
-        .order_by('-created_at')
+    forum_posts = ParentsForum_Model.objects.filter(author=request.user).order_by('-created_at')
     
     context = {
         'children': children,
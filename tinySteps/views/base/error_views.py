@@ -1,6 +1,7 @@
 from django.shortcuts import render
 from django.utils.translation import gettext as _
 from tinySteps.models import ConnectionError_Model
+from tinySteps.services.logger.log_pipeline import get_log_pipeline
 import uuid
 import logging
 
@@ -31,9 +32,10 @@ def custom_error_500(request):
     """Handler for error 500 (Server Error)"""
     error_id = None
     try:
-        # This logs the error to database
+        # This queues the error to be saved to the database
         error_id = str(uuid.uuid4())[:8]
-        ConnectionError_Model.objects.create(
+        get_log_pipeline().add_row(
+            ConnectionError_Model,
             error_type="Server Error",
             path=request.path,
             method=request.method,
@@ -54,9 +56,10 @@ def database_error_view(request, error_message=None):
     """Utility function for database errors"""
     error_id = None
     try:
-        # This logs the error to database
+        # This queues the error to be saved to the database
         error_id = str(uuid.uuid4())[:8]
-        ConnectionError_Model.objects.create(
+        get_log_pipeline().add_row(
+            ConnectionError_Model,
             error_type="Database Error",
             path=request.path,
             method=request.method,
@@ -0,0 +1,18 @@
+from django.http import Http404
+from django.shortcuts import redirect
+from django.views.decorators.http import require_GET
+
+from tinySteps.services.media.image_service import Image_Service
+
+@require_GET
+def image_derivative(request, size, image_format, name):
+    """Generate a missing image derivative on its first request, then redirect to the stored file"""
+    service = Image_Service()
+    if size not in service.sizes or image_format not in service.formats or not service.is_source(name):
+        raise Http404("Unknown image derivative")
+
+    if service.get_widths(name) is None:
+        if not service.storage.exists(name) or service.generate(name) is None:
+            raise Http404("Image not found")
+
+    return redirect(service.storage.url(service.derivative_name(name, size, image_format)))
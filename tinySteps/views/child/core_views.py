@@ -8,6 +8,7 @@ from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 from tinySteps.models import YourChild_Model
 from tinySteps.forms import YourChild_Form
 from tinySteps.factories.child.child_factory import ChildService_Factory
+from tinySteps.services.core.dashboard_service import Dashboard_Service
 
 child_service = ChildService_Factory.create_service()
 
@@ -37,7 +38,7 @@ def your_children(request):
         'children': children_page,
         'search_query': search_query,
         'total_children': children.count(),
-        # You can add more statistics here as needed
+        'stats': Dashboard_Service().get_user_statistics(request.user),
     }
     
     # Check if it's an AJAX request
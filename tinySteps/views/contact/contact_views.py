@@ -3,11 +3,10 @@ from django.shortcuts import render, redirect
 from django.views import View
 from django.contrib import messages
 from django.utils.translation import gettext as _
-from django.core.mail import send_mail
-from django.conf import settings
 
 from tinySteps.forms.communication.contact_forms import Contact_Form
 from tinySteps.services.communication.contact_service import Contact_Service
+from tinySteps.services.tasks.task_queue_service import enqueue_email
 
 class Contact_View(View):
     """View for handling contact form"""
@@ -25,23 +24,16 @@ class Contact_View(View):
             service = Contact_Service()
             service.save_contact_request(form.cleaned_data)
             
-            # Send confirmation email
+            # Queue a copy of the message for the sender
             name = form.cleaned_data.get('name', '')
             email = form.cleaned_data.get('email', '')
             message_content = form.cleaned_data.get('message', '')
             
             subject = f"Contact form submission from {name}"
             message = f"From: {email}\n\nMessage: {message_content}"
-            from_email = settings.DEFAULT_FROM_EMAIL
             recipient_list = [email]  # Send to the user who submitted the form
             
-            send_mail(
-                subject,
-                message,
-                from_email,
-                recipient_list,
-                fail_silently=False,
-            )
+            enqueue_email(subject, message, recipient_list)
             
             messages.success(request, _("Thank you for contacting us! We'll respond shortly."))
             return redirect('contact')
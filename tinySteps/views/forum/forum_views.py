@@ -1,6 +1,5 @@
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import Paginator, PageNotAnInteger, EmptyPage
 from django.http import JsonResponse
 from django.shortcuts import render, redirect
 from django.utils.translation import gettext as _
@@ -8,6 +7,7 @@ from django.utils.translation import gettext as _
 from tinySteps.forms import ForumPost_Form, ForumComment_Form
 from tinySteps.models import ParentsForum_Model
 from tinySteps.services import Forum_Service
+from tinySteps.utils.helpers.pagination_helper import Keyset_Paginator
 
 def parents_forum_page(request):
     """Main forum page"""
@@ -20,16 +20,8 @@ def parents_forum_page(request):
     else:
         posts_list = service.get_posts()
     
-    # Pagination
-    page = request.GET.get('page', 1)
-    paginator = Paginator(posts_list, 4)  # We show 4 posts per page
-    
-    try:
-        posts = paginator.page(page)
-    except PageNotAnInteger:
-        posts = paginator.page(1)
-    except EmptyPage:
-        posts = paginator.page(paginator.num_pages)
+    # Keyset pagination on (created_at, id): no COUNT(*) or OFFSET scans on deep pages
+    posts = Keyset_Paginator(posts_list, 4).page(request.GET.get('cursor'))  # We show 4 posts per page
     
     context = {
         'posts': posts,
@@ -47,15 +39,7 @@ def search_posts(request):
     category = request.GET.get('category', '')
     
     posts_list = service.search_posts(query, category)
-    page = request.GET.get('page', 1)
-    paginator = Paginator(posts_list, 10)  # we show 10 posts per page
-    
-    try:
-        posts = paginator.page(page)
-    except PageNotAnInteger:
-        posts = paginator.page(1)
-    except EmptyPage:
-        posts = paginator.page(paginator.num_pages)
+    posts = Keyset_Paginator(posts_list, 10).page(request.GET.get('cursor'))  # we show 10 posts per page
     
     context = {
         'posts': posts,
@@ -196,7 +180,18 @@ def add_post_comment(request, post_id):
 
 @login_required
 def forum_post_like_toggle(request, post_id):
-    pass
+    """Toggle the like of the current user on a forum post"""
+    if request.method != 'POST':
+        return redirect('forum:view_post', post_id=post_id)
+    
+    post = Forum_Service().get_post(post_id)
+    liked = post.toggle_like(request.user)
+    post.refresh_from_db(fields=['likes_count'])
+    
+    if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+        return JsonResponse({'success': True, 'liked': liked, 'likes_count': post.likes_count})
+    
+    return redirect('forum:view_post', post_id=post_id)
 
 @login_required
 def categories(request):
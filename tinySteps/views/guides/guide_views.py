@@ -22,8 +22,8 @@ def guides_page(request):
     recent_parent_guides = parent_service.get_recent_guides(count=4)
     recent_nutrition_guides = nutrition_service.get_recent_guides(count=4)
     
-    popular_parent_guides = parent_service.get_recent_guides(count=4)
-    popular_nutrition_guides = nutrition_service.get_recent_guides(count=4)
+    popular_parent_guides = parent_service.get_popular_guides(limit=4)
+    popular_nutrition_guides = nutrition_service.get_popular_guides(limit=4)
     
     # Rest of the function remains the same
     is_staff = request.user.is_staff
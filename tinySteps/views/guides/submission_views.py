@@ -11,6 +11,7 @@ from django.core.files.storage import default_storage
 from django.middleware.csrf import get_token
 
 from tinySteps.forms import GuideSubmission_Form
+from tinySteps.models.content.tag_models import format_tags
 from tinySteps.factories import GuideService_Factory
 
 logger = logging.getLogger(__name__)
@@ -79,13 +80,10 @@ class SubmitGuide_View(LoginRequiredMixin, View):
                 guide_instance.author = request.user
                 guide_instance.guide_type = guide_type
                 guide_instance.status = 'pending'  # Ensure status is pending
+                # Tags are normalized before the first save, which also indexes them
+                guide_instance.tags = format_tags(form.cleaned_data.get('tags', ''))
                 guide_instance.save()
                 
-                # Handle tags
-                tags = form.cleaned_data.get('tags', '')
-                if tags and hasattr(guide_instance, 'tags'):
-                    guide_instance.set_tags(tags)
-                
                 messages.success(request, 
                     _("Your guide has been submitted for review. You'll be notified when it's approved."))
                 